@@ -187,7 +187,8 @@ class CandleReader:
             raise ValueError(f"Formato de hora no válido: '{time_ref}'. "
                            f"Usa 'ahora', 'actual', o formato como '1am', '9am', '13:00'")
     
-    def _get_candle_at_time(self, symbol: str, timeframe: int, target_time_mt5: datetime) -> Optional[Dict]:
+    def _get_candle_at_time(self, symbol: str, timeframe: int, target_time_mt5: datetime,
+                            rates: Optional[np.ndarray] = None) -> Optional[Dict]:
         """
         Obtiene la vela que CONTIENE el tiempo específico de MT5
         
@@ -195,13 +196,15 @@ class CandleReader:
             symbol: Símbolo a consultar
             timeframe: Temporalidad MT5
             target_time_mt5: Tiempo objetivo en zona horaria de MT5 (sin timezone)
+            rates: Velas de esa temporalidad ya obtenidas (opcional, evita releerlas)
             
         Returns:
             Dict con información de la vela o None
         """
         # Obtener múltiples velas para buscar la correcta
         # Obtener velas de los últimos días para asegurar que encontramos la correcta
-        rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, 200)
+        if rates is None:
+            rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, 200)
         
         if rates is None or len(rates) == 0:
             return None
@@ -361,7 +364,8 @@ class CandleReader:
             'lower_wick': min(open_price, close) - low,
         }
     
-    def get_candle(self, timeframe: str, time_ref: str = 'ahora', symbol: str = None) -> Optional[Dict]:
+    def get_candle(self, timeframe: str, time_ref: str = 'ahora', symbol: str = None,
+                   rates: Optional[np.ndarray] = None) -> Optional[Dict]:
         """
         Obtiene información de una vela específica
         
@@ -369,6 +373,8 @@ class CandleReader:
             timeframe: Temporalidad (ej: 'M5', 'H4', 'H1')
             time_ref: Referencia de tiempo ('ahora', 'actual', '1am', '9am', '13:00', etc.)
             symbol: Símbolo a consultar (usa default si no se especifica)
+            rates: Velas de esa temporalidad ya obtenidas (opcional): permite leer varias
+                   velas por hora con una sola llamada a MT5
             
         Returns:
             Dict con información de la vela o None si no se encuentra
@@ -422,7 +428,7 @@ class CandleReader:
                         return None
                     return self._format_candle(rates[-1], is_current=True)
                 
-                return self._get_candle_at_time(symbol_to_use, tf, target_time)
+                return self._get_candle_at_time(symbol_to_use, tf, target_time, rates=rates)
                 
             except ValueError as e:
                 self.logger.error(str(e))
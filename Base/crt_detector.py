@@ -4,9 +4,81 @@ Detecta barridos de liquidez y patrones Vayas en múltiples temporalidades
 """
 
 import logging
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
+import numpy as np
 from Base.candle_reader import get_candle, CandleReader
 import MetaTrader5 as mt5
+from Base.numba_compat import njit
+
+
+@njit(cache=True, nogil=True)
+def _sweep_kernel(h, l, c, lookback):
+    """
+    Busca el primer barrido de liquidez de la vela 0 sobre las velas 1..lookback
+    
+    Args:
+        h, l, c: Arrays float64 de high, low y close
+        lookback: Número de velas anteriores a verificar
+        
+    Returns:
+        Tupla (tipo, índice): tipo 1 = barrido alcista (rompe máximo), -1 = barrido bajista
+        (rompe mínimo), 0 = sin barrido
+    """
+    current_high = h[0]
+    current_low = l[0]
+    current_close = c[0]
+    n = min(len(h), lookback + 1)
+    for i in range(1, n):
+        if current_high > h[i] and current_close < h[i]:
+            return 1, i
+        if current_low < l[i] and current_close > l[i]:
+            return -1, i
+    return 0, -1
+
+
+@njit(cache=True, nogil=True)
+def _engulfing_kernel(o, h, l, c):
+    """
+    Detecta si la vela 0 envuelve a la vela 1
+    
+    Args:
+        o, h, l, c: Arrays float64 de open, high, low y close (al menos 2 velas)
+        
+    Returns:
+        1 = envolvente alcista, -1 = envolvente bajista, 0 = sin envolvente
+    """
+    if not (l[0] < l[1] and h[0] > h[1]):
+        return 0
+    if c[1] < o[1] and c[0] > o[0]:
+        return 1
+    if c[1] > o[1] and c[0] < o[0]:
+        return -1
+    return 0
+
+
+# Vista "structure of arrays" de las velas: (open, high, low, close) contiguos en float64
+OHLCArrays = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def ohlc_arrays(rates: np.ndarray) -> OHLCArrays:
+    """
+    Convierte el array estructurado de MT5 en arrays contiguos float64 (open, high, low, close)
+    
+    Conviene hacerlo una sola vez por lectura de velas y pasar el resultado a los
+    detectores (parámetro ohlc) en lugar de repetir la extracción por campo.
+    
+    Args:
+        rates: Array estructurado devuelto por mt5.copy_rates_from_pos
+        
+    Returns:
+        Tupla (open, high, low, close)
+    """
+    return (
+        np.ascontiguousarray(rates['open'], dtype=np.float64),
+        np.ascontiguousarray(rates['high'], dtype=np.float64),
+        np.ascontiguousarray(rates['low'], dtype=np.float64),
+        np.ascontiguousarray(rates['close'], dtype=np.float64),
+    )
 
 
 class CRTDetector:
@@ -21,7 +93,8 @@ class CRTDetector:
         self.candle_reader = CandleReader()
     
     def detect_liquidity_sweep(self, symbol: str, timeframe: str = 'H4', 
-                               lookback: int = 5) -> Optional[Dict]:
+                               lookback: int = 5, rates: Optional[np.ndarray] = None,
+                               ohlc: Optional[OHLCArrays] = None) -> Optional[Dict]:
         """
         Detecta barridos de liquidez (Liquidity Sweep) según CRT
         
@@ -33,6 +106,8 @@ class CRTDetector:
             symbol: Símbolo a analizar (ej: 'EURUSD')
             timeframe: Temporalidad para análisis ('H4', 'H1', 'D1', etc.)
             lookback: Número de velas anteriores a verificar (default: 5)
+            rates: Velas ya obtenidas de MT5 (lookback + 1), evita una nueva llamada (opcional)
+            ohlc: Mismas velas ya convertidas con ohlc_arrays (opcional, tiene prioridad sobre rates)
             
         Returns:
             Dict con información del barrido o None:
@@ -61,28 +136,36 @@ class CRTDetector:
                 'D1': mt5.TIMEFRAME_D1,
             }
             
-            tf = timeframe_map.get(timeframe.upper(), mt5.TIMEFRAME_H4)
-            rates = mt5.copy_rates_from_pos(symbol, tf, 0, lookback + 1)
+            if ohlc is None:
+                if rates is None:
+                    tf = timeframe_map.get(timeframe.upper(), mt5.TIMEFRAME_H4)
+                    rates = mt5.copy_rates_from_pos(symbol, tf, 0, lookback + 1)
+                if rates is None or len(rates) < 2:
+                    return None
+                ohlc = ohlc_arrays(rates)
             
-            if rates is None or len(rates) < 2:
+            o, h, l, c = ohlc
+            if len(c) < 2:
                 return None
+            sweep_kind, i = _sweep_kernel(h, l, c, lookback)
             
-            # La vela actual es la última (posición 0)
-            current_candle = rates[0]
-            current_high = float(current_candle['high'])
-            current_low = float(current_candle['low'])
-            current_close = float(current_candle['close'])
-            
-            # Verificar barridos en velas anteriores
-            for i in range(1, min(len(rates), lookback + 1)):
-                previous_candle = rates[i]
-                prev_high = float(previous_candle['high'])
-                prev_low = float(previous_candle['low'])
-                prev_close = float(previous_candle['close'])
+            if sweep_kind != 0:
+                # La vela actual es la última (posición 0)
+                current_candle = {
+                    'high': float(h[0]),
+                    'low': float(l[0]),
+                    'close': float(c[0]),
+                    'open': float(o[0])
+                }
+                swept_candle = {
+                    'high': float(h[i]),
+                    'low': float(l[i]),
+                    'close': float(c[i]),
+                    'open': float(o[i])
+                }
                 
-                # Barrido Alcista (Bullish Sweep): rompe máximo pero cierra dentro
-                if current_high > prev_high and current_close < prev_high:
-                    # El precio barrió el máximo pero cerró dentro del rango
+                if sweep_kind == 1:
+                    # Barrido Alcista (Bullish Sweep): rompe máximo pero cierra dentro
                     # Señal: Reversión bajista esperada hacia el mínimo
                     return {
                         'detected': True,
@@ -91,50 +174,28 @@ class CRTDetector:
                         'swept_candle_index': i,
                         'swept_extreme': 'high',
                         'target_extreme': 'low',
-                        'target_price': prev_low,  # TP hacia el mínimo
-                        'sweep_price': prev_high,  # Precio barrido
-                        'current_candle': {
-                            'high': current_high,
-                            'low': current_low,
-                            'close': current_close,
-                            'open': float(current_candle['open'])
-                        },
-                        'swept_candle': {
-                            'high': prev_high,
-                            'low': prev_low,
-                            'close': prev_close,
-                            'open': float(previous_candle['open'])
-                        },
+                        'target_price': swept_candle['low'],  # TP hacia el mínimo
+                        'sweep_price': swept_candle['high'],  # Precio barrido
+                        'current_candle': current_candle,
+                        'swept_candle': swept_candle,
                         'timeframe': timeframe
                     }
                 
                 # Barrido Bajista (Bearish Sweep): rompe mínimo pero cierra dentro
-                if current_low < prev_low and current_close > prev_low:
-                    # El precio barrió el mínimo pero cerró dentro del rango
-                    # Señal: Reversión alcista esperada hacia el máximo
-                    return {
-                        'detected': True,
-                        'sweep_type': 'BEARISH_SWEEP',
-                        'direction': 'BULLISH',  # Reversión esperada
-                        'swept_candle_index': i,
-                        'swept_extreme': 'low',
-                        'target_extreme': 'high',
-                        'target_price': prev_high,  # TP hacia el máximo
-                        'sweep_price': prev_low,  # Precio barrido
-                        'current_candle': {
-                            'high': current_high,
-                            'low': current_low,
-                            'close': current_close,
-                            'open': float(current_candle['open'])
-                        },
-                        'swept_candle': {
-                            'high': prev_high,
-                            'low': prev_low,
-                            'close': prev_close,
-                            'open': float(previous_candle['open'])
-                        },
-                        'timeframe': timeframe
-                    }
+                # Señal: Reversión alcista esperada hacia el máximo
+                return {
+                    'detected': True,
+                    'sweep_type': 'BEARISH_SWEEP',
+                    'direction': 'BULLISH',  # Reversión esperada
+                    'swept_candle_index': i,
+                    'swept_extreme': 'low',
+                    'target_extreme': 'high',
+                    'target_price': swept_candle['high'],  # TP hacia el máximo
+                    'sweep_price': swept_candle['low'],  # Precio barrido
+                    'current_candle': current_candle,
+                    'swept_candle': swept_candle,
+                    'timeframe': timeframe
+                }
             
             # No se detectó barrido
             return {
@@ -147,7 +208,8 @@ class CRTDetector:
             return None
     
     def detect_vayas_pattern(self, symbol: str, timeframe: str = 'D1', 
-                            lookback: int = 3) -> Optional[Dict]:
+                            lookback: int = 3, rates: Optional[np.ndarray] = None,
+                            ohlc: Optional[OHLCArrays] = None) -> Optional[Dict]:
         """
         Detecta el patrón "Vayas" (cambio de sesgo)
         
@@ -159,6 +221,8 @@ class CRTDetector:
             symbol: Símbolo a analizar
             timeframe: Temporalidad para análisis ('D1', 'H4', etc.)
             lookback: Número de velas a analizar (default: 3)
+            rates: Velas ya obtenidas de MT5 (lookback + 1), evita una nueva llamada (opcional)
+            ohlc: Mismas velas ya convertidas con ohlc_arrays (opcional, tiene prioridad sobre rates)
             
         Returns:
             Dict con información del patrón Vayas o None:
@@ -181,25 +245,28 @@ class CRTDetector:
                 'D1': mt5.TIMEFRAME_D1,
             }
             
-            tf = timeframe_map.get(timeframe.upper(), mt5.TIMEFRAME_D1)
-            rates = mt5.copy_rates_from_pos(symbol, tf, 0, lookback + 1)
+            if ohlc is None:
+                if rates is None:
+                    tf = timeframe_map.get(timeframe.upper(), mt5.TIMEFRAME_D1)
+                    rates = mt5.copy_rates_from_pos(symbol, tf, 0, lookback + 1)
+                if rates is None or len(rates) < 2:
+                    return None
+                ohlc = ohlc_arrays(rates)
             
-            if rates is None or len(rates) < 2:
+            o, h, l, c = ohlc
+            if len(c) < 2:
                 return None
             
-            # Vela actual y anterior
-            current_candle = rates[0]
-            previous_candle = rates[1]
+            # Vela actual (posición 0) y anterior (posición 1)
+            current_high = float(h[0])
+            current_low = float(l[0])
+            current_close = float(c[0])
+            current_open = float(o[0])
             
-            current_high = float(current_candle['high'])
-            current_low = float(current_candle['low'])
-            current_close = float(current_candle['close'])
-            current_open = float(current_candle['open'])
-            
-            prev_high = float(previous_candle['high'])
-            prev_low = float(previous_candle['low'])
-            prev_close = float(previous_candle['close'])
-            prev_open = float(previous_candle['open'])
+            prev_high = float(h[1])
+            prev_low = float(l[1])
+            prev_close = float(c[1])
+            prev_open = float(o[1])
             
             # Vayas en tendencia alcista: vela anterior alcista, actual no rompe máximo
             if prev_close > prev_open:  # Vela anterior alcista
@@ -257,13 +324,17 @@ class CRTDetector:
             self.logger.error(f"Error al detectar patrón Vayas: {e}", exc_info=True)
             return None
     
-    def detect_engulfing_candle(self, symbol: str, timeframe: str = 'M15') -> Optional[Dict]:
+    def detect_engulfing_candle(self, symbol: str, timeframe: str = 'M15',
+                                rates: Optional[np.ndarray] = None,
+                                ohlc: Optional[OHLCArrays] = None) -> Optional[Dict]:
         """
         Detecta velas envolventes (Engulfing Candles) que pueden confirmar reversiones
         
         Args:
             symbol: Símbolo a analizar
             timeframe: Temporalidad para análisis
+            rates: Últimas 2 velas ya obtenidas de MT5, evita una nueva llamada (opcional)
+            ohlc: Mismas velas ya convertidas con ohlc_arrays (opcional, tiene prioridad sobre rates)
             
         Returns:
             Dict con información de la vela envolvente o None
@@ -285,70 +356,39 @@ class CRTDetector:
                 'D1': mt5.TIMEFRAME_D1,
             }
             
-            tf = timeframe_map.get(timeframe.upper(), mt5.TIMEFRAME_M15)
-            rates = mt5.copy_rates_from_pos(symbol, tf, 0, 2)
+            if ohlc is None:
+                if rates is None:
+                    tf = timeframe_map.get(timeframe.upper(), mt5.TIMEFRAME_M15)
+                    rates = mt5.copy_rates_from_pos(symbol, tf, 0, 2)
+                if rates is None or len(rates) < 2:
+                    return None
+                ohlc = ohlc_arrays(rates)
             
-            if rates is None or len(rates) < 2:
+            o, h, l, c = ohlc
+            if len(c) < 2:
                 return None
+            engulfing_kind = _engulfing_kernel(o, h, l, c)
             
-            current_candle = rates[0]
-            previous_candle = rates[1]
-            
-            current_high = float(current_candle['high'])
-            current_low = float(current_candle['low'])
-            current_close = float(current_candle['close'])
-            current_open = float(current_candle['open'])
-            
-            prev_high = float(previous_candle['high'])
-            prev_low = float(previous_candle['low'])
-            prev_close = float(previous_candle['close'])
-            prev_open = float(previous_candle['open'])
-            
-            # Vela envolvente alcista: vela anterior bajista, actual alcista que la envuelve
-            if prev_close < prev_open:  # Vela anterior bajista
-                if current_close > current_open:  # Vela actual alcista
-                    if current_low < prev_low and current_high > prev_high:
-                        # La vela actual envuelve completamente la anterior
-                        return {
-                            'detected': True,
-                            'engulfing_type': 'BULLISH_ENGULFING',
-                            'current_candle': {
-                                'high': current_high,
-                                'low': current_low,
-                                'close': current_close,
-                                'open': current_open
-                            },
-                            'previous_candle': {
-                                'high': prev_high,
-                                'low': prev_low,
-                                'close': prev_close,
-                                'open': prev_open
-                            },
-                            'timeframe': timeframe
-                        }
-            
-            # Vela envolvente bajista: vela anterior alcista, actual bajista que la envuelve
-            if prev_close > prev_open:  # Vela anterior alcista
-                if current_close < current_open:  # Vela actual bajista
-                    if current_low < prev_low and current_high > prev_high:
-                        # La vela actual envuelve completamente la anterior
-                        return {
-                            'detected': True,
-                            'engulfing_type': 'BEARISH_ENGULFING',
-                            'current_candle': {
-                                'high': current_high,
-                                'low': current_low,
-                                'close': current_close,
-                                'open': current_open
-                            },
-                            'previous_candle': {
-                                'high': prev_high,
-                                'low': prev_low,
-                                'close': prev_close,
-                                'open': prev_open
-                            },
-                            'timeframe': timeframe
-                        }
+            if engulfing_kind != 0:
+                # 1: vela anterior bajista y actual alcista que la envuelve
+                # -1: vela anterior alcista y actual bajista que la envuelve
+                return {
+                    'detected': True,
+                    'engulfing_type': 'BULLISH_ENGULFING' if engulfing_kind == 1 else 'BEARISH_ENGULFING',
+                    'current_candle': {
+                        'high': float(h[0]),
+                        'low': float(l[0]),
+                        'close': float(c[0]),
+                        'open': float(o[0])
+                    },
+                    'previous_candle': {
+                        'high': float(h[1]),
+                        'low': float(l[1]),
+                        'close': float(c[1]),
+                        'open': float(o[1])
+                    },
+                    'timeframe': timeframe
+                }
             
             return {
                 'detected': False,
@@ -360,7 +400,9 @@ class CRTDetector:
             return None
 
 
-def detect_crt_sweep(symbol: str, timeframe: str = 'H4', lookback: int = 5) -> Optional[Dict]:
+def detect_crt_sweep(symbol: str, timeframe: str = 'H4', lookback: int = 5,
+                     rates: Optional[np.ndarray] = None,
+                     ohlc: Optional[OHLCArrays] = None) -> Optional[Dict]:
     """
     Función de conveniencia para detectar barridos de liquidez CRT
     
@@ -368,15 +410,19 @@ def detect_crt_sweep(symbol: str, timeframe: str = 'H4', lookback: int = 5) -> O
         symbol: Símbolo a analizar
         timeframe: Temporalidad ('H4', 'H1', 'D1', etc.)
         lookback: Número de velas anteriores a verificar
+        rates: Velas ya obtenidas de MT5 (opcional)
+        ohlc: Velas ya convertidas con ohlc_arrays (opcional)
         
     Returns:
         Dict con información del barrido o None
     """
     detector = CRTDetector()
-    return detector.detect_liquidity_sweep(symbol, timeframe, lookback)
+    return detector.detect_liquidity_sweep(symbol, timeframe, lookback, rates=rates, ohlc=ohlc)
 
 
-def detect_crt_vayas(symbol: str, timeframe: str = 'D1', lookback: int = 3) -> Optional[Dict]:
+def detect_crt_vayas(symbol: str, timeframe: str = 'D1', lookback: int = 3,
+                     rates: Optional[np.ndarray] = None,
+                     ohlc: Optional[OHLCArrays] = None) -> Optional[Dict]:
     """
     Función de conveniencia para detectar patrón Vayas
     
@@ -384,24 +430,30 @@ def detect_crt_vayas(symbol: str, timeframe: str = 'D1', lookback: int = 3) -> O
         symbol: Símbolo a analizar
         timeframe: Temporalidad ('D1', 'H4', etc.)
         lookback: Número de velas a analizar
+        rates: Velas ya obtenidas de MT5 (opcional)
+        ohlc: Velas ya convertidas con ohlc_arrays (opcional)
         
     Returns:
         Dict con información del patrón Vayas o None
     """
     detector = CRTDetector()
-    return detector.detect_vayas_pattern(symbol, timeframe, lookback)
+    return detector.detect_vayas_pattern(symbol, timeframe, lookback, rates=rates, ohlc=ohlc)
 
 
-def detect_engulfing(symbol: str, timeframe: str = 'M15') -> Optional[Dict]:
+def detect_engulfing(symbol: str, timeframe: str = 'M15',
+                     rates: Optional[np.ndarray] = None,
+                     ohlc: Optional[OHLCArrays] = None) -> Optional[Dict]:
     """
     Función de conveniencia para detectar velas envolventes
     
     Args:
         symbol: Símbolo a analizar
         timeframe: Temporalidad
+        rates: Últimas 2 velas ya obtenidas de MT5 (opcional)
+        ohlc: Velas ya convertidas con ohlc_arrays (opcional)
         
     Returns:
         Dict con información de la vela envolvente o None
     """
     detector = CRTDetector()
-    return detector.detect_engulfing_candle(symbol, timeframe)
+    return detector.detect_engulfing_candle(symbol, timeframe, rates=rates, ohlc=ohlc)
@@ -6,6 +6,7 @@ Detecta cuando el precio toma (alcanza) los altos o bajos diarios de días anter
 
 import MetaTrader5 as mt5
 import logging
+import numpy as np
 from typing import Dict, Optional, List, Tuple
 from datetime import datetime, date, timedelta
 from pytz import timezone as tz
@@ -107,15 +108,17 @@ class DailyLevelsDetector:
             if rates is None or len(rates) < 2:
                 return None
             
-            # Procesar días anteriores (saltar el día actual, posición 0)
-            for i in range(1, min(len(rates), lookback_days + 1)):
-                candle_data = rates[i]
-                candle_time = datetime.fromtimestamp(candle_data['time'])
+            # Procesar días anteriores (saltar el día actual, posición 0) como columnas contiguas:
+            # evita indexar el array estructurado vela a vela y permite reducir con argmax/argmin
+            n = min(len(rates), lookback_days + 1)
+            highs = np.ascontiguousarray(rates['high'][1:n], dtype=np.float64)
+            lows = np.ascontiguousarray(rates['low'][1:n], dtype=np.float64)
+            times = rates['time'][1:n].tolist()
+            
+            for time_value, high, low in zip(times, highs.tolist(), lows.tolist()):
+                candle_time = datetime.fromtimestamp(time_value)
                 candle_date = candle_time.date()
                 
-                high = float(candle_data['high'])
-                low = float(candle_data['low'])
-                
                 previous_highs.append({
                     'date': candle_date,
                     'high': high,
@@ -131,9 +134,9 @@ class DailyLevelsDetector:
             if not previous_highs or not previous_lows:
                 return None
             
-            # Encontrar el HIGH más alto y el LOW más bajo
-            highest_high_item = max(previous_highs, key=lambda x: x['high'])
-            lowest_low_item = min(previous_lows, key=lambda x: x['low'])
+            # Encontrar el HIGH más alto y el LOW más bajo (primera ocurrencia, igual que max/min)
+            highest_high_item = previous_highs[int(np.argmax(highs))]
+            lowest_low_item = previous_lows[int(np.argmin(lows))]
             
             return {
                 'previous_highs': previous_highs,
@@ -150,7 +153,9 @@ class DailyLevelsDetector:
             return None
     
     def detect_daily_level_touch(self, symbol: str, lookback_days: int = 5, 
-                                 tolerance_pips: float = 1.0) -> Optional[Dict]:
+                                 tolerance_pips: float = 1.0, levels: Optional[Dict] = None,
+                                 current_price: Optional[float] = None,
+                                 pip_value: Optional[float] = None) -> Optional[Dict]:
         """
         Detecta si el precio actual está tocando o alcanzando un nivel diario previo
         
@@ -163,6 +168,9 @@ class DailyLevelsDetector:
             tolerance_pips: Tolerancia en pips para considerar que el precio "tocó" el nivel (default: 1.0)
                            - Para HIGH: precio >= (high - tolerance)
                            - Para LOW: precio <= (low + tolerance)
+            levels: Resultado de get_previous_daily_levels ya obtenido (opcional, evita releer velas D1)
+            current_price: Precio actual (bid) ya obtenido (opcional, evita otra llamada a MT5)
+            pip_value: Valor del pip del símbolo ya calculado (opcional, evita consultar symbol_info)
             
         Returns:
             Dict con información del nivel tocado o None:
@@ -181,24 +189,26 @@ class DailyLevelsDetector:
         """
         try:
             # Obtener niveles diarios
-            levels = self.get_previous_daily_levels(symbol, lookback_days)
+            if levels is None:
+                levels = self.get_previous_daily_levels(symbol, lookback_days)
             if not levels:
                 return None
             
             # Obtener precio actual
-            tick = mt5.symbol_info_tick(symbol)
-            if tick is None:
-                return None
-            
-            current_price = float(tick.bid)
+            if current_price is None:
+                tick = mt5.symbol_info_tick(symbol)
+                if tick is None:
+                    return None
+                current_price = float(tick.bid)
             
             # Obtener información del símbolo para calcular pips
-            symbol_info = mt5.symbol_info(symbol)
-            if symbol_info is None:
-                return None
-            
-            point = symbol_info.point
-            pip_value = point * 10 if symbol_info.digits == 5 else point * 1
+            if pip_value is None:
+                symbol_info = mt5.symbol_info(symbol)
+                if symbol_info is None:
+                    return None
+                
+                point = symbol_info.point
+                pip_value = point * 10 if symbol_info.digits == 5 else point * 1
             tolerance_price = tolerance_pips * pip_value
             
             # ⚠️ IMPORTANTE: Detectar cuando el precio TOMA el nivel (incluso por 1 pip)
@@ -455,7 +465,9 @@ def get_previous_daily_levels(symbol: str, lookback_days: int = 5) -> Optional[D
 
 
 def detect_daily_level_touch(symbol: str, lookback_days: int = 5, 
-                             tolerance_pips: float = 1.0) -> Optional[Dict]:
+                             tolerance_pips: float = 1.0, levels: Optional[Dict] = None,
+                             current_price: Optional[float] = None,
+                             pip_value: Optional[float] = None) -> Optional[Dict]:
     """
     Detecta si el precio actual está tocando o alcanzando un nivel diario previo
     
@@ -463,12 +475,17 @@ def detect_daily_level_touch(symbol: str, lookback_days: int = 5,
         symbol: Símbolo a analizar
         lookback_days: Número de días anteriores a revisar
         tolerance_pips: Tolerancia en pips para considerar que el precio "tocó" el nivel
+        levels: Niveles diarios ya obtenidos con get_previous_daily_levels (opcional)
+        current_price: Precio actual (bid) ya obtenido (opcional)
+        pip_value: Valor del pip del símbolo ya calculado (opcional)
         
     Returns:
         Dict con información del nivel tocado o None
     """
     detector = DailyLevelsDetector()
-    return detector.detect_daily_level_touch(symbol, lookback_days, tolerance_pips)
+    return detector.detect_daily_level_touch(symbol, lookback_days, tolerance_pips,
+                                             levels=levels, current_price=current_price,
+                                             pip_value=pip_value)
 
 
 def detect_daily_high_take(symbol: str, lookback_days: int = 5, 
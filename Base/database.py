@@ -3,7 +3,9 @@ Módulo de Base de Datos SQL Server
 Maneja la conexión y operaciones de base de datos para guardar logs y órdenes
 """
 
+import functools
 import logging
+import threading
 from datetime import datetime, date
 from typing import Dict, Optional, Any, List
 import json
@@ -20,6 +22,21 @@ except ImportError:
     PYODBC_AVAILABLE = False
 
 
+def _synchronized(method):
+    """
+    Ejecuta el método con el lock de la conexión del DatabaseManager
+    
+    La conexión pyodbc/pymssql es única y no es segura entre hilos: el hilo principal,
+    el escritor de órdenes en segundo plano y el handler de logs la comparten, y sin el
+    lock sus cursores, commit() y rollback() se intercalan.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class DatabaseManager:
     """Gestor de conexión y operaciones con SQL Server"""
     
@@ -48,6 +65,9 @@ class DatabaseManager:
         self.logger = logging.getLogger(__name__)
         self.config = config
         self.connection = None
+        # Lock reentrante de la conexión (los métodos se llaman entre sí); quien use
+        # self.connection directamente debe tomarlo también
+        self.lock = threading.RLock()
         self._tables_created = False  # Flag para evitar verificaciones repetidas - SIEMPRE inicializar
         
         # Cargar configuración de base de datos
@@ -67,6 +87,7 @@ class DatabaseManager:
                 self._tables_created = True
                 self.logger.info("✅ Tablas de base de datos verificadas/creadas")
     
+    @_synchronized
     def _connect(self) -> bool:
         """
         Establece conexión con SQL Server
@@ -117,6 +138,7 @@ class DatabaseManager:
             self.connection = None
             return False
     
+    @_synchronized
     def _ensure_connection(self) -> bool:
         """
         Verifica y restablece la conexión si es necesario
@@ -147,6 +169,7 @@ class DatabaseManager:
             self.connection = None
             return self._connect()
     
+    @_synchronized
     def save_log(self, level: str, logger_name: str, message: str, 
                  symbol: Optional[str] = None, strategy: Optional[str] = None,
                  extra_data: Optional[Dict] = None) -> bool:
@@ -225,6 +248,7 @@ class DatabaseManager:
                 pass
             return False
     
+    @_synchronized
     def save_order(self, ticket: int, symbol: str, order_type: str, 
                    entry_price: float, volume: float, stop_loss: Optional[float] = None,
                    take_profit: Optional[float] = None, strategy: Optional[str] = None,
@@ -319,6 +343,7 @@ class DatabaseManager:
                 pass
             return False
     
+    @_synchronized
     def _create_logs_table(self) -> bool:
         """Crea la tabla Logs si no existe"""
         try:
@@ -366,6 +391,7 @@ class DatabaseManager:
             self.logger.error(f"Error al crear tabla Logs: {e}", exc_info=True)
             return False
     
+    @_synchronized
     def _create_orders_table(self) -> bool:
         """Crea la tabla Orders si no existe"""
         try:
@@ -446,6 +472,7 @@ class DatabaseManager:
             self.logger.error(f"Error al crear tabla Orders: {e}", exc_info=True)
             return False
     
+    @_synchronized
     def mark_order_as_closed(self, ticket: int, close_reason: Optional[str] = None, 
                              close_price: Optional[float] = None) -> bool:
         """
@@ -540,6 +567,7 @@ class DatabaseManager:
                 pass
             return False
     
+    @_synchronized
     def _get_order_by_ticket(self, ticket: int) -> Optional[Dict]:
         """
         Obtiene información de una orden por su ticket
@@ -578,6 +606,7 @@ class DatabaseManager:
             self.logger.error(f"Error al obtener orden {ticket}: {e}", exc_info=True)
             return None
     
+    @_synchronized
     def get_open_orders(self, symbol: Optional[str] = None, strategy: Optional[str] = None, today_only: bool = True) -> List[Dict]:
         """
         Obtiene las órdenes abiertas desde la base de datos
@@ -653,6 +682,7 @@ class DatabaseManager:
             self.logger.error(f"Error al obtener órdenes abiertas desde BD: {e}", exc_info=True)
             return []
     
+    @_synchronized
     def count_trades_today(self, strategy: Optional[str] = None, symbol: Optional[str] = None) -> int:
         """
         Cuenta los trades ejecutados hoy desde la base de datos
@@ -708,6 +738,55 @@ class DatabaseManager:
             self.logger.error(f"Error al contar trades del día desde BD: {e}", exc_info=True)
             return 0
     
+    @_synchronized
+    def count_trades_today_by_symbol(self, strategy: Optional[str] = None) -> Dict[str, int]:
+        """
+        Cuenta los trades ejecutados hoy agrupados por símbolo (una sola consulta para todos los símbolos)
+        
+        Args:
+            strategy: Filtrar por estrategia (opcional)
+            
+        Returns:
+            Dict {símbolo: número de trades ejecutados hoy}
+        """
+        try:
+            if not self._ensure_connection():
+                return {}
+            
+            # Asegurar que las tablas existen (solo si no se han creado aún)
+            if not getattr(self, '_tables_created', False):
+                self._create_orders_table()
+                self._tables_created = True
+            
+            cursor = self.connection.cursor()
+            
+            # Obtener fecha de hoy (solo fecha, sin hora)
+            today = date.today()
+            
+            query = """
+                SELECT Symbol, COUNT(*) 
+                FROM Orders 
+                WHERE CONVERT(DATE, CreatedAt) = ?
+            """
+            params = [today]
+            
+            if strategy:
+                query += " AND Strategy = ?"
+                params.append(strategy)
+            
+            query += " GROUP BY Symbol"
+            
+            cursor.execute(query, params)
+            counts = {row[0]: row[1] for row in cursor.fetchall()}
+            cursor.close()
+            
+            return counts
+            
+        except Exception as e:
+            self.logger.error(f"Error al contar trades del día por símbolo desde BD: {e}", exc_info=True)
+            return {}
+    
+    @_synchronized
     def first_trade_closed_with_tp(self, strategy: Optional[str] = None, symbol: Optional[str] = None) -> bool:
         """
         Verifica si el primer trade del día cerró con Take Profit
@@ -768,6 +847,7 @@ class DatabaseManager:
             self.logger.error(f"Error al verificar primer trade con TP: {e}", exc_info=True)
             return False
     
+    @_synchronized
     def sync_orders_with_mt5(self, mt5_positions: List[Dict]) -> Dict:
         """
         Sincroniza el estado de las órdenes en BD con las posiciones abiertas en MT5
@@ -817,6 +897,7 @@ class DatabaseManager:
             self.logger.error(f"Error al sincronizar órdenes con MT5: {e}", exc_info=True)
             return {'synced': 0, 'closed': 0}
     
+    @_synchronized
     def close(self):
         """Cierra la conexión a la base de datos"""
         try:
@@ -36,6 +36,25 @@ class DatabaseLogHandler(logging.Handler):
         # Patrón para extraer símbolos del mensaje (ej: [EURUSD], [GBPUSD])
         self.symbol_pattern = re.compile(r'\[([A-Z]{6,12})\]')
     
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Descarta los logs del propio DatabaseManager
+        
+        Se emiten con el lock de la conexión tomado: guardarlos aquí tomaría el lock del
+        handler y, si otro hilo está en emit() esperando el lock de la conexión, ambos
+        quedarían bloqueados. También evita el bucle de "Error al guardar log en BD".
+        Siguen llegando a consola y archivo.
+        
+        Args:
+            record: Registro de log
+            
+        Returns:
+            True si el registro se debe guardar
+        """
+        if record.name == self.db_manager.logger.name:
+            return False
+        return super().filter(record)
+    
     def emit(self, record: logging.LogRecord):
         """
         Guarda el log en la base de datos
@@ -5,9 +5,50 @@ Detecta si el precio actual está formando un FVG y si entró/salió de la zona
 
 import MetaTrader5 as mt5
 import logging
+import numpy as np
 from typing import Dict, Optional, List
 from datetime import datetime
 from .candle_reader import get_candle
+from .numba_compat import njit
+
+
+@njit(cache=True, nogil=True)
+def _fvg_kernel(h, l, current_price):
+    """
+    Clasifica el FVG de las 3 velas (más antigua primero) con la misma prioridad que detect_fvg
+    
+    Args:
+        h, l: Arrays float64 de high y low de [vela1, vela2, vela3]
+        current_price: Precio actual (bid)
+        
+    Returns:
+        Tupla (tipo, bottom, top): tipo 1/-1 = FVG alcista/bajista entre vela1 y vela3 (en formación),
+        2/-2 = FVG alcista/bajista entre vela1 y vela2 con el precio interactuando, 0 = sin FVG
+    """
+    # Prioridad 1 y 2: FVG entre vela1 y vela3 (sin solapamiento)
+    if l[0] < h[2] and l[2] > h[0]:
+        return 1, h[0], l[2]
+    if h[0] > l[2] and h[2] < l[0]:
+        return -1, h[2], l[0]
+    
+    # 3. FVG ya formado entre vela1 y vela2, solo si el precio está interactuando con él
+    if h[0] < l[1]:
+        kind = 2
+        fvg_bottom = h[0]
+        fvg_top = l[1]
+    elif l[0] > h[1]:
+        kind = -2
+        fvg_bottom = h[1]
+        fvg_top = l[0]
+    else:
+        return 0, 0.0, 0.0
+    
+    size = fvg_top - fvg_bottom
+    if (fvg_bottom <= current_price <= fvg_top) or \
+       (current_price > fvg_top and current_price - fvg_top < size * 2) or \
+       (current_price < fvg_bottom and fvg_bottom - current_price < size * 2):
+        return kind, fvg_bottom, fvg_top
+    return 0, 0.0, 0.0
 
 
 class FVGDetector:
@@ -28,43 +69,63 @@ class FVGDetector:
         Returns:
             Lista de velas ordenadas (más antigua primero): [anterior2, anterior1, actual]
         """
-        candles = []
-        tf = self._parse_timeframe(timeframe)
-        
-        # Obtener vela actual (posición 0) + 2 velas anteriores (posición 1 y 2)
-        # MT5 devuelve las velas de más reciente (índice 0) a más antigua (índice n)
-        rates = mt5.copy_rates_from_pos(symbol, tf, 0, 3)
+        rates = self._get_recent_rates(symbol, timeframe)
+        if rates is None:
+            return []
+        return self._candles_from_rates(rates)
+    
+    def _get_recent_rates(self, symbol: str, timeframe: str) -> Optional[np.ndarray]:
+        """
+        Obtiene las 3 velas más recientes (actual en formación + 2 cerradas) ordenadas por tiempo
         
-        if rates is not None and len(rates) >= 3:
-            # MT5 devuelve las velas de más reciente (índice 0) a más antigua (índice n)
-            # Pero para asegurar orden correcto, siempre ordenamos por tiempo
-            # Necesitamos: [más antigua, del medio, más reciente]
-            
-            # Procesar todas las velas y ordenarlas por tiempo
-            for i, candle_data in enumerate(rates):
-                candle_time = datetime.fromtimestamp(candle_data['time'])
-                candles.append({
-                    'time': candle_time,
-                    'open': float(candle_data['open']),
-                    'high': float(candle_data['high']),
-                    'low': float(candle_data['low']),
-                    'close': float(candle_data['close']),
-                    'volume': int(candle_data['tick_volume']),
-                    'is_current': (i == 0)  # La primera (más reciente) es la actual
-                })
+        Args:
+            symbol: Símbolo a analizar
+            timeframe: Temporalidad (ej: 'H4', 'H1', 'M5')
             
-            # Ordenar siempre por tiempo para asegurar orden correcto (más antigua primero)
-            candles = sorted(candles, key=lambda x: x['time'])
+        Returns:
+            Array estructurado de MT5 (más antigua primero) o None si no hay 3 velas
+        """
+        tf = self._parse_timeframe(timeframe)
+        return self._last_three(mt5.copy_rates_from_pos(symbol, tf, 0, 3))
+    
+    def _last_three(self, rates: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        """
+        Devuelve las 3 velas más recientes de un array de MT5, ordenadas por tiempo
+        
+        Args:
+            rates: Array estructurado de MT5 (cualquier longitud y orden) o None
             
-            # Marcar la más reciente como actual (puede haber cambiado después de ordenar)
-            if len(candles) > 0:
-                candles[-1]['is_current'] = True
-                # Asegurar que las anteriores no sean marcadas como actuales
-                for i in range(len(candles) - 1):
-                    candles[i]['is_current'] = False
+        Returns:
+            Array con las 3 últimas velas (más antigua primero) o None si hay menos de 3
+        """
+        if rates is None or len(rates) < 3:
+            return None
+        # Asegurar orden por tiempo (más antigua primero) sin depender del orden de MT5
+        return rates[np.argsort(rates['time'], kind='stable')[-3:]]
+    
+    def _candles_from_rates(self, rates: np.ndarray) -> List[Dict]:
+        """
+        Convierte velas ya ordenadas por tiempo a dicts; la última se marca como actual
         
-        # Ya están ordenadas por tiempo (más antigua primero)
-        return candles
+        Args:
+            rates: Array estructurado de MT5 (más antigua primero)
+            
+        Returns:
+            Lista de velas: [anterior2, anterior1, actual]
+        """
+        last = len(rates) - 1
+        return [
+            {
+                'time': datetime.fromtimestamp(candle_data['time']),
+                'open': float(candle_data['open']),
+                'high': float(candle_data['high']),
+                'low': float(candle_data['low']),
+                'close': float(candle_data['close']),
+                'volume': int(candle_data['tick_volume']),
+                'is_current': (i == last)
+            }
+            for i, candle_data in enumerate(rates)
+        ]
     
     def _parse_timeframe(self, timeframe: str) -> int:
         """Convierte string de temporalidad a constante MT5"""
@@ -87,120 +148,58 @@ class FVGDetector:
             return float(tick.bid)
         return None
     
-    def detect_fvg(self, symbol: str, timeframe: str = 'H4') -> Optional[Dict]:
+    def detect_fvg(self, symbol: str, timeframe: str = 'H4',
+                   rates: Optional[np.ndarray] = None,
+                   current_price: Optional[float] = None) -> Optional[Dict]:
         """
         Detecta si el precio actual está formando un FVG
         
         Args:
             symbol: Símbolo a analizar
             timeframe: Temporalidad para análisis
+            rates: Velas de MT5 de esa temporalidad ya obtenidas (opcional, evita releerlas;
+                   se usan las 3 más recientes)
+            current_price: Precio actual (bid) ya leído del tick (opcional, evita releerlo)
             
         Returns:
             Dict con información del FVG o None si no hay FVG en formación
         """
         # Obtener vela actual + 2 velas anteriores
-        candles = self._get_recent_candles(symbol, timeframe, count=3)
-        
-        if len(candles) < 3:
+        if rates is not None:
+            rates = self._last_three(rates)
+        else:
+            rates = self._get_recent_rates(symbol, timeframe)
+        if rates is None:
             return None
         
         # Obtener precio actual
-        current_price = self._get_current_price(symbol)
+        if current_price is None:
+            current_price = self._get_current_price(symbol)
         if current_price is None:
             return None
         
-        # Estructura: candles[0] = vela1 (más antigua), candles[1] = vela2, candles[2] = vela3 (actual)
-        vela1 = candles[0]  # Más antigua
-        vela2 = candles[1]  # Del medio
-        vela3 = candles[2]  # Actual
-        
-        # Buscar FVG entre las 3 velas:
-        # Prioridad: FVG entre vela1 (más antigua) y vela3 (actual) - se forma CON la vela actual
-        
-        # Prioridad 1: FVG alcista entre vela1 (más antigua) y vela3 (actual)
-        # FVG alcista: Low vela1 < High vela3 (sin solapamiento)
-        # IMPORTANTE: Para que sea un FVG real, NO debe haber solapamiento
-        # La vela 3 NO debe tocar el nivel de la vela 1 (vela3.low debe ser > vela1.high)
-        # Rango del FVG: entre vela1.high y vela3.low (la brecha)
-        if vela1['low'] < vela3['high'] and vela3['low'] > vela1['high']:
-            fvg_bottom = vela1['high']  # HIGH de la vela 1 (más antigua) - bottom del FVG
-            fvg_top = vela3['low']  # LOW de la vela 3 (actual) - top del FVG
-            # FVG alcista en formación con vela actual
-            return self._analyze_fvg(
-                fvg_type='ALCISTA',
-                fvg_bottom=fvg_bottom,
-                fvg_top=fvg_top,
-                current_price=current_price,
-                forming_candle=vela3,
-                prev_candle=vela1,
-                next_candle=vela3,
-                symbol=symbol,
-                timeframe=timeframe
-            )
-        
-        # Prioridad 2: FVG bajista entre vela1 (más antigua) y vela3 (actual)
-        # FVG bajista: High vela1 > Low vela3 (sin solapamiento)
-        # IMPORTANTE: Para que sea un FVG real, NO debe haber solapamiento
-        # La vela 3 NO debe tocar el nivel de la vela 1 (vela3.high debe ser < vela1.low)
-        # Rango del FVG: entre vela3.high y vela1.low (la brecha)
-        elif vela1['high'] > vela3['low'] and vela3['high'] < vela1['low']:
-            fvg_bottom = vela3['high']  # HIGH de la vela 3 (actual) - bottom del FVG
-            fvg_top = vela1['low']  # LOW de la vela 1 (más antigua) - top del FVG
-            # FVG bajista en formación con vela actual
-            return self._analyze_fvg(
-                fvg_type='BAJISTA',
-                fvg_bottom=fvg_bottom,
-                fvg_top=fvg_top,
-                current_price=current_price,
-                forming_candle=vela3,
-                prev_candle=vela1,
-                next_candle=vela3,
-                symbol=symbol,
-                timeframe=timeframe
-            )
-        
-        # 3. Si no hay FVG entre vela2 y vela3, verificar entre vela1 y vela2
-        # FVG alcista: vela1.high < vela2.low
-        if vela1['high'] < vela2['low']:
-            fvg_bottom = vela1['high']
-            fvg_top = vela2['low']
-            # FVG alcista ya formado, verificar si precio está interactuando
-            if fvg_bottom <= current_price <= fvg_top or \
-               (current_price > fvg_top and current_price - fvg_top < (fvg_top - fvg_bottom) * 2) or \
-               (current_price < fvg_bottom and fvg_bottom - current_price < (fvg_top - fvg_bottom) * 2):
-                return self._analyze_fvg(
-                    fvg_type='ALCISTA',
-                    fvg_bottom=fvg_bottom,
-                    fvg_top=fvg_top,
-                    current_price=current_price,
-                    forming_candle=vela2,
-                    prev_candle=vela1,
-                    next_candle=vela3,
-                    symbol=symbol,
-                    timeframe=timeframe
-                )
-        
-        # FVG bajista entre vela1 y vela2: vela1.low > vela2.high
-        elif vela1['low'] > vela2['high']:
-            fvg_top = vela1['low']
-            fvg_bottom = vela2['high']
-            # FVG bajista ya formado, verificar si precio está interactuando
-            if fvg_bottom <= current_price <= fvg_top or \
-               (current_price > fvg_top and current_price - fvg_top < (fvg_top - fvg_bottom) * 2) or \
-               (current_price < fvg_bottom and fvg_bottom - current_price < (fvg_top - fvg_bottom) * 2):
-                return self._analyze_fvg(
-                    fvg_type='BAJISTA',
-                    fvg_bottom=fvg_bottom,
-                    fvg_top=fvg_top,
-                    current_price=current_price,
-                    forming_candle=vela2,
-                    prev_candle=vela1,
-                    next_candle=vela3,
-                    symbol=symbol,
-                    timeframe=timeframe
-                )
+        # Clasificar el patrón sobre columnas contiguas: vela1 (más antigua), vela2, vela3 (actual)
+        # Prioridad: FVG entre vela1 y vela3 (se forma CON la vela actual); si no, FVG entre
+        # vela1 y vela2 solo si el precio está interactuando con él
+        h = np.ascontiguousarray(rates['high'], dtype=np.float64)
+        l = np.ascontiguousarray(rates['low'], dtype=np.float64)
+        fvg_kind, fvg_bottom, fvg_top = _fvg_kernel(h, l, current_price)
+        if fvg_kind == 0:
+            return None
         
-        return None
+        # Solo se construyen los dicts de velas cuando hay FVG
+        vela1, vela2, vela3 = self._candles_from_rates(rates)
+        return self._analyze_fvg(
+            fvg_type='ALCISTA' if fvg_kind > 0 else 'BAJISTA',
+            fvg_bottom=float(fvg_bottom),
+            fvg_top=float(fvg_top),
+            current_price=current_price,
+            forming_candle=vela3 if abs(fvg_kind) == 1 else vela2,
+            prev_candle=vela1,
+            next_candle=vela3,
+            symbol=symbol,
+            timeframe=timeframe
+        )
     
     def _analyze_fvg(self, fvg_type: str, fvg_bottom: float, fvg_top: float,
                      current_price: float, forming_candle: Dict, prev_candle: Dict,
@@ -402,13 +401,16 @@ class FVGDetector:
 
 
 # Función global para facilitar el uso
-def detect_fvg(symbol: str, timeframe: str = 'H4') -> Optional[Dict]:
+def detect_fvg(symbol: str, timeframe: str = 'H4', rates: Optional[np.ndarray] = None,
+               current_price: Optional[float] = None) -> Optional[Dict]:
     """
     Detecta si el precio actual está formando un FVG
     
     Args:
         symbol: Símbolo a analizar (ej: 'EURUSD')
         timeframe: Temporalidad (ej: 'H4', 'H1', 'M5')
+        rates: Velas de MT5 de esa temporalidad ya obtenidas (opcional)
+        current_price: Precio actual (bid) ya obtenido (opcional)
         
     Returns:
         Dict con información del FVG o None si no hay FVG en formación
@@ -422,5 +424,5 @@ def detect_fvg(symbol: str, timeframe: str = 'H4') -> Optional[Dict]:
             print(f"Dirección salida: {fvg['exit_direction']}")
     """
     detector = FVGDetector()
-    return detector.detect_fvg(symbol, timeframe)
+    return detector.detect_fvg(symbol, timeframe, rates=rates, current_price=current_price)
 
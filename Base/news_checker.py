@@ -24,12 +24,18 @@ from bs4 import BeautifulSoup
 import re
 import time
 import logging
+import threading
 
 # Configurar logger
 logger = logging.getLogger(__name__)
 
 # Configuración
 HIGH_IMPACT = 3  # Nivel de impacto alto (3 estrellas)
+CALENDAR_CACHE_TTL = 60.0  # Segundos que se reutiliza el calendario compartido de can_trade_now
+
+# Calendario compartido por todos los símbolos y estrategias: (min_impact, monedas, horas) -> (expira, noticias)
+_calendar_cache: Dict[tuple, tuple] = {}
+_calendar_cache_lock = threading.Lock()
 
 
 def get_currency_from_symbol(symbol: str) -> tuple:
@@ -704,6 +710,35 @@ def has_high_impact_news_soon(symbol: str, minutes_before: int = 30, hours_ahead
     return has_news, relevant_news
 
 
+def _get_shared_calendar(symbol: str, min_impact: int, currencies: List[str], hours_ahead: int) -> List[Dict]:
+    """
+    Devuelve el calendario de scrape_investing_calendar reutilizándolo durante CALENDAR_CACHE_TTL segundos
+    
+    Con monedas explícitas el resultado no depende del símbolo, así que una sola descarga y
+    parseo del HTML sirve para todos los símbolos y estrategias en ese intervalo.
+    
+    Args:
+        symbol: Símbolo que solicita el calendario (solo se usa si hay que descargarlo)
+        min_impact: Nivel mínimo de impacto
+        currencies: Monedas a filtrar
+        hours_ahead: Horas adelante para buscar noticias
+    
+    Returns:
+        Lista de noticias encontradas
+    """
+    key = (min_impact, tuple(currencies), hours_ahead)
+    now = time.monotonic()
+    with _calendar_cache_lock:
+        cached = _calendar_cache.get(key)
+    if cached is not None and now < cached[0]:
+        return cached[1]
+    
+    news = scrape_investing_calendar(symbol, min_impact=min_impact, currencies=currencies, hours_ahead=hours_ahead)
+    with _calendar_cache_lock:
+        _calendar_cache[key] = (now + CALENDAR_CACHE_TTL, news)
+    return news
+
+
 def can_trade_now(symbol: str, minutes_before: int = 5, minutes_after: int = 5, check_consecutive: bool = True) -> tuple:
     """
     Determina si se puede operar en este momento basado en las noticias
@@ -731,7 +766,7 @@ def can_trade_now(symbol: str, minutes_before: int = 5, minutes_after: int = 5,
     now_ny = datetime.now(ny_tz)
     
     # Obtener todas las noticias de hoy y próximas horas (para USD/EUR, 3 estrellas)
-    all_news = scrape_investing_calendar(symbol, min_impact=3, currencies=['USD', 'EUR'], hours_ahead=24)
+    all_news = _get_shared_calendar(symbol, min_impact=3, currencies=['USD', 'EUR'], hours_ahead=24)
     
     # Logging mejorado para mostrar noticias detectadas
     logger.info(f"[{symbol}] 📰 Verificando noticias económicas (USD/EUR, 3 estrellas)...")
@@ -0,0 +1,16 @@
+"""
+Compatibilidad opcional con numba
+Expone njit: el de numba si está instalado o un decorador sin compilación si no lo está
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """Sustituto sin compilación cuando numba no está instalado"""
+        def decorator(func):
+            return func
+        return decorator
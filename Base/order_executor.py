@@ -5,6 +5,7 @@ Clase reutilizable para comprar y vender desde cualquier estrategia
 
 import MetaTrader5 as mt5
 import logging
+import threading
 from typing import Dict, Optional, Tuple
 from datetime import datetime
 from enum import Enum
@@ -22,6 +23,27 @@ class OrderExecutor:
     Permite comprar y vender con validación y manejo de errores
     """
     
+    # Instancia compartida por todo el proceso (ver instance())
+    _instance: Optional['OrderExecutor'] = None
+    _instance_lock = threading.Lock()
+    
+    @classmethod
+    def instance(cls) -> 'OrderExecutor':
+        """
+        Obtiene el OrderExecutor compartido por todo el proceso
+        
+        El ejecutor no guarda estado por estrategia, así que todas pueden usar el mismo:
+        la conexión con MT5 se verifica una sola vez en lugar de una por estrategia.
+        
+        Returns:
+            OrderExecutor: Instancia compartida (se crea la primera vez que se pide)
+        """
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+    
     def __init__(self):
         """Inicializa el ejecutor de órdenes"""
         self.logger = logging.getLogger(__name__)
@@ -145,17 +167,21 @@ class OrderExecutor:
         
         return normalized
     
-    def _normalize_price(self, symbol: str, price: float) -> float:
+    def _normalize_price(self, symbol: str, price: float, digits: Optional[int] = None) -> float:
         """
         Normaliza el precio según los dígitos del símbolo
         
         Args:
             symbol: Símbolo
             price: Precio a normalizar
+            digits: Dígitos del símbolo ya conocidos (opcional, evita consultar MT5)
             
         Returns:
             Precio normalizado
         """
+        if digits is not None:
+            return round(price, digits)
+        
         symbol_info = self._get_symbol_info(symbol)
         if symbol_info is None:
             return round(price, 5)  # Default a 5 decimales
@@ -509,6 +535,29 @@ class OrderExecutor:
             comment=comment or f"SELL {symbol}"
         )
     
+    def submit(self, request: Dict) -> Dict:
+        """
+        Ejecuta una orden a partir de un dict de solicitud (permite reutilizar el mismo dict entre órdenes)
+        
+        Args:
+            request: Dict con 'action' ('BUY' o 'SELL'), 'symbol', 'volume' y opcionalmente
+                     'price', 'stop_loss', 'take_profit', 'comment'
+            
+        Returns:
+            Dict con resultado de la orden
+        """
+        order_type = OrderType(request['action'])
+        symbol = request['symbol']
+        return self.execute_order(
+            symbol=symbol,
+            order_type=order_type,
+            volume=request['volume'],
+            price=request.get('price'),
+            stop_loss=request.get('stop_loss'),
+            take_profit=request.get('take_profit'),
+            comment=request.get('comment') or f"{order_type.value} {symbol}"
+        )
+    
     def close_position(self, ticket: int) -> Dict:
         """
         Cierra una posición existente por su ticket usando TRADE_ACTION_DEAL
@@ -808,7 +857,7 @@ def buy_order(symbol: str, volume: float, price: Optional[float] = None,
     Returns:
         Dict con resultado de la orden
     """
-    executor = OrderExecutor()
+    executor = OrderExecutor.instance()
     return executor.buy(symbol, volume, price, stop_loss, take_profit, comment)
 
 
@@ -829,6 +878,6 @@ def sell_order(symbol: str, volume: float, price: Optional[float] = None,
     Returns:
         Dict con resultado de la orden
     """
-    executor = OrderExecutor()
+    executor = OrderExecutor.instance()
     return executor.sell(symbol, volume, price, stop_loss, take_profit, comment)
 
@@ -26,7 +26,7 @@ class PositionMonitor:
             config: Configuración del bot (incluye position_monitoring, trading_hours)
         """
         self.logger = logging.getLogger(__name__)
-        self.executor = OrderExecutor()
+        self.executor = OrderExecutor.instance()
         self.config = config
         # Inicializar DatabaseManager para actualizar estado de órdenes
         self.db_manager = DatabaseManager(config)
@@ -562,14 +562,14 @@ class PositionMonitor:
         # Si no está disponible desde MT5, intentar desde BD
         if self.db_manager.enabled:
             try:
-                if not self.db_manager._ensure_connection():
-                    return None
-                
-                cursor = self.db_manager.connection.cursor()
                 query = "SELECT CreatedAt FROM Orders WHERE Ticket = ?"
-                cursor.execute(query, (ticket,))
-                row = cursor.fetchone()
-                cursor.close()
+                with self.db_manager.lock:
+                    if not self.db_manager._ensure_connection():
+                        return None
+                    cursor = self.db_manager.connection.cursor()
+                    cursor.execute(query, (ticket,))
+                    row = cursor.fetchone()
+                    cursor.close()
                 
                 if row and row[0]:
                     created_at = row[0]
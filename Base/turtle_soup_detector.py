@@ -5,9 +5,13 @@ Estrategia ICT: Detección de barridos de liquidez y objetivos
 
 import logging
 from typing import Dict, Optional, Tuple
-from Base.candle_reader import get_candle
+from functools import lru_cache
+import threading
+from Base.candle_reader import CandleReader
 from datetime import datetime
 import pytz
+import MetaTrader5 as mt5
+import numpy as np
 
 
 class TurtleSoupDetector:
@@ -20,13 +24,18 @@ class TurtleSoupDetector:
         """Inicializa el detector de Turtle Soup"""
         self.logger = logging.getLogger(__name__)
         self.ny_tz = pytz.timezone('America/New_York')
+        # Un solo lector para las 3 velas: el offset de zona horaria MT5 se detecta una vez
+        # (get_candle crea un CandleReader nuevo por llamada y repite esa detección)
+        self.reader = CandleReader()
     
-    def get_h4_key_candles(self, symbol: str) -> Dict[str, Optional[Dict]]:
+    def get_h4_key_candles(self, symbol: str, rates_h4: Optional[np.ndarray] = None) -> Dict[str, Optional[Dict]]:
         """
         Obtiene las velas H4 clave: 1 AM, 5 AM y 9 AM (hora NY)
         
         Args:
             symbol: Símbolo a analizar (ej: 'EURUSD')
+            rates_h4: Velas H4 ya obtenidas (opcional); si no se pasan se leen una sola vez
+                      para las 3 búsquedas
             
         Returns:
             Dict con las velas:
@@ -39,17 +48,14 @@ class TurtleSoupDetector:
         candles = {}
         
         try:
-            # Obtener vela de 1 AM NY
-            candle_1am = get_candle('H4', '1am', symbol)
-            candles['1am'] = candle_1am
-            
-            # Obtener vela de 5 AM NY
-            candle_5am = get_candle('H4', '5am', symbol)
-            candles['5am'] = candle_5am
-            
-            # Obtener vela de 9 AM NY
-            candle_9am = get_candle('H4', '9am', symbol)
-            candles['9am'] = candle_9am
+            # Obtener velas de 1 AM, 5 AM y 9 AM NY con el mismo lector y las mismas velas H4
+            if rates_h4 is None:
+                rates_h4 = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_H4, 0, 200)
+                if rates_h4 is None or len(rates_h4) == 0:
+                    rates_h4 = None  # Que cada búsqueda lo reintente por su cuenta
+            candle_1am = candles['1am'] = self.reader.get_candle('H4', '1am', symbol, rates=rates_h4)
+            candle_5am = candles['5am'] = self.reader.get_candle('H4', '5am', symbol, rates=rates_h4)
+            candle_9am = candles['9am'] = self.reader.get_candle('H4', '9am', symbol, rates=rates_h4)
             
             self.logger.debug(f"Velas H4 obtenidas para {symbol}: 1AM={candle_1am is not None}, 5AM={candle_5am is not None}, 9AM={candle_9am is not None}")
             
@@ -58,12 +64,13 @@ class TurtleSoupDetector:
         
         return candles
     
-    def detect_turtle_soup(self, symbol: str) -> Optional[Dict]:
+    def detect_turtle_soup(self, symbol: str, rates_h4: Optional[np.ndarray] = None) -> Optional[Dict]:
         """
         Detecta Turtle Soup en H4: verifica si la vela de 9 AM barre extremos de 1 AM o 5 AM
         
         Args:
             symbol: Símbolo a analizar
+            rates_h4: Velas H4 ya obtenidas (opcional, evita releerlas)
             
         Returns:
             Dict con información del Turtle Soup detectado o None:
@@ -75,12 +82,14 @@ class TurtleSoupDetector:
                 'target_price': float,  # Precio objetivo (TP)
                 'sweep_price': float,   # Precio del barrido
                 'candles': Dict,        # Velas H4 usadas
-                'direction': str        # 'BULLISH' o 'BEARISH'
+                'direction': str,       # 'BULLISH' o 'BEARISH'
+                'sweep_type': str,      # 'BULLISH_SWEEP' o 'BEARISH_SWEEP'
+                'expected_fvg_type': str  # FVG de entrada esperado: 'BAJISTA' o 'ALCISTA'
             }
         """
         try:
             # Obtener velas clave
-            candles = self.get_h4_key_candles(symbol)
+            candles = self.get_h4_key_candles(symbol, rates_h4=rates_h4)
             
             candle_1am = candles.get('1am')
             candle_5am = candles.get('5am')
@@ -163,7 +172,8 @@ class TurtleSoupDetector:
                         '9am': candle_9am
                     },
                     'direction': 'BEARISH',  # Barrido alcista → esperamos reversión bajista
-                    'sweep_type': 'BULLISH_SWEEP'  # El barrido fue alcista
+                    'sweep_type': 'BULLISH_SWEEP',  # El barrido fue alcista
+                    'expected_fvg_type': 'BAJISTA'  # FVG de entrada esperado (contrario al barrido)
                 }
             
             # Verificar si barre el LOW (barrido bajista)
@@ -182,7 +192,8 @@ class TurtleSoupDetector:
                         '9am': candle_9am
                     },
                     'direction': 'BULLISH',  # Barrido bajista → esperamos reversión alcista
-                    'sweep_type': 'BEARISH_SWEEP'  # El barrido fue bajista
+                    'sweep_type': 'BEARISH_SWEEP',  # El barrido fue bajista
+                    'expected_fvg_type': 'ALCISTA'  # FVG de entrada esperado (contrario al barrido)
                 }
             
             # No hay barrido
@@ -193,16 +204,86 @@ class TurtleSoupDetector:
             return None
 
 
+_NY_TZ = pytz.timezone('America/New_York')
+
+# Caché por barra H4 (antes de las 13:00 NY): símbolo -> (apertura de la barra H4 actual, resultado).
+# El gestor de estrategias puede evaluar varios símbolos en paralelo, de ahí el lock
+_bar_cache: Dict[str, Tuple[int, Dict]] = {}
+_bar_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=64)
+def _detect_turtle_soup_closed(symbol: str, ny_date) -> Dict:
+    """
+    Detecta Turtle Soup con las velas de 1 AM, 5 AM y 9 AM ya cerradas (memoizado por símbolo y fecha NY)
+    
+    lru_cache no guarda excepciones: si la detección falla se lanza LookupError para que
+    la próxima llamada lo reintente en lugar de reutilizar el fallo todo el día.
+    """
+    result = TurtleSoupDetector().detect_turtle_soup(symbol)
+    if result is None:
+        raise LookupError(symbol)
+    return result
+
+
 def detect_turtle_soup_h4(symbol: str) -> Optional[Dict]:
     """
     Función de conveniencia para detectar Turtle Soup en H4
     
+    Mientras la vela de 9 AM está en formación (antes de las 13:00 NY) sus extremos cambian y
+    se detecta en cada llamada. Desde las 13:00 NY las 3 velas clave están cerradas y el
+    resultado es fijo hasta el día siguiente, así que se reutiliza.
+    
     Args:
         symbol: Símbolo a analizar
         
     Returns:
         Dict con información del Turtle Soup o None
     """
-    detector = TurtleSoupDetector()
-    return detector.detect_turtle_soup(symbol)
+    now_ny = datetime.now(_NY_TZ)
+    if now_ny.hour < 13:
+        return _detect_turtle_soup_per_bar(symbol)
+    
+    try:
+        return _detect_turtle_soup_closed(symbol, now_ny.date())
+    except LookupError:
+        return None
+
 
+def _detect_turtle_soup_per_bar(symbol: str) -> Optional[Dict]:
+    """
+    Detecta Turtle Soup reutilizando el resultado mientras no abra una nueva barra H4
+    
+    Solo se reutiliza si ninguna de las velas clave del resultado es la barra H4 en formación
+    (sus extremos aún cambian); en ese caso se detecta de nuevo en cada llamada.
+    
+    Args:
+        symbol: Símbolo a analizar
+        
+    Returns:
+        Dict con información del Turtle Soup o None
+    """
+    bar = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_H4, 0, 1)
+    if bar is None or len(bar) == 0:
+        return TurtleSoupDetector().detect_turtle_soup(symbol)
+    bar_time = int(bar[0]['time'])
+    
+    with _bar_cache_lock:
+        cached = _bar_cache.get(symbol)
+    if cached is not None and cached[0] == bar_time:
+        return cached[1]
+    
+    result = TurtleSoupDetector().detect_turtle_soup(symbol)
+    if result is None:
+        return None
+    
+    forming = any(
+        candle is not None and candle.get('time') == bar_time
+        for candle in result.get('candles', {}).values()
+    )
+    with _bar_cache_lock:
+        if forming:
+            _bar_cache.pop(symbol, None)
+        else:
+            _bar_cache[symbol] = (bar_time, result)
+    return result
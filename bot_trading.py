@@ -205,42 +205,82 @@ class TradingBot:
         
         self.logger.info(f"Analizando mercado para {len(symbols)} símbolo(s) con estrategia: {strategy_name}")
         
+        timeframe = self._parse_timeframe(self.config['general']['timeframe'])
+        
+        if self.strategy_manager.has_batch_analysis(strategy_name):
+            # La estrategia descarta en bloque los símbolos sin patrón: obtener las velas de todos
+            # los símbolos y analizarlos en una sola llamada
+            rates_by_symbol = {}
+            for symbol in symbols:
+                try:
+                    rates = self._get_symbol_rates(symbol, timeframe)
+                    if rates is not None:
+                        rates_by_symbol[symbol] = rates
+                except Exception as e:
+                    self.logger.error(f"Error al obtener datos de {symbol}: {e}", exc_info=True)
+            
+            signals = self.strategy_manager.analyze_batch(list(rates_by_symbol), rates_by_symbol, strategy_name)
+            for symbol, signal in signals.items():
+                self._log_signal(symbol, signal)
+            return
+        
+        # Obtener y analizar símbolo a símbolo: las velas de cada símbolo se leen justo antes
+        # de analizarlo (las estrategias toman el precio actual de rates[-1])
         for symbol in symbols:
             try:
-                # Verificar que el símbolo existe en MT5
-                symbol_info = mt5.symbol_info(symbol)
-                if symbol_info is None:
-                    self.logger.warning(f"Símbolo {symbol} no encontrado en MT5")
-                    continue
-                
-                # Verificar que el símbolo está habilitado
-                if not symbol_info.visible:
-                    self.logger.info(f"Habilitando símbolo {symbol}...")
-                    if not mt5.symbol_select(symbol, True):
-                        self.logger.error(f"No se pudo habilitar {symbol}")
-                        continue
-                
-                # Obtener datos del mercado
-                timeframe = self._parse_timeframe(self.config['general']['timeframe'])
-                rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, 100)
-                
-                if rates is None or len(rates) == 0:
-                    self.logger.warning(f"No se pudieron obtener datos para {symbol}")
+                rates = self._get_symbol_rates(symbol, timeframe)
+                if rates is None:
                     continue
                 
                 # Ejecutar análisis con la estrategia
-                self.logger.debug(f"Analizando {symbol} con {len(rates)} velas")
                 signal = self.strategy_manager.analyze(symbol, rates, strategy_name)
-                
-                if signal:
-                    self.logger.info(f"Señal generada para {symbol}: {signal}")
-                    # Aquí se implementará la lógica de ejecución de órdenes
-                else:
-                    self.logger.debug(f"No hay señal para {symbol}")
+                self._log_signal(symbol, signal)
                     
             except Exception as e:
                 self.logger.error(f"Error al analizar {symbol}: {e}", exc_info=True)
     
+    def _get_symbol_rates(self, symbol: str, timeframe: int):
+        """
+        Obtiene las velas de un símbolo (habilitándolo en MT5 si hace falta)
+        
+        Args:
+            symbol: Símbolo a consultar
+            timeframe: Timeframe de MT5
+            
+        Returns:
+            Array de velas de MT5 o None si el símbolo no está disponible o no hay datos
+        """
+        # Verificar que el símbolo existe en MT5
+        symbol_info = mt5.symbol_info(symbol)
+        if symbol_info is None:
+            self.logger.warning(f"Símbolo {symbol} no encontrado en MT5")
+            return None
+        
+        # Verificar que el símbolo está habilitado
+        if not symbol_info.visible:
+            self.logger.info(f"Habilitando símbolo {symbol}...")
+            if not mt5.symbol_select(symbol, True):
+                self.logger.error(f"No se pudo habilitar {symbol}")
+                return None
+        
+        # Obtener datos del mercado
+        rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, 100)
+        
+        if rates is None or len(rates) == 0:
+            self.logger.warning(f"No se pudieron obtener datos para {symbol}")
+            return None
+        
+        self.logger.debug(f"Analizando {symbol} con {len(rates)} velas")
+        return rates
+    
+    def _log_signal(self, symbol: str, signal: Optional[Dict]):
+        """Registra la señal generada (o su ausencia) para un símbolo"""
+        if signal:
+            self.logger.info(f"Señal generada para {symbol}: {signal}")
+            # Aquí se implementará la lógica de ejecución de órdenes
+        else:
+            self.logger.debug(f"No hay señal para {symbol}")
+    
     def _monitor_positions(self) -> Dict:
         """
         Monitorea posiciones abiertas y aplica reglas de gestión:
@@ -393,12 +433,13 @@ class TradingBot:
                 if not hasattr(self, '_db_closed_orders_checked'):
                     try:
                         # Consultar todas las órdenes de hoy para diagnóstico
-                        cursor = self.db_manager.connection.cursor()
                         today = datetime.now().date()
                         query = "SELECT COUNT(*) FROM Orders WHERE CAST(CreatedAt AS DATE) = ?"
-                        cursor.execute(query, (today,))
-                        total_today = cursor.fetchone()[0]
-                        cursor.close()
+                        with self.db_manager.lock:
+                            cursor = self.db_manager.connection.cursor()
+                            cursor.execute(query, (today,))
+                            total_today = cursor.fetchone()[0]
+                            cursor.close()
                         
                         if total_today > 0:
                             self.logger.info(f"📊 Diagnóstico: Hay {total_today} orden(es) en BD hoy, pero todas están cerradas (Status='CLOSED')")
@@ -535,7 +576,7 @@ class TradingBot:
                             try:
                                 if self.mt5_connected:
                                     from Base.order_executor import OrderExecutor
-                                    executor = OrderExecutor()
+                                    executor = OrderExecutor.instance()
                                     mt5_positions = executor.get_positions()
                             except Exception as e:
                                 self.logger.error(f"Error al obtener posiciones MT5 para sincronización: {e}")
@@ -43,7 +43,7 @@ class CRTContinuationStrategy(BaseStrategy):
             config: Configuración del bot
         """
         super().__init__(config)
-        self.executor = OrderExecutor()
+        self.executor = OrderExecutor.instance()
         
         # Configuración de la estrategia
         strategy_config = config.get('strategy_config', {})
@@ -1464,7 +1464,7 @@ class CRTContinuationStrategy(BaseStrategy):
                     'max_trades_per_day': self.max_trades_per_day
                 }
                 
-                self.save_order_to_db(
+                self.save_order_to_db_async(
                     ticket=result['order_ticket'],
                     symbol=symbol,
                     order_type=direction,
@@ -44,7 +44,7 @@ class CRTextremeStrategy(BaseStrategy):
             config: Configuración del bot
         """
         super().__init__(config)
-        self.executor = OrderExecutor()
+        self.executor = OrderExecutor.instance()
         
         # Configuración de la estrategia
         strategy_config = config.get('strategy_config', {})
@@ -1446,7 +1446,7 @@ class CRTextremeStrategy(BaseStrategy):
                     'max_trades_per_day': self.max_trades_per_day
                 }
                 
-                self.save_order_to_db(
+                self.save_order_to_db_async(
                     ticket=result['order_ticket'],
                     symbol=symbol,
                     order_type=direction,
@@ -4,18 +4,19 @@ Combina detección de barridos de liquidez con confirmación multi-temporal
 """
 
 import logging
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple, Any, NamedTuple
 import numpy as np
 import MetaTrader5 as mt5
 from datetime import datetime, date
 import time
+from dataclasses import dataclass
 
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from strategy_manager import BaseStrategy
-from Base.crt_detector import detect_crt_sweep, detect_crt_vayas, detect_engulfing
+from Base.crt_detector import detect_crt_sweep, detect_crt_vayas, detect_engulfing, ohlc_arrays
 from Base.crt_revision_detector import detect_crt_revision
 from Base.crt_continuation_detector import detect_crt_continuation
 from Base.crt_extreme_detector import detect_crt_extreme
@@ -23,6 +24,127 @@ from Base.news_checker import can_trade_now
 from Base.order_executor import OrderExecutor
 from Base.fvg_detector import detect_fvg
 
+# Separadores para logs estructurados
+_HR = "=" * 70
+_HR2 = "-" * 70
+
+# Plantillas precompiladas (formato % perezoso con dict) de los banners de orden:
+# un solo registro multilínea, cada línea con el prefijo del símbolo
+_ORDER_BANNER_TMPL = "\n".join("[%(symbol)s] " + line for line in (
+    _HR,
+    "💹 EJECUTANDO ORDEN CRT",
+    _HR,
+    "📊 Dirección: %(direction)s (%(side)s)",
+    "💰 Precio de Entrada: %(entry).5f",
+    "🛑 Stop Loss: %(sl).5f (Risk: %(risk).5f)",
+    "🎯 Take Profit: %(tp).5f (Reward: %(reward).5f)",
+    "📈 Risk/Reward: %(rr).2f:1",
+    "📦 Volumen: %(volume).2f lotes",
+    _HR2,
+    "📋 Contexto CRT:",
+    "   • Tipo CRT: %(crt_type)s",
+    "   • Barrido: %(sweep_type)s en H4",
+)) + "%(context)s"
+_ORDER_OK_TMPL = "\n".join("[%(symbol)s] " + line for line in (
+    _HR,
+    "✅ ORDEN EJECUTADA EXITOSAMENTE",
+    _HR,
+    "🎫 Ticket: %(ticket)s",
+    "📊 Trades hoy: %(trades)d/%(max_trades)d",
+    _HR,
+))
+
+# Tipo de FVG esperado según la dirección del CRT (CRT alcista → FVG alcista, bajista → bajista)
+_EXPECTED_FVG_TYPE = {'BULLISH': 'ALCISTA', 'BEARISH': 'BAJISTA'}
+
+# Dict vacío compartido (solo lectura) para valores opcionales ausentes
+_EMPTY_DICT: Dict = {}
+
+# Mapeo de temporalidades a constantes de MT5
+_TF_MAP = {
+    'M1': mt5.TIMEFRAME_M1,
+    'M5': mt5.TIMEFRAME_M5,
+    'M15': mt5.TIMEFRAME_M15,
+    'M30': mt5.TIMEFRAME_M30,
+    'H1': mt5.TIMEFRAME_H1,
+    'H4': mt5.TIMEFRAME_H4,
+    'D1': mt5.TIMEFRAME_D1,
+}
+
+
+class OHLCView(NamedTuple):
+    """Vista compacta (solo lectura) de una vela OHLC"""
+    open: float
+    high: float
+    low: float
+    close: float
+
+
+def _ohlc_view(candle: Optional[Dict]) -> Optional[OHLCView]:
+    """
+    Convierte el dict de una vela (formato de los detectores) en un OHLCView
+    
+    Args:
+        candle: Dict con 'open', 'high', 'low', 'close' (o None)
+        
+    Returns:
+        OHLCView o None si no hay vela
+    """
+    if not candle:
+        return None
+    get = candle.get
+    return OHLCView(get('open', 0.0), get('high', 0.0), get('low', 0.0), get('close', 0.0))
+
+
+class SweepView(NamedTuple):
+    """Vista compacta (solo lectura) del dict de CRT devuelto por los detectores"""
+    direction: Optional[str]
+    target_price: Optional[float]
+    crt_type: Optional[str]
+    sweep_type: Optional[str]
+    sweep_price: Optional[float]
+    swept_low: Optional[float]
+    swept_high: Optional[float]
+    swept_extreme: Optional[str]
+    candle_1am: Optional[OHLCView]
+    candle_5am: Optional[OHLCView]
+
+
+def _sweep_view(sweep: Dict) -> SweepView:
+    """
+    Extrae una sola vez los campos del CRT detectado
+    
+    El dict se mantiene como contrato de los detectores (se muta con 'crt_type' y se
+    guarda en BD); la vista evita repetir búsquedas por clave en cada uso.
+    
+    Args:
+        sweep: Dict del CRT (formato de detect_crt_extreme/continuation/revision)
+    
+    Returns:
+        SweepView con los campos ausentes en None
+    """
+    get = sweep.get
+    return SweepView(
+        get('direction'), get('target_price'), get('crt_type'), get('sweep_type'),
+        get('sweep_price'), get('swept_low'), get('swept_high'), get('swept_extreme'),
+        _ohlc_view(get('candle_1am')), _ohlc_view(get('candle_5am')),
+    )
+
+
+@dataclass(slots=True, frozen=True)
+class SymbolConsts:
+    """Constantes casi estáticas de un símbolo (extraídas de mt5.symbol_info)"""
+    point: float
+    tick_size: float
+    tick_value: float
+    tick_value_per_price: float  # tick_value/tick_size: valor por lote de 1.0 de movimiento de precio (0.0 si no es válido)
+    volume_step: float
+    inv_volume_step: float  # 1/volume_step (0.0 si volume_step no es válido)
+    volume_min: float
+    volume_max: float
+    stops_level: int
+    spread_points: int
+
 
 class CRTStrategy(BaseStrategy):
     """
@@ -48,7 +170,9 @@ class CRTStrategy(BaseStrategy):
             config: Configuración del bot
         """
         super().__init__(config)
-        self.executor = OrderExecutor()
+        # Mismo ejecutor para las órdenes y para la verificación de posiciones de BaseStrategy
+        # OrderExecutor compartido por todo el proceso (no guarda estado por estrategia)
+        self.executor = self._order_executor = OrderExecutor.instance()
         
         # Configuración de la estrategia
         strategy_config = config.get('strategy_config', {})
@@ -62,13 +186,19 @@ class CRTStrategy(BaseStrategy):
         self.use_vayas = strategy_config.get('crt_use_vayas', False)  # Usar patrón Vayas
         self.use_fvg_entry = strategy_config.get('crt_use_fvg_entry', True)  # Usar FVG para entrada (similar a Turtle Soup)
         self.lookback = strategy_config.get('crt_lookback', 5)  # Velas a revisar
+        self._order_comment = f"CRT {self.high_timeframe} + {self.entry_timeframe}"  # Comentario fijo de las órdenes
+        # Constantes MT5 de las temporalidades (resueltas una sola vez)
+        self._high_tf_enum = _TF_MAP.get(self.high_timeframe.upper(), mt5.TIMEFRAME_H4)
+        self._entry_tf_enum = _TF_MAP.get(self.entry_timeframe.upper(), mt5.TIMEFRAME_M15)
+        self._high_tf_is_h4 = self._high_tf_enum == mt5.TIMEFRAME_H4
         
         # Estado de monitoreo intensivo de FVG (similar a Turtle Soup)
         self.monitoring_fvg = False  # Indica si estamos monitoreando un FVG en tiempo real
         self.monitoring_fvg_data = None  # Datos del FVG que estamos monitoreando (crt_sweep, fvg_info)
+        self._waiting_for_fvg = False  # Monitoreo intermedio: CRT detectado, esperando FVG
         
         # Configuración de gestión de riesgo
-        risk_config = config.get('risk_management', {})
+        risk_config = self.risk_config  # Ya leído por BaseStrategy
         self.risk_per_trade_percent = risk_config.get('risk_per_trade_percent', 1.0)
         self.max_trades_per_day = risk_config.get('max_trades_per_day', 2)
         self.max_position_size = risk_config.get('max_position_size', 0.1)
@@ -81,6 +211,43 @@ class CRTStrategy(BaseStrategy):
         self.day_closed_no_crt = False
         self.day_closed_no_crt_date = None
         
+        # Próximo instante (reloj monotónico) en que se pueden repetir los logs de bloqueo temprano
+        self._next_no_crt_log_at = 0.0
+        self._next_limit_log_at = 0.0
+        # ... y los logs periódicos del monitoreo de FVG (intermedio e intensivo)
+        self._next_waiting_log_at = 0.0
+        self._next_fvg_update_log_at = 0.0
+        self._next_inside_fvg_log_at = 0.0
+        self._next_monitor_log_at = 0.0
+        
+        # Caché de corta duración para symbol_info/account_info de MT5 (evita llamadas IPC repetidas)
+        self._mt5_cache_ttl = 0.25  # segundos (symbol_info: incluye spread, cambia con cada tick)
+        self._account_info_ttl = 2.0  # segundos (balance/margen solo cambian al operar; se invalida tras cada orden)
+        self._symbol_info_cache: Dict[str, Tuple[float, Any]] = {}
+        self._account_info_cache: Tuple[float, Any] = (0.0, None)
+        self._symbol_consts: Dict[str, Tuple[float, SymbolConsts]] = {}
+        # Resultado de _has_open_positions por símbolo (evita consultar BD/MT5 dos veces por intento de orden)
+        self._positions_ttl = 0.5  # segundos
+        self._positions_cache: Dict[str, Tuple[float, bool]] = {}
+        
+        # Conteo de trades del día desde BD para todos los símbolos, refrescado una vez por minuto:
+        # (minuto epoch, {símbolo: conteo})
+        self._trade_count_cache: Tuple[int, Dict[str, int]] = (-1, {})
+        # Símbolos que ya alcanzaron el límite diario (desde BD); se vacía al cambiar de día
+        self._done_today: set = set()
+        
+        # Dict reutilizable para la señal de entrada FVG
+        # (solo hay una señal en curso por instancia de estrategia)
+        self._signal_scratch: Dict = {}
+        self._request_scratch: Dict[str, Any] = {}
+        
+        # Caché de detección de CRT por (símbolo, tipo CRT) -> (tiempo de la última vela H4, resultado)
+        # Los detectores solo cambian de resultado cuando abre una nueva vela H4
+        self._analysis_cache: Dict[Tuple[str, str], Tuple[int, Optional[Dict]]] = {}
+        
+        # Caché del estado de noticias por (símbolo, minuto): las noticias no cambian dentro del mismo minuto
+        self._news_cache: Dict[Tuple[str, int], Tuple[bool, str, Any]] = {}
+        
         self.logger.info(f"CRTStrategy inicializada - High TF: {self.high_timeframe}, Entry TF: {self.entry_timeframe}, RR: {self.min_rr}")
         self.logger.info(f"Riesgo por trade: {self.risk_per_trade_percent}% | Máximo trades/día: {self.max_trades_per_day}")
         self.logger.info(f"Vayas: {'Habilitado' if self.use_vayas else 'Deshabilitado'} | FVG Entry: {'Habilitado' if self.use_fvg_entry else 'Deshabilitado'}")
@@ -98,154 +265,183 @@ class CRTStrategy(BaseStrategy):
         Returns:
             Dict con señal de trading o None
         """
+        # ⚠️ VERIFICACIÓN TEMPRANA: Si el día está cerrado por falta de CRT, detener análisis
+        if self._is_day_closed_no_crt():
+            now = time.monotonic()
+            if now >= self._next_no_crt_log_at:
+                self.logger.info(
+                    f"[{symbol}] ⏸️  Día operativo cerrado - No se detectó CRT específico (Revisión/Continuación/Extremo) | "
+                    f"Esperando al próximo día operativo"
+                )
+                self._next_no_crt_log_at = now + 300
+            return None
+        
+        # ⚠️ VERIFICACIÓN TEMPRANA: Si ya se alcanzó el límite de trades, detener análisis
+        self._reset_daily_trades_counter()
+        if self.trades_today >= self.max_trades_per_day:
+            now = time.monotonic()
+            if now >= self._next_limit_log_at:
+                self.logger.info(
+                    f"[{symbol}] ⏸️  Límite de trades diarios alcanzado: {self.trades_today}/{self.max_trades_per_day} | "
+                    f"Análisis detenido hasta próxima sesión operativa"
+                )
+                self._next_limit_log_at = now + 60
+            return None
+        
+        # Símbolo ya agotado hoy: sin BD, MT5 ni noticias hasta el próximo día
+        if symbol in self._done_today:
+            return None
+        
+        # Verificaciones baratas primero: límite diario (BD cacheada) y posiciones abiertas
+        if not self._check_daily_trade_limit(symbol):
+            return None
+        
+        # Evitar formatear logs INFO si el nivel está filtrado
+        info_enabled = self.logger.isEnabledFor(logging.INFO)
+        
+        # 1. Verificar noticias de alto impacto (5 min antes/después)
+        self.logger.info("[%s] 📰 Etapa 1/5: Verificando noticias económicas...", symbol)
+        if not self._check_news(symbol):
+            return None
+        self.logger.info("[%s] ✅ Etapa 1/5: Noticias OK - Puede operar", symbol)
+        
+        # 2. Detectar los 3 tipos de CRT en H4 (velas 1 AM, 5 AM, 9 AM)
+        self.logger.info("[%s] 🔍 Etapa 2/5: Buscando CRT en H4 (velas 1 AM, 5 AM, 9 AM)...", symbol)
+        # Una sola lectura de velas de la temporalidad alta: sirve para la caché de detección
+        # (si es H4) y para el patrón Vayas (lookback 3 + vela actual)
+        rates_high = None
         try:
-            # ⚠️ VERIFICACIÓN TEMPRANA: Si el día está cerrado por falta de CRT, detener análisis
-            if self._is_day_closed_no_crt():
-                if not hasattr(self, '_last_no_crt_log') or (time.time() - self._last_no_crt_log) >= 300:
-                    self.logger.info(
-                        f"[{symbol}] ⏸️  Día operativo cerrado - No se detectó CRT específico (Revisión/Continuación/Extremo) | "
-                        f"Esperando al próximo día operativo"
-                    )
-                    self._last_no_crt_log = time.time()
-                return None
-            
-            # ⚠️ VERIFICACIÓN TEMPRANA: Si ya se alcanzó el límite de trades, detener análisis
-            self._reset_daily_trades_counter()
-            if self.trades_today >= self.max_trades_per_day:
-                if not hasattr(self, '_last_limit_log') or (time.time() - self._last_limit_log) >= 60:
-                    self.logger.info(
-                        f"[{symbol}] ⏸️  Límite de trades diarios alcanzado: {self.trades_today}/{self.max_trades_per_day} | "
-                        f"Análisis detenido hasta próxima sesión operativa"
-                    )
-                    self._last_limit_log = time.time()
-                return None
-            
-            # 1. Verificar noticias de alto impacto (5 min antes/después)
-            self.logger.info(f"[{symbol}] 📰 Etapa 1/5: Verificando noticias económicas...")
-            if not self._check_news(symbol):
-                return None
-            self.logger.info(f"[{symbol}] ✅ Etapa 1/5: Noticias OK - Puede operar")
-            
-            # 2. Detectar los 3 tipos de CRT en H4 (velas 1 AM, 5 AM, 9 AM)
-            self.logger.info(f"[{symbol}] 🔍 Etapa 2/5: Buscando CRT en H4 (velas 1 AM, 5 AM, 9 AM)...")
-            
-            # Si estamos monitoreando FVG, verificar que el CRT aún existe
-            if self.monitoring_fvg and self.monitoring_fvg_data:
-                # Verificar que el CRT aún existe antes de continuar
-                crt_sweep = self.monitoring_fvg_data.get('crt_sweep')
-                if crt_sweep:
-                    crt_type = crt_sweep.get('crt_type')
-                    # Re-detectar el CRT para verificar que aún existe
-                    current_crt = None
-                    if crt_type == 'EXTREMO':
-                        current_crt = detect_crt_extreme(symbol)
-                    elif crt_type == 'CONTINUACIÓN':
-                        current_crt = detect_crt_continuation(symbol)
-                    elif crt_type == 'REVISIÓN':
-                        current_crt = detect_crt_revision(symbol)
-                    
-                    if current_crt and current_crt.get('detected'):
-                        # CRT aún existe, continuar con monitoreo
-                        sweep = current_crt
-                        sweep['crt_type'] = crt_type
-                    else:
-                        # CRT desapareció, cancelar monitoreo
-                        self.logger.info(f"[{symbol}] ⏸️  CRT {crt_type} desapareció - Cancelando monitoreo intensivo")
-                        self.monitoring_fvg = False
-                        self.monitoring_fvg_data = None
-                        return None
+            if self.use_vayas:
+                rates_high = mt5.copy_rates_from_pos(symbol, self._high_tf_enum, 0, 4)
+            bar_time = self._get_last_bar_time(
+                symbol, rates=rates_high if self._high_tf_is_h4 else None
+            )
+            # Vista SoA (arrays contiguos) construida una sola vez para los detectores
+            ohlc_high = ohlc_arrays(rates_high) if rates_high is not None and len(rates_high) else None
+        except Exception as e:
+            # Fallo de IPC con MT5: sin datos no se puede analizar en esta iteración
+            self.logger.error(f"[{symbol}] ❌ Error al obtener velas de MT5: {e}")
+            return None
+        
+        # Si estamos monitoreando FVG, verificar que el CRT aún existe
+        if self.monitoring_fvg and self.monitoring_fvg_data:
+            # Verificar que el CRT aún existe antes de continuar
+            crt_sweep = self.monitoring_fvg_data.get('crt_sweep')
+            if crt_sweep:
+                crt_type = crt_sweep.get('crt_type')
+                # Re-detectar el CRT para verificar que aún existe
+                current_crt = None
+                if crt_type == 'EXTREMO':
+                    current_crt = self._cached_detect(symbol, crt_type, detect_crt_extreme, bar_time)
+                elif crt_type == 'CONTINUACIÓN':
+                    current_crt = self._cached_detect(symbol, crt_type, detect_crt_continuation, bar_time)
+                elif crt_type == 'REVISIÓN':
+                    current_crt = self._cached_detect(symbol, crt_type, detect_crt_revision, bar_time)
+                
+                if current_crt and current_crt.get('detected'):
+                    # CRT aún existe, continuar con monitoreo
+                    sweep = current_crt
+                    sweep['crt_type'] = crt_type
                 else:
-                    # No hay CRT en monitoreo, cancelar
+                    # CRT desapareció, cancelar monitoreo
+                    self.logger.info(f"[{symbol}] ⏸️  CRT {crt_type} desapareció - Cancelando monitoreo intensivo")
                     self.monitoring_fvg = False
                     self.monitoring_fvg_data = None
                     return None
             else:
-                # No estamos monitoreando, detectar CRT normalmente
-                # Prioridad: 1. Extremo, 2. Continuación, 3. Revisión
-                # Primero verificar CRT de Extremo (más específico)
-                self.logger.debug(f"[{symbol}] 🔍 Verificando CRT de EXTREMO...")
-                crt_extreme = detect_crt_extreme(symbol)
-                if crt_extreme and crt_extreme.get('detected'):
-                    sweep = crt_extreme
-                    sweep['crt_type'] = 'EXTREMO'
+                # No hay CRT en monitoreo, cancelar
+                self.monitoring_fvg = False
+                self.monitoring_fvg_data = None
+                return None
+        else:
+            # No estamos monitoreando, detectar CRT normalmente
+            # Prioridad: 1. Extremo, 2. Continuación, 3. Revisión
+            # Primero verificar CRT de Extremo (más específico)
+            self.logger.debug(f"[{symbol}] 🔍 Verificando CRT de EXTREMO...")
+            crt_extreme = self._cached_detect(symbol, 'EXTREMO', detect_crt_extreme, bar_time)
+            if crt_extreme and crt_extreme.get('detected'):
+                sweep = crt_extreme
+                sweep['crt_type'] = 'EXTREMO'
+                self.logger.info(
+                    f"[{symbol}] ✅ Etapa 2/5 COMPLETA: CRT de EXTREMO detectado | "
+                    f"Vela 5 AM barrió AMBOS extremos de vela 1 AM | "
+                    f"Dirección: {sweep.get('direction')} | TP: {sweep.get('target_price'):.5f}"
+                )
+            else:
+                if crt_extreme is None:
+                    self.logger.debug(f"[{symbol}] ⏸️  CRT de EXTREMO: No detectado (retornó None)")
+                else:
+                    self.logger.debug(f"[{symbol}] ⏸️  CRT de EXTREMO: No detectado (detected=False)")
+                
+                # Verificar CRT de Continuación
+                self.logger.debug(f"[{symbol}] 🔍 Verificando CRT de CONTINUACIÓN...")
+                crt_continuation = self._cached_detect(symbol, 'CONTINUACIÓN', detect_crt_continuation, bar_time)
+                if crt_continuation and crt_continuation.get('detected'):
+                    sweep = crt_continuation
+                    sweep['crt_type'] = 'CONTINUACIÓN'
                     self.logger.info(
-                        f"[{symbol}] ✅ Etapa 2/5 COMPLETA: CRT de EXTREMO detectado | "
-                        f"Vela 5 AM barrió AMBOS extremos de vela 1 AM | "
+                        f"[{symbol}] ✅ Etapa 2/5 COMPLETA: CRT de CONTINUACIÓN detectado | "
+                        f"Vela 5 AM barrió extremo y cerró FUERA del rango | "
                         f"Dirección: {sweep.get('direction')} | TP: {sweep.get('target_price'):.5f}"
                     )
                 else:
-                    if crt_extreme is None:
-                        self.logger.debug(f"[{symbol}] ⏸️  CRT de EXTREMO: No detectado (retornó None)")
+                    if crt_continuation is None:
+                        self.logger.debug(f"[{symbol}] ⏸️  CRT de CONTINUACIÓN: No detectado (retornó None)")
                     else:
-                        self.logger.debug(f"[{symbol}] ⏸️  CRT de EXTREMO: No detectado (detected=False)")
+                        self.logger.debug(f"[{symbol}] ⏸️  CRT de CONTINUACIÓN: No detectado (detected=False)")
                     
-                    # Verificar CRT de Continuación
-                    self.logger.debug(f"[{symbol}] 🔍 Verificando CRT de CONTINUACIÓN...")
-                    crt_continuation = detect_crt_continuation(symbol)
-                    if crt_continuation and crt_continuation.get('detected'):
-                        sweep = crt_continuation
-                        sweep['crt_type'] = 'CONTINUACIÓN'
+                    # Verificar CRT de Revisión
+                    self.logger.debug(f"[{symbol}] 🔍 Verificando CRT de REVISIÓN...")
+                    crt_revision = self._cached_detect(symbol, 'REVISIÓN', detect_crt_revision, bar_time)
+                    if crt_revision and crt_revision.get('detected'):
+                        sweep = crt_revision
+                        sweep['crt_type'] = 'REVISIÓN'
                         self.logger.info(
-                            f"[{symbol}] ✅ Etapa 2/5 COMPLETA: CRT de CONTINUACIÓN detectado | "
-                            f"Vela 5 AM barrió extremo y cerró FUERA del rango | "
+                            f"[{symbol}] ✅ Etapa 2/5 COMPLETA: CRT de REVISIÓN detectado | "
+                            f"Vela 5 AM barrió extremo y cuerpo cerró DENTRO del rango | "
                             f"Dirección: {sweep.get('direction')} | TP: {sweep.get('target_price'):.5f}"
                         )
                     else:
-                        if crt_continuation is None:
-                            self.logger.debug(f"[{symbol}] ⏸️  CRT de CONTINUACIÓN: No detectado (retornó None)")
+                        if crt_revision is None:
+                            self.logger.debug(f"[{symbol}] ⏸️  CRT de REVISIÓN: No detectado (retornó None)")
                         else:
-                            self.logger.debug(f"[{symbol}] ⏸️  CRT de CONTINUACIÓN: No detectado (detected=False)")
+                            self.logger.debug(f"[{symbol}] ⏸️  CRT de REVISIÓN: No detectado (detected=False)")
                         
-                        # Verificar CRT de Revisión
-                        self.logger.debug(f"[{symbol}] 🔍 Verificando CRT de REVISIÓN...")
-                        crt_revision = detect_crt_revision(symbol)
-                        if crt_revision and crt_revision.get('detected'):
-                            sweep = crt_revision
-                            sweep['crt_type'] = 'REVISIÓN'
-                            self.logger.info(
-                                f"[{symbol}] ✅ Etapa 2/5 COMPLETA: CRT de REVISIÓN detectado | "
-                                f"Vela 5 AM barrió extremo y cuerpo cerró DENTRO del rango | "
-                                f"Dirección: {sweep.get('direction')} | TP: {sweep.get('target_price'):.5f}"
-                            )
-                        else:
-                            if crt_revision is None:
-                                self.logger.debug(f"[{symbol}] ⏸️  CRT de REVISIÓN: No detectado (retornó None)")
-                            else:
-                                self.logger.debug(f"[{symbol}] ⏸️  CRT de REVISIÓN: No detectado (detected=False)")
-                            
-                            # NO se detectó ningún CRT específico (Extremo, Continuación, Revisión)
-                            # Cerrar el día operativo y esperar al próximo día
-                            self.logger.warning(f"[{symbol}] {'='*70}")
-                            self.logger.warning(f"[{symbol}] 🚫 NO SE DETECTÓ NINGÚN CRT ESPECÍFICO (Revisión/Continuación/Extremo)")
-                            self.logger.warning(f"[{symbol}] {'='*70}")
-                            self.logger.warning(f"[{symbol}] ⏸️  DÍA OPERATIVO CERRADO - No se realizarán más operaciones hasta el próximo día operativo")
-                            self.logger.warning(f"[{symbol}] 📅 Esperando al próximo día operativo para buscar nuevos CRT")
-                            self.logger.warning(f"[{symbol}] {'='*70}")
-                            
-                            # Si estaba monitoreando, cancelar monitoreo
-                            if self.monitoring_fvg:
-                                self.logger.info(f"[{symbol}] ⏸️  Cancelando monitoreo intensivo - No hay CRT")
-                                self.monitoring_fvg = False
-                                self.monitoring_fvg_data = None
-                            
-                            # Marcar que el día debe cerrarse (no operar más hoy)
-                            # Esto se hace guardando un registro especial en BD o usando un flag
-                            self._mark_day_closed_no_crt(symbol)
-                            
-                            return None
-            
-            # Extraer información del CRT detectado
-            sweep_type = sweep.get('sweep_type', 'UNKNOWN')
-            direction = sweep.get('direction')
-            target_price = sweep.get('target_price')
-            crt_type = sweep.get('crt_type', 'UNKNOWN')
-            
-            # Log de diagnóstico para verificar TP asignado
-            candle_1am = sweep.get('candle_1am', {})
-            candle_1am_high = candle_1am.get('high') if candle_1am else None
-            candle_1am_low = candle_1am.get('low') if candle_1am else None
-            swept_extreme = sweep.get('swept_extreme', 'UNKNOWN')
-            
+                        # NO se detectó ningún CRT específico (Extremo, Continuación, Revisión)
+                        # Cerrar el día operativo y esperar al próximo día
+                        self.logger.warning(f"[{symbol}] {'='*70}")
+                        self.logger.warning(f"[{symbol}] 🚫 NO SE DETECTÓ NINGÚN CRT ESPECÍFICO (Revisión/Continuación/Extremo)")
+                        self.logger.warning(f"[{symbol}] {'='*70}")
+                        self.logger.warning(f"[{symbol}] ⏸️  DÍA OPERATIVO CERRADO - No se realizarán más operaciones hasta el próximo día operativo")
+                        self.logger.warning(f"[{symbol}] 📅 Esperando al próximo día operativo para buscar nuevos CRT")
+                        self.logger.warning(f"[{symbol}] {'='*70}")
+                        
+                        # Si estaba monitoreando, cancelar monitoreo
+                        if self.monitoring_fvg:
+                            self.logger.info(f"[{symbol}] ⏸️  Cancelando monitoreo intensivo - No hay CRT")
+                            self.monitoring_fvg = False
+                            self.monitoring_fvg_data = None
+                        
+                        # Marcar que el día debe cerrarse (no operar más hoy)
+                        # Esto se hace guardando un registro especial en BD o usando un flag
+                        self._mark_day_closed_no_crt(symbol)
+                        
+                        return None
+        
+        # Extraer información del CRT detectado
+        sv = _sweep_view(sweep)
+        sweep_type = sv.sweep_type or 'UNKNOWN'
+        direction = sv.direction
+        target_price = sv.target_price
+        crt_type = sv.crt_type or 'UNKNOWN'
+        
+        # Log de diagnóstico para verificar TP asignado
+        candle_1am = sv.candle_1am
+        candle_1am_high = candle_1am.high if candle_1am is not None else None
+        candle_1am_low = candle_1am.low if candle_1am is not None else None
+        swept_extreme = sv.swept_extreme or 'UNKNOWN'
+        
+        if info_enabled:
             # Formatear valores para el log (manejar None)
             high_str = f"{candle_1am_high:.5f}" if candle_1am_high is not None else 'N/A'
             low_str = f"{candle_1am_low:.5f}" if candle_1am_low is not None else 'N/A'
@@ -257,141 +453,149 @@ class CRTStrategy(BaseStrategy):
                 f"Vela 1AM HIGH={high_str} | "
                 f"Vela 1AM LOW={low_str}"
             )
+        
+        # Validación: Verificar que el TP asignado sea correcto según el extremo barrido
+        if crt_type == 'REVISIÓN':
+            if swept_extreme == 'low' and direction == 'BULLISH':
+                # Se barrió LOW → TP debe ser HIGH de vela 1 AM
+                if candle_1am_high and abs(target_price - candle_1am_high) > 0.0001:
+                    self.logger.error(
+                        f"[{symbol}] ❌ ERROR: TP incorrecto para CRT REVISIÓN | "
+                        f"Se barrió LOW → TP debería ser HIGH de vela 1 AM ({candle_1am_high:.5f}) "
+                        f"pero se asignó {target_price:.5f}"
+                    )
+            elif swept_extreme == 'high' and direction == 'BEARISH':
+                # Se barrió HIGH → TP debe ser LOW de vela 1 AM
+                if candle_1am_low and abs(target_price - candle_1am_low) > 0.0001:
+                    self.logger.error(
+                        f"[{symbol}] ❌ ERROR: TP incorrecto para CRT REVISIÓN | "
+                        f"Se barrió HIGH → TP debería ser LOW de vela 1 AM ({candle_1am_low:.5f}) "
+                        f"pero se asignó {target_price:.5f}"
+                    )
+        
+        # Un solo tick por análisis: lo comparten la verificación del TP, la búsqueda de FVG
+        # y la ejecución (menos IPC y mismo precio en todas las validaciones)
+        try:
+            tick = mt5.symbol_info_tick(symbol)
+        except Exception as e:
+            self.logger.error(f"[{symbol}] ❌ Error al obtener tick de MT5: {e}")
+            return None
+        
+        # ⚠️ VERIFICACIÓN CRÍTICA: Verificar si el precio del mercado YA ALCANZÓ el objetivo (TP) del CRT
+        if self._check_crt_target_reached(symbol, target_price, direction, tick=tick):
+            self.logger.warning(f"[{symbol}] {'='*70}")
+            self.logger.warning(f"[{symbol}] 🎯 OBJETIVO (TP) DEL CRT YA FUE ALCANZADO POR EL PRECIO")
+            self.logger.warning(f"[{symbol}] {'='*70}")
+            self.logger.warning(f"[{symbol}] 📊 CRT: {crt_type} | TP: {target_price:.5f} | Dirección: {direction}")
+            self.logger.warning(f"[{symbol}] ⏸️  El precio del mercado ya pasó por el objetivo del CRT")
+            self.logger.warning(f"[{symbol}] ⏸️  DÍA OPERATIVO CERRADO - No se realizarán más operaciones hasta el próximo día operativo")
+            self.logger.warning(f"[{symbol}] 📅 Esperando al próximo día operativo para buscar nuevos CRT")
+            self.logger.warning(f"[{symbol}] {'='*70}")
+            
+            # Marcar el día como cerrado por TP alcanzado
+            self._mark_day_closed_tp_reached(symbol, crt_type, target_price)
+            return None
+        
+        # Obtener precio de barrido según el tipo de CRT
+        if crt_type == 'EXTREMO':
+            # En CRT de Extremo, ambos extremos fueron barridos
+            # Usamos el extremo que corresponde a la dirección opuesta (donde está el SL)
+            if direction == 'BULLISH':
+                sweep_price = sv.swept_low or 0  # SL por debajo del LOW barrido
+            else:  # BEARISH
+                sweep_price = sv.swept_high or 0  # SL por encima del HIGH barrido
+        else:  # CONTINUACIÓN / REVISIÓN
+            sweep_price = sv.sweep_price or 0
+        
+        # 3. Opcional: Detectar patrón Vayas (agotamiento de tendencia)
+        if self.use_vayas:
+            self.logger.info("[%s] 🔍 Etapa 3/5: Verificando patrón Vayas en %s...", symbol, self.high_timeframe)
+            vayas = detect_crt_vayas(symbol, self.high_timeframe, rates=rates_high, ohlc=ohlc_high)
+            if vayas and vayas.get('detected'):
+                trend_exhaustion = vayas.get('trend_exhaustion')
+                self.logger.info("[%s] ✅ Patrón Vayas detectado - Agotamiento de tendencia: %s", symbol, trend_exhaustion)
+            else:
+                self.logger.info("[%s] ⏸️  Patrón Vayas no detectado (continuando con barrido)", symbol)
+        
+        # 4. Buscar entrada en FVG (similar a Turtle Soup)
+        if self.use_fvg_entry:
+            # Si estamos en modo monitoreo intensivo, evaluar condiciones del FVG
+            if self.monitoring_fvg and self.monitoring_fvg_data:
+                return self._monitor_fvg_intensive(symbol)
             
-            # Validación: Verificar que el TP asignado sea correcto según el extremo barrido
-            if crt_type == 'REVISIÓN':
-                if swept_extreme == 'low' and direction == 'BULLISH':
-                    # Se barrió LOW → TP debe ser HIGH de vela 1 AM
-                    if candle_1am_high and abs(target_price - candle_1am_high) > 0.0001:
-                        self.logger.error(
-                            f"[{symbol}] ❌ ERROR: TP incorrecto para CRT REVISIÓN | "
-                            f"Se barrió LOW → TP debería ser HIGH de vela 1 AM ({candle_1am_high:.5f}) "
-                            f"pero se asignó {target_price:.5f}"
-                        )
-                elif swept_extreme == 'high' and direction == 'BEARISH':
-                    # Se barrió HIGH → TP debe ser LOW de vela 1 AM
-                    if candle_1am_low and abs(target_price - candle_1am_low) > 0.0001:
-                        self.logger.error(
-                            f"[{symbol}] ❌ ERROR: TP incorrecto para CRT REVISIÓN | "
-                            f"Se barrió HIGH → TP debería ser LOW de vela 1 AM ({candle_1am_low:.5f}) "
-                            f"pero se asignó {target_price:.5f}"
-                        )
-            
-            # ⚠️ VERIFICACIÓN CRÍTICA: Verificar si el precio del mercado YA ALCANZÓ el objetivo (TP) del CRT
-            if self._check_crt_target_reached(symbol, target_price, direction):
-                self.logger.warning(f"[{symbol}] {'='*70}")
-                self.logger.warning(f"[{symbol}] 🎯 OBJETIVO (TP) DEL CRT YA FUE ALCANZADO POR EL PRECIO")
-                self.logger.warning(f"[{symbol}] {'='*70}")
-                self.logger.warning(f"[{symbol}] 📊 CRT: {crt_type} | TP: {target_price:.5f} | Dirección: {direction}")
-                self.logger.warning(f"[{symbol}] ⏸️  El precio del mercado ya pasó por el objetivo del CRT")
-                self.logger.warning(f"[{symbol}] ⏸️  DÍA OPERATIVO CERRADO - No se realizarán más operaciones hasta el próximo día operativo")
-                self.logger.warning(f"[{symbol}] 📅 Esperando al próximo día operativo para buscar nuevos CRT")
-                self.logger.warning(f"[{symbol}] {'='*70}")
-                
-                # Marcar el día como cerrado por TP alcanzado
-                self._mark_day_closed_tp_reached(symbol, crt_type, target_price)
-                return None
+            self.logger.info("[%s] 🔍 Etapa 4/5: Buscando entrada en FVG (%s)...", symbol, self.entry_timeframe)
+            entry_signal = self._find_fvg_entry(symbol, sweep, tick=tick)
             
-            # Obtener precio de barrido según el tipo de CRT
-            if crt_type == 'EXTREMO':
-                # En CRT de Extremo, ambos extremos fueron barridos
-                # Usamos el extremo que corresponde a la dirección opuesta (donde está el SL)
-                if direction == 'BULLISH':
-                    sweep_price = sweep.get('swept_low', 0)  # SL por debajo del LOW barrido
-                else:  # BEARISH
-                    sweep_price = sweep.get('swept_high', 0)  # SL por encima del HIGH barrido
-            elif crt_type in ['CONTINUACIÓN', 'REVISIÓN']:
-                sweep_price = sweep.get('sweep_price', 0)
+            if entry_signal:
+                # 5. Ejecutar orden
+                # Cancelar monitoreo intermedio si estaba activo
+                self._waiting_for_fvg = False
+                self.logger.info("[%s] 💹 Etapa 5/5: Ejecutando orden...", symbol)
+                return self._execute_order(symbol, sweep, entry_signal, tick=tick)
             else:
-                sweep_price = sweep.get('sweep_price', 0)
-            
-            # 3. Opcional: Detectar patrón Vayas (agotamiento de tendencia)
-            if self.use_vayas:
-                self.logger.info(f"[{symbol}] 🔍 Etapa 3/5: Verificando patrón Vayas en {self.high_timeframe}...")
-                vayas = detect_crt_vayas(symbol, self.high_timeframe)
-                if vayas and vayas.get('detected'):
-                    trend_exhaustion = vayas.get('trend_exhaustion')
-                    self.logger.info(f"[{symbol}] ✅ Patrón Vayas detectado - Agotamiento de tendencia: {trend_exhaustion}")
+                # Verificar si hay un FVG esperado para activar monitoreo intensivo
+                fvg = detect_fvg(symbol, self.entry_timeframe)
+                if fvg and self._is_expected_fvg(fvg, sweep):
+                    # Activar monitoreo intensivo solo si no está ya activo
+                    if not self.monitoring_fvg:
+                        if info_enabled:
+                            parts = [
+                                _HR,
+                                "🔄 FVG ESPERADO DETECTADO - ACTIVANDO MONITOREO INTENSIVO",
+                                _HR,
+                                f"📊 FVG {fvg.get('fvg_type')} detectado: {fvg.get('fvg_bottom', 0):.5f} - {fvg.get('fvg_top', 0):.5f}",
+                                f"📊 Estado FVG: {fvg.get('status')} | Entró: {fvg.get('entered_fvg')} | Salió: {fvg.get('exited_fvg')}",
+                                "🔄 El bot ahora analizará cada SEGUNDO evaluando:",
+                                "   • Si las 3 velas forman el FVG esperado",
+                                "   • Si la vela EN FORMACIÓN entró al FVG (HIGH para BAJISTA, LOW para ALCISTA)",
+                                "   • Si el precio actual salió del FVG en la dirección correcta",
+                                _HR,
+                            ]
+                            prefix = f"[{symbol}] "
+                            self.logger.info(prefix + f"\n{prefix}".join(parts))
+                        self.monitoring_fvg = True
+                        self.monitoring_fvg_data = {
+                            'crt_sweep': sweep,
+                            'fvg': fvg
+                        }
+                    else:
+                        # Actualizar datos del FVG si ya está monitoreando
+                        self.monitoring_fvg_data['fvg'] = fvg
+                        self.monitoring_fvg_data['crt_sweep'] = sweep
+                        # Log cada 10 segundos para no saturar
+                        now = time.monotonic()
+                        if now >= self._next_fvg_update_log_at:
+                            self.logger.debug("[%s] 🔄 Monitoreando FVG en tiempo real... Estado: %s", symbol, fvg.get('status'))
+                            self._next_fvg_update_log_at = now + 10
                 else:
-                    self.logger.info(f"[{symbol}] ⏸️  Patrón Vayas no detectado (continuando con barrido)")
-            
-            # 4. Buscar entrada en FVG (similar a Turtle Soup)
-            if self.use_fvg_entry:
-                # Si estamos en modo monitoreo intensivo, evaluar condiciones del FVG
-                if self.monitoring_fvg and self.monitoring_fvg_data:
-                    return self._monitor_fvg_intensive(symbol)
-                
-                self.logger.info(f"[{symbol}] 🔍 Etapa 4/5: Buscando entrada en FVG ({self.entry_timeframe})...")
-                entry_signal = self._find_fvg_entry(symbol, sweep)
+                    # Si estaba monitoreando pero el FVG desapareció o no es el esperado, cancelar monitoreo
+                    if self.monitoring_fvg:
+                        self.logger.info("[%s] ⏸️  FVG esperado desapareció o cambió - Cancelando monitoreo intensivo", symbol)
+                        self.monitoring_fvg = False
+                        self.monitoring_fvg_data = None
                 
-                if entry_signal:
-                    # 5. Ejecutar orden
-                    # Cancelar monitoreo intermedio si estaba activo
-                    if hasattr(self, '_waiting_for_fvg'):
-                        self._waiting_for_fvg = False
-                    self.logger.info(f"[{symbol}] 💹 Etapa 5/5: Ejecutando orden...")
-                    return self._execute_order(symbol, sweep, entry_signal)
-                else:
-                    # Verificar si hay un FVG esperado para activar monitoreo intensivo
-                    fvg = detect_fvg(symbol, self.entry_timeframe)
-                    if fvg and self._is_expected_fvg(fvg, sweep):
-                        # Activar monitoreo intensivo solo si no está ya activo
-                        if not self.monitoring_fvg:
-                            self.logger.info(f"[{symbol}] {'='*70}")
-                            self.logger.info(f"[{symbol}] 🔄 FVG ESPERADO DETECTADO - ACTIVANDO MONITOREO INTENSIVO")
-                            self.logger.info(f"[{symbol}] {'='*70}")
-                            self.logger.info(f"[{symbol}] 📊 FVG {fvg.get('fvg_type')} detectado: {fvg.get('fvg_bottom', 0):.5f} - {fvg.get('fvg_top', 0):.5f}")
-                            self.logger.info(f"[{symbol}] 📊 Estado FVG: {fvg.get('status')} | Entró: {fvg.get('entered_fvg')} | Salió: {fvg.get('exited_fvg')}")
-                            self.logger.info(f"[{symbol}] 🔄 El bot ahora analizará cada SEGUNDO evaluando:")
-                            self.logger.info(f"[{symbol}]    • Si las 3 velas forman el FVG esperado")
-                            self.logger.info(f"[{symbol}]    • Si la vela EN FORMACIÓN entró al FVG (HIGH para BAJISTA, LOW para ALCISTA)")
-                            self.logger.info(f"[{symbol}]    • Si el precio actual salió del FVG en la dirección correcta")
-                            self.logger.info(f"[{symbol}] {'='*70}")
-                            self.monitoring_fvg = True
-                            self.monitoring_fvg_data = {
-                                'crt_sweep': sweep,
-                                'fvg': fvg
-                            }
-                        else:
-                            # Actualizar datos del FVG si ya está monitoreando
-                            self.monitoring_fvg_data['fvg'] = fvg
-                            self.monitoring_fvg_data['crt_sweep'] = sweep
-                            # Log cada 10 segundos para no saturar
-                            if not hasattr(self, '_last_fvg_update_log') or (time.time() - self._last_fvg_update_log) >= 10:
-                                self.logger.debug(f"[{symbol}] 🔄 Monitoreando FVG en tiempo real... Estado: {fvg.get('status')}")
-                                self._last_fvg_update_log = time.time()
-                    else:
-                        # Si estaba monitoreando pero el FVG desapareció o no es el esperado, cancelar monitoreo
-                        if self.monitoring_fvg:
-                            self.logger.info(f"[{symbol}] ⏸️  FVG esperado desapareció o cambió - Cancelando monitoreo intensivo")
-                            self.monitoring_fvg = False
-                            self.monitoring_fvg_data = None
-                    
-                    # Cuando hay CRT pero no hay FVG, activar monitoreo intermedio
-                    if not self.monitoring_fvg:
-                        # Activar monitoreo intermedio (cada 5-10 segundos) cuando hay CRT pero no FVG
-                        if not hasattr(self, '_waiting_for_fvg') or not self._waiting_for_fvg:
-                            self._waiting_for_fvg = True
-                            self.logger.info(f"[{symbol}] ⏳ CRT detectado pero sin FVG - Activando monitoreo intermedio")
-                            self.logger.info(f"[{symbol}]    • El bot analizará cada 10 segundos buscando FVG {self.entry_timeframe}")
-                            self.logger.info(f"[{symbol}]    • CRT: {crt_type} | TP: {target_price:.5f} | Dirección: {direction}")
-                            self.logger.info(f"[{symbol}]    • Esperando FVG {'BAJISTA' if direction == 'BEARISH' else 'ALCISTA'} en {self.entry_timeframe}")
-                        
-                        # Log periódico cada 30 segundos para indicar que sigue esperando
-                        current_time = time.time()
-                        if not hasattr(self, '_last_waiting_log') or (current_time - self._last_waiting_log) >= 30:
-                            self.logger.info(f"[{symbol}] ⏸️  Etapa 4/5: Esperando FVG válida - CRT activo, buscando FVG en {self.entry_timeframe}...")
-                            self._last_waiting_log = current_time
+                # Cuando hay CRT pero no hay FVG, activar monitoreo intermedio
+                if not self.monitoring_fvg:
+                    # Activar monitoreo intermedio (cada 5-10 segundos) cuando hay CRT pero no FVG
+                    if not self._waiting_for_fvg:
+                        self._waiting_for_fvg = True
+                        self.logger.info("[%s] ⏳ CRT detectado pero sin FVG - Activando monitoreo intermedio", symbol)
+                        self.logger.info("[%s]    • El bot analizará cada 10 segundos buscando FVG %s", symbol, self.entry_timeframe)
+                        self.logger.info("[%s]    • CRT: %s | TP: %.5f | Dirección: %s", symbol, crt_type, target_price, direction)
+                        self.logger.info("[%s]    • Esperando FVG %s en %s", symbol,
+                                         'BAJISTA' if direction == 'BEARISH' else 'ALCISTA', self.entry_timeframe)
                     
-                    return None
-            else:
-                # Si no se usa FVG, ejecutar orden directamente (comportamiento antiguo)
-                self.logger.info(f"[{symbol}] 💹 Etapa 4/5: Ejecutando orden sin FVG...")
-                return self._execute_order(symbol, sweep)
-            
-        except Exception as e:
-            self.logger.error(f"Error en análisis CRT: {e}", exc_info=True)
-            return None
+                    # Log periódico cada 30 segundos para indicar que sigue esperando
+                    now = time.monotonic()
+                    if now >= self._next_waiting_log_at:
+                        self.logger.info("[%s] ⏸️  Etapa 4/5: Esperando FVG válida - CRT activo, buscando FVG en %s...", symbol, self.entry_timeframe)
+                        self._next_waiting_log_at = now + 30
+                
+                return None
+        else:
+            # Si no se usa FVG, ejecutar orden directamente (comportamiento antiguo)
+            self.logger.info("[%s] 💹 Etapa 4/5: Ejecutando orden sin FVG...", symbol)
+            return self._execute_order(symbol, sweep, tick=tick)
     
     def needs_intensive_monitoring(self) -> bool:
         """
@@ -417,20 +621,9 @@ class CRTStrategy(BaseStrategy):
         Returns:
             True si el FVG es el esperado
         """
-        try:
-            direction = crt_sweep.get('direction')
-            fvg_type = fvg.get('fvg_type')
-            
-            # Determinar qué tipo de FVG buscamos según la dirección del CRT
-            expected_fvg_type = None
-            if direction == 'BULLISH':
-                expected_fvg_type = 'ALCISTA'  # CRT alcista → FVG alcista
-            elif direction == 'BEARISH':
-                expected_fvg_type = 'BAJISTA'  # CRT bajista → FVG bajista
-            
-            return expected_fvg_type is not None and fvg_type == expected_fvg_type
-        except:
-            return False
+        # Determinar qué tipo de FVG buscamos según la dirección del CRT
+        expected_fvg_type = _EXPECTED_FVG_TYPE.get(crt_sweep.get('direction'))
+        return expected_fvg_type is not None and fvg.get('fvg_type') == expected_fvg_type
     
     def _monitor_fvg_intensive(self, symbol: str) -> Optional[Dict]:
         """
@@ -501,8 +694,8 @@ class CRTStrategy(BaseStrategy):
             # Si el precio está dentro del FVG, esperar a que salga en la dirección esperada
             if price_inside_fvg:
                 # Log cada 10 segundos para no saturar
-                current_time = time.time()
-                if not hasattr(self, '_last_inside_fvg_log') or (current_time - self._last_inside_fvg_log) >= 10:
+                now = time.monotonic()
+                if now >= self._next_inside_fvg_log_at:
                     # Determinar dirección esperada de salida
                     expected_exit = None
                     if fvg_type == 'BAJISTA' and direction == 'BEARISH':
@@ -511,11 +704,12 @@ class CRTStrategy(BaseStrategy):
                         expected_exit = "ARRIBA"
                     
                     self.logger.info(
-                        f"[{symbol}] ⏳ MONITOREO INTENSIVO: Precio DENTRO del FVG {fvg_type} | "
-                        f"Precio actual: {current_price:.5f} | FVG: {fvg_bottom:.5f}-{fvg_top:.5f} | "
-                        f"Esperando salida hacia {expected_exit} en dirección {direction}"
+                        "[%s] ⏳ MONITOREO INTENSIVO: Precio DENTRO del FVG %s | "
+                        "Precio actual: %.5f | FVG: %.5f-%.5f | "
+                        "Esperando salida hacia %s en dirección %s",
+                        symbol, fvg_type, current_price, fvg_bottom, fvg_top, expected_exit, direction
                     )
-                    self._last_inside_fvg_log = current_time
+                    self._next_inside_fvg_log_at = now + 10
                 # NO intentar ejecutar orden mientras el precio está dentro
                 return None
             
@@ -531,14 +725,14 @@ class CRTStrategy(BaseStrategy):
             
             # El precio salió del FVG pero no en la dirección esperada, o condiciones no cumplidas
             # Log cada 10 segundos para no saturar
-            current_time = time.time()
-            if not hasattr(self, '_last_monitor_log') or (current_time - self._last_monitor_log) >= 10:
+            now = time.monotonic()
+            if now >= self._next_monitor_log_at:
                 self.logger.debug(
-                    f"[{symbol}] 🔄 Monitoreando FVG en tiempo real... "
-                    f"(Estado: {fvg.get('status')}, Entró: {fvg.get('entered_fvg')}, Salió: {fvg.get('exited_fvg')}, "
-                    f"Precio: {current_price:.5f})"
+                    "[%s] 🔄 Monitoreando FVG en tiempo real... "
+                    "(Estado: %s, Entró: %s, Salió: %s, Precio: %.5f)",
+                    symbol, fvg.get('status'), fvg.get('entered_fvg'), fvg.get('exited_fvg'), current_price
                 )
-                self._last_monitor_log = current_time
+                self._next_monitor_log_at = now + 10
             
             return None
             
@@ -548,6 +742,50 @@ class CRTStrategy(BaseStrategy):
             self.monitoring_fvg_data = None
             return None
     
+    def _get_last_bar_time(self, symbol: str, timeframe: str = 'H4',
+                           rates: Optional[np.ndarray] = None) -> Optional[int]:
+        """
+        Obtiene el tiempo (epoch) de la última vela de la temporalidad indicada
+        
+        Args:
+            symbol: Símbolo
+            timeframe: Temporalidad ('H4' por defecto, la usada por los detectores CRT)
+            rates: Velas ya obtenidas de esa temporalidad (opcional, evita otra llamada a MT5)
+            
+        Returns:
+            Epoch de apertura de la última vela o None si no se pudo obtener
+        """
+        if rates is None:
+            rates = mt5.copy_rates_from_pos(symbol, _TF_MAP.get(timeframe, mt5.TIMEFRAME_H4), 0, 1)
+        if rates is None or len(rates) == 0:
+            return None
+        return int(rates[-1]['time'])
+    
+    def _cached_detect(self, symbol: str, crt_type: str, detector, bar_time: Optional[int]) -> Optional[Dict]:
+        """
+        Ejecuta un detector CRT reutilizando el resultado mientras no abra una nueva vela H4
+        
+        Args:
+            symbol: Símbolo
+            crt_type: Tipo de CRT ('EXTREMO', 'CONTINUACIÓN', 'REVISIÓN')
+            detector: Función detectora (detect_crt_extreme, etc.)
+            bar_time: Tiempo de la última vela H4 (None desactiva la caché)
+            
+        Returns:
+            Resultado del detector
+        """
+        key = (symbol, crt_type)
+        if bar_time is not None:
+            cached = self._analysis_cache.get(key)
+            if cached is not None and cached[0] == bar_time:
+                return cached[1]
+        
+        result = detector(symbol)
+        # No cachear errores (None) para reintentar en la siguiente iteración
+        if bar_time is not None and result is not None:
+            self._analysis_cache[key] = (bar_time, result)
+        return result
+    
     def _reset_daily_trades_counter(self):
         """Resetea el contador de trades si es un nuevo día"""
         today = date.today()
@@ -556,6 +794,8 @@ class CRTStrategy(BaseStrategy):
                 self.logger.info(f"🔄 Nuevo día - Reseteando contador de trades (anterior: {self.trades_today})")
             self.trades_today = 0
             self.last_trade_date = today
+            self._trade_count_cache = (-1, {})
+            self._done_today.clear()
             
             # Resetear flag de día cerrado por falta de CRT si es un nuevo día
             if self.day_closed_no_crt_date != today:
@@ -564,6 +804,19 @@ class CRTStrategy(BaseStrategy):
                 self.day_closed_no_crt = False
                 self.day_closed_no_crt_date = None
     
+    def has_reached_daily_limit(self) -> bool:
+        """
+        Verifica si se ha alcanzado el límite de trades diarios
+        
+        El bot lo consulta una vez por ciclo y omite el análisis de todos los símbolos
+        cuando devuelve True (sin detectores ni llamadas a MT5).
+        
+        Returns:
+            True si se alcanzó el límite, False si aún se pueden ejecutar trades
+        """
+        self._reset_daily_trades_counter()
+        return self.trades_today >= self.max_trades_per_day
+    
     def _is_day_closed_no_crt(self) -> bool:
         """
         Verifica si el día está cerrado por falta de CRT específico
@@ -581,7 +834,8 @@ class CRTStrategy(BaseStrategy):
         
         return self.day_closed_no_crt
     
-    def _check_crt_target_reached(self, symbol: str, target_price: float, direction: str) -> bool:
+    def _check_crt_target_reached(self, symbol: str, target_price: float, direction: str,
+                                  tick=None) -> bool:
         """
         Verifica si el precio ACTUAL del mercado YA ALCANZÓ el objetivo (TP) del CRT
         
@@ -597,13 +851,15 @@ class CRTStrategy(BaseStrategy):
             symbol: Símbolo a verificar
             target_price: Precio objetivo (TP) del CRT
             direction: Dirección del CRT ('BULLISH' o 'BEARISH')
+            tick: Tick ya obtenido en analyze() (opcional, evita otra llamada a MT5)
             
         Returns:
             True si el precio ACTUAL ya alcanzó el TP, False en caso contrario
         """
         try:
             # Obtener precio actual del mercado
-            tick = mt5.symbol_info_tick(symbol)
+            if tick is None:
+                tick = mt5.symbol_info_tick(symbol)
             if tick is None:
                 self.logger.warning(f"[{symbol}] ⚠️  No se pudo obtener precio actual para verificar TP")
                 return False
@@ -716,7 +972,7 @@ class CRTStrategy(BaseStrategy):
             except Exception as e:
                 self.logger.debug(f"Error al guardar log de día cerrado en BD: {e}")
     
-    def _find_fvg_entry(self, symbol: str, crt_sweep: Dict) -> Optional[Dict]:
+    def _find_fvg_entry(self, symbol: str, crt_sweep: Dict, tick=None) -> Optional[Dict]:
         """
         Busca entrada en FVG en la MISMA dirección del objetivo del CRT
         - CRT BULLISH → busca FVG ALCISTA (para ir hacia arriba)
@@ -726,6 +982,7 @@ class CRTStrategy(BaseStrategy):
         Args:
             symbol: Símbolo
             crt_sweep: Información del CRT detectado
+            tick: Tick ya obtenido en analyze() (opcional, evita otra llamada a MT5)
             
         Returns:
             Dict con señal de entrada o None
@@ -760,18 +1017,7 @@ class CRTStrategy(BaseStrategy):
             self.logger.info(f"[{symbol}] 🔍 Validando regla crítica: Vela EN FORMACIÓN + 2 anteriores deben formar FVG esperado...")
             
             # Obtener las 3 velas: vela en formación (posición 0) + 2 anteriores (posición 1 y 2)
-            # Mapeo de timeframe
-            timeframe_map = {
-                'M1': mt5.TIMEFRAME_M1,
-                'M5': mt5.TIMEFRAME_M5,
-                'M15': mt5.TIMEFRAME_M15,
-                'M30': mt5.TIMEFRAME_M30,
-                'H1': mt5.TIMEFRAME_H1,
-                'H4': mt5.TIMEFRAME_H4,
-                'D1': mt5.TIMEFRAME_D1,
-            }
-            tf = timeframe_map.get(self.entry_timeframe.upper(), mt5.TIMEFRAME_M15)
-            rates = mt5.copy_rates_from_pos(symbol, tf, 0, 3)  # Obtener 3 velas: actual (pos 0), anterior1 (pos 1), anterior2 (pos 2)
+            rates = mt5.copy_rates_from_pos(symbol, self._entry_tf_enum, 0, 3)  # Obtener 3 velas: actual (pos 0), anterior1 (pos 1), anterior2 (pos 2)
             
             if rates is None or len(rates) < 3:
                 self.logger.error(f"[{symbol}] ❌ No se pudo obtener las 3 velas necesarias (necesitamos vela en formación + 2 anteriores)")
@@ -866,7 +1112,8 @@ class CRTStrategy(BaseStrategy):
                 return None
             
             # Obtener precio actual (bid) para validar salida
-            tick = mt5.symbol_info_tick(symbol)
+            if tick is None:
+                tick = mt5.symbol_info_tick(symbol)
             if tick is None:
                 self.logger.error(f"[{symbol}] ❌ No se pudo obtener precio actual")
                 return None
@@ -941,7 +1188,15 @@ class CRTStrategy(BaseStrategy):
             # Verificar la dirección de salida según el tipo de FVG y dirección esperada
             # ⚠️ VALIDACIÓN CRÍTICA: El precio DEBE salir del FVG en la dirección CORRECTA
             # Si sale en dirección INCORRECTA, se rechaza la entrada
-            if calculated_fvg_type == 'BAJISTA' and direction == 'BEARISH':
+            expected_fvg_type = _EXPECTED_FVG_TYPE.get(direction)
+            if expected_fvg_type is None or calculated_fvg_type != expected_fvg_type:
+                # Tipo de FVG no coincide con dirección esperada
+                self.logger.info(
+                    f"[{symbol}] ⏸️  REGLA NO CUMPLIDA: FVG {calculated_fvg_type} no coincide con dirección {direction} esperada"
+                )
+                return None
+            
+            if direction == 'BEARISH':
                 # FVG BAJISTA + dirección BEARISH: precio debe estar DEBAJO del FVG
                 if current_price < fvg_bottom:
                     price_exited_fvg = True
@@ -962,7 +1217,7 @@ class CRTStrategy(BaseStrategy):
                         f"Precio actual={current_price:.5f} | FVG: {fvg_bottom:.5f}-{fvg_top:.5f}"
                     )
                     return None
-            elif calculated_fvg_type == 'ALCISTA' and direction == 'BULLISH':
+            else:
                 # FVG ALCISTA + dirección BULLISH: precio debe estar ARRIBA del FVG
                 if current_price > fvg_top:
                     price_exited_fvg = True
@@ -983,12 +1238,6 @@ class CRTStrategy(BaseStrategy):
                         f"Precio actual={current_price:.5f} | FVG: {fvg_bottom:.5f}-{fvg_top:.5f}"
                     )
                     return None
-            else:
-                # Tipo de FVG no coincide con dirección esperada
-                self.logger.info(
-                    f"[{symbol}] ⏸️  REGLA NO CUMPLIDA: FVG {calculated_fvg_type} no coincide con dirección {direction} esperada"
-                )
-                return None
             
             if not price_exited_fvg:
                 self.logger.info(
@@ -1005,10 +1254,7 @@ class CRTStrategy(BaseStrategy):
             
             self.logger.info(f"[{symbol}] ✅ Condiciones cumplidas - Listo para calcular entrada")
             
-            # Obtener precio actual (bid para venta, ask para compra)
-            tick = mt5.symbol_info_tick(symbol)
-            if tick is None:
-                return None
+            # Precio actual (bid para venta, ask para compra): mismo tick usado al validar la salida
             
             # Calcular niveles
             target_price = crt_sweep.get('target_price')
@@ -1061,35 +1307,28 @@ class CRTStrategy(BaseStrategy):
             )
             
             # ⚡ ORDEN A MERCADO: Usar precio actual del mercado
-            if direction == 'BULLISH':
-                entry_price = float(tick.ask)
-                calculated_sl = fvg_bottom - fvg_size - safety_margin
-                min_sl_price = entry_price - min_sl_distance
-                stop_loss = min(calculated_sl, min_sl_price)
-                take_profit = target_price
-            else:
-                entry_price = float(tick.bid)
-                calculated_sl = fvg_top + fvg_size + safety_margin
-                min_sl_price = entry_price + min_sl_distance
-                stop_loss = max(calculated_sl, min_sl_price)
-                take_profit = target_price
-            
-            # Verificar y ajustar Risk/Reward
-            risk = abs(entry_price - stop_loss)
-            if risk == 0:
+            # Dirección como signo: +1 compra (SL bajo el FVG), -1 venta (SL sobre el FVG)
+            sign = 1.0 if direction == 'BULLISH' else -1.0
+            entry_price = float(tick.ask if sign > 0 else tick.bid)
+            fvg_edge = fvg_bottom if sign > 0 else fvg_top
+            calculated_sl = fvg_edge - sign * (fvg_size + safety_margin)
+            # El SL más alejado entre el calculado y la distancia mínima desde la entrada
+            stop_loss = entry_price - sign * max(sign * (entry_price - calculated_sl), min_sl_distance)
+            take_profit = target_price
+            
+            # Verificar y ajustar Risk/Reward (con el signo conocido no hace falta abs)
+            risk = sign * (entry_price - stop_loss)
+            if risk <= 0:
                 return None
             
-            initial_reward = abs(take_profit - entry_price)
+            initial_reward = sign * (take_profit - entry_price)
             initial_rr = initial_reward / risk
             
             max_rr = self.min_rr
             
             if initial_rr > max_rr:
                 max_reward = risk * max_rr
-                if direction == 'BULLISH':
-                    take_profit = entry_price + max_reward
-                else:
-                    take_profit = entry_price - max_reward
+                take_profit = entry_price + sign * max_reward
                 reward = max_reward
                 rr = max_rr
             else:
@@ -1104,27 +1343,11 @@ class CRTStrategy(BaseStrategy):
                     rr_percent_deficit = rr_deficit / self.min_rr
                     
                     if rr_percent_deficit <= self.rr_tolerance:
-                        required_reward = risk * self.min_rr
-                        if direction == 'BULLISH':
-                            new_tp = entry_price + required_reward
-                            max_tp = target_price * 1.20
-                            if new_tp <= max_tp:
-                                take_profit = new_tp
-                                reward = required_reward
-                                rr = self.min_rr
-                            else:
-                                self.logger.info(f"[{symbol}] ⏸️  RR insuficiente - Ajuste requeriría TP muy lejano")
-                                return None
-                        else:
-                            new_tp = entry_price - required_reward
-                            min_tp = target_price * 0.80
-                            if new_tp >= min_tp:
-                                take_profit = new_tp
-                                reward = required_reward
-                                rr = self.min_rr
-                            else:
-                                self.logger.info(f"[{symbol}] ⏸️  RR insuficiente - Ajuste requeriría TP muy lejano")
-                                return None
+                        adjusted = self._adjust_tp_for_rr(sign, entry_price, risk, target_price)
+                        if adjusted is None:
+                            self.logger.info(f"[{symbol}] ⏸️  RR insuficiente - Ajuste requeriría TP muy lejano")
+                            return None
+                        take_profit, reward, rr = adjusted
                     else:
                         self.logger.info(f"[{symbol}] ⏸️  RR insuficiente ({rr:.2f} < {self.min_rr}) - Déficit excede tolerancia")
                         return None
@@ -1132,16 +1355,18 @@ class CRTStrategy(BaseStrategy):
                     self.logger.info(f"[{symbol}] ⏸️  RR insuficiente ({rr:.2f} < {self.min_rr})")
                     return None
             
-            return {
-                'direction': direction,
-                'entry_price': entry_price,
-                'stop_loss': stop_loss,
-                'take_profit': take_profit,
-                'risk': risk,
-                'reward': reward,
-                'rr': rr,
-                'fvg': fvg
-            }
+            # Reutilizar el dict de señal (se consume inmediatamente en _execute_order)
+            signal = self._signal_scratch
+            signal.clear()
+            signal['direction'] = direction
+            signal['entry_price'] = entry_price
+            signal['stop_loss'] = stop_loss
+            signal['take_profit'] = take_profit
+            signal['risk'] = risk
+            signal['reward'] = reward
+            signal['rr'] = rr
+            signal['fvg'] = fvg
+            return signal
             
         except Exception as e:
             self.logger.error(f"Error al buscar entrada FVG: {e}", exc_info=True)
@@ -1161,10 +1386,17 @@ class CRTStrategy(BaseStrategy):
         db_manager = self._get_db_manager()
         if db_manager.enabled:
             strategy_name = 'crt_strategy'
-            trades_today_db = db_manager.count_trades_today(strategy=strategy_name, symbol=symbol)
+            # Una sola consulta agrupada por símbolo por minuto (en lugar de una por símbolo)
+            minute_key = int(time.time() // 60)
+            cached_minute, counts = self._trade_count_cache
+            if cached_minute != minute_key:
+                counts = db_manager.count_trades_today_by_symbol(strategy=strategy_name)
+                self._trade_count_cache = (minute_key, counts)
+            trades_today_db = counts.get(symbol, 0)
             if trades_today_db >= self.max_trades_per_day:
                 self.logger.info(f"[{symbol}] ⏸️  Límite de trades diarios alcanzado (desde BD): {trades_today_db}/{self.max_trades_per_day}")
                 self.trades_today = trades_today_db
+                self._done_today.add(symbol)
                 return False
             self.trades_today = trades_today_db
         else:
@@ -1189,113 +1421,240 @@ class CRTStrategy(BaseStrategy):
         Returns:
             True si se puede operar, False si hay noticia cercana
         """
-        try:
-            can_trade, reason, next_news = can_trade_now(symbol, minutes_before=5, minutes_after=5)
-            
-            if not can_trade:
-                if next_news:
-                    self.logger.info(f"[{symbol}] ⏸️  Bloqueado por noticias: {reason} | Próxima noticia: {next_news.get('title', 'N/A')} a las {next_news.get('time_str', 'N/A')}")
-                else:
-                    self.logger.info(f"[{symbol}] ⏸️  Bloqueado por noticias: {reason}")
+        minute_key = int(time.time() // 60)
+        key = (symbol, minute_key)
+        cached = self._news_cache.get(key)
+        if cached is not None:
+            can_trade, reason, next_news = cached
+        else:
+            try:
+                can_trade, reason, next_news = can_trade_now(symbol, minutes_before=5, minutes_after=5)
+            except Exception as e:
+                self.logger.error(f"Error al verificar noticias: {e}")
                 return False
+            if len(self._news_cache) > 128:
+                # Descartar entradas de minutos anteriores
+                for stale_key in [k for k in self._news_cache if k[1] < minute_key - 1]:
+                    del self._news_cache[stale_key]
+            self._news_cache[key] = (can_trade, reason, next_news)
+        
+        if not can_trade:
+            if next_news:
+                self.logger.info(f"[{symbol}] ⏸️  Bloqueado por noticias: {reason} | Próxima noticia: {next_news.get('title', 'N/A')} a las {next_news.get('time_str', 'N/A')}")
+            else:
+                self.logger.info(f"[{symbol}] ⏸️  Bloqueado por noticias: {reason}")
+            return False
+        
+        return True
+    
+    def _cached_symbol_info(self, symbol: str):
+        """
+        Obtiene mt5.symbol_info(symbol) usando una caché con TTL corto
+        
+        Args:
+            symbol: Símbolo
             
-            return True
+        Returns:
+            Información del símbolo o None si no se pudo obtener
+        """
+        now = time.monotonic()
+        cached = self._symbol_info_cache.get(symbol)
+        if cached is not None and now - cached[0] < self._mt5_cache_ttl:
+            return cached[1]
+        
+        symbol_info = mt5.symbol_info(symbol)
+        if symbol_info is not None:
+            self._symbol_info_cache[symbol] = (now, symbol_info)
+        return symbol_info
+    
+    def _cached_account_info(self):
+        """
+        Obtiene mt5.account_info() usando una caché con TTL corto
+        
+        Returns:
+            Información de la cuenta o None si no se pudo obtener
+        """
+        now = time.monotonic()
+        ts, account_info = self._account_info_cache
+        if account_info is not None and now - ts < self._account_info_ttl:
+            return account_info
+        
+        account_info = mt5.account_info()
+        if account_info is not None:
+            self._account_info_cache = (now, account_info)
+        return account_info
+    
+    def _get_symbol_consts(self, symbol: str, ttl: float = 60.0) -> Optional[SymbolConsts]:
+        """
+        Obtiene las constantes del símbolo (point, tick_size, volúmenes, etc.) cacheadas por símbolo
+        
+        Args:
+            symbol: Símbolo
+            ttl: Segundos de validez de la caché
             
-        except Exception as e:
-            self.logger.error(f"Error al verificar noticias: {e}")
-            return False
+        Returns:
+            SymbolConsts o None si no se pudo obtener información del símbolo
+        """
+        now = time.monotonic()
+        cached = self._symbol_consts.get(symbol)
+        if cached is not None and now - cached[0] < ttl:
+            return cached[1]
+        
+        symbol_info = self._cached_symbol_info(symbol)
+        if symbol_info is None:
+            return None
+        
+        consts = SymbolConsts(
+            point=symbol_info.point,
+            tick_size=symbol_info.trade_tick_size,
+            tick_value=symbol_info.trade_tick_value,
+            tick_value_per_price=(
+                symbol_info.trade_tick_value / symbol_info.trade_tick_size
+                if symbol_info.trade_tick_size > 0 and symbol_info.trade_tick_value > 0 else 0.0
+            ),
+            volume_step=symbol_info.volume_step,
+            inv_volume_step=1.0 / symbol_info.volume_step if symbol_info.volume_step > 0 else 0.0,
+            volume_min=symbol_info.volume_min,
+            volume_max=symbol_info.volume_max,
+            stops_level=symbol_info.trade_stops_level,
+            spread_points=symbol_info.spread
+        )
+        self._symbol_consts[symbol] = (now, consts)
+        return consts
+    
+    def _has_open_positions(self, symbol: str) -> bool:
+        """
+        Verifica si hay posiciones abiertas del día actual (resultado cacheado con TTL corto)
+        
+        Args:
+            symbol: Símbolo a verificar
+            
+        Returns:
+            True si hay posiciones abiertas del día actual, False si no hay posiciones
+        """
+        now = time.monotonic()
+        cached = self._positions_cache.get(symbol)
+        if cached is not None and now - cached[0] < self._positions_ttl:
+            return cached[1]
+        
+        has_positions = super()._has_open_positions(symbol)
+        self._positions_cache[symbol] = (now, has_positions)
+        return has_positions
+    
+    def _invalidate_mt5_cache(self, symbol: str):
+        """
+        Invalida la caché de symbol_info/account_info/posiciones (tras ejecutar una orden)
+        
+        Args:
+            symbol: Símbolo operado
+        """
+        self._symbol_info_cache.pop(symbol, None)
+        self._account_info_cache = (0.0, None)
+        self._positions_cache.pop(symbol, None)
     
     def _calculate_volume_by_risk(self, symbol: str, entry_price: float, stop_loss: float) -> Optional[float]:
         """
         Calcula el volumen basado en el riesgo porcentual de la cuenta
         (Reutiliza la lógica de TurtleSoupFVGStrategy)
         """
+        logger = self.logger
+        risk_percent = self.risk_per_trade_percent
+        
         try:
-            account_info = mt5.account_info()
-            if account_info is None:
-                self.logger.error("No se pudo obtener información de la cuenta")
-                return None
-            
-            balance = account_info.balance
-            margin_free = account_info.margin_free if hasattr(account_info, 'margin_free') else balance
-            
-            if balance <= 0:
-                self.logger.error(f"[{symbol}] ❌ Balance inválido: {balance}")
-                return None
-            
-            symbol_info = mt5.symbol_info(symbol)
-            if symbol_info is None:
-                self.logger.error(f"[{symbol}] No se pudo obtener información del símbolo {symbol}")
-                return None
-            
-            risk_amount = balance * (self.risk_per_trade_percent / 100.0)
-            min_balance_required = risk_amount * 2
-            if balance < min_balance_required:
-                self.logger.error(f"[{symbol}] ❌ Balance insuficiente: Balance={balance:.2f} | Riesgo={risk_amount:.2f}")
-                return None
-            
-            min_margin_required = risk_amount * 3
-            if margin_free < min_margin_required:
-                self.logger.error(f"[{symbol}] ❌ Margen libre insuficiente: Margen libre={margin_free:.2f}")
-                return None
-            
-            risk_in_price = abs(entry_price - stop_loss)
-            if risk_in_price == 0:
-                self.logger.error("El riesgo en precio es 0, no se puede calcular volumen")
-                return None
-            
-            tick_size = symbol_info.trade_tick_size
-            tick_value = symbol_info.trade_tick_value
-            
-            if tick_size > 0 and tick_value > 0:
-                ticks_in_risk = risk_in_price / tick_size
-                risk_value_per_lot = ticks_in_risk * tick_value
-                
-                if risk_value_per_lot > 0:
-                    volume = risk_amount / risk_value_per_lot
-                else:
-                    return None
-            else:
-                # Fallback aproximado
-                pips_in_risk = risk_in_price / 0.0001
-                value_per_pip_per_lot = 10.0
-                risk_value_per_lot = pips_in_risk * value_per_pip_per_lot
-                
-                if risk_value_per_lot > 0:
-                    volume = risk_amount / risk_value_per_lot
-                else:
-                    return None
-            
-            # Normalizar volumen
-            volume_step = symbol_info.volume_step
-            volume_min = symbol_info.volume_min
-            volume_max = symbol_info.volume_max
-            
-            if volume_step > 0:
-                volume = round(volume / volume_step) * volume_step
-                if volume < volume_min:
-                    volume = volume_min
-            
-            if volume > volume_max:
-                volume = volume_max
-                self.logger.warning(f"[{symbol}] ⚠️  Volumen excede máximo, usando máximo: {volume_max}")
-            
+            account_info = self._cached_account_info()
+            consts = self._get_symbol_consts(symbol)
+        except Exception as e:
+            logger.error(f"Error al calcular volumen por riesgo: {e}", exc_info=True)
+            return None
+        
+        if account_info is None:
+            logger.error("No se pudo obtener información de la cuenta")
+            return None
+        
+        balance = account_info.balance
+        margin_free = account_info.margin_free if hasattr(account_info, 'margin_free') else balance
+        
+        if balance <= 0:
+            logger.error(f"[{symbol}] ❌ Balance inválido: {balance}")
+            return None
+        
+        if consts is None:
+            logger.error(f"[{symbol}] No se pudo obtener información del símbolo {symbol}")
+            return None
+        
+        risk_amount = balance * (risk_percent / 100.0)
+        min_balance_required = risk_amount * 2
+        if balance < min_balance_required:
+            logger.error(f"[{symbol}] ❌ Balance insuficiente: Balance={balance:.2f} | Riesgo={risk_amount:.2f}")
+            return None
+        
+        min_margin_required = risk_amount * 3
+        if margin_free < min_margin_required:
+            logger.error(f"[{symbol}] ❌ Margen libre insuficiente: Margen libre={margin_free:.2f}")
+            return None
+        
+        risk_in_price = abs(entry_price - stop_loss)
+        if risk_in_price == 0:
+            logger.error("El riesgo en precio es 0, no se puede calcular volumen")
+            return None
+        
+        # Valor por lote de 1.0 de movimiento de precio; fallback aproximado:
+        # 10 por pip (0.0001) y lote → 10 / 0.0001 = 100000
+        value_per_price = consts.tick_value_per_price
+        if value_per_price <= 0.0:
+            value_per_price = 100000.0
+        # risk_in_price > 0 garantizado arriba: una sola división
+        volume = risk_amount / (risk_in_price * value_per_price)
+        
+        # Normalizar volumen
+        volume_step = consts.volume_step
+        volume_min = consts.volume_min
+        volume_max = consts.volume_max
+        
+        if volume_step > 0:
+            # Cuantizar al paso de volumen (solo multiplicaciones, inverso precalculado)
+            volume = int(volume * consts.inv_volume_step + 0.5) * volume_step
             if volume < volume_min:
-                self.logger.error(f"[{symbol}] ❌ Volumen calculado ({volume:.4f}) es menor al mínimo ({volume_min})")
-                return None
-            
-            self.logger.info(
-                f"[{symbol}] 💰 Volumen calculado: {volume:.2f} lotes | "
-                f"Riesgo: {self.risk_per_trade_percent}% = {risk_amount:.2f}"
-            )
-            
-            return volume
+                volume = volume_min
+        
+        if volume > volume_max:
+            volume = volume_max
+            logger.warning(f"[{symbol}] ⚠️  Volumen excede máximo, usando máximo: {volume_max}")
+        
+        if volume < volume_min:
+            logger.error(f"[{symbol}] ❌ Volumen calculado ({volume:.4f}) es menor al mínimo ({volume_min})")
+            return None
+        
+        logger.info(
+            f"[{symbol}] 💰 Volumen calculado: {volume:.2f} lotes | "
+            f"Riesgo: {risk_percent}% = {risk_amount:.2f}"
+        )
+        
+        return volume
+    
+    def _adjust_tp_for_rr(self, sign: float, entry_price: float, risk: float,
+                          target_price: float) -> Optional[Tuple[float, float, float]]:
+        """
+        Calcula el TP necesario para alcanzar el RR mínimo sin alejarse más del 20% del objetivo
+        
+        Args:
+            sign: 1.0 para compra, -1.0 para venta
+            entry_price: Precio de entrada
+            risk: Riesgo en precio (distancia entry-SL)
+            target_price: TP original (objetivo CRT)
             
-        except Exception as e:
-            self.logger.error(f"Error al calcular volumen por riesgo: {e}", exc_info=True)
+        Returns:
+            Tupla (take_profit, reward, rr) o None si el ajuste excede el límite
+        """
+        required_reward = risk * self.min_rr
+        new_tp = entry_price + sign * required_reward
+        tp_limit = target_price * (1.20 if sign > 0 else 0.80)
+        if sign * (tp_limit - new_tp) < 0:
             return None
+        return new_tp, required_reward, self.min_rr
     
-    def _execute_order(self, symbol: str, sweep: Dict, entry_signal: Optional[Dict] = None) -> Optional[Dict]:
+    def _execute_order(self, symbol: str, sweep: Dict, entry_signal: Optional[Dict] = None,
+                       tick=None) -> Optional[Dict]:
         """
         Ejecuta la orden de trading basada en el barrido CRT
         
@@ -1303,261 +1662,231 @@ class CRTStrategy(BaseStrategy):
             symbol: Símbolo
             sweep: Información del barrido detectado
             entry_signal: Señal de entrada del FVG (opcional). Si se proporciona, usa estos valores directamente.
+            tick: Tick ya obtenido en analyze() (opcional, evita otra llamada a MT5)
             
         Returns:
             Dict con resultado de la orden
         """
-        try:
-            # Verificar límite de trades por día
-            if not self._check_daily_trade_limit(symbol):
+        # Verificar límite de trades por día
+        if not self._check_daily_trade_limit(symbol):
+            return None
+        
+        # Verificar posiciones abiertas
+        if self._has_open_positions(symbol):
+            return None
+        
+        # Extraer una sola vez los campos del barrido
+        sv = _sweep_view(sweep)
+        direction = sv.direction
+        target_price = sv.target_price
+        crt_type = sv.crt_type or 'N/A'
+        sweep_type = sv.sweep_type or 'N/A'
+        sweep_price = sv.sweep_price
+        candle_1am = sv.candle_1am
+        candle_5am = sv.candle_5am
+        fvg_info = (entry_signal.get('fvg') if entry_signal else None) or _EMPTY_DICT
+        
+        # Atributos de instancia usados repetidamente
+        min_rr = self.min_rr
+        rr_tol = self.rr_tolerance
+        flex = self.flexible_rr
+        max_per_day = self.max_trades_per_day
+        etf = self.entry_timeframe
+        logger = self.logger
+        log_info = logger.info
+        
+        # Si hay entry_signal del FVG, usar esos valores directamente
+        if entry_signal:
+            signal_get = entry_signal.get
+            entry_price = signal_get('entry_price')
+            stop_loss = signal_get('stop_loss')
+            take_profit = signal_get('take_profit')
+            risk = signal_get('risk')
+            reward = signal_get('reward')
+            rr = signal_get('rr')
+            
+            log_info(f"[{symbol}] 💹 Usando valores de entrada desde FVG:")
+            log_info(f"[{symbol}]    Entry: {entry_price:.5f} | SL: {stop_loss:.5f} | TP: {take_profit:.5f}")
+            log_info(f"[{symbol}]    Risk: {risk:.5f} | Reward: {reward:.5f} | RR: {rr:.2f}")
+        else:
+            # Comportamiento antiguo: calcular desde el sweep (sin FVG)
+            # Obtener precio actual del mercado e información del símbolo (para calcular margen adecuado)
+            try:
+                if tick is None:
+                    tick = mt5.symbol_info_tick(symbol)
+                consts = self._get_symbol_consts(symbol)
+            except Exception as e:
+                logger.error(f"[{symbol}] ❌ Error al consultar MT5: {e}", exc_info=True)
                 return None
             
-            # Verificar posiciones abiertas
-            if self._has_open_positions(symbol):
+            if tick is None:
+                logger.error(f"[{symbol}] ❌ No se pudo obtener precio actual")
                 return None
             
-            direction = sweep.get('direction')
-            target_price = sweep.get('target_price')
+            # Calcular niveles de entrada, SL y TP
+            if consts is None:
+                logger.error(f"[{symbol}] ❌ No se pudo obtener información del símbolo")
+                return None
             
-            # Si hay entry_signal del FVG, usar esos valores directamente
-            if entry_signal:
-                entry_price = entry_signal.get('entry_price')
-                stop_loss = entry_signal.get('stop_loss')
-                take_profit = entry_signal.get('take_profit')
-                risk = entry_signal.get('risk')
-                reward = entry_signal.get('reward')
-                rr = entry_signal.get('rr')
-                
-                self.logger.info(f"[{symbol}] 💹 Usando valores de entrada desde FVG:")
-                self.logger.info(f"[{symbol}]    Entry: {entry_price:.5f} | SL: {stop_loss:.5f} | TP: {take_profit:.5f}")
-                self.logger.info(f"[{symbol}]    Risk: {risk:.5f} | Reward: {reward:.5f} | RR: {rr:.2f}")
+            point = consts.point
+            spread_points = consts.spread_points
+            spread_price = spread_points * point
+            stop_level = consts.stops_level  # Puntos mínimos requeridos por broker
+            min_stop_distance = stop_level * point if stop_level > 0 else spread_price * 3
+            
+            # Calcular margen de seguridad basado en el rango de la vela 1 AM
+            if candle_1am is not None:
+                candle_1am_range = candle_1am.high - candle_1am.low
+                # Usar 20% del rango de la vela 1 AM como margen de seguridad (mínimo 10 pips)
+                safety_margin = max(candle_1am_range * 0.20, point * 10)
             else:
-                # Comportamiento antiguo: calcular desde el sweep (sin FVG)
-                sweep_price = sweep.get('sweep_price')
-                swept_candle = sweep.get('swept_candle', {})
-                
-                # Obtener precio actual del mercado
-                tick = mt5.symbol_info_tick(symbol)
-                if tick is None:
-                    self.logger.error(f"[{symbol}] ❌ No se pudo obtener precio actual")
-                    return None
-                
-                # Calcular niveles de entrada, SL y TP
-                # Obtener información del símbolo para calcular margen adecuado
-                symbol_info = mt5.symbol_info(symbol)
-                if symbol_info is None:
-                    self.logger.error(f"[{symbol}] ❌ No se pudo obtener información del símbolo")
-                    return None
-                
-                point = symbol_info.point
-                spread_points = symbol_info.spread
-                spread_price = spread_points * point
-                stop_level = symbol_info.trade_stops_level  # Puntos mínimos requeridos por broker
-                min_stop_distance = stop_level * point if stop_level > 0 else spread_price * 3
-                
-                # Calcular margen de seguridad basado en el rango de la vela 1 AM
-                candle_1am = sweep.get('candle_1am', {})
-                if candle_1am:
-                    candle_1am_high = candle_1am.get('high', 0)
-                    candle_1am_low = candle_1am.get('low', 0)
-                    candle_1am_range = candle_1am_high - candle_1am_low
-                    # Usar 20% del rango de la vela 1 AM como margen de seguridad (mínimo 10 pips)
-                    safety_margin = max(candle_1am_range * 0.20, point * 10)
-                else:
-                    # Fallback: usar 15 pips como margen mínimo
-                    safety_margin = point * 15
-                
-                if direction == 'BULLISH':
-                    entry_price = float(tick.ask)
-                    # SL: Por debajo del HIGH barrido (sweep_price = HIGH de vela 1 AM)
-                    # Usar el mayor entre: margen de seguridad, distancia mínima del broker, o 10 pips
-                    sl_margin = max(safety_margin, min_stop_distance, point * 10)
-                    stop_loss = sweep_price - sl_margin
-                    
-                    # Asegurar que el SL esté por debajo del entry price
-                    if stop_loss >= entry_price:
-                        stop_loss = entry_price - min_stop_distance
-                        self.logger.warning(f"[{symbol}] ⚠️  SL ajustado: {stop_loss:.5f} (debe estar por debajo del entry {entry_price:.5f})")
-                    
-                    take_profit = target_price
-                else:  # BEARISH
-                    entry_price = float(tick.bid)
-                    # SL: Por encima del LOW barrido (sweep_price = LOW de vela 1 AM)
-                    # Usar el mayor entre: margen de seguridad, distancia mínima del broker, o 10 pips
-                    sl_margin = max(safety_margin, min_stop_distance, point * 10)
-                    stop_loss = sweep_price + sl_margin
-                    
-                    # Asegurar que el SL esté por encima del entry price
-                    if stop_loss <= entry_price:
-                        stop_loss = entry_price + min_stop_distance
-                        self.logger.warning(f"[{symbol}] ⚠️  SL ajustado: {stop_loss:.5f} (debe estar por encima del entry {entry_price:.5f})")
+                # Fallback: usar 15 pips como margen mínimo
+                safety_margin = point * 15
+            
+            # Dirección como signo: +1 compra (SL por debajo), -1 venta (SL por encima)
+            sign = 1.0 if direction == 'BULLISH' else -1.0
+            entry_price = float(tick.ask if sign > 0 else tick.bid)
+            # SL: Al otro lado del extremo barrido de la vela 1 AM
+            # Usar el mayor entre: margen de seguridad, distancia mínima del broker, o 10 pips
+            sl_margin = max(safety_margin, min_stop_distance, point * 10.0)
+            stop_loss = sweep_price - sign * sl_margin
+            
+            # Asegurar que el SL quede del lado correcto del entry price
+            if (entry_price - stop_loss) * sign <= 0:
+                stop_loss = entry_price - sign * min_stop_distance
+                logger.warning(
+                    f"[{symbol}] ⚠️  SL ajustado: {stop_loss:.5f} "
+                    f"(debe estar {'por debajo' if sign > 0 else 'por encima'} del entry {entry_price:.5f})"
+                )
+            
+            take_profit = target_price
+            
+            # Verificar y ajustar Risk/Reward (con el signo conocido no hace falta abs)
+            risk = sign * (entry_price - stop_loss)
+            if risk <= 0:
+                return None
+            
+            reward = sign * (take_profit - entry_price)
+            rr = reward / risk
+            
+            log_info(f"[{symbol}] 📈 Calculando RR: Risk={risk:.5f}, Reward={reward:.5f}, RR={rr:.2f} (mínimo requerido: {min_rr})")
+            
+            # RR flexible: si está cerca del mínimo, ajustar TP para alcanzarlo
+            if rr < min_rr:
+                if flex:
+                    # Calcular qué tan cerca está del mínimo
+                    rr_deficit = min_rr - rr
+                    rr_percent_deficit = rr_deficit / min_rr
                     
-                    take_profit = target_price
-                
-                # Verificar y ajustar Risk/Reward
-                risk = abs(entry_price - stop_loss)
-                if risk == 0:
-                    return None
-                
-                reward = abs(take_profit - entry_price)
-                rr = reward / risk
-                
-                self.logger.info(f"[{symbol}] 📈 Calculando RR: Risk={risk:.5f}, Reward={reward:.5f}, RR={rr:.2f} (mínimo requerido: {self.min_rr})")
-                
-                # RR flexible: si está cerca del mínimo, ajustar TP para alcanzarlo
-                if rr < self.min_rr:
-                    if self.flexible_rr:
-                        # Calcular qué tan cerca está del mínimo
-                        rr_deficit = self.min_rr - rr
-                        rr_percent_deficit = rr_deficit / self.min_rr
-                        
-                        # Si el déficit está dentro de la tolerancia, ajustar TP
-                        if rr_percent_deficit <= self.rr_tolerance:
-                            # Ajustar TP para alcanzar el RR mínimo
-                            if direction == 'BULLISH':
-                                # Aumentar TP para mejorar RR
-                                required_reward = risk * self.min_rr
-                                new_tp = entry_price + required_reward
-                                # No exceder el TP original por más del 20%
-                                max_tp = target_price * 1.20
-                                if new_tp <= max_tp:
-                                    take_profit = new_tp
-                                    reward = required_reward
-                                    rr = self.min_rr
-                                    self.logger.info(
-                                        f"[{symbol}] 🔧 RR ajustado: TP modificado de {target_price:.5f} a {take_profit:.5f} "
-                                        f"para alcanzar RR mínimo {self.min_rr:.2f} (déficit: {rr_percent_deficit*100:.1f}% dentro de tolerancia)"
-                                    )
-                                else:
-                                    self.logger.info(
-                                        f"[{symbol}] ⏸️  RR insuficiente ({rr:.2f} < {self.min_rr}) - "
-                                        f"Ajuste requeriría TP muy lejano ({new_tp:.5f} > {max_tp:.5f})"
-                                    )
-                                    return None
-                            else:  # BEARISH
-                                # Disminuir TP para mejorar RR
-                                required_reward = risk * self.min_rr
-                                new_tp = entry_price - required_reward
-                                # No exceder el TP original por más del 20%
-                                min_tp = target_price * 0.80
-                                if new_tp >= min_tp:
-                                    take_profit = new_tp
-                                    reward = required_reward
-                                    rr = self.min_rr
-                                    self.logger.info(
-                                        f"[{symbol}] 🔧 RR ajustado: TP modificado de {target_price:.5f} a {take_profit:.5f} "
-                                        f"para alcanzar RR mínimo {self.min_rr:.2f} (déficit: {rr_percent_deficit*100:.1f}% dentro de tolerancia)"
-                                    )
-                                else:
-                                    self.logger.info(
-                                        f"[{symbol}] ⏸️  RR insuficiente ({rr:.2f} < {self.min_rr}) - "
-                                        f"Ajuste requeriría TP muy lejano ({new_tp:.5f} < {min_tp:.5f})"
-                                    )
-                                    return None
-                        else:
-                            # Déficit demasiado grande, no ajustar
-                            self.logger.info(
-                                f"[{symbol}] ⏸️  RR insuficiente ({rr:.2f} < {self.min_rr}) - "
-                                f"Déficit {rr_percent_deficit*100:.1f}% excede tolerancia {self.rr_tolerance*100:.0f}%"
+                    # Si el déficit está dentro de la tolerancia, ajustar TP
+                    if rr_percent_deficit <= rr_tol:
+                        # Ajustar TP para alcanzar el RR mínimo (aumentar en compra, disminuir en venta)
+                        adjusted = self._adjust_tp_for_rr(sign, entry_price, risk, target_price)
+                        if adjusted is None:
+                            log_info(
+                                "[%s] ⏸️  RR insuficiente (%.2f < %s) - Ajuste requeriría TP a más del 20%% del objetivo %.5f",
+                                symbol, rr, min_rr, target_price
                             )
                             return None
+                        take_profit, reward, rr = adjusted
+                        log_info(
+                            f"[{symbol}] 🔧 RR ajustado: TP modificado de {target_price:.5f} a {take_profit:.5f} "
+                            f"para alcanzar RR mínimo {min_rr:.2f} (déficit: {rr_percent_deficit*100:.1f}% dentro de tolerancia)"
+                        )
                     else:
-                        # RR flexible deshabilitado
-                        self.logger.info(f"[{symbol}] ⏸️  RR insuficiente ({rr:.2f} < {self.min_rr})")
+                        # Déficit demasiado grande, no ajustar
+                        log_info(
+                            "[%s] ⏸️  RR insuficiente (%.2f < %s) - Déficit %.1f%% excede tolerancia %.0f%%",
+                            symbol, rr, min_rr, rr_percent_deficit * 100, rr_tol * 100
+                        )
                         return None
-            
-            # Calcular volumen
-            volume = self._calculate_volume_by_risk(symbol, entry_price, stop_loss)
-            if volume is None or volume <= 0:
-                self.logger.error(f"[{symbol}] ❌ No se pudo calcular el volumen")
-                return None
-            
-            # Log estructurado de la orden
-            self.logger.info(f"[{symbol}] {'='*70}")
-            self.logger.info(f"[{symbol}] 💹 EJECUTANDO ORDEN CRT")
-            self.logger.info(f"[{symbol}] {'='*70}")
-            self.logger.info(f"[{symbol}] 📊 Dirección: {direction} ({'COMPRA' if direction == 'BULLISH' else 'VENTA'})")
-            self.logger.info(f"[{symbol}] 💰 Precio de Entrada: {entry_price:.5f}")
-            self.logger.info(f"[{symbol}] 🛑 Stop Loss: {stop_loss:.5f} (Risk: {risk:.5f})")
-            self.logger.info(f"[{symbol}] 🎯 Take Profit: {take_profit:.5f} (Reward: {reward:.5f})")
-            self.logger.info(f"[{symbol}] 📈 Risk/Reward: {rr:.2f}:1")
-            self.logger.info(f"[{symbol}] 📦 Volumen: {volume:.2f} lotes")
-            self.logger.info(f"[{symbol}] {'-'*70}")
-            self.logger.info(f"[{symbol}] 📋 Contexto CRT:")
-            self.logger.info(f"[{symbol}]    • Tipo CRT: {sweep.get('crt_type', 'N/A')}")
-            self.logger.info(f"[{symbol}]    • Barrido: {sweep.get('sweep_type', 'N/A')} en H4")
-            sweep_price = sweep.get('sweep_price', 0)
+                else:
+                    # RR flexible deshabilitado
+                    log_info("[%s] ⏸️  RR insuficiente (%.2f < %s)", symbol, rr, min_rr)
+                    return None
+        
+        # Calcular volumen
+        volume = self._calculate_volume_by_risk(symbol, entry_price, stop_loss)
+        if volume is None or volume <= 0:
+            logger.error(f"[{symbol}] ❌ No se pudo calcular el volumen")
+            return None
+        
+        # Log estructurado de la orden
+        if logger.isEnabledFor(logging.INFO):
+            # Solo las líneas opcionales del contexto se construyen aquí; el resto es plantilla
+            parts = []
             if sweep_price:
-                self.logger.info(f"[{symbol}]    • Precio barrido: {sweep_price:.5f}")
-            self.logger.info(f"[{symbol}]    • Objetivo: {target_price:.5f}")
-            if entry_signal and entry_signal.get('fvg'):
-                fvg_info = entry_signal.get('fvg', {})
-                self.logger.info(f"[{symbol}]    • FVG {self.entry_timeframe}: {fvg_info.get('fvg_type', 'N/A')} ({fvg_info.get('fvg_bottom', 0):.5f} - {fvg_info.get('fvg_top', 0):.5f})")
-            if sweep.get('candle_1am'):
-                self.logger.info(f"[{symbol}]    • Vela 1 AM: H={sweep['candle_1am'].get('high', 0):.5f}, L={sweep['candle_1am'].get('low', 0):.5f}")
-            if sweep.get('candle_5am'):
-                self.logger.info(f"[{symbol}]    • Vela 5 AM: H={sweep['candle_5am'].get('high', 0):.5f}, L={sweep['candle_5am'].get('low', 0):.5f}")
-            self.logger.info(f"[{symbol}] {'='*70}")
-            
-            # Ejecutar orden
-            if direction == 'BULLISH':
-                result = self.executor.buy(
-                    symbol=symbol,
-                    volume=volume,
-                    price=entry_price,
-                    stop_loss=stop_loss,
-                    take_profit=take_profit,
-                    comment=f"CRT {self.high_timeframe} + {self.entry_timeframe}"
-                )
-            else:
-                result = self.executor.sell(
-                    symbol=symbol,
-                    volume=volume,
-                    price=entry_price,
-                    stop_loss=stop_loss,
-                    take_profit=take_profit,
-                    comment=f"CRT {self.high_timeframe} + {self.entry_timeframe}"
-                )
-            
-            if result['success']:
-                self.trades_today += 1
-                
-                self.logger.info(f"[{symbol}] {'='*70}")
-                self.logger.info(f"[{symbol}] ✅ ORDEN EJECUTADA EXITOSAMENTE")
-                self.logger.info(f"[{symbol}] {'='*70}")
-                self.logger.info(f"[{symbol}] 🎫 Ticket: {result['order_ticket']}")
-                self.logger.info(f"[{symbol}] 📊 Trades hoy: {self.trades_today}/{self.max_trades_per_day}")
-                self.logger.info(f"[{symbol}] {'='*70}")
-                
-                # Guardar orden en base de datos
-                extra_data = {
+                parts.append(f"   • Precio barrido: {sweep_price:.5f}")
+            parts.append(f"   • Objetivo: {target_price:.5f}")
+            if fvg_info:
+                parts.append(f"   • FVG {etf}: {fvg_info.get('fvg_type', 'N/A')} ({fvg_info.get('fvg_bottom', 0):.5f} - {fvg_info.get('fvg_top', 0):.5f})")
+            if candle_1am is not None:
+                parts.append(f"   • Vela 1 AM: H={candle_1am.high:.5f}, L={candle_1am.low:.5f}")
+            if candle_5am is not None:
+                parts.append(f"   • Vela 5 AM: H={candle_5am.high:.5f}, L={candle_5am.low:.5f}")
+            parts.append(_HR)
+            prefix = f"\n[{symbol}] "
+            log_info(_ORDER_BANNER_TMPL, {
+                'symbol': symbol, 'direction': direction,
+                'side': 'COMPRA' if direction == 'BULLISH' else 'VENTA',
+                'entry': entry_price, 'sl': stop_loss, 'risk': risk,
+                'tp': take_profit, 'reward': reward, 'rr': rr, 'volume': volume,
+                'crt_type': crt_type, 'sweep_type': sweep_type,
+                'context': prefix + prefix.join(parts),
+            })
+        
+        # Ejecutar orden
+        request = self._request_scratch
+        request.clear()
+        request['action'] = 'BUY' if direction == 'BULLISH' else 'SELL'
+        request['symbol'] = symbol
+        request['volume'] = volume
+        request['price'] = entry_price
+        request['stop_loss'] = stop_loss
+        request['take_profit'] = take_profit
+        request['comment'] = self._order_comment
+        try:
+            result = self.executor.submit(request)
+        except Exception as e:
+            logger.error(f"[{symbol}] ❌ Error al ejecutar orden CRT: {e}", exc_info=True)
+            return None
+        
+        if result['success']:
+            self.trades_today += 1
+            # Balance/margen cambian tras la orden: forzar lectura fresca
+            self._invalidate_mt5_cache(symbol)
+            # Incrementar conteo cacheado (la orden se guarda en BD en segundo plano)
+            counts = self._trade_count_cache[1]
+            counts[symbol] = counts.get(symbol, 0) + 1
+            
+            log_info(_ORDER_OK_TMPL, {
+                'symbol': symbol, 'ticket': result['order_ticket'],
+                'trades': self.trades_today, 'max_trades': max_per_day,
+            })
+            
+            # Guardar orden en base de datos (en segundo plano, método disponible en BaseStrategy)
+            self.save_order_to_db_async(
+                ticket=result['order_ticket'],
+                symbol=symbol,
+                order_type=direction,  # 'BULLISH' o 'BEARISH'
+                entry_price=entry_price,
+                volume=volume,
+                stop_loss=stop_loss,
+                take_profit=take_profit,
+                rr=rr,
+                comment=self._order_comment,
+                extra_data={
                     'sweep': sweep,
                     'trades_today': self.trades_today,
-                    'max_trades_per_day': self.max_trades_per_day
+                    'max_trades_per_day': max_per_day
                 }
-                
-                self.save_order_to_db(
-                    ticket=result['order_ticket'],
-                    symbol=symbol,
-                    order_type=direction,  # 'BULLISH' o 'BEARISH'
-                    entry_price=entry_price,
-                    volume=volume,
-                    stop_loss=stop_loss,
-                    take_profit=take_profit,
-                    rr=rr,
-                    comment=f"CRT {self.high_timeframe} + {self.entry_timeframe}",
-                    extra_data=extra_data
-                )
-                
-                return {
-                    'action': f'{direction}_EXECUTED',
-                    'ticket': result['order_ticket'],
-                    'sweep': sweep
-                }
-            else:
-                self.logger.error(f"[{symbol}] ❌ ERROR AL EJECUTAR ORDEN: {result.get('message', 'Error desconocido')}")
-                return None
-                
-        except Exception as e:
-            self.logger.error(f"[{symbol}] ❌ Error al ejecutar orden CRT: {e}", exc_info=True)
+            )
+            
+            return {
+                'action': f'{direction}_EXECUTED',
+                'ticket': result['order_ticket'],
+                'sweep': sweep
+            }
+        else:
+            logger.error(f"[{symbol}] ❌ ERROR AL EJECUTAR ORDEN: {result.get('message', 'Error desconocido')}")
             return None
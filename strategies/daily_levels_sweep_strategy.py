@@ -5,10 +5,10 @@ Funciona 24/7 (sin restricciones de horario)
 """
 
 import logging
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple, Any, NamedTuple
 import numpy as np
 import MetaTrader5 as mt5
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 import time
 
 import sys
@@ -17,11 +17,98 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from strategy_manager import BaseStrategy
 from Base.daily_levels_detector import (
-    detect_daily_high_take,
-    detect_daily_low_take,
+    detect_daily_level_touch,
     get_previous_daily_levels
 )
 from Base.order_executor import OrderExecutor
+from Base.numba_compat import njit
+
+
+# Tolerancia para considerar un barrido "en vivo" (pips desde el nivel)
+LIVE_TOLERANCE_PIPS = 5.0
+
+# Plantillas de log precompiladas (formato diferido: logging solo las formatea si el registro se emite)
+SIGNAL_LOG_FMT = (
+    "[%s] 📊 Señal %s generada | "
+    "Entry: %.5f | SL: %.5f (%s pips) | "
+    "TP: %.5f (%s pips) | RR: 1:2 | "
+    "Volumen: %.2f lotes"
+)
+ORDER_OK_LOG_FMT = (
+    "[%s] ✅ Orden %s ejecutada exitosamente | "
+    "Ticket: %s | "
+    "Entry: %.5f | "
+    "Trades hoy: %s/%s | "
+    "Barrido diario ejecutado - Esperando próximo día tradeable"
+)
+VOLUME_LOG_FMT = "[%s] 💰 Volumen calculado: %.2f lotes | Riesgo: %s%% = %.2f"
+LIVE_SWEEP_LOG_FMT = "[%s] Barrido %s es EN VIVO: Precio %.5f está a %.1f pips del %s %.5f"
+
+
+@njit(cache=True, nogil=True)
+def _order_kernel(entry_price, side, sl_distance, tp_distance, digits, balance, risk_percent,
+                  tick_size, tick_value, volume_step, volume_min, volume_max):
+    """
+    Calcula SL, TP y volumen por riesgo de una entrada en una sola llamada escalar
+    
+    Args:
+        entry_price: Precio de entrada
+        side: +1 para compra (BUY), -1 para venta (SELL)
+        sl_distance, tp_distance: Distancias de SL y TP en precio
+        digits: Dígitos del símbolo para normalizar SL/TP
+        balance: Balance de la cuenta
+        risk_percent: Porcentaje de riesgo por trade
+        tick_size, tick_value: Tamaño y valor del tick del símbolo
+        volume_step, volume_min, volume_max: Restricciones de volumen del símbolo
+        
+    Returns:
+        Tupla (stop_loss, take_profit, volume, risk_amount, estado): estado 0 = OK,
+        1 = volumen recortado al máximo, -1 = volumen inválido o menor al mínimo
+    """
+    stop_loss = round(entry_price - side * sl_distance, digits)
+    take_profit = round(entry_price + side * tp_distance, digits)
+    risk_amount = balance * (risk_percent / 100.0)
+    risk_in_price = abs(entry_price - stop_loss)
+    
+    if tick_size > 0 and tick_value > 0:
+        risk_value_per_lot = (risk_in_price / tick_size) * tick_value
+    else:
+        # Fallback aproximado: 10 por pip y lote
+        risk_value_per_lot = (risk_in_price / 0.0001) * 10.0
+    
+    if risk_value_per_lot <= 0:
+        return stop_loss, take_profit, 0.0, risk_amount, -1
+    
+    volume = risk_amount / risk_value_per_lot
+    if volume_step > 0:
+        volume = round(volume / volume_step) * volume_step
+        if volume < volume_min:
+            volume = volume_min
+    
+    status = 0
+    if volume > volume_max:
+        volume = volume_max
+        status = 1
+    if volume < volume_min:
+        status = -1
+    return stop_loss, take_profit, volume, risk_amount, status
+
+
+class SymbolSpecs(NamedTuple):
+    """Datos de mt5.symbol_info ya derivados a pips/precio (se reconstruyen al refrescar la caché)"""
+    info: Any
+    point: float
+    pip_value: float
+    digits: int
+    tick_size: float
+    tick_value: float
+    volume_step: float
+    volume_min: float
+    volume_max: float
+    retracement_price: float  # retracement_pips en precio
+    stop_loss_price: float  # stop_loss_pips en precio
+    take_profit_price: float  # take_profit_pips en precio
+    live_tolerance_points: int  # LIVE_TOLERANCE_PIPS en points enteros
 
 
 class DailyLevelsSweepStrategy(BaseStrategy):
@@ -48,7 +135,7 @@ class DailyLevelsSweepStrategy(BaseStrategy):
             config: Configuración del bot
         """
         super().__init__(config)
-        self.executor = OrderExecutor()
+        self.executor = OrderExecutor.instance()
         
         # Configuración de la estrategia
         strategy_config = config.get('strategy_config', {})
@@ -75,15 +162,40 @@ class DailyLevelsSweepStrategy(BaseStrategy):
         # Estado de monitoreo
         self.monitoring_sweep = None  # Dict con información del barrido que estamos monitoreando
         self.sweep_extreme_price = None  # Precio del extremo barrido
+        self.sweep_extreme_points = None  # Extremo barrido en points enteros (comparaciones exactas)
         self.sweep_type = None  # 'HIGH' o 'LOW'
         self.sweep_date = None  # Fecha del nivel barrido
         self.sweep_timestamp = None  # Timestamp cuando se detectó el barrido
+        self._side = 0  # Dirección de la entrada: -1 (HIGH → SELL), +1 (LOW → BUY)
+        self._trigger_price = 0.0  # Precio que debe superar el retracement en la dirección _side
+        
+        # Fecha local cacheada hasta la próxima medianoche (epoch): evita date.today() por tick
+        self._today: Optional[date] = None
+        self._today_until = 0.0
         
-        self.logger.info(f"DailyLevelsSweepStrategy inicializada - Funciona 24/7")
-        self.logger.info(f"Lookback: {self.lookback_days} días | Tolerancia: {self.tolerance_pips} pips")
-        self.logger.info(f"Retracement mínimo: {self.retracement_pips} pips")
-        self.logger.info(f"SL: {self.stop_loss_pips} pips | TP: {self.take_profit_pips} pips (RR 1:2)")
-        self.logger.info(f"Riesgo por trade: {self.risk_per_trade_percent}%")
+        # Próximo instante (time.monotonic) en que se permite emitir los logs limitados a uno cada 5 minutos
+        self._next_both_swept_log_ts = 0.0
+        self._next_old_sweep_log_ts = 0.0
+        
+        # Caché de mt5.symbol_info por símbolo (evita varias llamadas IPC a MT5 por tick)
+        self._sym_info_ttl = 1.0  # segundos
+        self._sym_info_cache: Dict[str, Tuple[float, SymbolSpecs]] = {}
+        
+        # Caché de niveles diarios previos por símbolo: solo cambian al abrir una nueva vela D1.
+        # Se invalida al cambiar de fecha y, por seguridad, tras un TTL corto (el día del broker
+        # puede no coincidir con la fecha local): símbolo -> (fecha, instante monotónico, niveles)
+        self._levels_ttl = 30.0  # segundos
+        self._levels_cache: Dict[str, Tuple[date, float, Dict]] = {}
+        
+        # Caché del balance de la cuenta: (instante monotónico, balance). Se invalida tras cada orden propia
+        self._balance_ttl = 10.0  # segundos
+        self._balance_cache: Tuple[float, float] = (float('-inf'), 0.0)
+        
+        self.logger.info("DailyLevelsSweepStrategy inicializada - Funciona 24/7")
+        self.logger.info("Lookback: %s días | Tolerancia: %s pips", self.lookback_days, self.tolerance_pips)
+        self.logger.info("Retracement mínimo: %s pips", self.retracement_pips)
+        self.logger.info("SL: %s pips | TP: %s pips (RR 1:2)", self.stop_loss_pips, self.take_profit_pips)
+        self.logger.info("Riesgo por trade: %s%%", self.risk_per_trade_percent)
     
     def analyze(self, symbol: str, rates: np.ndarray) -> Optional[Dict]:
         """
@@ -97,12 +209,20 @@ class DailyLevelsSweepStrategy(BaseStrategy):
             Dict con señal de trading o None
         """
         try:
-            # Obtener precio actual
-            tick = mt5.symbol_info_tick(symbol)
-            if tick is None:
+            # ⚠️ VERIFICACIÓN TEMPRANA: Día cerrado (barrido ya operado o ambos niveles barridos)
+            # o límite de trades alcanzado → no hay nada que detectar hasta el próximo día
+            self._reset_daily_sweep_flag()
+            if self.daily_sweep_trade_executed or self.has_reached_daily_limit():
+                if self.monitoring_sweep:
+                    self._clear_sweep_monitoring()
+                return None
+            
+            # Obtener precio actual (y refrescar la info del símbolo en la misma llamada)
+            snapshot = self._get_snapshot(symbol)
+            if snapshot is None:
                 return None
             
-            current_price = float(tick.bid)
+            current_price, specs = snapshot
             
             # 1. Verificar si hay un barrido activo que estamos monitoreando
             if self.monitoring_sweep:
@@ -110,36 +230,22 @@ class DailyLevelsSweepStrategy(BaseStrategy):
                 signal = self._check_retracement_and_enter(symbol, current_price)
                 if signal:
                     # Limpiar estado de monitoreo después de entrar
-                    self.monitoring_sweep = None
-                    self.sweep_extreme_price = None
-                    self.sweep_type = None
-                    self.sweep_date = None
-                    self.sweep_timestamp = None
+                    self._clear_sweep_monitoring()
                     return signal
                 
                 # Si el barrido ya no es válido, limpiar estado
-                if not self._is_sweep_still_valid(symbol):
+                if not self._is_sweep_still_valid(symbol, current_price):
                     self.logger.info(
-                        f"[{symbol}] El barrido de {self.sweep_type} ya no es válido - Limpiando monitoreo"
+                        "[%s] El barrido de %s ya no es válido - Limpiando monitoreo",
+                        symbol, self.sweep_type
                     )
-                    self.monitoring_sweep = None
-                    self.sweep_extreme_price = None
-                    self.sweep_type = None
-                    self.sweep_date = None
-                    self.sweep_timestamp = None
+                    self._clear_sweep_monitoring()
+                else:
+                    # Barrido aún válido: seguir esperando el retracement sin re-detectar niveles
+                    return None
             
             # 2. Detectar nuevos barridos de Daily High y Low simultáneamente
-            high_take = detect_daily_high_take(
-                symbol, 
-                lookback_days=self.lookback_days, 
-                tolerance_pips=self.tolerance_pips
-            )
-            
-            low_take = detect_daily_low_take(
-                symbol, 
-                lookback_days=self.lookback_days, 
-                tolerance_pips=self.tolerance_pips
-            )
+            high_take, low_take = self._detect_level_takes(symbol, current_price)
             
             # Verificar si AMBOS fueron tomados
             high_taken = high_take and high_take.get('has_taken')
@@ -147,89 +253,132 @@ class DailyLevelsSweepStrategy(BaseStrategy):
             
             if high_taken and low_taken:
                 # AMBOS fueron tomados - Esperar al próximo día operativo
-                if not hasattr(self, '_last_both_swept_log') or (time.time() - self._last_both_swept_log) >= 300:
+                now = time.monotonic()
+                if now >= self._next_both_swept_log_ts:
                     self.logger.info(
-                        f"[{symbol}] ⏸️  AMBOS niveles barridos (HIGH y LOW) detectados | "
-                        f"Esperando al próximo día operativo para buscar nuevos barridos"
+                        "[%s] ⏸️  AMBOS niveles barridos (HIGH y LOW) detectados | "
+                        "Esperando al próximo día operativo para buscar nuevos barridos",
+                        symbol
                     )
-                    self._last_both_swept_log = time.time()
+                    self._next_both_swept_log_ts = now + 300.0
                 
                 # Marcar el día como cerrado
-                today = date.today()
+                today = self._get_today()
                 self.daily_sweep_trade_executed = True
                 self.daily_sweep_trade_date = today
                 return None
             
-            # 3. Detectar barrido de Daily High (solo si no se barrió también el LOW)
-            if high_taken:
+            # 3. Barrido de Daily High o Low en un único paso: la detección devuelve como máximo
+            # uno de los dos, así que ambos lados comparten la verificación "en vivo"
+            take = high_take if high_taken else (low_take if low_taken else None)
+            if take:
+                level_type = take['level_type']
+                level_price = take['level_price']
                 # Verificar si el barrido es "en vivo" (recién ocurrió)
-                if self._is_sweep_live(symbol, current_price, high_take['level_price'], 'HIGH'):
-                    # Se detectó un barrido de Daily High EN VIVO
-                    level_price = high_take['level_price']
-                    level_date = high_take['level_date']
+                if self._is_sweep_live(symbol, current_price, level_price, level_type):
+                    level_date = take['level_date']
                     
-                    # Iniciar monitoreo del barrido
-                    self.monitoring_sweep = high_take
+                    # Iniciar monitoreo del barrido (HIGH → SELL, LOW → BUY)
+                    self.monitoring_sweep = take
                     self.sweep_extreme_price = level_price
-                    self.sweep_type = 'HIGH'
+                    self.sweep_extreme_points = int(round(level_price / specs.point))
+                    self.sweep_type = level_type
                     self.sweep_date = level_date
                     self.sweep_timestamp = time.time()
+                    self._side = -1 if level_type == 'HIGH' else +1
+                    self._trigger_price = level_price + self._side * specs.retracement_price
                     
                     self.logger.info(
-                        f"[{symbol}] 🔍 Daily HIGH barrido detectado EN VIVO: {level_price:.5f} ({level_date}) | "
-                        f"Precio actual: {current_price:.5f} | "
-                        f"Monitoreando retracement de {self.retracement_pips} pips para entrada SELL"
+                        "[%s] 🔍 Daily %s barrido detectado EN VIVO: %.5f (%s) | "
+                        "Precio actual: %.5f | "
+                        "Monitoreando retracement de %s pips para entrada %s",
+                        symbol, level_type, level_price, level_date, current_price,
+                        self.retracement_pips, 'SELL' if self._side < 0 else 'BUY'
                     )
                     return None  # Aún no hay señal, solo monitoreo
                 else:
                     # El barrido ya ocurrió hace tiempo, no es "en vivo"
-                    if not hasattr(self, '_last_old_sweep_log') or (time.time() - self._last_old_sweep_log) >= 300:
+                    now = time.monotonic()
+                    if now >= self._next_old_sweep_log_ts:
                         self.logger.debug(
-                            f"[{symbol}] Daily HIGH fue barrido pero no es en vivo (ya pasó) - Esperando detección en vivo"
+                            "[%s] Daily %s fue barrido pero no es en vivo (ya pasó) - Esperando detección en vivo",
+                            symbol, level_type
                         )
-                        self._last_old_sweep_log = time.time()
-            
-            # 4. Detectar barrido de Daily Low (solo si no se barrió también el HIGH)
-            if low_taken:
-                # Verificar si el barrido es "en vivo" (recién ocurrió)
-                if self._is_sweep_live(symbol, current_price, low_take['level_price'], 'LOW'):
-                    # Se detectó un barrido de Daily Low EN VIVO
-                    level_price = low_take['level_price']
-                    level_date = low_take['level_date']
-                    
-                    # Iniciar monitoreo del barrido
-                    self.monitoring_sweep = low_take
-                    self.sweep_extreme_price = level_price
-                    self.sweep_type = 'LOW'
-                    self.sweep_date = level_date
-                    self.sweep_timestamp = time.time()
-                    
-                    self.logger.info(
-                        f"[{symbol}] 🔍 Daily LOW barrido detectado EN VIVO: {level_price:.5f} ({level_date}) | "
-                        f"Precio actual: {current_price:.5f} | "
-                        f"Monitoreando retracement de {self.retracement_pips} pips para entrada BUY"
-                    )
-                    return None  # Aún no hay señal, solo monitoreo
-                else:
-                    # El barrido ya ocurrió hace tiempo, no es "en vivo"
-                    if not hasattr(self, '_last_old_sweep_log') or (time.time() - self._last_old_sweep_log) >= 300:
-                        self.logger.debug(
-                            f"[{symbol}] Daily LOW fue barrido pero no es en vivo (ya pasó) - Esperando detección en vivo"
-                        )
-                        self._last_old_sweep_log = time.time()
+                        self._next_old_sweep_log_ts = now + 300.0
             
             return None
             
         except Exception as e:
-            self.logger.error(f"Error en análisis de Daily Levels Sweep: {e}", exc_info=True)
+            self.logger.error("Error en análisis de Daily Levels Sweep: %s", e, exc_info=True)
             return None
     
-    def _is_sweep_still_valid(self, symbol: str) -> bool:
+    def _get_daily_levels(self, symbol: str) -> Optional[Dict]:
+        """
+        Obtiene los niveles diarios previos usando la caché por (símbolo, fecha) con TTL
+        
+        Args:
+            symbol: Símbolo a analizar
+            
+        Returns:
+            Dict de get_previous_daily_levels o None si no se pudo obtener
+        """
+        today = self._get_today()
+        now = time.monotonic()
+        cached = self._levels_cache.get(symbol)
+        if cached is not None and cached[0] == today and now - cached[1] < self._levels_ttl:
+            return cached[2]
+        
+        levels = get_previous_daily_levels(symbol, lookback_days=self.lookback_days)
+        if levels:
+            self._levels_cache[symbol] = (today, now, levels)
+        return levels
+    
+    def _detect_level_takes(self, symbol: str, current_price: float) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        Detecta la toma de Daily High y Daily Low con una sola evaluación del precio actual
+        
+        Equivale a detect_daily_high_take + detect_daily_low_take, pero reutiliza los niveles
+        cacheados y el precio ya obtenido en lugar de releer velas D1 y tick dos veces.
+        
+        Args:
+            symbol: Símbolo a analizar
+            current_price: Precio actual (bid)
+            
+        Returns:
+            Tuple (high_take, low_take); cada uno es el dict del toque o None
+        """
+        levels = self._get_daily_levels(symbol)
+        if not levels:
+            return None, None
+        specs = self._get_symbol_info(symbol)
+        if specs is None:
+            return None, None
+        
+        touch_info = detect_daily_level_touch(
+            symbol,
+            lookback_days=self.lookback_days,
+            tolerance_pips=self.tolerance_pips,
+            levels=levels,
+            current_price=current_price,
+            pip_value=specs.pip_value
+        )
+        if not touch_info or not touch_info.get('is_taking'):
+            return None, None
+        
+        level_type = touch_info.get('level_type')
+        if level_type == 'HIGH':
+            return touch_info, None
+        if level_type == 'LOW':
+            return None, touch_info
+        return None, None
+    
+    def _is_sweep_still_valid(self, symbol: str, current_price: float) -> bool:
         """
         Verifica si el barrido que estamos monitoreando aún es válido
         
         Args:
             symbol: Símbolo a analizar
+            current_price: Precio actual (bid)
             
         Returns:
             True si el barrido aún es válido, False si no
@@ -238,32 +387,28 @@ class DailyLevelsSweepStrategy(BaseStrategy):
             return False
         
         try:
+            specs = self._get_symbol_info(symbol)
+            if specs is None:
+                return False
+            point = specs.point
+            
             # Re-detectar el barrido para verificar que aún existe
+            high_take, low_take = self._detect_level_takes(symbol, current_price)
             if self.sweep_type == 'HIGH':
-                high_take = detect_daily_high_take(
-                    symbol, 
-                    lookback_days=self.lookback_days, 
-                    tolerance_pips=self.tolerance_pips
-                )
                 if high_take and high_take.get('has_taken'):
-                    # Verificar que es el mismo nivel
-                    if abs(high_take['level_price'] - self.sweep_extreme_price) < 0.0001:
+                    # Verificar que es el mismo nivel (igualdad exacta en points enteros)
+                    if int(round(high_take['level_price'] / point)) == self.sweep_extreme_points:
                         return True
             elif self.sweep_type == 'LOW':
-                low_take = detect_daily_low_take(
-                    symbol, 
-                    lookback_days=self.lookback_days, 
-                    tolerance_pips=self.tolerance_pips
-                )
                 if low_take and low_take.get('has_taken'):
-                    # Verificar que es el mismo nivel
-                    if abs(low_take['level_price'] - self.sweep_extreme_price) < 0.0001:
+                    # Verificar que es el mismo nivel (igualdad exacta en points enteros)
+                    if int(round(low_take['level_price'] / point)) == self.sweep_extreme_points:
                         return True
             
             return False
             
         except Exception as e:
-            self.logger.error(f"Error al verificar validez del barrido: {e}", exc_info=True)
+            self.logger.error("Error al verificar validez del barrido: %s", e, exc_info=True)
             return False
     
     def _check_retracement_and_enter(self, symbol: str, current_price: float) -> Optional[Dict]:
@@ -280,125 +425,95 @@ class DailyLevelsSweepStrategy(BaseStrategy):
         if not self.monitoring_sweep or not self.sweep_extreme_price or not self.sweep_type:
             return None
         
+        # HIGH → SELL: el precio debe bajar al menos retracement_pips por debajo del HIGH barrido
+        # LOW → BUY: el precio debe subir al menos retracement_pips por encima del LOW barrido
+        # Ambos casos se reducen a un único signo: _side * (precio - _trigger_price) > 0
+        if self._side * (current_price - self._trigger_price) <= 0:
+            return None
+        
         try:
-            # Obtener información del símbolo para calcular pips
-            symbol_info = mt5.symbol_info(symbol)
-            if symbol_info is None:
+            specs = self._get_symbol_info(symbol)
+            if specs is None:
                 return None
             
-            point = symbol_info.point
-            pip_value = point * 10 if symbol_info.digits == 5 else point * 1
-            retracement_price = self.retracement_pips * pip_value
-            
-            if self.sweep_type == 'HIGH':
-                # Si barrió HIGH, esperamos que el precio baje (retracement)
-                # El precio debe estar al menos 10 pips por debajo del HIGH barrido
-                if current_price < (self.sweep_extreme_price - retracement_price):
-                    # Calcular distancia del retracement
-                    retracement_distance = self.sweep_extreme_price - current_price
-                    retracement_pips_actual = retracement_distance / pip_value
-                    
-                    self.logger.info(
-                        f"[{symbol}] ✅ Retracement detectado después de barrido de HIGH | "
-                        f"Precio regresó {retracement_pips_actual:.1f} pips | "
-                        f"Generando señal SELL"
-                    )
-                    
-                    # Generar señal SELL
-                    return self._create_sell_signal(symbol, current_price)
+            # Calcular distancia del retracement
+            retracement_pips_actual = self._side * (current_price - self.sweep_extreme_price) / specs.pip_value
             
-            elif self.sweep_type == 'LOW':
-                # Si barrió LOW, esperamos que el precio suba (retracement)
-                # El precio debe estar al menos 10 pips por encima del LOW barrido
-                if current_price > (self.sweep_extreme_price + retracement_price):
-                    # Calcular distancia del retracement
-                    retracement_distance = current_price - self.sweep_extreme_price
-                    retracement_pips_actual = retracement_distance / pip_value
-                    
-                    self.logger.info(
-                        f"[{symbol}] ✅ Retracement detectado después de barrido de LOW | "
-                        f"Precio regresó {retracement_pips_actual:.1f} pips | "
-                        f"Generando señal BUY"
-                    )
-                    
-                    # Generar señal BUY
-                    return self._create_buy_signal(symbol, current_price)
+            self.logger.info(
+                "[%s] ✅ Retracement detectado después de barrido de %s | "
+                "Precio regresó %.1f pips | "
+                "Generando señal %s",
+                symbol, self.sweep_type, retracement_pips_actual,
+                'BUY' if self._side > 0 else 'SELL'
+            )
             
-            return None
+            return self._create_signal(symbol, current_price, self._side)
             
         except Exception as e:
-            self.logger.error(f"Error al verificar retracement: {e}", exc_info=True)
+            self.logger.error("Error al verificar retracement: %s", e, exc_info=True)
             return None
     
-    def _create_buy_signal(self, symbol: str, entry_price: float) -> Optional[Dict]:
+    def _create_signal(self, symbol: str, entry_price: float, side: int) -> Optional[Dict]:
         """
-        Crea una señal de compra (BUY)
+        Crea y ejecuta una señal de trading en la dirección indicada
         
         Args:
             symbol: Símbolo
             entry_price: Precio de entrada
+            side: +1 para compra (BUY), -1 para venta (SELL)
             
         Returns:
             Dict con señal de trading
         """
+        direction = 'BUY' if side > 0 else 'SELL'
         try:
             # Calcular SL y TP en pips
-            symbol_info = mt5.symbol_info(symbol)
-            if symbol_info is None:
+            specs = self._get_symbol_info(symbol)
+            if specs is None:
                 return None
             
-            point = symbol_info.point
-            pip_value = point * 10 if symbol_info.digits == 5 else point * 1
-            
-            # SL: 100 pips por debajo del entry
-            stop_loss = entry_price - (self.stop_loss_pips * pip_value)
-            # TP: 200 pips por encima del entry
-            take_profit = entry_price + (self.take_profit_pips * pip_value)
-            
-            # Normalizar precios
-            stop_loss = self.executor._normalize_price(symbol, stop_loss)
-            take_profit = self.executor._normalize_price(symbol, take_profit)
-            
-            # Calcular volumen basado en riesgo
-            volume = self._calculate_volume_by_risk(symbol, entry_price, stop_loss)
-            if volume is None:
+            # SL (100 pips en contra), TP (200 pips a favor) y volumen basado en riesgo
+            order_params = self._calculate_order_params(symbol, entry_price, side, specs)
+            if order_params is None:
                 return None
+            stop_loss, take_profit, volume = order_params
             
             self.logger.info(
-                f"[{symbol}] 📊 Señal BUY generada | "
-                f"Entry: {entry_price:.5f} | SL: {stop_loss:.5f} ({self.stop_loss_pips} pips) | "
-                f"TP: {take_profit:.5f} ({self.take_profit_pips} pips) | RR: 1:2 | "
-                f"Volumen: {volume:.2f} lotes"
+                SIGNAL_LOG_FMT,
+                symbol, direction, entry_price, stop_loss, self.stop_loss_pips,
+                take_profit, self.take_profit_pips, volume
             )
             
             # Ejecutar orden
-            result = self.executor.buy(
+            send_order = self.executor.buy if side > 0 else self.executor.sell
+            result = send_order(
                 symbol=symbol,
                 volume=volume,
                 stop_loss=stop_loss,
                 take_profit=take_profit,
-                comment="Daily Levels Sweep - BUY"
+                comment=f"Daily Levels Sweep - {direction}"
             )
             
             if result['success']:
+                # El balance cambiará con esta orden: forzar relectura en la próxima señal
+                self._balance_cache = (float('-inf'), 0.0)
+                
                 # Incrementar contador de trades
                 self._reset_daily_trades_counter()
                 self.trades_today += 1
                 
                 # Marcar que se ejecutó una orden por barrido diario hoy
-                today = date.today()
+                today = self._get_today()
                 self.daily_sweep_trade_executed = True
                 self.daily_sweep_trade_date = today
                 
                 self.logger.info(
-                    f"[{symbol}] ✅ Orden BUY ejecutada exitosamente | "
-                    f"Ticket: {result['order_ticket']} | "
-                    f"Entry: {entry_price:.5f} | "
-                    f"Trades hoy: {self.trades_today}/{self.max_trades_per_day} | "
-                    f"Barrido diario ejecutado - Esperando próximo día tradeable"
+                    ORDER_OK_LOG_FMT,
+                    symbol, direction, result['order_ticket'], entry_price,
+                    self.trades_today, self.max_trades_per_day
                 )
                 return {
-                    'action': 'BUY_EXECUTED',
+                    'action': f'{direction}_EXECUTED',
                     'ticket': result['order_ticket'],
                     'entry_price': entry_price,
                     'stop_loss': stop_loss,
@@ -410,184 +525,151 @@ class DailyLevelsSweepStrategy(BaseStrategy):
                 }
             else:
                 self.logger.error(
-                    f"[{symbol}] ❌ Error al ejecutar orden BUY: {result.get('error', 'Unknown error')}"
+                    "[%s] ❌ Error al ejecutar orden %s: %s",
+                    symbol, direction, result.get('error', 'Unknown error')
                 )
                 return None
                 
         except Exception as e:
-            self.logger.error(f"Error al crear señal BUY: {e}", exc_info=True)
+            self.logger.error("Error al crear señal %s: %s", direction, e, exc_info=True)
             return None
     
-    def _create_sell_signal(self, symbol: str, entry_price: float) -> Optional[Dict]:
+    def _calculate_order_params(self, symbol: str, entry_price: float, side: int,
+                                specs: SymbolSpecs) -> Optional[Tuple[float, float, float]]:
         """
-        Crea una señal de venta (SELL)
+        Calcula SL, TP normalizados y el volumen basado en el porcentaje de riesgo
         
         Args:
             symbol: Símbolo
             entry_price: Precio de entrada
+            side: +1 para compra (BUY), -1 para venta (SELL)
+            specs: SymbolSpecs cacheado del símbolo
             
         Returns:
-            Dict con señal de trading
+            Tuple (stop_loss, take_profit, volume) o None si hay error
         """
         try:
-            # Calcular SL y TP en pips
-            symbol_info = mt5.symbol_info(symbol)
-            if symbol_info is None:
+            # Obtener balance de la cuenta (cacheado)
+            balance = self._get_balance()
+            if balance is None:
+                self.logger.error("[%s] No se pudo obtener información de la cuenta", symbol)
                 return None
             
-            point = symbol_info.point
-            pip_value = point * 10 if symbol_info.digits == 5 else point * 1
-            
-            # SL: 100 pips por encima del entry
-            stop_loss = entry_price + (self.stop_loss_pips * pip_value)
-            # TP: 200 pips por debajo del entry
-            take_profit = entry_price - (self.take_profit_pips * pip_value)
+            stop_loss, take_profit, volume, risk_amount, status = _order_kernel(
+                float(entry_price), side, specs.stop_loss_price, specs.take_profit_price,
+                specs.digits, balance, float(self.risk_per_trade_percent),
+                specs.tick_size, specs.tick_value,
+                specs.volume_step, specs.volume_min, specs.volume_max
+            )
             
-            # Normalizar precios
-            stop_loss = self.executor._normalize_price(symbol, stop_loss)
-            take_profit = self.executor._normalize_price(symbol, take_profit)
+            if volume <= 0:
+                return None
             
-            # Calcular volumen basado en riesgo
-            volume = self._calculate_volume_by_risk(symbol, entry_price, stop_loss)
-            if volume is None:
+            if status == 1:
+                self.logger.warning("[%s] ⚠️  Volumen excede máximo, usando máximo: %s", symbol, specs.volume_max)
+            elif status < 0:
+                self.logger.error("[%s] ❌ Volumen calculado (%.4f) es menor al mínimo (%s)", symbol, volume, specs.volume_min)
                 return None
             
             self.logger.info(
-                f"[{symbol}] 📊 Señal SELL generada | "
-                f"Entry: {entry_price:.5f} | SL: {stop_loss:.5f} ({self.stop_loss_pips} pips) | "
-                f"TP: {take_profit:.5f} ({self.take_profit_pips} pips) | RR: 1:2 | "
-                f"Volumen: {volume:.2f} lotes"
+                VOLUME_LOG_FMT,
+                symbol, volume, self.risk_per_trade_percent, risk_amount
             )
             
-            # Ejecutar orden
-            result = self.executor.sell(
-                symbol=symbol,
-                volume=volume,
-                stop_loss=stop_loss,
-                take_profit=take_profit,
-                comment="Daily Levels Sweep - SELL"
-            )
+            return stop_loss, take_profit, volume
             
-            if result['success']:
-                # Incrementar contador de trades
-                self._reset_daily_trades_counter()
-                self.trades_today += 1
-                
-                # Marcar que se ejecutó una orden por barrido diario hoy
-                today = date.today()
-                self.daily_sweep_trade_executed = True
-                self.daily_sweep_trade_date = today
-                
-                self.logger.info(
-                    f"[{symbol}] ✅ Orden SELL ejecutada exitosamente | "
-                    f"Ticket: {result['order_ticket']} | "
-                    f"Entry: {entry_price:.5f} | "
-                    f"Trades hoy: {self.trades_today}/{self.max_trades_per_day} | "
-                    f"Barrido diario ejecutado - Esperando próximo día tradeable"
-                )
-                return {
-                    'action': 'SELL_EXECUTED',
-                    'ticket': result['order_ticket'],
-                    'entry_price': entry_price,
-                    'stop_loss': stop_loss,
-                    'take_profit': take_profit,
-                    'volume': volume,
-                    'sweep_type': self.sweep_type,
-                    'sweep_level': self.sweep_extreme_price,
-                    'sweep_date': self.sweep_date
-                }
-            else:
-                self.logger.error(
-                    f"[{symbol}] ❌ Error al ejecutar orden SELL: {result.get('error', 'Unknown error')}"
-                )
-                return None
-                
         except Exception as e:
-            self.logger.error(f"Error al crear señal SELL: {e}", exc_info=True)
+            self.logger.error("Error al calcular volumen por riesgo: %s", e, exc_info=True)
             return None
     
-    def _calculate_volume_by_risk(self, symbol: str, entry_price: float, stop_loss: float) -> Optional[float]:
+    def _get_balance(self) -> Optional[float]:
         """
-        Calcula el volumen basado en el porcentaje de riesgo
+        Obtiene el balance de la cuenta usando una caché con TTL (evita una llamada IPC a MT5 por señal)
+        
+        Returns:
+            Balance de la cuenta o None si no se pudo obtener
+        """
+        now = time.monotonic()
+        cached_at, balance = self._balance_cache
+        if now - cached_at < self._balance_ttl:
+            return balance
+        
+        account_info = mt5.account_info()
+        if account_info is None:
+            return None
+        balance = float(account_info.balance)
+        self._balance_cache = (now, balance)
+        return balance
+    
+    def _get_symbol_info(self, symbol: str) -> Optional[SymbolSpecs]:
+        """
+        Obtiene mt5.symbol_info(symbol) usando una caché con TTL corto
+        
+        Junto con la información se precalculan el valor del pip y las distancias
+        de la estrategia (retracement, SL, TP, tolerancia en vivo) en precio.
         
         Args:
             symbol: Símbolo
-            entry_price: Precio de entrada
-            stop_loss: Precio de stop loss
             
         Returns:
-            Volumen calculado o None si hay error
+            SymbolSpecs del símbolo o None si no se pudo obtener
         """
-        try:
-            # Obtener balance de la cuenta
-            account_info = mt5.account_info()
-            if account_info is None:
-                self.logger.error(f"[{symbol}] No se pudo obtener información de la cuenta")
-                return None
-            
-            balance = float(account_info.balance)
-            risk_amount = balance * (self.risk_per_trade_percent / 100.0)
-            
-            # Calcular riesgo en precio
-            risk_in_price = abs(entry_price - stop_loss)
-            
-            # Obtener información del símbolo
-            symbol_info = mt5.symbol_info(symbol)
-            if symbol_info is None:
-                return None
-            
-            tick_size = symbol_info.trade_tick_size
-            tick_value = symbol_info.trade_tick_value
-            
-            volume = None
-            
-            if tick_size > 0 and tick_value > 0:
-                ticks_in_risk = risk_in_price / tick_size
-                risk_value_per_lot = ticks_in_risk * tick_value
-                
-                if risk_value_per_lot > 0:
-                    volume = risk_amount / risk_value_per_lot
-                else:
-                    return None
-            else:
-                # Fallback aproximado
-                pips_in_risk = risk_in_price / 0.0001
-                value_per_pip_per_lot = 10.0
-                risk_value_per_lot = pips_in_risk * value_per_pip_per_lot
-                
-                if risk_value_per_lot > 0:
-                    volume = risk_amount / risk_value_per_lot
-                else:
-                    return None
-            
-            # Normalizar volumen
-            volume_step = symbol_info.volume_step
-            volume_min = symbol_info.volume_min
-            volume_max = symbol_info.volume_max
-            
-            if volume_step > 0:
-                volume = round(volume / volume_step) * volume_step
-                if volume < volume_min:
-                    volume = volume_min
-            
-            if volume > volume_max:
-                volume = volume_max
-                self.logger.warning(f"[{symbol}] ⚠️  Volumen excede máximo, usando máximo: {volume_max}")
-            
-            if volume < volume_min:
-                self.logger.error(f"[{symbol}] ❌ Volumen calculado ({volume:.4f}) es menor al mínimo ({volume_min})")
-                return None
-            
-            self.logger.info(
-                f"[{symbol}] 💰 Volumen calculado: {volume:.2f} lotes | "
-                f"Riesgo: {self.risk_per_trade_percent}% = {risk_amount:.2f}"
-            )
-            
-            return volume
+        now = time.monotonic()
+        cached = self._sym_info_cache.get(symbol)
+        if cached is not None and now - cached[0] < self._sym_info_ttl:
+            return cached[1]
+        
+        symbol_info = mt5.symbol_info(symbol)
+        if symbol_info is None:
+            return None
+        return self._store_symbol_specs(symbol, symbol_info, now)
+    
+    def _get_snapshot(self, symbol: str) -> Optional[Tuple[float, SymbolSpecs]]:
+        """
+        Obtiene precio actual e información del símbolo con una sola llamada IPC a MT5
+        
+        mt5.symbol_info ya incluye bid/ask, así que sustituye a symbol_info_tick al inicio
+        de cada tick y de paso refresca la caché de SymbolSpecs si está vencida.
+        
+        Args:
+            symbol: Símbolo
             
-        except Exception as e:
-            self.logger.error(f"Error al calcular volumen por riesgo: {e}", exc_info=True)
+        Returns:
+            Tuple (bid, SymbolSpecs) o None si no se pudo obtener
+        """
+        symbol_info = mt5.symbol_info(symbol)
+        if symbol_info is None:
             return None
+        
+        now = time.monotonic()
+        cached = self._sym_info_cache.get(symbol)
+        if cached is not None and now - cached[0] < self._sym_info_ttl:
+            specs = cached[1]
+        else:
+            specs = self._store_symbol_specs(symbol, symbol_info, now)
+        return float(symbol_info.bid), specs
+    
+    def _store_symbol_specs(self, symbol: str, symbol_info: Any, now: float) -> SymbolSpecs:
+        """Construye y cachea el SymbolSpecs de un symbol_info recién obtenido"""
+        point = symbol_info.point
+        pip_value = point * 10 if symbol_info.digits == 5 else point * 1
+        specs = SymbolSpecs(
+            info=symbol_info,
+            point=point,
+            pip_value=pip_value,
+            digits=symbol_info.digits,
+            tick_size=symbol_info.trade_tick_size,
+            tick_value=symbol_info.trade_tick_value,
+            volume_step=symbol_info.volume_step,
+            volume_min=symbol_info.volume_min,
+            volume_max=symbol_info.volume_max,
+            retracement_price=self.retracement_pips * pip_value,
+            stop_loss_price=self.stop_loss_pips * pip_value,
+            take_profit_price=self.take_profit_pips * pip_value,
+            live_tolerance_points=int(round(LIVE_TOLERANCE_PIPS * pip_value / point)),
+        )
+        self._sym_info_cache[symbol] = (now, specs)
+        return specs
     
     def needs_intensive_monitoring(self) -> bool:
         """
@@ -609,14 +691,33 @@ class DailyLevelsSweepStrategy(BaseStrategy):
     
     def _reset_daily_trades_counter(self):
         """Reinicia el contador de trades si cambió el día"""
-        today = date.today()
+        today = self._get_today()
         if self.last_trade_date != today:
             self.trades_today = 0
             self.last_trade_date = today
     
+    def _get_today(self) -> date:
+        """Fecha local actual, recalculada solo al pasar la medianoche"""
+        if time.time() >= self._today_until:
+            self._today = date.today()
+            next_day = datetime.combine(self._today + timedelta(days=1), datetime.min.time())
+            self._today_until = next_day.timestamp()
+        return self._today
+    
+    def _clear_sweep_monitoring(self):
+        """Limpia el estado del barrido que se estaba monitoreando"""
+        self.monitoring_sweep = None
+        self.sweep_extreme_price = None
+        self.sweep_extreme_points = None
+        self.sweep_type = None
+        self.sweep_date = None
+        self.sweep_timestamp = None
+        self._side = 0
+        self._trigger_price = 0.0
+    
     def _reset_daily_sweep_flag(self):
         """Reinicia el flag de barrido diario si cambió el día"""
-        today = date.today()
+        today = self._get_today()
         if self.daily_sweep_trade_date != today:
             self.daily_sweep_trade_executed = False
             self.daily_sweep_trade_date = None
@@ -652,46 +753,29 @@ class DailyLevelsSweepStrategy(BaseStrategy):
         """
         try:
             # Obtener información del símbolo para calcular pips
-            symbol_info = mt5.symbol_info(symbol)
-            if symbol_info is None:
+            specs = self._get_symbol_info(symbol)
+            if specs is None:
                 return False
             
-            point = symbol_info.point
-            pip_value = point * 10 if symbol_info.digits == 5 else point * 1
-            
-            # Tolerancia para considerar "en vivo": 5 pips
-            live_tolerance_pips = 5.0
-            live_tolerance_price = live_tolerance_pips * pip_value
-            
-            if level_type == 'HIGH':
-                # Para HIGH: El precio debe estar cerca del HIGH (dentro de 5 pips)
-                # Puede estar ligeramente por encima (ya lo barrió) o ligeramente por debajo (está a punto)
-                distance = abs(current_price - level_price)
-                is_live = distance <= live_tolerance_price
-                
-                if is_live:
-                    self.logger.debug(
-                        f"[{symbol}] Barrido HIGH es EN VIVO: Precio {current_price:.5f} está a "
-                        f"{distance/pip_value:.1f} pips del HIGH {level_price:.5f}"
-                    )
-                return is_live
-            
-            elif level_type == 'LOW':
-                # Para LOW: El precio debe estar cerca del LOW (dentro de 5 pips)
-                # Puede estar ligeramente por debajo (ya lo barrió) o ligeramente por encima (está a punto)
-                distance = abs(current_price - level_price)
-                is_live = distance <= live_tolerance_price
-                
-                if is_live:
-                    self.logger.debug(
-                        f"[{symbol}] Barrido LOW es EN VIVO: Precio {current_price:.5f} está a "
-                        f"{distance/pip_value:.1f} pips del LOW {level_price:.5f}"
-                    )
-                return is_live
+            if level_type != 'HIGH' and level_type != 'LOW':
+                return False
             
-            return False
+            # Mismo criterio para HIGH y LOW: el precio debe estar a menos de 5 pips del nivel
+            # (ligeramente más allá = ya lo barrió, ligeramente antes = está a punto)
+            # Distancia en points enteros: sin ruido de redondeo en el límite de la tolerancia
+            point = specs.point
+            distance_points = abs(int(round(current_price / point)) - int(round(level_price / point)))
+            is_live = distance_points <= specs.live_tolerance_points
+            
+            if is_live and self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    LIVE_SWEEP_LOG_FMT,
+                    symbol, level_type, current_price, distance_points * point / specs.pip_value,
+                    level_type, level_price
+                )
+            return is_live
             
         except Exception as e:
-            self.logger.error(f"Error al verificar si barrido es en vivo: {e}", exc_info=True)
+            self.logger.error("Error al verificar si barrido es en vivo: %s", e, exc_info=True)
             return False
 
@@ -3,6 +3,7 @@ Estrategia por defecto (placeholder)
 Esta estrategia debe ser reemplazada por tus estrategias reales
 """
 
+import logging
 from strategy_manager import BaseStrategy
 import numpy as np
 from typing import Optional, Dict
@@ -29,10 +30,10 @@ class DefaultStrategy(BaseStrategy):
             return None
         
         # Ejemplo básico: obtener último precio
-        last_candle = rates[-1]
-        current_price = last_candle['close']
+        current_price = rates['close'][-1]
         
-        self.logger.debug(f"{symbol} - Precio actual: {current_price}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("%s - Precio actual: %s", symbol, current_price)
         
         # TODO: Implementar lógica de estrategia aquí
         # Por ahora retorna None (no hay señal)
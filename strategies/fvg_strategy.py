@@ -5,7 +5,7 @@ Ejemplo de estrategia usando los módulos de Base
 
 from strategies import BaseStrategy
 import numpy as np
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from Base import can_trade_now, detect_fvg
 
 
@@ -14,6 +14,40 @@ class FVGStrategy(BaseStrategy):
     Estrategia que usa FVG y verificación de noticias
     """
     
+    def analyze_batch(self, symbols: List[str], rates_by_symbol: Dict[str, np.ndarray]) -> Dict[str, Optional[Dict]]:
+        """
+        Analiza varios símbolos descartando en bloque los que no tienen hueco en sus 3 últimas velas
+        
+        Solo aplica cuando las velas recibidas son H4 (la temporalidad del FVG); el filtro es un
+        superconjunto de los patrones que reconoce detect_fvg, así que no pierde señales.
+        
+        Args:
+            symbols: Símbolos a analizar
+            rates_by_symbol: Array de velas OHLCV por símbolo
+            
+        Returns:
+            Dict símbolo -> señal de trading o None
+        """
+        if str(self.config.get('general', {}).get('timeframe', '')).upper() != 'H4':
+            return super().analyze_batch(symbols, rates_by_symbol)
+        
+        stackable = [s for s in symbols if len(rates_by_symbol[s]) >= 3]
+        signals = {s: None for s in symbols}
+        candidates = [s for s in symbols if len(rates_by_symbol[s]) < 3]
+        if stackable:
+            # Matrices (N, 3) con [vela1, vela2, vela3] de cada símbolo
+            highs = np.stack([rates_by_symbol[s]['high'][-3:] for s in stackable]).astype(np.float64)
+            lows = np.stack([rates_by_symbol[s]['low'][-3:] for s in stackable]).astype(np.float64)
+            # Hueco vela1-vela3 (alcista/bajista) o vela1-vela2 (alcista/bajista)
+            has_gap = (
+                (lows[:, 2] > highs[:, 0]) | (highs[:, 2] < lows[:, 0]) |
+                (highs[:, 0] < lows[:, 1]) | (lows[:, 0] > highs[:, 1])
+            )
+            candidates.extend(s for s, gap in zip(stackable, has_gap) if gap)
+        
+        signals.update(super().analyze_batch(candidates, rates_by_symbol))
+        return signals
+    
     def analyze(self, symbol: str, rates: np.ndarray) -> Optional[Dict]:
         """
         Analiza el mercado usando FVG y noticias
@@ -31,14 +65,15 @@ class FVGStrategy(BaseStrategy):
             self.logger.info(f"Bloqueado por noticias: {reason}")
             return None
         
-        # 2. Detectar FVG en H4
-        fvg = detect_fvg(symbol, 'H4')
+        # 2. Detectar FVG en H4 (reutilizar las velas recibidas si ya son H4)
+        h4_rates = rates if str(self.config.get('general', {}).get('timeframe', '')).upper() == 'H4' else None
+        fvg = detect_fvg(symbol, 'H4', rates=h4_rates)
         if not fvg:
             return None
         
         # 3. Estrategia: FVG completamente lleno y precio salió
         if fvg['fvg_filled_completely'] and fvg['exited_fvg']:
-            current_price = rates[-1]['close']
+            current_price = rates['close'][-1]
             
             if fvg['exit_direction'] == 'ALCISTA':
                 # Señal de compra: FVG alcista lleno, precio salió por arriba
@@ -4,8 +4,8 @@ Combina detección de Turtle Soup en H4 con entradas basadas en FVG
 """
 
 import logging
-from typing import Optional, Dict
-import numpy as np
+import math
+from typing import Optional, Dict, Tuple, Any, TYPE_CHECKING
 import MetaTrader5 as mt5
 from datetime import datetime, date
 import time
@@ -19,7 +19,149 @@ from Base.turtle_soup_detector import detect_turtle_soup_h4
 from Base.fvg_detector import detect_fvg
 from Base.news_checker import can_trade_now
 from Base.order_executor import OrderExecutor
-from Base.candle_reader import get_candle
+from Base.numba_compat import njit
+from concurrent.futures import Future, ThreadPoolExecutor
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class _SymbolLogAdapter(logging.LoggerAdapter):
+    """Antepone "[símbolo] " a cada línea del mensaje; solo se aplica si el nivel está habilitado"""
+    
+    def process(self, msg, kwargs):
+        prefix = f"[{self.extra['symbol']}] "
+        return prefix + msg.replace('\n', '\n' + prefix), kwargs
+
+
+_SEP = '=' * 70
+
+# Banners con argumentos por nombre: se formatean solo si el nivel está habilitado
+# (el adaptador de símbolo antepone "[símbolo] " a cada línea)
+_FVG_MONITOR_BANNER = "\n".join((
+    "🔄 FVG ESPERADO DETECTADO - ACTIVANDO MONITOREO INTENSIVO",
+    _SEP,
+    "📊 FVG %(fvg_type)s detectado: %(fvg_bottom).5f - %(fvg_top).5f",
+    "📊 Estado FVG: %(status)s | Entró: %(entered)s | Salió: %(exited)s",
+    "🔄 El bot ahora analizará cada SEGUNDO evaluando:",
+    "   • Si las 3 velas forman el FVG esperado",
+    "   • Si la vela EN FORMACIÓN entró al FVG (HIGH para BAJISTA, LOW para ALCISTA)",
+    "   • Si el precio actual salió del FVG en la dirección correcta",
+    _SEP,
+))
+
+_ORDER_BANNER_HEAD = "\n".join((
+    "💹 EJECUTANDO ORDEN DE TRADING",
+    _SEP,
+    "📊 Dirección: %(direction)s (%(side)s)",
+    "💰 Precio de Entrada: %(entry).5f",
+    "🛑 Stop Loss: %(sl).5f (Risk: %(signal_risk).5f)",
+    "🎯 Take Profit: %(tp).5f (Reward: %(signal_reward).5f)",
+    "📈 Risk/Reward FINAL: %(rr).2f:1 (objetivo: %(min_rr)s:1) | "
+    "Risk: %(risk).5f (%(risk_pips).1f pips) | "
+    "Reward: %(reward).5f (%(reward_pips).1f pips)",
+))
+
+_ORDER_BANNER_RR_EXACT = "✅ RR exacto de %(min_rr)s:1 logrado exitosamente"
+
+_ORDER_BANNER_CONTEXT = "\n".join((
+    "📦 Volumen: %(volume).2f lotes (calculado por %(risk_pct)s%% de riesgo)",
+    '-' * 70,
+    "📋 Contexto de la Señal:",
+    "   • Turtle Soup H4: %(sweep_type)s → %(ts_direction)s",
+    "   • Vela barrida: %(swept_candle)s (%(swept_extreme)s)",
+    "   • Precio barrido: %(sweep_price)s",
+    "   • Objetivo: %(target)s",
+    "   • FVG %(entry_tf)s: %(fvg_type)s (%(fvg_bottom).5f - %(fvg_top).5f)",
+    "   • FVG Estado: %(fvg_status)s | Entró: %(fvg_entered)s | Salió: %(fvg_exited)s",
+    "   • Dirección de salida FVG: %(fvg_exit)s",
+    _SEP,
+))
+
+# "ORDEN EJECUTADA" va en la primera línea del registro (con fecha) para poder buscarla
+_ORDER_OK_BANNER = "\n".join((
+    "✅ ORDEN EJECUTADA EXITOSAMENTE",
+    _SEP,
+    "🎫 Ticket: %(ticket)s",
+    "📊 Símbolo: %(symbol)s",
+    "💰 Precio: %(entry).5f",
+    "📦 Volumen: %(volume).2f lotes",
+    "🛑 Stop Loss: %(sl).5f",
+    "🎯 Take Profit: %(tp).5f",
+    "📈 Risk/Reward: %(rr).2f:1",
+    "📊 Trades hoy: %(trades)s/%(max_trades)s",
+    _SEP,
+))
+
+_ORDER_ERROR_BANNER = "\n".join((
+    "❌ ERROR AL EJECUTAR ORDEN",
+    _SEP,
+    "Mensaje: %s",
+    _SEP,
+))
+
+
+# Pool para solapar la descarga del calendario de noticias (HTTP) con la detección H4 (MT5).
+# Solo ejecuta can_trade_now: las llamadas a MT5 se quedan en el hilo que llama a analyze
+_prefetch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="TurtleSoupPrefetch")
+
+
+@njit(cache=True, nogil=True)
+def _rr_kernel(side, entry_price, stop_loss, target_price, fvg_top, fvg_bottom, min_rr, inv_min_rr):
+    """
+    Limita el TP a RR = min_rr (RR máximo = RR mínimo) y, si el RR no llega al mínimo,
+    reintenta con el SL optimizado
+    
+    El SL optimizado es el que da exactamente RR = min_rr; solo es válido si queda más allá
+    del mínimo requerido por el FVG (tamaño del FVG + 30% de margen). El mínimo del FVG
+    como alternativa nunca da RR = min_rr salvo que coincida con él, así que se rechaza sin
+    recalcular.
+    
+    Args:
+        side: +1 compra, -1 venta
+        entry_price, stop_loss, target_price: Precios de entrada, SL calculado y objetivo del Turtle Soup
+        fvg_top, fvg_bottom: Extremos del FVG
+        min_rr: RR mínimo (y máximo)
+        inv_min_rr: 1 / RR mínimo
+        
+    Returns:
+        Tupla (estado, stop_loss, take_profit, risk, reward, rr, initial_rr, new_rr):
+        estado 0 = RR válido, 1 = válido con SL optimizado, -1 = riesgo nulo o SL del lado
+        incorrecto, -2 = SL optimizado fuera de rango, -3 = no se pudo optimizar el SL
+    """
+    # Con el signo de la dirección risk y reward son positivos si SL y objetivo están del lado
+    # correcto; un objetivo ya superado da reward negativo y el RR no alcanza el mínimo
+    risk = side * (entry_price - stop_loss)
+    if risk <= 0.0:
+        return -1, stop_loss, target_price, 0.0, 0.0, 0.0, 0.0, 0.0
+    
+    take_profit = target_price
+    initial_reward = side * (take_profit - entry_price)
+    initial_rr = initial_reward / risk
+    if initial_rr > min_rr:
+        # Ajustar TP para que el RR sea exactamente el máximo permitido
+        reward = risk * min_rr
+        take_profit = entry_price + side * reward
+        rr = min_rr
+    else:
+        reward = initial_reward
+        rr = initial_rr
+    
+    if reward >= risk * min_rr:
+        return 0, stop_loss, take_profit, risk, reward, rr, initial_rr, rr
+    
+    required_risk = reward * inv_min_rr
+    fvg_size = fvg_top - fvg_bottom
+    # Extremo del FVG más allá del cual debe quedar el SL: tamaño del FVG + 30% de margen
+    fvg_edge = fvg_bottom if side > 0 else fvg_top
+    min_sl_required = fvg_edge - side * (fvg_size * 1.3)
+    optimal_sl = entry_price - side * required_risk
+    if side * (min_sl_required - optimal_sl) >= 0.0:
+        return 1, optimal_sl, take_profit, required_risk, reward, min_rr, initial_rr, min_rr
+    min_sl_risk = side * (entry_price - min_sl_required)
+    if min_sl_risk <= 0.0:
+        return -3, stop_loss, take_profit, risk, reward, rr, initial_rr, 0.0
+    return -2, stop_loss, take_profit, risk, reward, rr, initial_rr, reward / min_sl_risk
 
 
 class TurtleSoupFVGStrategy(BaseStrategy):
@@ -34,6 +176,24 @@ class TurtleSoupFVGStrategy(BaseStrategy):
     5. Ejecuta orden con RR mínimo 1:2
     """
     
+    # (tipo de barrido H4, dirección, tipo de FVG) válidos -> dirección de salida requerida del FVG:
+    # - Barrido de HIGH (BULLISH_SWEEP) + BEARISH → FVG BAJISTA, el precio debe salir por debajo (venta)
+    # - Barrido de LOW (BEARISH_SWEEP) + BULLISH → FVG ALCISTA, el precio debe salir por encima (compra)
+    _SWEEP_DISPATCH = {
+        ('BULLISH_SWEEP', 'BEARISH', 'BAJISTA'): 'BAJISTA',
+        ('BEARISH_SWEEP', 'BULLISH', 'ALCISTA'): 'ALCISTA',
+    }
+    # Lado por el que debe salir el precio del FVG (solo para logs)
+    _EXIT_SIDE = {('BAJISTA', 'BEARISH'): 'DEBAJO', ('ALCISTA', 'BULLISH'): 'ARRIBA'}
+    
+    # Atributos leídos en cada tick como slots (acceso por descriptor). BaseStrategy no declara
+    # __slots__, así que el resto del estado (y los atributos dinámicos) sigue en __dict__
+    __slots__ = (
+        'executor', 'entry_timeframe', 'min_rr', '_inv_min_rr', '_side_fn', '_comment',
+        'evaluation_interval', '_news_cache', '_skip_until', '_last_analyze_ts',
+        '_last_entry_fvg', '_no_fvg_bar_key', '_symbol_logs',
+    )
+    
     def __init__(self, config: Dict):
         """
         Inicializa la estrategia
@@ -42,12 +202,17 @@ class TurtleSoupFVGStrategy(BaseStrategy):
             config: Configuración del bot
         """
         super().__init__(config)
-        self.executor = OrderExecutor()
+        self.executor = OrderExecutor.instance()
         
         # Configuración de la estrategia
         strategy_config = config.get('strategy_config', {})
         self.entry_timeframe = strategy_config.get('entry_timeframe', 'M5')  # M1 o M5
         self.min_rr = strategy_config.get('min_rr', 2.0)  # Risk/Reward mínimo
+        self._inv_min_rr = 1.0 / self.min_rr  # Precalculado para _rr_kernel (multiplicar en vez de dividir)
+        
+        # Método del executor por dirección y comentario de las órdenes (constantes, se resuelven una vez)
+        self._side_fn = {'BULLISH': self.executor.buy, 'BEARISH': self.executor.sell}
+        self._comment = f"TurtleSoup H4 + FVG {self.entry_timeframe}"
         
         # Configuración de gestión de riesgo
         risk_config = config.get('risk_management', {})
@@ -74,10 +239,29 @@ class TurtleSoupFVGStrategy(BaseStrategy):
         self.monitoring_fvg = False  # Indica si estamos monitoreando un FVG en tiempo real
         self.monitoring_fvg_data = None  # Datos del FVG que estamos monitoreando (turtle_soup, fvg_info)
         
-        self.logger.info(f"TurtleSoupFVGStrategy inicializada - Entry: {self.entry_timeframe}, RR: {self.min_rr}")
-        self.logger.info(f"Riesgo por trade: {self.risk_per_trade_percent}% | Máximo trades/día: {self.max_trades_per_day}")
+        # Caché del estado de noticias por símbolo: (vencimiento monotónico, can_trade, reason, next_news)
+        # Si se puede operar, el resultado vale hasta que empiece el bloqueo previo a la próxima noticia
+        self._news_cache: Dict[str, Tuple[float, bool, str, Any]] = {}
+        
+        # Último FVG evaluado por _find_fvg_entry (lo reutiliza analyze en el mismo ciclo)
+        self._last_entry_fvg: Optional[Dict] = None
+        # Velas de entrada (símbolo, tiempos, highs, lows) de la última evaluación sin FVG posible
+        # para ningún precio: mientras no cambien, el resultado sigue siendo "sin FVG"
+        self._no_fvg_bar_key: Optional[Tuple] = None
+        
+        # Última evaluación completa por símbolo (time.monotonic) para respetar evaluation_interval
+        self._last_analyze_ts: Dict[str, float] = {}
+        # Instante (monotonic) por símbolo hasta el que las noticias bloquean el análisis: se
+        # comprueba antes que cualquier otra etapa para no tocar MT5 ni el calendario mientras dure
+        self._skip_until: Dict[str, float] = {}
+        
+        # Logger por símbolo (antepone "[símbolo] " a cada mensaje), creado una vez por símbolo
+        self._symbol_logs: Dict[str, logging.LoggerAdapter] = {}
+        
+        self.logger.info("TurtleSoupFVGStrategy inicializada - Entry: %s, RR: %s", self.entry_timeframe, self.min_rr)
+        self.logger.info("Riesgo por trade: %s%% | Máximo trades/día: %s", self.risk_per_trade_percent, self.max_trades_per_day)
     
-    def analyze(self, symbol: str, rates: np.ndarray) -> Optional[Dict]:
+    def analyze(self, symbol: str, rates: 'np.ndarray') -> Optional[Dict]:
         """
         Analiza el mercado y genera señales de trading
         
@@ -88,15 +272,17 @@ class TurtleSoupFVGStrategy(BaseStrategy):
         Returns:
             Dict con señal de trading o None
         """
+        log = self._symbol_log(symbol)
         try:
             # ⚠️ VERIFICACIÓN TEMPRANA: Si ya se alcanzó el límite de trades, detener análisis
             self._reset_daily_trades_counter()
             if self.trades_today >= self.max_trades_per_day:
                 # Solo loguear una vez cada minuto para no saturar
                 if not hasattr(self, '_last_limit_log') or (time.time() - self._last_limit_log) >= 60:
-                    self.logger.info(
-                        f"[{symbol}] ⏸️  Límite de trades diarios alcanzado: {self.trades_today}/{self.max_trades_per_day} | "
-                        f"Análisis detenido hasta próxima sesión operativa"
+                    log.info(
+                        "⏸️  Límite de trades diarios alcanzado: %s/%s | "
+                        "Análisis detenido hasta próxima sesión operativa",
+                        self.trades_today, self.max_trades_per_day
                     )
                     self._last_limit_log = time.time()
                 return None
@@ -105,41 +291,64 @@ class TurtleSoupFVGStrategy(BaseStrategy):
             if self.monitoring_fvg and self.monitoring_fvg_data:
                 return self._monitor_fvg_intensive(symbol)
             
+            # Bloqueo por noticias ya conocido: no hay nada que evaluar hasta que termine
+            now = time.monotonic()
+            if now < self._skip_until.get(symbol, 0.0):
+                return None
+            
+            # Respetar evaluation_interval entre evaluaciones completas del mismo símbolo
+            # (salvo en monitoreo intermedio, que tiene su propia cadencia de 10 segundos)
+            if not getattr(self, '_waiting_for_fvg', False):
+                if now - self._last_analyze_ts.get(symbol, float('-inf')) < self.evaluation_interval:
+                    return None
+            self._last_analyze_ts[symbol] = now
+            
+            # Si el estado de noticias no está en caché habrá que descargar el calendario (HTTP):
+            # se descarga en el pool mientras este hilo detecta el Turtle Soup H4 (MT5, no es seguro
+            # entre hilos); la detección se descarta si las noticias bloquean
+            news_future = None
+            cached_news = self._news_cache.get(symbol)
+            if cached_news is None or now >= cached_news[0]:
+                news_future = _prefetch_pool.submit(can_trade_now, symbol, minutes_before=5, minutes_after=5)
+                turtle_soup = detect_turtle_soup_h4(symbol)
+            
             # 1. Verificar noticias de alto impacto (5 min antes/después)
-            self.logger.info(f"[{symbol}] 📰 Etapa 1/4: Verificando noticias económicas...")
-            if not self._check_news(symbol):
+            log.info("📰 Etapa 1/4: Verificando noticias económicas...")
+            if not self._check_news(symbol, news_future):
                 return None
-            self.logger.info(f"[{symbol}] ✅ Etapa 1/4: Noticias OK - Puede operar")
+            log.info("✅ Etapa 1/4: Noticias OK - Puede operar")
             
-            # 2. Detectar Turtle Soup en H4
-            self.logger.info(f"[{symbol}] 🔍 Etapa 2/4: Buscando Turtle Soup en H4...")
-            turtle_soup = detect_turtle_soup_h4(symbol)
+            # 2. Detectar Turtle Soup en H4 (ya detectado si se descargaron las noticias)
+            log.info("🔍 Etapa 2/4: Buscando Turtle Soup en H4...")
+            if news_future is None:
+                turtle_soup = detect_turtle_soup_h4(symbol)
             
             if not turtle_soup or not turtle_soup.get('detected'):
                 self.turtle_soup_signal = None
                 # Si estaba monitoreando, cancelar monitoreo
                 if self.monitoring_fvg:
-                    self.logger.info(f"[{symbol}] ⏸️  Turtle Soup desapareció - Cancelando monitoreo intensivo")
+                    log.info("⏸️  Turtle Soup desapareció - Cancelando monitoreo intensivo")
                     self.monitoring_fvg = False
                     self.monitoring_fvg_data = None
                 # Cancelar también monitoreo intermedio
                 if hasattr(self, '_waiting_for_fvg'):
                     self._waiting_for_fvg = False
-                self.logger.info(f"[{symbol}] ⏸️  Etapa 2/4: Esperando - No hay Turtle Soup detectado en H4")
+                log.info("⏸️  Etapa 2/4: Esperando - No hay Turtle Soup detectado en H4")
                 return None
             
             # Guardar señal de Turtle Soup
             self.turtle_soup_signal = turtle_soup
             
-            self.logger.info(
-                f"[{symbol}] ✅ Etapa 2/4 COMPLETA: Turtle Soup detectado - {turtle_soup['sweep_type']} | "
-                f"Barrido: {turtle_soup['swept_candle']} | "
-                f"TP: {turtle_soup['target_price']:.5f} | "
-                f"Dirección: {turtle_soup['direction']}"
+            log.info(
+                "✅ Etapa 2/4 COMPLETA: Turtle Soup detectado - %s | "
+                "Barrido: %s | "
+                "TP: %.5f | "
+                "Dirección: %s",
+                turtle_soup['sweep_type'], turtle_soup['swept_candle'], turtle_soup['target_price'], turtle_soup['direction']
             )
             
             # 3. Buscar entrada en FVG contrario al barrido
-            self.logger.info(f"[{symbol}] 🔍 Etapa 3/4: Buscando entrada en FVG ({self.entry_timeframe})...")
+            log.info("🔍 Etapa 3/4: Buscando entrada en FVG (%s)...", self.entry_timeframe)
             entry_signal = self._find_fvg_entry(symbol, turtle_soup)
             
             if entry_signal:
@@ -147,24 +356,21 @@ class TurtleSoupFVGStrategy(BaseStrategy):
                 # Cancelar monitoreo intermedio si estaba activo
                 if hasattr(self, '_waiting_for_fvg'):
                     self._waiting_for_fvg = False
-                self.logger.info(f"[{symbol}] 💹 Etapa 4/4: Ejecutando orden...")
+                log.info("💹 Etapa 4/4: Ejecutando orden...")
                 return self._execute_order(symbol, turtle_soup, entry_signal)
             else:
                 # Verificar si hay un FVG esperado para activar monitoreo intensivo
-                fvg = detect_fvg(symbol, self.entry_timeframe)
+                # (mismo FVG que acaba de evaluar _find_fvg_entry en este ciclo)
+                fvg = self._last_entry_fvg
                 if fvg and self._is_expected_fvg(fvg, turtle_soup):
                     # Activar monitoreo intensivo solo si no está ya activo
                     if not self.monitoring_fvg:
-                        self.logger.info(f"[{symbol}] {'='*70}")
-                        self.logger.info(f"[{symbol}] 🔄 FVG ESPERADO DETECTADO - ACTIVANDO MONITOREO INTENSIVO")
-                        self.logger.info(f"[{symbol}] {'='*70}")
-                        self.logger.info(f"[{symbol}] 📊 FVG {fvg.get('fvg_type')} detectado: {fvg.get('fvg_bottom', 0):.5f} - {fvg.get('fvg_top', 0):.5f}")
-                        self.logger.info(f"[{symbol}] 📊 Estado FVG: {fvg.get('status')} | Entró: {fvg.get('entered_fvg')} | Salió: {fvg.get('exited_fvg')}")
-                        self.logger.info(f"[{symbol}] 🔄 El bot ahora analizará cada SEGUNDO evaluando:")
-                        self.logger.info(f"[{symbol}]    • Si las 3 velas forman el FVG esperado")
-                        self.logger.info(f"[{symbol}]    • Si la vela EN FORMACIÓN entró al FVG (HIGH para BAJISTA, LOW para ALCISTA)")
-                        self.logger.info(f"[{symbol}]    • Si el precio actual salió del FVG en la dirección correcta")
-                        self.logger.info(f"[{symbol}] {'='*70}")
+                        log.info(_FVG_MONITOR_BANNER, {
+                            'fvg_type': fvg.get('fvg_type'),
+                            'fvg_bottom': fvg.get('fvg_bottom', 0), 'fvg_top': fvg.get('fvg_top', 0),
+                            'status': fvg.get('status'),
+                            'entered': fvg.get('entered_fvg'), 'exited': fvg.get('exited_fvg'),
+                        })
                         self.monitoring_fvg = True
                         self.monitoring_fvg_data = {
                             'turtle_soup': turtle_soup,
@@ -176,12 +382,12 @@ class TurtleSoupFVGStrategy(BaseStrategy):
                         self.monitoring_fvg_data['turtle_soup'] = turtle_soup
                         # Log cada 10 segundos para no saturar
                         if not hasattr(self, '_last_fvg_update_log') or (time.time() - self._last_fvg_update_log) >= 10:
-                            self.logger.debug(f"[{symbol}] 🔄 Monitoreando FVG en tiempo real... Estado: {fvg.get('status')}")
+                            log.debug("🔄 Monitoreando FVG en tiempo real... Estado: %s", fvg.get('status'))
                             self._last_fvg_update_log = time.time()
                 else:
                     # Si estaba monitoreando pero el FVG desapareció o no es el esperado, cancelar monitoreo
                     if self.monitoring_fvg:
-                        self.logger.info(f"[{symbol}] ⏸️  FVG esperado desapareció o cambió - Cancelando monitoreo intensivo")
+                        log.info("⏸️  FVG esperado desapareció o cambió - Cancelando monitoreo intensivo")
                         self.monitoring_fvg = False
                         self.monitoring_fvg_data = None
                 
@@ -191,21 +397,21 @@ class TurtleSoupFVGStrategy(BaseStrategy):
                     # Activar monitoreo intermedio (cada 5-10 segundos) cuando hay Turtle Soup pero no FVG
                     if not hasattr(self, '_waiting_for_fvg') or not self._waiting_for_fvg:
                         self._waiting_for_fvg = True
-                        self.logger.info(f"[{symbol}] ⏳ Turtle Soup detectado pero sin FVG - Activando monitoreo intermedio")
-                        self.logger.info(f"[{symbol}]    • El bot analizará cada 10 segundos buscando FVG {self.entry_timeframe}")
-                        self.logger.info(f"[{symbol}]    • Turtle Soup: {turtle_soup['sweep_type']} | TP: {turtle_soup['target_price']:.5f} | Dirección: {turtle_soup['direction']}")
-                        self.logger.info(f"[{symbol}]    • Esperando FVG {'BAJISTA' if turtle_soup['direction'] == 'BEARISH' else 'ALCISTA'} en {self.entry_timeframe}")
+                        log.info("⏳ Turtle Soup detectado pero sin FVG - Activando monitoreo intermedio")
+                        log.info("   • El bot analizará cada 10 segundos buscando FVG %s", self.entry_timeframe)
+                        log.info("   • Turtle Soup: %s | TP: %.5f | Dirección: %s", turtle_soup['sweep_type'], turtle_soup['target_price'], turtle_soup['direction'])
+                        log.info("   • Esperando FVG %s en %s", turtle_soup.get('expected_fvg_type'), self.entry_timeframe)
                     
                     # Log periódico cada 30 segundos para indicar que sigue esperando
                     current_time = time.time()
                     if not hasattr(self, '_last_waiting_log') or (current_time - self._last_waiting_log) >= 30:
-                        self.logger.info(f"[{symbol}] ⏸️  Etapa 3/4: Esperando FVG válida - Turtle Soup activo, buscando FVG en {self.entry_timeframe}...")
+                        log.info("⏸️  Etapa 3/4: Esperando FVG válida - Turtle Soup activo, buscando FVG en %s...", self.entry_timeframe)
                         self._last_waiting_log = current_time
             
             return None
             
         except Exception as e:
-            self.logger.error(f"Error en análisis: {e}", exc_info=True)
+            log.error("Error en análisis: %r", e, exc_info=True)
             return None
     
     def needs_intensive_monitoring(self) -> bool:
@@ -259,21 +465,8 @@ class TurtleSoupFVGStrategy(BaseStrategy):
         Returns:
             True si el FVG es el esperado
         """
-        try:
-            sweep_type = turtle_soup.get('sweep_type')
-            direction = turtle_soup.get('direction')
-            fvg_type = fvg.get('fvg_type')
-            
-            # Determinar qué tipo de FVG buscamos según el barrido de H4
-            expected_fvg_type = None
-            if sweep_type == 'BULLISH_SWEEP' and direction == 'BEARISH':
-                expected_fvg_type = 'BAJISTA'
-            elif sweep_type == 'BEARISH_SWEEP' and direction == 'BULLISH':
-                expected_fvg_type = 'ALCISTA'
-            
-            return expected_fvg_type is not None and fvg_type == expected_fvg_type
-        except:
-            return False
+        key = (turtle_soup.get('sweep_type'), turtle_soup.get('direction'), fvg.get('fvg_type'))
+        return key in self._SWEEP_DISPATCH
     
     def _monitor_fvg_intensive(self, symbol: str) -> Optional[Dict]:
         """
@@ -285,6 +478,7 @@ class TurtleSoupFVGStrategy(BaseStrategy):
         Returns:
             Dict con señal de trading si se cumplen condiciones, None si sigue monitoreando
         """
+        log = self._symbol_log(symbol)
         try:
             if not self.monitoring_fvg_data:
                 self.monitoring_fvg = False
@@ -299,7 +493,7 @@ class TurtleSoupFVGStrategy(BaseStrategy):
             # Verificar que el Turtle Soup aún existe
             current_turtle_soup = detect_turtle_soup_h4(symbol)
             if not current_turtle_soup or not current_turtle_soup.get('detected'):
-                self.logger.info(f"[{symbol}] ⏸️  Turtle Soup desapareció durante monitoreo - Cancelando")
+                log.info("⏸️  Turtle Soup desapareció durante monitoreo - Cancelando")
                 self.monitoring_fvg = False
                 self.monitoring_fvg_data = None
                 return None
@@ -307,7 +501,7 @@ class TurtleSoupFVGStrategy(BaseStrategy):
             # Verificar que el FVG aún existe y es el esperado
             fvg = detect_fvg(symbol, self.entry_timeframe)
             if not fvg or not self._is_expected_fvg(fvg, turtle_soup):
-                self.logger.info(f"[{symbol}] ⏸️  FVG esperado desapareció durante monitoreo - Cancelando")
+                log.info("⏸️  FVG esperado desapareció durante monitoreo - Cancelando")
                 self.monitoring_fvg = False
                 self.monitoring_fvg_data = None
                 return None
@@ -318,7 +512,7 @@ class TurtleSoupFVGStrategy(BaseStrategy):
             # Obtener precio actual para verificar estado
             tick = mt5.symbol_info_tick(symbol)
             if tick is None:
-                self.logger.error(f"[{symbol}] ❌ No se pudo obtener precio actual durante monitoreo")
+                log.error("❌ No se pudo obtener precio actual durante monitoreo")
                 return None
             
             current_price = float(tick.bid)
@@ -337,16 +531,13 @@ class TurtleSoupFVGStrategy(BaseStrategy):
                 current_time = time.time()
                 if not hasattr(self, '_last_inside_fvg_log') or (current_time - self._last_inside_fvg_log) >= 10:
                     # Determinar dirección esperada de salida
-                    expected_exit = None
-                    if fvg_type == 'BAJISTA' and direction == 'BEARISH':
-                        expected_exit = "DEBAJO"
-                    elif fvg_type == 'ALCISTA' and direction == 'BULLISH':
-                        expected_exit = "ARRIBA"
+                    expected_exit = self._EXIT_SIDE.get((fvg_type, direction))
                     
-                    self.logger.info(
-                        f"[{symbol}] ⏳ MONITOREO INTENSIVO: Precio DENTRO del FVG {fvg_type} | "
-                        f"Precio actual: {current_price:.5f} | FVG: {fvg_bottom:.5f}-{fvg_top:.5f} | "
-                        f"Esperando salida hacia {expected_exit} en dirección {direction}"
+                    log.info(
+                        "⏳ MONITOREO INTENSIVO: Precio DENTRO del FVG %s | "
+                        "Precio actual: %.5f | FVG: %.5f-%.5f | "
+                        "Esperando salida hacia %s en dirección %s",
+                        fvg_type, current_price, fvg_bottom, fvg_top, expected_exit, direction
                     )
                     self._last_inside_fvg_log = current_time
                 # NO intentar ejecutar orden mientras el precio está dentro
@@ -357,7 +548,7 @@ class TurtleSoupFVGStrategy(BaseStrategy):
             
             if entry_signal:
                 # Condiciones cumplidas - ejecutar orden y cancelar monitoreo
-                self.logger.info(f"[{symbol}] ✅ Condiciones cumplidas durante monitoreo intensivo - Precio salió del FVG en dirección esperada - Ejecutando orden")
+                log.info("✅ Condiciones cumplidas durante monitoreo intensivo - Precio salió del FVG en dirección esperada - Ejecutando orden")
                 self.monitoring_fvg = False
                 self.monitoring_fvg_data = None
                 return self._execute_order(symbol, turtle_soup, entry_signal)
@@ -367,17 +558,18 @@ class TurtleSoupFVGStrategy(BaseStrategy):
             import time
             current_time = time.time()
             if not hasattr(self, '_last_monitor_log') or (current_time - self._last_monitor_log) >= 10:
-                self.logger.debug(
-                    f"[{symbol}] 🔄 Monitoreando FVG en tiempo real... "
-                    f"(Estado: {fvg.get('status')}, Entró: {fvg.get('entered_fvg')}, Salió: {fvg.get('exited_fvg')}, "
-                    f"Precio: {current_price:.5f})"
+                log.debug(
+                    "🔄 Monitoreando FVG en tiempo real... "
+                    "(Estado: %s, Entró: %s, Salió: %s, "
+                    "Precio: %.5f)",
+                    fvg.get('status'), fvg.get('entered_fvg'), fvg.get('exited_fvg'), current_price
                 )
                 self._last_monitor_log = current_time
             
             return None
             
         except Exception as e:
-            self.logger.error(f"Error en monitoreo intensivo: {e}", exc_info=True)
+            log.error("Error en monitoreo intensivo: %r", e, exc_info=True)
             self.monitoring_fvg = False
             self.monitoring_fvg_data = None
             return None
@@ -387,7 +579,7 @@ class TurtleSoupFVGStrategy(BaseStrategy):
         today = date.today()
         if self.last_trade_date != today:
             if self.last_trade_date is not None:
-                self.logger.info(f"🔄 Nuevo día - Reseteando contador de trades (anterior: {self.trades_today})")
+                self.logger.info("🔄 Nuevo día - Reseteando contador de trades (anterior: %s)", self.trades_today)
             self.trades_today = 0
             self.last_trade_date = today
     
@@ -406,6 +598,7 @@ class TurtleSoupFVGStrategy(BaseStrategy):
         Returns:
             True si se puede ejecutar, False si hay algún bloqueo
         """
+        log = self._symbol_log(symbol)
         # 3. Verificar si el primer trade del día cerró con TP (cerrar día operativo)
         if self._check_first_trade_tp_closure(symbol):
             return False
@@ -413,21 +606,21 @@ class TurtleSoupFVGStrategy(BaseStrategy):
         # 1. Verificar límite de trades diarios desde base de datos
         db_manager = self._get_db_manager()
         if db_manager.enabled:
-            # Obtener conteo desde BD (más confiable)
+            # Obtener conteo desde BD (más confiable). Las órdenes se guardan en segundo plano
+            # (save_order_to_db_async): si la escritura aún no llegó, el conteo de BD va por detrás
+            # del contador local, así que se toma el mayor de los dos (el local se resetea por día)
+            self._reset_daily_trades_counter()
             strategy_name = 'turtle_soup_fvg'  # Nombre de esta estrategia
             trades_today_db = db_manager.count_trades_today(strategy=strategy_name)
-            if trades_today_db >= self.max_trades_per_day:
-                self.logger.info(f"[{symbol}] ⏸️  Límite de trades diarios alcanzado (desde BD): {trades_today_db}/{self.max_trades_per_day}")
-                # Actualizar contador local para consistencia
-                self.trades_today = trades_today_db
+            self.trades_today = max(self.trades_today, trades_today_db)
+            if self.trades_today >= self.max_trades_per_day:
+                log.info("⏸️  Límite de trades diarios alcanzado (desde BD): %s/%s", self.trades_today, self.max_trades_per_day)
                 return False
-            # Actualizar contador local
-            self.trades_today = trades_today_db
         else:
             # Si BD no está disponible, usar contador local
             self._reset_daily_trades_counter()
             if self.trades_today >= self.max_trades_per_day:
-                self.logger.info(f"[{symbol}] ⏸️  Límite de trades diarios alcanzado: {self.trades_today}/{self.max_trades_per_day}")
+                log.info("⏸️  Límite de trades diarios alcanzado: %s/%s", self.trades_today, self.max_trades_per_day)
                 return False
         
         # 2. Verificar si hay posiciones abiertas (no permitir nueva entrada mientras hay posición activa)
@@ -448,11 +641,12 @@ class TurtleSoupFVGStrategy(BaseStrategy):
         Returns:
             Volumen calculado en lotes o None si hay error
         """
+        log = self._symbol_log(symbol)
         try:
             # Obtener información de la cuenta
             account_info = mt5.account_info()
             if account_info is None:
-                self.logger.error("No se pudo obtener información de la cuenta")
+                log.error("No se pudo obtener información de la cuenta")
                 return None
             
             balance = account_info.balance
@@ -460,13 +654,13 @@ class TurtleSoupFVGStrategy(BaseStrategy):
             margin_free = account_info.margin_free if hasattr(account_info, 'margin_free') else balance
             
             if balance <= 0:
-                self.logger.error(f"[{symbol}] ❌ Balance inválido: {balance}")
+                log.error("❌ Balance inválido: %s", balance)
                 return None
             
             # Obtener información del símbolo
             symbol_info = mt5.symbol_info(symbol)
             if symbol_info is None:
-                self.logger.error(f"[{symbol}] No se pudo obtener información del símbolo {symbol}")
+                log.error("No se pudo obtener información del símbolo %s", symbol)
                 return None
             
             # Calcular el riesgo en dinero
@@ -476,9 +670,10 @@ class TurtleSoupFVGStrategy(BaseStrategy):
             # El balance debe ser al menos 2x el riesgo para tener margen de seguridad
             min_balance_required = risk_amount * 2
             if balance < min_balance_required:
-                self.logger.error(
-                    f"[{symbol}] ❌ Balance insuficiente: Balance={balance:.2f} | "
-                    f"Riesgo calculado={risk_amount:.2f} | Mínimo requerido={min_balance_required:.2f}"
+                log.error(
+                    "❌ Balance insuficiente: Balance=%.2f | "
+                    "Riesgo calculado=%.2f | Mínimo requerido=%.2f",
+                    balance, risk_amount, min_balance_required
                 )
                 return None
             
@@ -487,23 +682,25 @@ class TurtleSoupFVGStrategy(BaseStrategy):
             # Estimación conservadora: necesitamos al menos 3x el riesgo en margen libre
             min_margin_required = risk_amount * 3
             if margin_free < min_margin_required:
-                self.logger.error(
-                    f"[{symbol}] ❌ Margen libre insuficiente: Margen libre={margin_free:.2f} | "
-                    f"Mínimo requerido={min_margin_required:.2f} | Equity={equity:.2f}"
+                log.error(
+                    "❌ Margen libre insuficiente: Margen libre=%.2f | "
+                    "Mínimo requerido=%.2f | Equity=%.2f",
+                    margin_free, min_margin_required, equity
                 )
                 return None
             
-            self.logger.debug(
-                f"[{symbol}] ✅ Validación de balance: Balance={balance:.2f} | "
-                f"Equity={equity:.2f} | Margen libre={margin_free:.2f} | "
-                f"Riesgo={risk_amount:.2f} ({self.risk_per_trade_percent}%)"
+            log.debug(
+                "✅ Validación de balance: Balance=%.2f | "
+                "Equity=%.2f | Margen libre=%.2f | "
+                "Riesgo=%.2f (%s%%)",
+                balance, equity, margin_free, risk_amount, self.risk_per_trade_percent
             )
             
             # Calcular el riesgo en precio (distancia del SL al entry)
             risk_in_price = abs(entry_price - stop_loss)
             
             if risk_in_price == 0:
-                self.logger.error("El riesgo en precio es 0, no se puede calcular volumen")
+                log.error("El riesgo en precio es 0, no se puede calcular volumen")
                 return None
             
             # Obtener información del símbolo para calcular el valor del pip
@@ -522,14 +719,14 @@ class TurtleSoupFVGStrategy(BaseStrategy):
                 # Valor del riesgo por lote = ticks_in_risk * tick_value
                 risk_value_per_lot = ticks_in_risk * tick_value
                 
-                self.logger.debug(f"[{symbol}] Cálculo detallado: ticks_in_risk={ticks_in_risk:.2f}, tick_value={tick_value}, risk_value_per_lot={risk_value_per_lot:.2f}")
+                log.debug("Cálculo detallado: ticks_in_risk=%.2f, tick_value=%s, risk_value_per_lot=%.2f", ticks_in_risk, tick_value, risk_value_per_lot)
                 
                 if risk_value_per_lot > 0:
                     # Volumen = riesgo_en_dinero / riesgo_por_lote
                     volume = risk_amount / risk_value_per_lot
-                    self.logger.debug(f"[{symbol}] Volumen calculado antes de normalizar: {volume:.4f} lotes")
+                    log.debug("Volumen calculado antes de normalizar: %.4f lotes", volume)
                 else:
-                    self.logger.error("No se pudo calcular el valor del riesgo por lote")
+                    log.error("No se pudo calcular el valor del riesgo por lote")
                     return None
             else:
                 # Fallback: usar fórmula simplificada para forex estándar
@@ -547,9 +744,9 @@ class TurtleSoupFVGStrategy(BaseStrategy):
                 
                 if risk_value_per_lot > 0:
                     volume = risk_amount / risk_value_per_lot
-                    self.logger.warning(f"[{symbol}] Usando cálculo aproximado de volumen (fallback)")
+                    log.warning("Usando cálculo aproximado de volumen (fallback)")
                 else:
-                    self.logger.error("No se pudo calcular el volumen con método fallback")
+                    log.error("No se pudo calcular el volumen con método fallback")
                     return None
             
             # Normalizar volumen según los límites del símbolo
@@ -566,39 +763,42 @@ class TurtleSoupFVGStrategy(BaseStrategy):
                     volume = volume_min
                     # Advertencia si el volumen calculado era mucho menor al mínimo
                     if volume_before_limit < volume_min * 0.5:
-                        self.logger.warning(
-                            f"[{symbol}] ⚠️  Volumen calculado ({volume_before_limit:.4f}) es menor al mínimo ({volume_min}). "
-                            f"Usando mínimo, pero el riesgo real será menor al {self.risk_per_trade_percent}% configurado"
+                        log.warning(
+                            "⚠️  Volumen calculado (%.4f) es menor al mínimo (%s). "
+                            "Usando mínimo, pero el riesgo real será menor al %s%% configurado",
+                            volume_before_limit, volume_min, self.risk_per_trade_percent
                         )
             else:
                 # Si no hay step definido, usar el mínimo si es necesario
                 if volume < volume_min:
                     if volume < volume_min * 0.5:
-                        self.logger.warning(
-                            f"[{symbol}] ⚠️  Volumen calculado ({volume:.4f}) es menor al mínimo ({volume_min}). "
-                            f"Usando mínimo, pero el riesgo real será menor al {self.risk_per_trade_percent}% configurado"
+                        log.warning(
+                            "⚠️  Volumen calculado (%.4f) es menor al mínimo (%s). "
+                            "Usando mínimo, pero el riesgo real será menor al %s%% configurado",
+                            volume, volume_min, self.risk_per_trade_percent
                         )
                     volume = volume_min
             
             # Aplicar límite máximo del símbolo
             if volume > volume_max:
                 volume = volume_max
-                self.logger.warning(f"[{symbol}] ⚠️  Volumen calculado excede el máximo del símbolo ({volume_max}), usando máximo")
+                log.warning("⚠️  Volumen calculado excede el máximo del símbolo (%s), usando máximo", volume_max)
             
             # Aplicar límite de seguridad de la configuración (solo como advertencia, no como límite restrictivo)
             # El volumen se calcula basado en el 1% de riesgo, por lo que no debe limitarse arbitrariamente
             if volume > self.max_position_size:
                 # Si el volumen calculado es mayor al límite, loguear advertencia pero permitir el volumen calculado
                 # El límite max_position_size es solo una referencia de seguridad, no un límite absoluto
-                self.logger.info(
-                    f"[{symbol}] ℹ️  Volumen calculado ({volume:.2f}) es mayor al límite de referencia ({self.max_position_size}), "
-                    f"pero se usa el volumen calculado para respetar el {self.risk_per_trade_percent}% de riesgo configurado"
+                log.info(
+                    "ℹ️  Volumen calculado (%.2f) es mayor al límite de referencia (%s), "
+                    "pero se usa el volumen calculado para respetar el %s%% de riesgo configurado",
+                    volume, self.max_position_size, self.risk_per_trade_percent
                 )
                 # NO limitar el volumen - usar el calculado para respetar el % de riesgo
             
             # Verificar que el volumen final sea válido
             if volume < volume_min:
-                self.logger.error(f"[{symbol}] ❌ Volumen calculado ({volume:.4f}) es menor al mínimo permitido ({volume_min})")
+                log.error("❌ Volumen calculado (%.4f) es menor al mínimo permitido (%s)", volume, volume_min)
                 return None
             
             # Calcular el riesgo real que se está tomando con el volumen calculado
@@ -611,51 +811,104 @@ class TurtleSoupFVGStrategy(BaseStrategy):
                 risk_value_actual = pips_in_risk * 10.0 * volume
                 risk_percent_actual = (risk_value_actual / balance) * 100
             
-            self.logger.info(
-                f"[{symbol}] 💰 Cálculo de volumen por riesgo: "
-                f"Balance={balance:.2f} | Riesgo objetivo={self.risk_per_trade_percent}%={risk_amount:.2f} | "
-                f"Risk en precio={risk_in_price:.5f} | Volumen={volume:.2f} lotes | "
-                f"Riesgo real={risk_percent_actual:.2f}%={risk_value_actual:.2f}"
+            log.info(
+                "💰 Cálculo de volumen por riesgo: "
+                "Balance=%.2f | Riesgo objetivo=%s%%=%.2f | "
+                "Risk en precio=%.5f | Volumen=%.2f lotes | "
+                "Riesgo real=%.2f%%=%.2f",
+                balance, self.risk_per_trade_percent, risk_amount, risk_in_price, volume, risk_percent_actual, risk_value_actual
             )
             
             # Advertencia si el riesgo real es muy diferente al objetivo
             if abs(risk_percent_actual - self.risk_per_trade_percent) > 0.1:
-                self.logger.warning(
-                    f"[{symbol}] ⚠️  Diferencia entre riesgo objetivo ({self.risk_per_trade_percent}%) y real ({risk_percent_actual:.2f}%) "
-                    f"puede deberse a límites de volumen mínimo/máximo"
+                log.warning(
+                    "⚠️  Diferencia entre riesgo objetivo (%s%%) y real (%.2f%%) "
+                    "puede deberse a límites de volumen mínimo/máximo",
+                    self.risk_per_trade_percent, risk_percent_actual
                 )
             
             return volume
             
         except Exception as e:
-            self.logger.error(f"Error al calcular volumen por riesgo: {e}", exc_info=True)
+            log.error("Error al calcular volumen por riesgo: %r", e, exc_info=True)
             return None
     
-    def _check_news(self, symbol: str) -> bool:
+    def _check_news(self, symbol: str, news_future: Optional[Future] = None) -> bool:
         """
         Verifica si se puede operar según noticias (5 min antes/después)
         
         Args:
             symbol: Símbolo a verificar
+            news_future: can_trade_now ya lanzado en el pool (opcional); si no, se llama aquí
             
         Returns:
             True si se puede operar, False si hay noticia cercana
         """
-        try:
-            can_trade, reason, next_news = can_trade_now(symbol, minutes_before=5, minutes_after=5)
-            
-            if not can_trade:
-                if next_news:
-                    self.logger.info(f"[{symbol}] ⏸️  Bloqueado por noticias: {reason} | Próxima noticia: {next_news.get('title', 'N/A')} a las {next_news.get('time_str', 'N/A')}")
+        log = self._symbol_log(symbol)
+        now = time.monotonic()
+        cached = self._news_cache.get(symbol)
+        if cached is not None and now < cached[0]:
+            _, can_trade, reason, next_news = cached
+        else:
+            try:
+                if news_future is not None:
+                    can_trade, reason, next_news = news_future.result()
                 else:
-                    self.logger.info(f"[{symbol}] ⏸️  Bloqueado por noticias: {reason}")
+                    can_trade, reason, next_news = can_trade_now(symbol, minutes_before=5, minutes_after=5)
+            except Exception as e:
+                log.error("Error al verificar noticias: %r", e)
                 return False
+            self._news_cache[symbol] = (now + self._news_ttl(can_trade, next_news), can_trade, reason, next_news)
+        
+        if not can_trade:
+            self._skip_until[symbol] = self._news_cache[symbol][0]
+            if next_news:
+                log.info("⏸️  Bloqueado por noticias: %s | Próxima noticia: %s a las %s", reason, next_news.get('title', 'N/A'), next_news.get('time_str', 'N/A'))
+            else:
+                log.info("⏸️  Bloqueado por noticias: %s", reason)
+            return False
+        
+        return True
+    
+    def _symbol_log(self, symbol: str) -> logging.LoggerAdapter:
+        """
+        Devuelve el logger del símbolo (prefijo "[símbolo] " en cada mensaje)
+        
+        Args:
+            symbol: Símbolo
             
-            return True
+        Returns:
+            LoggerAdapter sobre self.logger, cacheado por símbolo
+        """
+        log = self._symbol_logs.get(symbol)
+        if log is None:
+            log = self._symbol_logs[symbol] = _SymbolLogAdapter(self.logger, {'symbol': symbol})
+        return log
+    
+    def _news_ttl(self, can_trade: bool, next_news: Optional[Dict]) -> float:
+        """
+        Calcula cuántos segundos reutilizar un resultado de can_trade_now
+        
+        Args:
+            can_trade: Si se podía operar
+            next_news: Próxima noticia devuelta por can_trade_now (o None)
             
-        except Exception as e:
-            self.logger.error(f"Error al verificar noticias: {e}")
-            return False
+        Returns:
+            Segundos de validez del resultado cacheado
+        """
+        news_time = next_news.get('time') if next_news else None
+        if not isinstance(news_time, datetime):
+            # Bloqueado sin hora conocida: reevaluar pronto; sin noticias: refrescar cada 5 minutos
+            return 300.0 if can_trade else 30.0
+        seconds_until_news = (news_time - datetime.now(news_time.tzinfo)).total_seconds()
+        if can_trade:
+            # Válido hasta 5 minutos antes de la próxima noticia (inicio del bloqueo)
+            return max(1.0, seconds_until_news - 5 * 60)
+        if -5 * 60 <= seconds_until_news <= 5 * 60:
+            # Noticia a menos de 5 minutos (antes o después): el bloqueo dura hasta 5 minutos después de ella
+            return max(1.0, seconds_until_news + 5 * 60)
+        # Bloqueo por noticia consecutiva lejana: su fin no se conoce, reevaluar pronto
+        return 30.0
     
     def _find_fvg_entry(self, symbol: str, turtle_soup: Dict) -> Optional[Dict]:
         """
@@ -668,409 +921,401 @@ class TurtleSoupFVGStrategy(BaseStrategy):
         Returns:
             Dict con señal de entrada o None
         """
+        log = self._symbol_log(symbol)
+        self._last_entry_fvg = None
+        
+        # Obtener las 3 velas: vela en formación (posición 0) + 2 anteriores (posición 1 y 2)
+        # Se leen una sola vez y se comparten con detect_fvg y con la validación de la regla crítica
+        timeframe_map = {
+            'M1': mt5.TIMEFRAME_M1,
+            'M5': mt5.TIMEFRAME_M5,
+            'M15': mt5.TIMEFRAME_M15,
+            'M30': mt5.TIMEFRAME_M30,
+            'H1': mt5.TIMEFRAME_H1,
+            'H4': mt5.TIMEFRAME_H4,
+            'D1': mt5.TIMEFRAME_D1,
+        }
+        tf = timeframe_map.get(self.entry_timeframe.upper(), mt5.TIMEFRAME_M5)
+        rates = mt5.copy_rates_from_pos(symbol, tf, 0, 3)  # Obtener 3 velas: actual (pos 0), anterior1 (pos 1), anterior2 (pos 2)
+        
+        if rates is None or len(rates) < 3:
+            log.error("❌ No se pudo obtener las 3 velas necesarias (necesitamos vela en formación + 2 anteriores)")
+            return None
+        
+        # Misma vela de entrada y mismos extremos que la última evaluación sin FVG: nada que redetectar
+        bar_key = (symbol, rates['time'].tobytes(), rates['high'].tobytes(), rates['low'].tobytes())
+        if bar_key == self._no_fvg_bar_key:
+            log.info("⏸️  Esperando: No hay FVG detectado en %s", self.entry_timeframe)
+            return None
+        
+        # Un solo tick por evaluación: su bid alimenta detect_fvg y la validación de salida,
+        # y su ask/bid es el precio de entrada a mercado
+        tick = mt5.symbol_info_tick(symbol)
+        if tick is None:
+            log.error("❌ No se pudo obtener precio actual")
+            return None
+        
+        # Detectar FVG en la temporalidad de entrada (única llamada externa que puede lanzar)
         try:
-            # Detectar FVG en la temporalidad de entrada
-            fvg = detect_fvg(symbol, self.entry_timeframe)
-            
-            if not fvg:
-                self.logger.info(f"[{symbol}] ⏸️  Esperando: No hay FVG detectado en {self.entry_timeframe}")
-                return None
-            
-            sweep_type = turtle_soup.get('sweep_type')
-            direction = turtle_soup.get('direction')
-            fvg_type = fvg.get('fvg_type')
-            
-            # Verificar si el FVG es el esperado según el Turtle Soup
-            if not self._is_expected_fvg(fvg, turtle_soup):
-                self.logger.info(f"[{symbol}] ⏸️  FVG detectado ({fvg_type}) no es el esperado según Turtle Soup ({sweep_type} → {direction})")
-                return None
-            
-            exit_direction = fvg.get('exit_direction')
-            fvg_bottom = fvg.get('fvg_bottom')
-            fvg_top = fvg.get('fvg_top')
-            current_price_fvg = fvg.get('current_price')
-            self.logger.info(f"[{symbol}] 📊 FVG ESPERADO detectado: {fvg_type} | Estado: {fvg.get('status')} | Entró: {fvg.get('entered_fvg')} | Salió: {fvg.get('exited_fvg')} | Exit Direction: {exit_direction}")
-            self.logger.info(f"[{symbol}] 📊 FVG detalles: Bottom={fvg_bottom:.5f} | Top={fvg_top:.5f} | Precio actual={current_price_fvg:.5f}")
-            
-            # ⚠️ VALIDACIÓN CRÍTICA: Verificar que la VELA EN FORMACIÓN (junto con las 2 anteriores) formen el FVG esperado
-            # REGLA OBLIGATORIA: 
-            # 1. Las 3 velas (en formación + 2 anteriores) DEBEN formar el FVG esperado
-            # 2. La VELA EN FORMACIÓN (posición 0) DEBE haber entrado al FVG y salido en la dirección esperada
-            self.logger.info(f"[{symbol}] 🔍 Validando regla crítica: Vela EN FORMACIÓN + 2 anteriores deben formar FVG esperado...")
-            
-            # Obtener las 3 velas: vela en formación (posición 0) + 2 anteriores (posición 1 y 2)
-            # Mapeo de timeframe
-            timeframe_map = {
-                'M1': mt5.TIMEFRAME_M1,
-                'M5': mt5.TIMEFRAME_M5,
-                'M15': mt5.TIMEFRAME_M15,
-                'M30': mt5.TIMEFRAME_M30,
-                'H1': mt5.TIMEFRAME_H1,
-                'H4': mt5.TIMEFRAME_H4,
-                'D1': mt5.TIMEFRAME_D1,
-            }
-            tf = timeframe_map.get(self.entry_timeframe.upper(), mt5.TIMEFRAME_M5)
-            rates = mt5.copy_rates_from_pos(symbol, tf, 0, 3)  # Obtener 3 velas: actual (pos 0), anterior1 (pos 1), anterior2 (pos 2)
-            
-            if rates is None or len(rates) < 3:
-                self.logger.error(f"[{symbol}] ❌ No se pudo obtener las 3 velas necesarias (necesitamos vela en formación + 2 anteriores)")
-                return None
-            
-            # Estructura: rates[0] = vela3 (en formación/actual), rates[1] = vela2 (anterior), rates[2] = vela1 (más antigua)
-            # Ordenar por tiempo para tener: vela1 (más antigua), vela2 (del medio), vela3 (actual/en formación)
-            candles_data = []
-            for i, candle_data in enumerate(rates):
-                candles_data.append({
-                    'open': float(candle_data['open']),
-                    'high': float(candle_data['high']),
-                    'low': float(candle_data['low']),
-                    'close': float(candle_data['close']),
-                    'time': datetime.fromtimestamp(candle_data['time']),
-                    'index': i  # Guardar índice original
-                })
-            
-            # Ordenar por tiempo (más antigua primero)
-            candles_data = sorted(candles_data, key=lambda x: x['time'])
-            
-            # vela1 = más antigua, vela2 = del medio, vela3 = actual/en formación
-            vela1 = candles_data[0]  # Más antigua
-            vela2 = candles_data[1]    # Del medio
-            vela3 = candles_data[2]    # Actual/en formación
-            
-            self.logger.info(f"[{symbol}] 📊 Analizando 3 velas para formar FVG:")
-            self.logger.info(f"[{symbol}]    • Vela1 (antigua): {vela1['time'].strftime('%Y-%m-%d %H:%M:%S')} | H={vela1['high']:.5f} L={vela1['low']:.5f}")
-            self.logger.info(f"[{symbol}]    • Vela2 (medio): {vela2['time'].strftime('%Y-%m-%d %H:%M:%S')} | H={vela2['high']:.5f} L={vela2['low']:.5f}")
-            self.logger.info(f"[{symbol}]    • Vela3 (EN FORMACIÓN): {vela3['time'].strftime('%Y-%m-%d %H:%M:%S')} | H={vela3['high']:.5f} L={vela3['low']:.5f} C={vela3['close']:.5f}")
-            
-            # VALIDACIÓN 0: Verificar que las 3 velas forman el FVG esperado
-            # Según la lógica del detector FVG:
-            # - FVG ALCISTA: vela1.low < vela3.high AND vela3.low > vela1.high (sin solapamiento)
-            #   Rango: entre vela1.high (bottom) y vela3.low (top)
-            # - FVG BAJISTA: vela1.high > vela3.low AND vela3.high < vela1.low (sin solapamiento)
-            #   Rango: entre vela3.high (bottom) y vela1.low (top)
-            
-            fvg_formed = False
-            calculated_fvg_bottom = None
-            calculated_fvg_top = None
-            calculated_fvg_type = None
-            
-            # Verificar FVG ALCISTA entre vela1 y vela3
-            if vela1['low'] < vela3['high'] and vela3['low'] > vela1['high']:
-                calculated_fvg_bottom = vela1['high']  # HIGH de vela1
-                calculated_fvg_top = vela3['low']      # LOW de vela3
-                calculated_fvg_type = 'ALCISTA'
-                fvg_formed = True
-                self.logger.info(f"[{symbol}] ✅ FVG ALCISTA formado por las 3 velas: {calculated_fvg_bottom:.5f} - {calculated_fvg_top:.5f}")
-            
-            # Verificar FVG BAJISTA entre vela1 y vela3
-            elif vela1['high'] > vela3['low'] and vela3['high'] < vela1['low']:
-                calculated_fvg_bottom = vela3['high']    # HIGH de vela3
-                calculated_fvg_top = vela1['low']      # LOW de vela1
-                calculated_fvg_type = 'BAJISTA'
-                fvg_formed = True
-                self.logger.info(f"[{symbol}] ✅ FVG BAJISTA formado por las 3 velas: {calculated_fvg_bottom:.5f} - {calculated_fvg_top:.5f}")
-            
-            if not fvg_formed:
-                self.logger.info(f"[{symbol}] ⏸️  REGLA NO CUMPLIDA: Las 3 velas NO forman un FVG válido")
-                return None
-            
-            # Verificar que el FVG formado es del tipo esperado según el Turtle Soup
-            if calculated_fvg_type != fvg_type:
-                self.logger.info(
-                    f"[{symbol}] ⏸️  REGLA NO CUMPLIDA: FVG formado es {calculated_fvg_type} pero esperábamos {fvg_type} "
-                    f"(según Turtle Soup {sweep_type} + dirección {direction})"
-                )
-                return None
-            
-            # Verificar que el FVG calculado coincide con el detectado (con tolerancia pequeña)
-            tolerance = abs(fvg_top - fvg_bottom) * 0.01  # 1% de tolerancia
-            if abs(calculated_fvg_bottom - fvg_bottom) > tolerance or abs(calculated_fvg_top - fvg_top) > tolerance:
-                self.logger.warning(
-                    f"[{symbol}] ⚠️  FVG calculado difiere del detectado: "
-                    f"Calculado: {calculated_fvg_bottom:.5f}-{calculated_fvg_top:.5f} | "
-                    f"Detectado: {fvg_bottom:.5f}-{fvg_top:.5f}"
-                )
-                # Usar el FVG calculado de las velas (más confiable)
-                fvg_bottom = calculated_fvg_bottom
-                fvg_top = calculated_fvg_top
-            
-            # Obtener información de la vela EN FORMACIÓN (vela3)
-            candle_high = vela3.get('high')
-            candle_low = vela3.get('low')
-            candle_close = vela3.get('close')
-            candle_open = vela3.get('open')
-            
-            if candle_high is None or candle_low is None or candle_close is None:
-                self.logger.error(f"[{symbol}] ❌ Vela en formación no tiene datos completos")
-                return None
-            
-            # Obtener precio actual (bid) para validar salida
-            tick = mt5.symbol_info_tick(symbol)
-            if tick is None:
-                self.logger.error(f"[{symbol}] ❌ No se pudo obtener precio actual")
-                return None
-            current_price = float(tick.bid)
-            
-            self.logger.info(f"[{symbol}] 📊 Vela EN FORMACIÓN: H={candle_high:.5f} L={candle_low:.5f} C={candle_close:.5f} | Precio actual: {current_price:.5f}")
-            self.logger.info(f"[{symbol}] 📊 FVG calculado desde velas: {calculated_fvg_type} | Bottom: {fvg_bottom:.5f} | Top: {fvg_top:.5f}")
-            
-            # ⚠️ VALIDACIÓN CRÍTICA 1: La vela EN FORMACIÓN (vela3) DEBE haber entrado al FVG
-            # REGLA ESPECÍFICA POR TIPO DE FVG (VERIFICACIÓN ESTRICTA):
-            # - FVG BAJISTA: El HIGH de la vela DEBE estar dentro del FVG (fvg_bottom <= HIGH <= fvg_top)
-            # - FVG ALCISTA: El LOW de la vela DEBE estar dentro del FVG (fvg_bottom <= LOW <= fvg_top)
-            # 
-            # IMPORTANTE: Si la vela NO tocó el FVG, NO puede haber una entrada válida
-            candle_entered_fvg = False
-            
-            if calculated_fvg_type == 'BAJISTA':
-                # FVG BAJISTA: El HIGH de la vela en formación DEBE estar dentro del FVG
-                # Verificación estricta: HIGH debe estar en el rango [fvg_bottom, fvg_top]
-                if fvg_bottom <= candle_high <= fvg_top:
-                    candle_entered_fvg = True
-                    self.logger.info(f"[{symbol}] ✅ Vela entró al FVG BAJISTA: HIGH ({candle_high:.5f}) está dentro del FVG ({fvg_bottom:.5f}-{fvg_top:.5f})")
-                else:
-                    # CRÍTICO: Si el HIGH no está dentro del FVG, la vela NO entró
-                    self.logger.warning(
-                        f"[{symbol}] ❌ VALIDACIÓN FALLIDA: Para FVG BAJISTA, HIGH de vela ({candle_high:.5f}) NO está dentro del FVG ({fvg_bottom:.5f}-{fvg_top:.5f}) | "
-                        f"La vela NO entró al FVG - NO SE PUEDE EJECUTAR ORDEN"
-                    )
-                    return None
-            elif calculated_fvg_type == 'ALCISTA':
-                # FVG ALCISTA: El LOW de la vela en formación DEBE estar dentro del FVG
-                # Verificación estricta: LOW debe estar en el rango [fvg_bottom, fvg_top]
-                if fvg_bottom <= candle_low <= fvg_top:
-                    candle_entered_fvg = True
-                    self.logger.info(f"[{symbol}] ✅ Vela entró al FVG ALCISTA: LOW ({candle_low:.5f}) está dentro del FVG ({fvg_bottom:.5f}-{fvg_top:.5f})")
-                else:
-                    # CRÍTICO: Si el LOW no está dentro del FVG, la vela NO entró
-                    self.logger.warning(
-                        f"[{symbol}] ❌ VALIDACIÓN FALLIDA: Para FVG ALCISTA, LOW de vela ({candle_low:.5f}) NO está dentro del FVG ({fvg_bottom:.5f}-{fvg_top:.5f}) | "
-                        f"La vela NO entró al FVG - NO SE PUEDE EJECUTAR ORDEN"
-                    )
-                    return None
-            
-            # Verificación adicional de seguridad (no debería llegar aquí si no entró, pero por si acaso)
-            if not candle_entered_fvg:
-                self.logger.error(
-                    f"[{symbol}] ❌ VALIDACIÓN FALLIDA: La vela EN FORMACIÓN NO entró al FVG {calculated_fvg_type} | "
-                    f"Vela: H={candle_high:.5f} L={candle_low:.5f} C={candle_close:.5f} | "
-                    f"FVG: {fvg_bottom:.5f}-{fvg_top:.5f} | NO SE EJECUTARÁ ORDEN"
-                )
-                return None
-            
-            self.logger.info(f"[{symbol}] ✅ Vela EN FORMACIÓN entró al FVG {calculated_fvg_type}: H={candle_high:.5f} L={candle_low:.5f}")
-            
-            # VALIDACIÓN 2: El precio actual DEBE haber salido del FVG en la dirección correcta
-            # IMPORTANTE: Usamos el precio actual (bid) para validar salida, no el CLOSE de la vela
-            # porque la vela está en formación y el CLOSE puede cambiar
-            price_exited_fvg = False
-            exit_direction = None
-            
-            # Verificar que el precio actual esté FUERA del rango del FVG
-            price_outside_fvg = (current_price < fvg_bottom) or (current_price > fvg_top)
-            
-            if not price_outside_fvg:
-                self.logger.info(
-                    f"[{symbol}] ⏸️  REGLA NO CUMPLIDA: El precio actual ({current_price:.5f}) aún NO salió del FVG | "
-                    f"Precio está DENTRO del FVG ({fvg_bottom:.5f}-{fvg_top:.5f}) | "
-                    f"Debe estar FUERA del FVG en dirección {direction}"
-                )
-                return None
-            
-            # Verificar la dirección de salida según el tipo de FVG y dirección esperada
-            # ⚠️ VALIDACIÓN CRÍTICA: El precio DEBE salir del FVG en la dirección CORRECTA
-            # Si sale en dirección INCORRECTA, se rechaza la entrada
-            if calculated_fvg_type == 'BAJISTA' and direction == 'BEARISH':
-                # FVG BAJISTA + dirección BEARISH: precio debe estar DEBAJO del FVG
-                if current_price < fvg_bottom:
-                    price_exited_fvg = True
-                    exit_direction = 'BAJISTA'
-                    self.logger.info(f"[{symbol}] 📍 Precio salió del FVG BAJISTA: Precio actual ({current_price:.5f}) está DEBAJO del FVG Bottom ({fvg_bottom:.5f})")
-                elif current_price > fvg_top:
-                    # ⚠️ ERROR CRÍTICO: Precio salió ARRIBA del FVG pero esperábamos salida BAJISTA
-                    self.logger.error(
-                        f"[{symbol}] ❌ VALIDACIÓN FALLIDA: Precio salió del FVG en dirección INCORRECTA | "
-                        f"FVG BAJISTA + dirección BEARISH esperada, pero precio ({current_price:.5f}) está ARRIBA del FVG Top ({fvg_top:.5f}) | "
-                        f"El precio salió ALCISTA cuando debería haber salido BAJISTA - RECHAZANDO ENTRADA"
-                    )
-                    return None
-                else:
-                    # Precio aún dentro del FVG o en el borde (no debería llegar aquí por la validación anterior)
-                    self.logger.info(
-                        f"[{symbol}] ⏸️  REGLA NO CUMPLIDA: Precio aún no salió del FVG en dirección {direction} | "
-                        f"Precio actual={current_price:.5f} | FVG: {fvg_bottom:.5f}-{fvg_top:.5f}"
-                    )
-                    return None
-            elif calculated_fvg_type == 'ALCISTA' and direction == 'BULLISH':
-                # FVG ALCISTA + dirección BULLISH: precio debe estar ARRIBA del FVG
-                if current_price > fvg_top:
-                    price_exited_fvg = True
-                    exit_direction = 'ALCISTA'
-                    self.logger.info(f"[{symbol}] 📍 Precio salió del FVG ALCISTA: Precio actual ({current_price:.5f}) está ARRIBA del FVG Top ({fvg_top:.5f})")
-                elif current_price < fvg_bottom:
-                    # ⚠️ ERROR CRÍTICO: Precio salió DEBAJO del FVG pero esperábamos salida ALCISTA
-                    self.logger.error(
-                        f"[{symbol}] ❌ VALIDACIÓN FALLIDA: Precio salió del FVG en dirección INCORRECTA | "
-                        f"FVG ALCISTA + dirección BULLISH esperada, pero precio ({current_price:.5f}) está DEBAJO del FVG Bottom ({fvg_bottom:.5f}) | "
-                        f"El precio salió BAJISTA cuando debería haber salido ALCISTA - RECHAZANDO ENTRADA"
-                    )
-                    return None
-                else:
-                    # Precio aún dentro del FVG o en el borde (no debería llegar aquí por la validación anterior)
-                    self.logger.info(
-                        f"[{symbol}] ⏸️  REGLA NO CUMPLIDA: Precio aún no salió del FVG en dirección {direction} | "
-                        f"Precio actual={current_price:.5f} | FVG: {fvg_bottom:.5f}-{fvg_top:.5f}"
-                    )
-                    return None
+            fvg = detect_fvg(symbol, self.entry_timeframe, rates=rates, current_price=float(tick.bid))
+        except Exception as e:
+            log.error("Error al detectar FVG: %r", e)
+            return None
+        # analyze() reutiliza este FVG para decidir el monitoreo intensivo si no hay entrada
+        self._last_entry_fvg = fvg
+        
+        if not fvg:
+            # Sin hueco entre vela1 y vela2 el resultado no depende del precio (solo de las velas)
+            high, low = rates['high'], rates['low']
+            if not (high[0] < low[1] or low[0] > high[1]):
+                self._no_fvg_bar_key = bar_key
+            log.info("⏸️  Esperando: No hay FVG detectado en %s", self.entry_timeframe)
+            return None
+        
+        # Leer una sola vez los campos usados del Turtle Soup y del FVG detectado
+        sweep_type, direction, target_price, expected_fvg_type = (
+            turtle_soup.get(k) for k in ('sweep_type', 'direction', 'target_price', 'expected_fvg_type')
+        )
+        (fvg_type, fvg_status, entered_fvg, exited_fvg, exit_direction,
+         detected_fvg_top, detected_fvg_bottom, current_price_fvg) = (
+            fvg.get(k) for k in ('fvg_type', 'status', 'entered_fvg', 'exited_fvg', 'exit_direction',
+                                 'fvg_top', 'fvg_bottom', 'current_price')
+        )
+        
+        # Verificar si el FVG es el esperado según el Turtle Soup (decidido al detectar el barrido)
+        if fvg_type != expected_fvg_type:
+            log.info("⏸️  FVG detectado (%s) no es el esperado según Turtle Soup (%s → %s)", fvg_type, sweep_type, direction)
+            return None
+        
+        # Sin extremos del FVG u objetivo no hay niveles que calcular: salir antes de formatearlos
+        if detected_fvg_top is None or detected_fvg_bottom is None or target_price is None:
+            return None
+        
+        fvg_bottom = detected_fvg_bottom
+        fvg_top = detected_fvg_top
+        log_info = self.logger.isEnabledFor(logging.INFO)
+        if log_info:
+            log.info("📊 FVG ESPERADO detectado: %s | Estado: %s | Entró: %s | Salió: %s | Exit Direction: %s",
+                     fvg_type, fvg_status, entered_fvg, exited_fvg, exit_direction)
+            log.info("📊 FVG detalles: Bottom=%.5f | Top=%.5f | Precio actual=%.5f",
+                     fvg_bottom, fvg_top, current_price_fvg)
+        
+        # ⚠️ VALIDACIÓN CRÍTICA: Verificar que la VELA EN FORMACIÓN (junto con las 2 anteriores) formen el FVG esperado
+        # REGLA OBLIGATORIA: 
+        # 1. Las 3 velas (en formación + 2 anteriores) DEBEN formar el FVG esperado
+        # 2. La VELA EN FORMACIÓN (posición 0) DEBE haber entrado al FVG y salido en la dirección esperada
+        log.info("🔍 Validando regla crítica: Vela EN FORMACIÓN + 2 anteriores deben formar FVG esperado...")
+        
+        # Estructura: rates[0] = vela3 (en formación/actual), rates[1] = vela2 (anterior), rates[2] = vela1 (más antigua)
+        # Ordenar por tiempo para tener: vela1 (más antigua), vela2 (del medio), vela3 (actual/en formación)
+        candles_data = []
+        for i, candle_data in enumerate(rates):
+            candles_data.append({
+                'open': float(candle_data['open']),
+                'high': float(candle_data['high']),
+                'low': float(candle_data['low']),
+                'close': float(candle_data['close']),
+                'time': datetime.fromtimestamp(candle_data['time']),
+                'index': i  # Guardar índice original
+            })
+        
+        # Ordenar por tiempo (más antigua primero)
+        candles_data = sorted(candles_data, key=lambda x: x['time'])
+        
+        # vela1 = más antigua, vela2 = del medio, vela3 = actual/en formación
+        vela1 = candles_data[0]  # Más antigua
+        vela2 = candles_data[1]    # Del medio
+        vela3 = candles_data[2]    # Actual/en formación
+        
+        if log_info:
+            log.info("📊 Analizando 3 velas para formar FVG:")
+            log.info("   • Vela1 (antigua): %s | H=%.5f L=%.5f",
+                     vela1['time'].strftime('%Y-%m-%d %H:%M:%S'), vela1['high'], vela1['low'])
+            log.info("   • Vela2 (medio): %s | H=%.5f L=%.5f",
+                     vela2['time'].strftime('%Y-%m-%d %H:%M:%S'), vela2['high'], vela2['low'])
+            log.info("   • Vela3 (EN FORMACIÓN): %s | H=%.5f L=%.5f C=%.5f",
+                     vela3['time'].strftime('%Y-%m-%d %H:%M:%S'), vela3['high'], vela3['low'], vela3['close'])
+        
+        # VALIDACIÓN 0: Verificar que las 3 velas forman el FVG esperado
+        # Según la lógica del detector FVG:
+        # - FVG ALCISTA: vela1.low < vela3.high AND vela3.low > vela1.high (sin solapamiento)
+        #   Rango: entre vela1.high (bottom) y vela3.low (top)
+        # - FVG BAJISTA: vela1.high > vela3.low AND vela3.high < vela1.low (sin solapamiento)
+        #   Rango: entre vela3.high (bottom) y vela1.low (top)
+        
+        fvg_formed = False
+        calculated_fvg_bottom = None
+        calculated_fvg_top = None
+        calculated_fvg_type = None
+        
+        # Verificar FVG ALCISTA entre vela1 y vela3
+        if vela1['low'] < vela3['high'] and vela3['low'] > vela1['high']:
+            calculated_fvg_bottom = vela1['high']  # HIGH de vela1
+            calculated_fvg_top = vela3['low']      # LOW de vela3
+            calculated_fvg_type = 'ALCISTA'
+            fvg_formed = True
+            if log_info:
+                log.info("✅ FVG ALCISTA formado por las 3 velas: %.5f - %.5f", calculated_fvg_bottom, calculated_fvg_top)
+        
+        # Verificar FVG BAJISTA entre vela1 y vela3
+        elif vela1['high'] > vela3['low'] and vela3['high'] < vela1['low']:
+            calculated_fvg_bottom = vela3['high']    # HIGH de vela3
+            calculated_fvg_top = vela1['low']      # LOW de vela1
+            calculated_fvg_type = 'BAJISTA'
+            fvg_formed = True
+            if log_info:
+                log.info("✅ FVG BAJISTA formado por las 3 velas: %.5f - %.5f", calculated_fvg_bottom, calculated_fvg_top)
+        
+        if not fvg_formed:
+            log.info("⏸️  REGLA NO CUMPLIDA: Las 3 velas NO forman un FVG válido")
+            return None
+        
+        # Verificar que el FVG formado es del tipo esperado según el Turtle Soup
+        if calculated_fvg_type != fvg_type:
+            log.info(
+                "⏸️  REGLA NO CUMPLIDA: FVG formado es %s pero esperábamos %s "
+                "(según Turtle Soup %s + dirección %s)",
+                calculated_fvg_type, fvg_type, sweep_type, direction
+            )
+            return None
+        
+        # Verificar que el FVG calculado coincide con el detectado (con tolerancia pequeña)
+        tolerance = abs(fvg_top - fvg_bottom) * 0.01  # 1% de tolerancia
+        if abs(calculated_fvg_bottom - fvg_bottom) > tolerance or abs(calculated_fvg_top - fvg_top) > tolerance:
+            log.warning(
+                "⚠️  FVG calculado difiere del detectado: "
+                "Calculado: %.5f-%.5f | "
+                "Detectado: %.5f-%.5f",
+                calculated_fvg_bottom, calculated_fvg_top, fvg_bottom, fvg_top
+            )
+            # Usar el FVG calculado de las velas (más confiable)
+            fvg_bottom = calculated_fvg_bottom
+            fvg_top = calculated_fvg_top
+        
+        # Obtener información de la vela EN FORMACIÓN (vela3)
+        candle_high = vela3.get('high')
+        candle_low = vela3.get('low')
+        candle_close = vela3.get('close')
+        candle_open = vela3.get('open')
+        
+        if candle_high is None or candle_low is None or candle_close is None:
+            log.error("❌ Vela en formación no tiene datos completos")
+            return None
+        
+        # Precio actual (bid) del tick leído al inicio para validar salida
+        current_price = float(tick.bid)
+        
+        if log_info:
+            log.info("📊 Vela EN FORMACIÓN: H=%.5f L=%.5f C=%.5f | Precio actual: %.5f",
+                     candle_high, candle_low, candle_close, current_price)
+            log.info("📊 FVG calculado desde velas: %s | Bottom: %.5f | Top: %.5f",
+                     calculated_fvg_type, fvg_bottom, fvg_top)
+        
+        # ⚠️ VALIDACIÓN CRÍTICA 1: La vela EN FORMACIÓN (vela3) DEBE haber entrado al FVG
+        # REGLA ESPECÍFICA POR TIPO DE FVG (VERIFICACIÓN ESTRICTA):
+        # - FVG BAJISTA: El HIGH de la vela DEBE estar dentro del FVG (fvg_bottom <= HIGH <= fvg_top)
+        # - FVG ALCISTA: El LOW de la vela DEBE estar dentro del FVG (fvg_bottom <= LOW <= fvg_top)
+        # 
+        # IMPORTANTE: Si la vela NO tocó el FVG, NO puede haber una entrada válida
+        candle_entered_fvg = False
+        
+        if calculated_fvg_type == 'BAJISTA':
+            # FVG BAJISTA: El HIGH de la vela en formación DEBE estar dentro del FVG
+            # Verificación estricta: HIGH debe estar en el rango [fvg_bottom, fvg_top]
+            if fvg_bottom <= candle_high <= fvg_top:
+                candle_entered_fvg = True
+                if log_info:
+                    log.info("✅ Vela entró al FVG BAJISTA: HIGH (%.5f) está dentro del FVG (%.5f-%.5f)", candle_high, fvg_bottom, fvg_top)
             else:
-                # Tipo de FVG no coincide con dirección esperada
-                self.logger.info(
-                    f"[{symbol}] ⏸️  REGLA NO CUMPLIDA: FVG {calculated_fvg_type} no coincide con dirección {direction} esperada"
+                # CRÍTICO: Si el HIGH no está dentro del FVG, la vela NO entró
+                log.warning(
+                    "❌ VALIDACIÓN FALLIDA: Para FVG BAJISTA, HIGH de vela (%.5f) NO está dentro del FVG (%.5f-%.5f) | "
+                    "La vela NO entró al FVG - NO SE PUEDE EJECUTAR ORDEN",
+                    candle_high, fvg_bottom, fvg_top
                 )
                 return None
-            
-            if not price_exited_fvg:
-                self.logger.info(
-                    f"[{symbol}] ⏸️  REGLA NO CUMPLIDA: El precio NO salió del FVG en dirección {direction} | "
-                    f"Precio actual={current_price:.5f} | FVG: {fvg_bottom:.5f}-{fvg_top:.5f}"
+        elif calculated_fvg_type == 'ALCISTA':
+            # FVG ALCISTA: El LOW de la vela en formación DEBE estar dentro del FVG
+            # Verificación estricta: LOW debe estar en el rango [fvg_bottom, fvg_top]
+            if fvg_bottom <= candle_low <= fvg_top:
+                candle_entered_fvg = True
+                if log_info:
+                    log.info("✅ Vela entró al FVG ALCISTA: LOW (%.5f) está dentro del FVG (%.5f-%.5f)", candle_low, fvg_bottom, fvg_top)
+            else:
+                # CRÍTICO: Si el LOW no está dentro del FVG, la vela NO entró
+                log.warning(
+                    "❌ VALIDACIÓN FALLIDA: Para FVG ALCISTA, LOW de vela (%.5f) NO está dentro del FVG (%.5f-%.5f) | "
+                    "La vela NO entró al FVG - NO SE PUEDE EJECUTAR ORDEN",
+                    candle_low, fvg_bottom, fvg_top
                 )
                 return None
-            
-            self.logger.info(
-                f"[{symbol}] ✅ REGLA CUMPLIDA: Vela EN FORMACIÓN entró al FVG {calculated_fvg_type} y precio salió en dirección {exit_direction} | "
-                f"Vela: O={candle_open:.5f} H={candle_high:.5f} L={candle_low:.5f} C={candle_close:.5f} | "
-                f"Precio actual: {current_price:.5f}"
+        
+        # Verificación adicional de seguridad (no debería llegar aquí si no entró, pero por si acaso)
+        if not candle_entered_fvg:
+            log.error(
+                "❌ VALIDACIÓN FALLIDA: La vela EN FORMACIÓN NO entró al FVG %s | "
+                "Vela: H=%.5f L=%.5f C=%.5f | "
+                "FVG: %.5f-%.5f | NO SE EJECUTARÁ ORDEN",
+                calculated_fvg_type, candle_high, candle_low, candle_close, fvg_bottom, fvg_top
             )
-            
-            # Determinar qué tipo de FVG buscamos según el barrido de H4
-            # LÓGICA CORREGIDA:
-            # - Barrido de HIGH (BULLISH_SWEEP) + dirección BEARISH → Busca FVG BAJISTA (formado a la baja) para vender
-            # - Barrido de LOW (BEARISH_SWEEP) + dirección BULLISH → Busca FVG ALCISTA (formado en alza) para comprar
-            # En ambos casos, esperamos que el precio entre y salga en la dirección del Turtle Soup
-            
-            # Verificar tipo de FVG según el barrido de H4
-            expected_fvg_type = None
-            if sweep_type == 'BULLISH_SWEEP' and direction == 'BEARISH':
-                # Barrido de HIGH → Busca FVG BAJISTA (formado a la baja) para entrada bajista (venta)
-                expected_fvg_type = 'BAJISTA'
-            elif sweep_type == 'BEARISH_SWEEP' and direction == 'BULLISH':
-                # Barrido de LOW → Busca FVG ALCISTA (formado en alza) para entrada alcista (compra)
-                expected_fvg_type = 'ALCISTA'
-            
-            if expected_fvg_type and fvg_type != expected_fvg_type:
-                # El tipo de FVG no es el esperado según el barrido
-                self.logger.info(f"[{symbol}] ⏸️  Esperando: FVG {fvg_type} detectado, pero necesitamos FVG {expected_fvg_type} (barrido {sweep_type} → {direction})")
-                return None
-            
-            self.logger.info(f"[{symbol}] ✅ FVG {fvg_type} correcto para la estrategia (según barrido H4: {sweep_type})")
-            
-            self.logger.info(f"[{symbol}] ✅ Condiciones cumplidas - Listo para calcular entrada")
-            
-            # Obtener precio actual (bid para venta, ask para compra)
-            tick = mt5.symbol_info_tick(symbol)
-            if tick is None:
-                return None
-            
-            # Calcular niveles
-            fvg_top = fvg.get('fvg_top')
-            fvg_bottom = fvg.get('fvg_bottom')
-            target_price = turtle_soup.get('target_price')
-            
-            if fvg_top is None or fvg_bottom is None or target_price is None:
-                return None
-            
-            # Calcular Stop Loss (debe cubrir TODO el espacio del FVG + margen adicional para soportar movimientos del precio)
-            # El SL debe estar lo suficientemente lejos para que si el precio retrocede y completa el FVG, el SL no se active
-            fvg_size = fvg_top - fvg_bottom
-            
-            # Obtener información del símbolo para calcular spread y distancia mínima
-            symbol_info = mt5.symbol_info(symbol)
-            if symbol_info is None:
-                return None
-            
-            spread_points = symbol_info.spread  # Spread en puntos
-            point = symbol_info.point  # Valor de un punto
-            spread_price = spread_points * point  # Spread en precio
-            
-            # Para calcular pips correctamente: 1 pip = 10 points para símbolos con 5 dígitos, 1 point para 3 dígitos
-            pips_to_points = 10 if symbol_info.digits == 5 else 1
-            
-            # Margen adicional estándar: 100% del tamaño del FVG (aumentado de 50% a 100%)
-            # Esto asegura que el SL cubra el espacio completo del FVG (100%) + un margen adicional igual (100%)
-            # Total: 2.0x el tamaño del FVG para soportar movimientos del precio
-            safety_margin = fvg_size * 1.0  # 100% adicional más allá del FVG
-            
-            # Distancia mínima estándar del SL: debe ser razonable para soportar movimientos del precio
-            # IMPORTANTE: La distancia mínima debe adaptarse a la temporalidad de entrada
-            # - M1: Entradas más ajustadas, SL más corto (15-20 pips)
-            # - M5 o superior: SL más amplio (30-40 pips)
-            fvg_size_pips = fvg_size * (10000 if symbol_info.digits == 5 else 100)
-            
-            # Determinar distancia mínima según temporalidad de entrada
-            entry_tf = self.entry_timeframe.upper()
-            if entry_tf == 'M1':
-                # Para M1: SL más ajustado, pero aún cubriendo el FVG bien
-                if fvg_size_pips < 3:
-                    min_pips = 15  # FVG muy pequeño en M1: 15 pips mínimo
-                elif fvg_size_pips < 5:
-                    min_pips = 18  # FVG pequeño en M1: 18 pips mínimo
-                else:
-                    min_pips = 20  # FVG normal en M1: 20 pips mínimo
-                self.logger.info(f"[{symbol}] 📏 Entrada M1: FVG {fvg_size_pips:.1f} pips → distancia mínima ajustada: {min_pips} pips")
-            else:
-                # Para M5 o superior: SL más amplio
-                if fvg_size_pips < 5:
-                    # FVG muy pequeño (< 5 pips): usar distancia mínima generosa de 40 pips
-                    min_pips = 40
-                    self.logger.info(f"[{symbol}] 📏 FVG pequeño ({fvg_size_pips:.1f} pips) → usando distancia mínima generosa de {min_pips} pips")
-                elif fvg_size_pips < 10:
-                    # FVG pequeño (5-10 pips): usar distancia mínima de 35 pips
-                    min_pips = 35
-                    self.logger.info(f"[{symbol}] 📏 FVG pequeño ({fvg_size_pips:.1f} pips) → usando distancia mínima de {min_pips} pips")
-                else:
-                    # FVG normal o grande (>= 10 pips): usar distancia mínima estándar de 30 pips
-                    min_pips = 30
-                    self.logger.info(f"[{symbol}] 📏 FVG normal ({fvg_size_pips:.1f} pips) → usando distancia mínima estándar de {min_pips} pips")
-            
-            min_sl_distance_pips = min_pips * pips_to_points * point
-            
-            # La distancia mínima debe ser el mayor entre:
-            # 1. 5x el spread (mínimo por spread)
-            # 2. La distancia mínima en pips (30-40 pips según tamaño del FVG)
-            # 3. 2.5x el tamaño del FVG (solo si el FVG es grande, para cubrirlo bien)
-            min_sl_distance = max(
-                spread_price * 5,  # 5x el spread como mínimo
-                min_sl_distance_pips,  # Mínimo 30-40 pips según tamaño del FVG
-                fvg_size * 2.5  # 2.5x el tamaño del FVG para cubrirlo bien + margen adicional
+            return None
+        
+        if log_info:
+            log.info("✅ Vela EN FORMACIÓN entró al FVG %s: H=%.5f L=%.5f", calculated_fvg_type, candle_high, candle_low)
+        
+        # VALIDACIÓN 2: El precio actual DEBE haber salido del FVG en la dirección correcta
+        # IMPORTANTE: Usamos el precio actual (bid) para validar salida, no el CLOSE de la vela
+        # porque la vela está en formación y el CLOSE puede cambiar
+        
+        # Verificar que el precio actual esté FUERA del rango del FVG
+        price_outside_fvg = (current_price < fvg_bottom) or (current_price > fvg_top)
+        
+        if not price_outside_fvg:
+            log.info(
+                "⏸️  REGLA NO CUMPLIDA: El precio actual (%.5f) aún NO salió del FVG | "
+                "Precio está DENTRO del FVG (%.5f-%.5f) | "
+                "Debe estar FUERA del FVG en dirección %s",
+                current_price, fvg_bottom, fvg_top, direction
             )
-            
-            self.logger.info(f"[{symbol}] 📐 Cálculo SL: FVG Size={fvg_size:.5f} ({fvg_size_pips:.1f} pips) | Safety Margin={safety_margin:.5f} ({safety_margin * (10000 if symbol_info.digits == 5 else 100):.1f} pips) | Min Distance={min_sl_distance:.5f} ({min_sl_distance * (10000 if symbol_info.digits == 5 else 100):.1f} pips)")
-            
-            # ⚡ ORDEN A MERCADO: Usar precio actual del mercado (bid/ask)
-            # Para órdenes a mercado, el precio de entrada es el precio actual del mercado
-            # La optimización viene de entrar cuando el precio ya salió del FVG (mejor momento)
-            
-            if direction == 'BULLISH':
-                # Compra: Orden a mercado se ejecuta al precio ASK actual
-                entry_price = float(tick.ask)
-                self.logger.info(f"[{symbol}] 💹 Entrada a mercado (BUY): Precio ASK actual = {entry_price:.5f}")
-                
-                # SL debajo del FVG: cubre el espacio completo del FVG + margen adicional estándar
-                # Fórmula: SL = FVG Bottom - (Tamaño del FVG + Margen de seguridad)
-                # Esto asegura que el SL esté a 2.0x el tamaño del FVG debajo del FVG Bottom
-                # Cubriendo así todo el espacio del FVG (100%) + margen adicional igual (100%) = 200% del FVG
-                # Esto soporta mejor los movimientos del precio y evita SL demasiado cortos
-                calculated_sl = fvg_bottom - fvg_size - safety_margin
-                self.logger.info(f"[{symbol}] 📊 SL desde FVG: FVG Bottom={fvg_bottom:.5f} - FVG Size={fvg_size:.5f} - Safety Margin={safety_margin:.5f} = {calculated_sl:.5f}")
-                
-                # Asegurar distancia mínima del SL desde el precio de entrada
-                # El SL debe estar al menos a min_sl_distance del precio de entrada
-                # IMPORTANTE: SIEMPRE usar el MENOR entre el SL calculado y el mínimo requerido (para BUY, SL está abajo)
-                # Esto asegura que el SL tenga una distancia mínima razonable del entry,
-                # incluso cuando el entry está muy cerca del FVG o el FVG es muy pequeño
-                min_sl_price = entry_price - min_sl_distance
-                stop_loss = min(calculated_sl, min_sl_price)
-                
+            return None
+        
+        # Verificar la dirección de salida según el tipo de FVG y dirección esperada
+        # ⚠️ VALIDACIÓN CRÍTICA: El precio DEBE salir del FVG en la dirección CORRECTA
+        # Si sale en dirección INCORRECTA, se rechaza la entrada
+        required_exit = self._SWEEP_DISPATCH.get((sweep_type, direction, calculated_fvg_type))
+        if required_exit is None:
+            # Tipo de FVG no coincide con dirección esperada
+            log.info(
+                "⏸️  REGLA NO CUMPLIDA: FVG %s no coincide con dirección %s esperada", calculated_fvg_type, direction
+            )
+            return None
+        
+        # El precio ya está fuera del FVG: por debajo del bottom = salida BAJISTA, por encima del top = ALCISTA
+        exit_direction = 'BAJISTA' if current_price < fvg_bottom else 'ALCISTA'
+        if exit_direction != required_exit:
+            # ⚠️ ERROR CRÍTICO: Precio salió del FVG en la dirección contraria a la esperada
+            log.error(
+                "❌ VALIDACIÓN FALLIDA: Precio salió del FVG en dirección INCORRECTA | "
+                "FVG %s + dirección %s esperada, pero precio (%.5f) salió "
+                "%s del FVG (%.5f-%.5f) | "
+                "Debería haber salido %s - RECHAZANDO ENTRADA",
+                calculated_fvg_type, direction, current_price, exit_direction, fvg_bottom, fvg_top, required_exit
+            )
+            return None
+        
+        if log_info:
+            log.info("📍 Precio salió del FVG %s en dirección %s: Precio actual (%.5f) | FVG: %.5f-%.5f",
+                     calculated_fvg_type, exit_direction, current_price, fvg_bottom, fvg_top)
+            log.info("✅ REGLA CUMPLIDA: Vela EN FORMACIÓN entró al FVG %s y precio salió en dirección %s | "
+                     "Vela: O=%.5f H=%.5f L=%.5f C=%.5f | Precio actual: %.5f",
+                     calculated_fvg_type, exit_direction, candle_open, candle_high, candle_low, candle_close, current_price)
+            # El tipo de FVG según el barrido de H4 ya se validó con _is_expected_fvg / _SWEEP_DISPATCH
+            log.info("✅ FVG %s correcto para la estrategia (según barrido H4: %s)", fvg_type, sweep_type)
+            log.info("✅ Condiciones cumplidas - Listo para calcular entrada")
+        
+        # Calcular niveles (a partir del FVG detectado; ya se comprobó que no son None)
+        fvg_top = detected_fvg_top
+        fvg_bottom = detected_fvg_bottom
+        
+        # Calcular Stop Loss (debe cubrir TODO el espacio del FVG + margen adicional para soportar movimientos del precio)
+        # El SL debe estar lo suficientemente lejos para que si el precio retrocede y completa el FVG, el SL no se active
+        fvg_size = fvg_top - fvg_bottom
+        
+        # Obtener información del símbolo para calcular spread y distancia mínima
+        symbol_info = mt5.symbol_info(symbol)
+        if symbol_info is None:
+            return None
+        
+        spread_points = symbol_info.spread  # Spread en puntos
+        point = symbol_info.point  # Valor de un punto
+        
+        # Para calcular pips correctamente: 1 pip = 10 points para símbolos con 5 dígitos, 1 point para 3 dígitos
+        pips_to_points = 10 if symbol_info.digits == 5 else 1
+        
+        # Margen adicional estándar: 100% del tamaño del FVG (aumentado de 50% a 100%)
+        # Esto asegura que el SL cubra el espacio completo del FVG (100%) + un margen adicional igual (100%)
+        # Total: 2.0x el tamaño del FVG para soportar movimientos del precio
+        safety_margin = fvg_size * 1.0  # 100% adicional más allá del FVG
+        
+        # Distancia mínima estándar del SL: debe ser razonable para soportar movimientos del precio
+        # IMPORTANTE: La distancia mínima debe adaptarse a la temporalidad de entrada
+        # - M1: Entradas más ajustadas, SL más corto (15-20 pips)
+        # - M5 o superior: SL más amplio (30-40 pips)
+        fvg_size_pips = fvg_size * (10000 if symbol_info.digits == 5 else 100)
+        
+        # Determinar distancia mínima según temporalidad de entrada
+        entry_tf = self.entry_timeframe.upper()
+        if entry_tf == 'M1':
+            # Para M1: SL más ajustado, pero aún cubriendo el FVG bien
+            if fvg_size_pips < 3:
+                min_pips = 15  # FVG muy pequeño en M1: 15 pips mínimo
+            elif fvg_size_pips < 5:
+                min_pips = 18  # FVG pequeño en M1: 18 pips mínimo
+            else:
+                min_pips = 20  # FVG normal en M1: 20 pips mínimo
+            log.info("📏 Entrada M1: FVG %.1f pips → distancia mínima ajustada: %s pips", fvg_size_pips, min_pips)
+        else:
+            # Para M5 o superior: SL más amplio
+            if fvg_size_pips < 5:
+                # FVG muy pequeño (< 5 pips): usar distancia mínima generosa de 40 pips
+                min_pips = 40
+                log.info("📏 FVG pequeño (%.1f pips) → usando distancia mínima generosa de %s pips", fvg_size_pips, min_pips)
+            elif fvg_size_pips < 10:
+                # FVG pequeño (5-10 pips): usar distancia mínima de 35 pips
+                min_pips = 35
+                log.info("📏 FVG pequeño (%.1f pips) → usando distancia mínima de %s pips", fvg_size_pips, min_pips)
+            else:
+                # FVG normal o grande (>= 10 pips): usar distancia mínima estándar de 30 pips
+                min_pips = 30
+                log.info("📏 FVG normal (%.1f pips) → usando distancia mínima estándar de %s pips", fvg_size_pips, min_pips)
+        
+        # La distancia mínima debe ser el mayor entre:
+        # 1. 5x el spread (mínimo por spread)
+        # 2. La distancia mínima en pips (30-40 pips según tamaño del FVG)
+        # 3. 2.5x el tamaño del FVG (solo si el FVG es grande, para cubrirlo bien)
+        # Se compara en puntos enteros (spread ya viene en puntos desde MT5) y se convierte
+        # a precio con una única multiplicación al final. El tamaño del FVG es un número entero
+        # de puntos: se redondea antes del ceil para que el ruido de fvg_size / point no sume un punto
+        min_sl_points = max(
+            spread_points * 5,  # 5x el spread como mínimo
+            min_pips * pips_to_points,  # Mínimo 30-40 pips según tamaño del FVG
+            math.ceil(round(fvg_size / point) * 2.5)  # 2.5x el tamaño del FVG para cubrirlo bien + margen adicional
+        )
+        min_sl_distance = min_sl_points * point
+        
+        if log_info:
+            pips_factor = 10000 if symbol_info.digits == 5 else 100
+            log.info("📐 Cálculo SL: FVG Size=%.5f (%.1f pips) | Safety Margin=%.5f (%.1f pips) | Min Distance=%.5f (%.1f pips)",
+                     fvg_size, fvg_size_pips, safety_margin, safety_margin * pips_factor,
+                     min_sl_distance, min_sl_distance * pips_factor)
+        
+        # ⚡ ORDEN A MERCADO: Usar precio actual del mercado (bid/ask)
+        # Para órdenes a mercado, el precio de entrada es el precio actual del mercado
+        # La optimización viene de entrar cuando el precio ya salió del FVG (mejor momento)
+        
+        if direction == 'BULLISH':
+            # Compra: Orden a mercado se ejecuta al precio ASK actual
+            entry_price = float(tick.ask)
+            log.info("💹 Entrada a mercado (BUY): Precio ASK actual = %.5f", entry_price)
+            
+            # SL debajo del FVG: cubre el espacio completo del FVG + margen adicional estándar
+            # Fórmula: SL = FVG Bottom - (Tamaño del FVG + Margen de seguridad)
+            # Esto asegura que el SL esté a 2.0x el tamaño del FVG debajo del FVG Bottom
+            # Cubriendo así todo el espacio del FVG (100%) + margen adicional igual (100%) = 200% del FVG
+            # Esto soporta mejor los movimientos del precio y evita SL demasiado cortos
+            calculated_sl = fvg_bottom - fvg_size - safety_margin
+            log.info("📊 SL desde FVG: FVG Bottom=%.5f - FVG Size=%.5f - Safety Margin=%.5f = %.5f", fvg_bottom, fvg_size, safety_margin, calculated_sl)
+            
+            # Asegurar distancia mínima del SL desde el precio de entrada
+            # El SL debe estar al menos a min_sl_distance del precio de entrada
+            # IMPORTANTE: SIEMPRE usar el MENOR entre el SL calculado y el mínimo requerido (para BUY, SL está abajo)
+            # Esto asegura que el SL tenga una distancia mínima razonable del entry,
+            # incluso cuando el entry está muy cerca del FVG o el FVG es muy pequeño
+            min_sl_price = entry_price - min_sl_distance
+            stop_loss = min(calculated_sl, min_sl_price)
+            
+            # Diagnóstico de cobertura del SL: solo se calcula si el nivel INFO está activo
+            if log_info:
                 # Calcular distancia final del SL al entry
                 final_sl_distance = abs(entry_price - stop_loss)
                 
@@ -1086,39 +1331,41 @@ class TurtleSoupFVGStrategy(BaseStrategy):
                 
                 if stop_loss < calculated_sl:
                     # SL fue ajustado por distancia mínima (más lejos del entry = más seguro)
-                    self.logger.info(f"[{symbol}] ⚠️  SL ajustado por distancia mínima: {calculated_sl:.5f} → {stop_loss:.5f}")
-                    self.logger.info(f"[{symbol}]    Mínimo requerido: {min_sl_price:.5f} | Distancia mínima: {min_sl_distance:.5f} ({pips_min:.1f} pips)")
-                    self.logger.info(f"[{symbol}]    Distancia final del SL al entry: {final_sl_distance:.5f} ({pips_final:.1f} pips)")
-                    self.logger.info(f"[{symbol}]    Cobertura del FVG: {sl_to_fvg_bottom:.5f} ({pips_coverage:.1f} pips) | Requerido: {required_coverage:.5f} ({pips_required:.1f} pips)")
+                    log.info("⚠️  SL ajustado por distancia mínima: %.5f → %.5f", calculated_sl, stop_loss)
+                    log.info("   Mínimo requerido: %.5f | Distancia mínima: %.5f (%.1f pips)", min_sl_price, min_sl_distance, pips_min)
+                    log.info("   Distancia final del SL al entry: %.5f (%.1f pips)", final_sl_distance, pips_final)
+                    log.info("   Cobertura del FVG: %.5f (%.1f pips) | Requerido: %.5f (%.1f pips)", sl_to_fvg_bottom, pips_coverage, required_coverage, pips_required)
                 else:
                     # SL calculado cubre el FVG adecuadamente
-                    self.logger.info(f"[{symbol}] ✅ SL calculado cubre FVG adecuadamente: {stop_loss:.5f}")
-                    self.logger.info(f"[{symbol}]    Distancia desde entry: {final_sl_distance:.5f} ({pips_final:.1f} pips)")
-                    self.logger.info(f"[{symbol}]    Cobertura del FVG: {sl_to_fvg_bottom:.5f} ({pips_coverage:.1f} pips) | Requerido: {required_coverage:.5f} ({pips_required:.1f} pips)")
-                
-                take_profit = target_price
-                self.logger.info(f"[{symbol}] 🛑 SL calculado: {stop_loss:.5f} (FVG Bottom: {fvg_bottom:.5f} - FVG Size: {fvg_size:.5f} - Safety Margin: {safety_margin:.5f} - Min Distance: {min_sl_distance:.5f})")
-            else:
-                # Venta: Orden a mercado se ejecuta al precio BID actual
-                entry_price = float(tick.bid)
-                self.logger.info(f"[{symbol}] 💹 Entrada a mercado (SELL): Precio BID actual = {entry_price:.5f}")
-                
-                # SL arriba del FVG: cubre el espacio completo del FVG + margen adicional estándar
-                # Fórmula: SL = FVG Top + (Tamaño del FVG + Margen de seguridad)
-                # Esto asegura que el SL esté a 2.0x el tamaño del FVG arriba del FVG Top
-                # Cubriendo así todo el espacio del FVG (100%) + margen adicional igual (100%) = 200% del FVG
-                # Esto soporta mejor los movimientos del precio y evita SL demasiado cortos
-                calculated_sl = fvg_top + fvg_size + safety_margin
-                self.logger.info(f"[{symbol}] 📊 SL desde FVG: FVG Top={fvg_top:.5f} + FVG Size={fvg_size:.5f} + Safety Margin={safety_margin:.5f} = {calculated_sl:.5f}")
-                
-                # Asegurar distancia mínima del SL desde el precio de entrada
-                # El SL debe estar al menos a min_sl_distance del precio de entrada
-                # IMPORTANTE: SIEMPRE usar el MAYOR entre el SL calculado y el mínimo requerido
-                # Esto asegura que el SL tenga una distancia mínima razonable del entry,
-                # incluso cuando el entry está muy cerca del FVG o el FVG es muy pequeño
-                min_sl_price = entry_price + min_sl_distance
-                stop_loss = max(calculated_sl, min_sl_price)
-                
+                    log.info("✅ SL calculado cubre FVG adecuadamente: %.5f", stop_loss)
+                    log.info("   Distancia desde entry: %.5f (%.1f pips)", final_sl_distance, pips_final)
+                    log.info("   Cobertura del FVG: %.5f (%.1f pips) | Requerido: %.5f (%.1f pips)", sl_to_fvg_bottom, pips_coverage, required_coverage, pips_required)
+            
+            take_profit = target_price
+            log.info("🛑 SL calculado: %.5f (FVG Bottom: %.5f - FVG Size: %.5f - Safety Margin: %.5f - Min Distance: %.5f)", stop_loss, fvg_bottom, fvg_size, safety_margin, min_sl_distance)
+        else:
+            # Venta: Orden a mercado se ejecuta al precio BID actual
+            entry_price = float(tick.bid)
+            log.info("💹 Entrada a mercado (SELL): Precio BID actual = %.5f", entry_price)
+            
+            # SL arriba del FVG: cubre el espacio completo del FVG + margen adicional estándar
+            # Fórmula: SL = FVG Top + (Tamaño del FVG + Margen de seguridad)
+            # Esto asegura que el SL esté a 2.0x el tamaño del FVG arriba del FVG Top
+            # Cubriendo así todo el espacio del FVG (100%) + margen adicional igual (100%) = 200% del FVG
+            # Esto soporta mejor los movimientos del precio y evita SL demasiado cortos
+            calculated_sl = fvg_top + fvg_size + safety_margin
+            log.info("📊 SL desde FVG: FVG Top=%.5f + FVG Size=%.5f + Safety Margin=%.5f = %.5f", fvg_top, fvg_size, safety_margin, calculated_sl)
+            
+            # Asegurar distancia mínima del SL desde el precio de entrada
+            # El SL debe estar al menos a min_sl_distance del precio de entrada
+            # IMPORTANTE: SIEMPRE usar el MAYOR entre el SL calculado y el mínimo requerido
+            # Esto asegura que el SL tenga una distancia mínima razonable del entry,
+            # incluso cuando el entry está muy cerca del FVG o el FVG es muy pequeño
+            min_sl_price = entry_price + min_sl_distance
+            stop_loss = max(calculated_sl, min_sl_price)
+            
+            # Diagnóstico de cobertura del SL: solo se calcula si el nivel INFO está activo
+            if log_info:
                 # Calcular distancia final del SL al entry
                 final_sl_distance = abs(entry_price - stop_loss)
                 
@@ -1134,146 +1381,62 @@ class TurtleSoupFVGStrategy(BaseStrategy):
                 
                 if stop_loss > calculated_sl:
                     # SL fue ajustado por distancia mínima (más lejos del entry = más seguro)
-                    self.logger.info(f"[{symbol}] ⚠️  SL ajustado por distancia mínima: {calculated_sl:.5f} → {stop_loss:.5f}")
-                    self.logger.info(f"[{symbol}]    Mínimo requerido: {min_sl_price:.5f} | Distancia mínima: {min_sl_distance:.5f} ({pips_min:.1f} pips)")
-                    self.logger.info(f"[{symbol}]    Distancia final del SL al entry: {final_sl_distance:.5f} ({pips_final:.1f} pips)")
-                    self.logger.info(f"[{symbol}]    Cobertura del FVG: {sl_to_fvg_top:.5f} ({pips_coverage:.1f} pips) | Requerido: {required_coverage:.5f} ({pips_required:.1f} pips)")
+                    log.info("⚠️  SL ajustado por distancia mínima: %.5f → %.5f", calculated_sl, stop_loss)
+                    log.info("   Mínimo requerido: %.5f | Distancia mínima: %.5f (%.1f pips)", min_sl_price, min_sl_distance, pips_min)
+                    log.info("   Distancia final del SL al entry: %.5f (%.1f pips)", final_sl_distance, pips_final)
+                    log.info("   Cobertura del FVG: %.5f (%.1f pips) | Requerido: %.5f (%.1f pips)", sl_to_fvg_top, pips_coverage, required_coverage, pips_required)
                 else:
                     # SL calculado cubre el FVG adecuadamente
-                    self.logger.info(f"[{symbol}] ✅ SL calculado cubre FVG adecuadamente: {stop_loss:.5f}")
-                    self.logger.info(f"[{symbol}]    Distancia desde entry: {final_sl_distance:.5f} ({pips_final:.1f} pips)")
-                    self.logger.info(f"[{symbol}]    Cobertura del FVG: {sl_to_fvg_top:.5f} ({pips_coverage:.1f} pips) | Requerido: {required_coverage:.5f} ({pips_required:.1f} pips)")
-                
-                take_profit = target_price
-                self.logger.info(f"[{symbol}] 🛑 SL calculado: {stop_loss:.5f} (FVG Top: {fvg_top:.5f} + FVG Size: {fvg_size:.5f} + Safety Margin: {safety_margin:.5f} + Min Distance: {min_sl_distance:.5f})")
-            
-            # Verificar y ajustar Risk/Reward (mínimo: min_rr, máximo: min_rr)
-            # El TP debe estar limitado para que el RR no exceda el máximo permitido (1:2)
-            risk = abs(entry_price - stop_loss)
+                    log.info("✅ SL calculado cubre FVG adecuadamente: %.5f", stop_loss)
+                    log.info("   Distancia desde entry: %.5f (%.1f pips)", final_sl_distance, pips_final)
+                    log.info("   Cobertura del FVG: %.5f (%.1f pips) | Requerido: %.5f (%.1f pips)", sl_to_fvg_top, pips_coverage, required_coverage, pips_required)
             
-            if risk == 0:
+            take_profit = target_price
+            log.info("🛑 SL calculado: %.5f (FVG Top: %.5f + FVG Size: %.5f + Safety Margin: %.5f + Min Distance: %.5f)", stop_loss, fvg_top, fvg_size, safety_margin, min_sl_distance)
+        
+        # Verificar y ajustar Risk/Reward (mínimo: min_rr, máximo: min_rr)
+        # El TP debe estar limitado para que el RR no exceda el máximo permitido (1:2)
+        max_rr = self.min_rr  # RR máximo = RR mínimo (1:2)
+        status, stop_loss, take_profit, risk, reward, rr, initial_rr, new_rr = _rr_kernel(
+            1 if direction == 'BULLISH' else -1, entry_price, stop_loss, target_price,
+            fvg_top, fvg_bottom, float(self.min_rr), self._inv_min_rr
+        )
+        
+        if status == -1:
+            return None
+        
+        if initial_rr > max_rr:
+            log.info(
+                "⚠️  TP ajustado: RR inicial (%.2f) excedía el máximo permitido (%.2f) | "
+                "TP original: %.5f → TP ajustado: %.5f | "
+                "RR final: %.2f",
+                initial_rr, max_rr, target_price, take_profit, max_rr
+            )
+        
+        if status == 0:
+            log.info("📈 Calculando RR: Risk=%.5f, Reward=%.5f, RR=%.2f (mínimo requerido: %s, máximo: %s)", risk, reward, rr, self.min_rr, max_rr)
+            log.info("✅ RR válido: %.2f (dentro del rango %s-%s) - Etapa 3/4 COMPLETA", rr, self.min_rr, max_rr)
+        else:
+            log.info("⏸️  Esperando: RR insuficiente (%.2f < %s). Intentando optimizar SL...", initial_rr, self.min_rr)
+            if status == 1:
+                log.info("✅ SL optimizado: Nuevo RR=%.2f", rr)
+            elif status == -2:
+                log.info("⏸️  Esperando: SL optimizado no alcanza RR válido (RR=%.2f, requiere: %s-%s)", new_rr, self.min_rr, max_rr)
                 return None
-            
-            # Calcular RR con el TP del target_price
-            initial_reward = abs(take_profit - entry_price)
-            initial_rr = initial_reward / risk
-            
-            # ⚠️ LIMITAR TP: Si el RR es mayor que el máximo permitido, ajustar TP para que RR = max_rr
-            max_rr = self.min_rr  # RR máximo = RR mínimo (1:2)
-            
-            if initial_rr > max_rr:
-                # Ajustar TP para que el RR sea exactamente el máximo permitido
-                max_reward = risk * max_rr
-                if direction == 'BULLISH':
-                    # Compra: TP debe estar arriba del entry
-                    take_profit = entry_price + max_reward
-                else:
-                    # Venta: TP debe estar debajo del entry
-                    take_profit = entry_price - max_reward
-                
-                reward = max_reward
-                rr = max_rr
-                
-                self.logger.info(
-                    f"[{symbol}] ⚠️  TP ajustado: RR inicial ({initial_rr:.2f}) excedía el máximo permitido ({max_rr:.2f}) | "
-                    f"TP original: {turtle_soup.get('target_price'):.5f} → TP ajustado: {take_profit:.5f} | "
-                    f"RR final: {rr:.2f}"
-                )
-            else:
-                reward = initial_reward
-                rr = initial_rr
-            
-            self.logger.info(f"[{symbol}] 📈 Calculando RR: Risk={risk:.5f}, Reward={reward:.5f}, RR={rr:.2f} (mínimo requerido: {self.min_rr}, máximo: {max_rr})")
-            
-            if rr < self.min_rr:
-                self.logger.info(f"[{symbol}] ⏸️  Esperando: RR insuficiente ({rr:.2f} < {self.min_rr}). Intentando optimizar SL...")
-                # Intentar ajustar SL si es posible
-                adjusted_sl = self._optimize_sl(entry_price, take_profit, direction, fvg_top, fvg_bottom)
-                if adjusted_sl:
-                    new_risk = abs(entry_price - adjusted_sl)
-                    new_rr = reward / new_risk
-                    if new_rr >= self.min_rr and new_rr <= max_rr:
-                        stop_loss = adjusted_sl
-                        rr = new_rr
-                        risk = new_risk
-                        self.logger.info(f"[{symbol}] ✅ SL optimizado: Nuevo RR={rr:.2f}")
-                    else:
-                        self.logger.info(f"[{symbol}] ⏸️  Esperando: SL optimizado no alcanza RR válido (RR={new_rr:.2f}, requiere: {self.min_rr}-{max_rr})")
-                        return None
-                else:
-                    self.logger.info(f"[{symbol}] ⏸️  Esperando: No se pudo optimizar SL para alcanzar RR mínimo")
-                    return None
             else:
-                self.logger.info(f"[{symbol}] ✅ RR válido: {rr:.2f} (dentro del rango {self.min_rr}-{max_rr}) - Etapa 3/4 COMPLETA")
-            
-            return {
-                'direction': direction,
-                'entry_price': entry_price,
-                'stop_loss': stop_loss,
-                'take_profit': take_profit,
-                'risk': risk,
-                'reward': reward,
-                'rr': rr,
-                'fvg': fvg
-            }
-            
-        except Exception as e:
-            self.logger.error(f"Error al buscar entrada FVG: {e}", exc_info=True)
-            return None
-    
-    def _optimize_sl(self, entry_price: float, take_profit: float, direction: str, 
-                    fvg_top: float, fvg_bottom: float) -> Optional[float]:
-        """
-        Intenta optimizar el SL para lograr RR mínimo respetando el margen de seguridad del FVG
+                log.info("⏸️  Esperando: No se pudo optimizar SL para alcanzar RR mínimo")
+                return None
         
-        Args:
-            entry_price: Precio de entrada
-            take_profit: Precio objetivo
-            direction: Dirección de la operación
-            fvg_top: Top del FVG
-            fvg_bottom: Bottom del FVG
-            
-        Returns:
-            SL optimizado o None
-        """
-        try:
-            reward = abs(take_profit - entry_price)
-            required_risk = reward / self.min_rr
-            fvg_size = fvg_top - fvg_bottom
-            safety_margin = fvg_size * 0.3  # 30% adicional más allá del FVG (reducido de 50% para SL más corto)
-            
-            if direction == 'BULLISH':
-                # Compra: SL debe estar debajo del entry
-                optimal_sl = entry_price - required_risk
-                # Calcular el SL mínimo requerido (FVG bottom - tamaño FVG - margen)
-                min_sl_required = fvg_bottom - fvg_size - safety_margin
-                # El SL optimizado debe estar al menos al nivel mínimo requerido
-                if optimal_sl <= min_sl_required:
-                    return optimal_sl
-                else:
-                    # Si el SL optimizado está muy cerca del FVG, usar el mínimo requerido
-                    # pero verificar que aún cumpla con el RR mínimo
-                    if min_sl_required < entry_price:
-                        return min_sl_required
-            else:
-                # Venta: SL debe estar arriba del entry
-                optimal_sl = entry_price + required_risk
-                # Calcular el SL mínimo requerido (FVG top + tamaño FVG + margen)
-                min_sl_required = fvg_top + fvg_size + safety_margin
-                # El SL optimizado debe estar al menos al nivel mínimo requerido
-                if optimal_sl >= min_sl_required:
-                    return optimal_sl
-                else:
-                    # Si el SL optimizado está muy cerca del FVG, usar el mínimo requerido
-                    # pero verificar que aún cumpla con el RR mínimo
-                    if min_sl_required > entry_price:
-                        return min_sl_required
-            
-            return None
-            
-        except Exception as e:
-            self.logger.error(f"Error al optimizar SL: {e}")
-            return None
+        return {
+            'direction': direction,
+            'entry_price': entry_price,
+            'stop_loss': stop_loss,
+            'take_profit': take_profit,
+            'risk': risk,
+            'reward': reward,
+            'rr': rr,
+            'fvg': fvg
+        }
     
     def _execute_order(self, symbol: str, turtle_soup: Dict, entry_signal: Dict) -> Optional[Dict]:
         """
@@ -1287,716 +1450,701 @@ class TurtleSoupFVGStrategy(BaseStrategy):
         Returns:
             Dict con resultado de la orden
         """
-        try:
-            # ⚠️ VALIDACIÓN CRÍTICA FINAL: Verificar que la VELA EN FORMACIÓN (junto con las 2 anteriores) formen el FVG esperado
-            # Esta es la validación final más estricta antes de ejecutar la orden
-            self.logger.info(f"[{symbol}] 🔍 Validación final estricta: Verificando vela EN FORMACIÓN + 2 anteriores forman FVG esperado...")
-            
-            # Obtener las 3 velas: vela en formación (posición 0) + 2 anteriores (posición 1 y 2)
-            timeframe_map = {
-                'M1': mt5.TIMEFRAME_M1,
-                'M5': mt5.TIMEFRAME_M5,
-                'M15': mt5.TIMEFRAME_M15,
-                'M30': mt5.TIMEFRAME_M30,
-                'H1': mt5.TIMEFRAME_H1,
-                'H4': mt5.TIMEFRAME_H4,
-                'D1': mt5.TIMEFRAME_D1,
-            }
-            tf = timeframe_map.get(self.entry_timeframe.upper(), mt5.TIMEFRAME_M5)
-            rates = mt5.copy_rates_from_pos(symbol, tf, 0, 3)  # Obtener 3 velas: actual (pos 0), anterior1 (pos 1), anterior2 (pos 2)
-            
-            if rates is None or len(rates) < 3:
-                self.logger.error(f"[{symbol}] ❌ VALIDACIÓN FALLIDA: No se pudo obtener las 3 velas necesarias - Cancelando orden")
-                return None
-            
-            # Ordenar por tiempo para tener: vela1 (más antigua), vela2 (del medio), vela3 (actual/en formación)
-            candles_data = []
-            for i, candle_data in enumerate(rates):
-                candles_data.append({
-                    'open': float(candle_data['open']),
-                    'high': float(candle_data['high']),
-                    'low': float(candle_data['low']),
-                    'close': float(candle_data['close']),
-                    'time': datetime.fromtimestamp(candle_data['time'])
-                })
-            
-            candles_data = sorted(candles_data, key=lambda x: x['time'])
-            vela1 = candles_data[0]  # Más antigua
-            vela2 = candles_data[1]    # Del medio
-            vela3 = candles_data[2]    # Actual/en formación
-            
-            # VALIDACIÓN FINAL 0: Verificar que las 3 velas forman el FVG esperado
-            fvg_formed = False
-            calculated_fvg_bottom = None
-            calculated_fvg_top = None
-            calculated_fvg_type = None
-            
-            # Verificar FVG ALCISTA entre vela1 y vela3
-            if vela1['low'] < vela3['high'] and vela3['low'] > vela1['high']:
-                calculated_fvg_bottom = vela1['high']
-                calculated_fvg_top = vela3['low']
-                calculated_fvg_type = 'ALCISTA'
-                fvg_formed = True
-            
-            # Verificar FVG BAJISTA entre vela1 y vela3
-            elif vela1['high'] > vela3['low'] and vela3['high'] < vela1['low']:
-                calculated_fvg_bottom = vela3['high']
-                calculated_fvg_top = vela1['low']
-                calculated_fvg_type = 'BAJISTA'
-                fvg_formed = True
-            
-            if not fvg_formed:
-                self.logger.error(f"[{symbol}] ❌ VALIDACIÓN FALLIDA: Las 3 velas NO forman un FVG válido - Cancelando orden")
-                return None
-            
-            # Verificar que el FVG formado es del tipo esperado
-            expected_fvg_type = None
-            sweep_type = turtle_soup.get('sweep_type')
-            direction = entry_signal['direction']
-            if sweep_type == 'BULLISH_SWEEP' and direction == 'BEARISH':
-                expected_fvg_type = 'BAJISTA'
-            elif sweep_type == 'BEARISH_SWEEP' and direction == 'BULLISH':
-                expected_fvg_type = 'ALCISTA'
-            
-            if calculated_fvg_type != expected_fvg_type:
-                self.logger.error(
-                    f"[{symbol}] ❌ VALIDACIÓN FALLIDA: FVG formado es {calculated_fvg_type} pero esperábamos {expected_fvg_type} - Cancelando orden"
+        log = self._symbol_log(symbol)
+        # ⚠️ VALIDACIÓN CRÍTICA FINAL: Verificar que la VELA EN FORMACIÓN (junto con las 2 anteriores) formen el FVG esperado
+        # Esta es la validación final más estricta antes de ejecutar la orden
+        log.info("🔍 Validación final estricta: Verificando vela EN FORMACIÓN + 2 anteriores forman FVG esperado...")
+        
+        # Obtener las 3 velas: vela en formación (posición 0) + 2 anteriores (posición 1 y 2)
+        timeframe_map = {
+            'M1': mt5.TIMEFRAME_M1,
+            'M5': mt5.TIMEFRAME_M5,
+            'M15': mt5.TIMEFRAME_M15,
+            'M30': mt5.TIMEFRAME_M30,
+            'H1': mt5.TIMEFRAME_H1,
+            'H4': mt5.TIMEFRAME_H4,
+            'D1': mt5.TIMEFRAME_D1,
+        }
+        tf = timeframe_map.get(self.entry_timeframe.upper(), mt5.TIMEFRAME_M5)
+        rates = mt5.copy_rates_from_pos(symbol, tf, 0, 3)  # Obtener 3 velas: actual (pos 0), anterior1 (pos 1), anterior2 (pos 2)
+        
+        if rates is None or len(rates) < 3:
+            log.error("❌ VALIDACIÓN FALLIDA: No se pudo obtener las 3 velas necesarias - Cancelando orden")
+            return None
+        
+        # Ordenar por tiempo para tener: vela1 (más antigua), vela2 (del medio), vela3 (actual/en formación)
+        candles_data = []
+        for i, candle_data in enumerate(rates):
+            candles_data.append({
+                'open': float(candle_data['open']),
+                'high': float(candle_data['high']),
+                'low': float(candle_data['low']),
+                'close': float(candle_data['close']),
+                'time': datetime.fromtimestamp(candle_data['time'])
+            })
+        
+        candles_data = sorted(candles_data, key=lambda x: x['time'])
+        vela1 = candles_data[0]  # Más antigua
+        vela2 = candles_data[1]    # Del medio
+        vela3 = candles_data[2]    # Actual/en formación
+        
+        # VALIDACIÓN FINAL 0: Verificar que las 3 velas forman el FVG esperado
+        fvg_formed = False
+        calculated_fvg_bottom = None
+        calculated_fvg_top = None
+        calculated_fvg_type = None
+        
+        # Verificar FVG ALCISTA entre vela1 y vela3
+        if vela1['low'] < vela3['high'] and vela3['low'] > vela1['high']:
+            calculated_fvg_bottom = vela1['high']
+            calculated_fvg_top = vela3['low']
+            calculated_fvg_type = 'ALCISTA'
+            fvg_formed = True
+        
+        # Verificar FVG BAJISTA entre vela1 y vela3
+        elif vela1['high'] > vela3['low'] and vela3['high'] < vela1['low']:
+            calculated_fvg_bottom = vela3['high']
+            calculated_fvg_top = vela1['low']
+            calculated_fvg_type = 'BAJISTA'
+            fvg_formed = True
+        
+        if not fvg_formed:
+            log.error("❌ VALIDACIÓN FALLIDA: Las 3 velas NO forman un FVG válido - Cancelando orden")
+            return None
+        
+        # Verificar que el FVG formado es del tipo esperado
+        sweep_type = turtle_soup.get('sweep_type')
+        direction = entry_signal['direction']
+        # Sentido resuelto una vez: el resto de la validación/ejecución compara un bool, no strings
+        is_buy = direction == 'BULLISH'
+        if (sweep_type, direction, calculated_fvg_type) not in self._SWEEP_DISPATCH:
+            log.error(
+                "❌ VALIDACIÓN FALLIDA: FVG formado es %s, que no corresponde al barrido "
+                "%s → %s - Cancelando orden",
+                calculated_fvg_type, sweep_type, direction
+            )
+            return None
+        
+        # Usar el FVG calculado
+        fvg_bottom = calculated_fvg_bottom
+        fvg_top = calculated_fvg_top
+        
+        # Obtener información de la vela EN FORMACIÓN (vela3)
+        candle_high = vela3.get('high')
+        candle_low = vela3.get('low')
+        candle_close = vela3.get('close')
+        candle_time = vela3.get('time')
+        
+        # Obtener precio actual (bid) para validar salida
+        tick = mt5.symbol_info_tick(symbol)
+        if tick is None:
+            log.error("❌ VALIDACIÓN FALLIDA: No se pudo obtener precio actual - Cancelando orden")
+            return None
+        current_price = float(tick.bid)
+        
+        log.info("📊 Validando vela EN FORMACIÓN: %s | H=%.5f L=%.5f C=%.5f | Precio actual: %.5f", candle_time.strftime('%Y-%m-%d %H:%M:%S'), candle_high, candle_low, candle_close, current_price)
+        log.info("📊 FVG calculado: %s | Bottom: %.5f | Top: %.5f", calculated_fvg_type, fvg_bottom, fvg_top)
+        
+        # ⚠️ VALIDACIÓN CRÍTICA FINAL 1: La vela EN FORMACIÓN (vela3) DEBE haber entrado al FVG
+        # Esta es la validación MÁS ESTRICTA antes de ejecutar - NO SE PUEDE EJECUTAR si la vela NO entró
+        # REGLA ESPECÍFICA POR TIPO DE FVG:
+        # - FVG BAJISTA: El HIGH de la vela DEBE estar dentro del FVG [fvg_bottom, fvg_top]
+        # - FVG ALCISTA: El LOW de la vela DEBE estar dentro del FVG [fvg_bottom, fvg_top]
+        candle_entered = False
+        
+        if calculated_fvg_type == 'BAJISTA':
+            # FVG BAJISTA: HIGH debe estar dentro del FVG - VERIFICACIÓN ESTRICTA
+            if fvg_bottom <= candle_high <= fvg_top:
+                candle_entered = True
+                log.info("✅ VALIDACIÓN: HIGH (%.5f) está dentro del FVG BAJISTA (%.5f-%.5f)", candle_high, fvg_bottom, fvg_top)
+            else:
+                log.error(
+                    "❌ VALIDACIÓN FALLIDA: Para FVG BAJISTA, HIGH (%.5f) NO está dentro del FVG (%.5f-%.5f) | "
+                    "Vela: H=%.5f L=%.5f | "
+                    "La vela NO entró al FVG - CANCELANDO ORDEN",
+                    candle_high, fvg_bottom, fvg_top, candle_high, candle_low
                 )
                 return None
-            
-            # Usar el FVG calculado
-            fvg_bottom = calculated_fvg_bottom
-            fvg_top = calculated_fvg_top
-            
-            # Obtener información de la vela EN FORMACIÓN (vela3)
-            candle_high = vela3.get('high')
-            candle_low = vela3.get('low')
-            candle_close = vela3.get('close')
-            candle_time = vela3.get('time')
-            
-            # Obtener precio actual (bid) para validar salida
-            tick = mt5.symbol_info_tick(symbol)
-            if tick is None:
-                self.logger.error(f"[{symbol}] ❌ VALIDACIÓN FALLIDA: No se pudo obtener precio actual - Cancelando orden")
-                return None
-            current_price = float(tick.bid)
-            
-            self.logger.info(f"[{symbol}] 📊 Validando vela EN FORMACIÓN: {candle_time.strftime('%Y-%m-%d %H:%M:%S')} | H={candle_high:.5f} L={candle_low:.5f} C={candle_close:.5f} | Precio actual: {current_price:.5f}")
-            self.logger.info(f"[{symbol}] 📊 FVG calculado: {calculated_fvg_type} | Bottom: {fvg_bottom:.5f} | Top: {fvg_top:.5f}")
-            
-            # ⚠️ VALIDACIÓN CRÍTICA FINAL 1: La vela EN FORMACIÓN (vela3) DEBE haber entrado al FVG
-            # Esta es la validación MÁS ESTRICTA antes de ejecutar - NO SE PUEDE EJECUTAR si la vela NO entró
-            # REGLA ESPECÍFICA POR TIPO DE FVG:
-            # - FVG BAJISTA: El HIGH de la vela DEBE estar dentro del FVG [fvg_bottom, fvg_top]
-            # - FVG ALCISTA: El LOW de la vela DEBE estar dentro del FVG [fvg_bottom, fvg_top]
-            candle_entered = False
-            
-            if calculated_fvg_type == 'BAJISTA':
-                # FVG BAJISTA: HIGH debe estar dentro del FVG - VERIFICACIÓN ESTRICTA
-                if fvg_bottom <= candle_high <= fvg_top:
-                    candle_entered = True
-                    self.logger.info(f"[{symbol}] ✅ VALIDACIÓN: HIGH ({candle_high:.5f}) está dentro del FVG BAJISTA ({fvg_bottom:.5f}-{fvg_top:.5f})")
-                else:
-                    self.logger.error(
-                        f"[{symbol}] ❌ VALIDACIÓN FALLIDA: Para FVG BAJISTA, HIGH ({candle_high:.5f}) NO está dentro del FVG ({fvg_bottom:.5f}-{fvg_top:.5f}) | "
-                        f"Vela: H={candle_high:.5f} L={candle_low:.5f} | "
-                        f"La vela NO entró al FVG - CANCELANDO ORDEN"
-                    )
-                    return None
-            elif calculated_fvg_type == 'ALCISTA':
-                # FVG ALCISTA: LOW debe estar dentro del FVG - VERIFICACIÓN ESTRICTA
-                if fvg_bottom <= candle_low <= fvg_top:
-                    candle_entered = True
-                    self.logger.info(f"[{symbol}] ✅ VALIDACIÓN: LOW ({candle_low:.5f}) está dentro del FVG ALCISTA ({fvg_bottom:.5f}-{fvg_top:.5f})")
-                else:
-                    self.logger.error(
-                        f"[{symbol}] ❌ VALIDACIÓN FALLIDA: Para FVG ALCISTA, LOW ({candle_low:.5f}) NO está dentro del FVG ({fvg_bottom:.5f}-{fvg_top:.5f}) | "
-                        f"Vela: H={candle_high:.5f} L={candle_low:.5f} | "
-                        f"La vela NO entró al FVG - CANCELANDO ORDEN"
-                    )
-                    return None
-            
-            # Verificación adicional de seguridad (no debería llegar aquí si no entró)
-            if not candle_entered:
-                self.logger.error(
-                    f"[{symbol}] ❌ VALIDACIÓN FALLIDA: La vela EN FORMACIÓN NO entró al FVG {calculated_fvg_type} | "
-                    f"Vela: H={candle_high:.5f} L={candle_low:.5f} C={candle_close:.5f} | "
-                    f"FVG: {fvg_bottom:.5f}-{fvg_top:.5f} | CANCELANDO ORDEN - NO SE EJECUTARÁ"
+        elif calculated_fvg_type == 'ALCISTA':
+            # FVG ALCISTA: LOW debe estar dentro del FVG - VERIFICACIÓN ESTRICTA
+            if fvg_bottom <= candle_low <= fvg_top:
+                candle_entered = True
+                log.info("✅ VALIDACIÓN: LOW (%.5f) está dentro del FVG ALCISTA (%.5f-%.5f)", candle_low, fvg_bottom, fvg_top)
+            else:
+                log.error(
+                    "❌ VALIDACIÓN FALLIDA: Para FVG ALCISTA, LOW (%.5f) NO está dentro del FVG (%.5f-%.5f) | "
+                    "Vela: H=%.5f L=%.5f | "
+                    "La vela NO entró al FVG - CANCELANDO ORDEN",
+                    candle_low, fvg_bottom, fvg_top, candle_high, candle_low
                 )
                 return None
-            
-            # VALIDACIÓN FINAL 2: El precio actual DEBE haber salido del FVG en la dirección correcta
-            # Usamos precio actual (bid) para validar salida, no el CLOSE de la vela
-            price_outside = (current_price < fvg_bottom) or (current_price > fvg_top)
-            if not price_outside:
-                self.logger.error(
-                    f"[{symbol}] ❌ VALIDACIÓN FALLIDA: El precio actual ({current_price:.5f}) NO salió del FVG | "
-                    f"Precio está DENTRO del FVG ({fvg_bottom:.5f}-{fvg_top:.5f}) - Cancelando orden"
+        
+        # Verificación adicional de seguridad (no debería llegar aquí si no entró)
+        if not candle_entered:
+            log.error(
+                "❌ VALIDACIÓN FALLIDA: La vela EN FORMACIÓN NO entró al FVG %s | "
+                "Vela: H=%.5f L=%.5f C=%.5f | "
+                "FVG: %.5f-%.5f | CANCELANDO ORDEN - NO SE EJECUTARÁ",
+                calculated_fvg_type, candle_high, candle_low, candle_close, fvg_bottom, fvg_top
+            )
+            return None
+        
+        # VALIDACIÓN FINAL 2: El precio actual DEBE haber salido del FVG en la dirección correcta
+        # Usamos precio actual (bid) para validar salida, no el CLOSE de la vela
+        price_outside = (current_price < fvg_bottom) or (current_price > fvg_top)
+        if not price_outside:
+            log.error(
+                "❌ VALIDACIÓN FALLIDA: El precio actual (%.5f) NO salió del FVG | "
+                "Precio está DENTRO del FVG (%.5f-%.5f) - Cancelando orden",
+                current_price, fvg_bottom, fvg_top
+            )
+            return None
+        
+        # VALIDACIÓN FINAL 3: La dirección de salida DEBE ser correcta
+        # ⚠️ VALIDACIÓN CRÍTICA: El precio DEBE salir del FVG en la dirección CORRECTA
+        # Si sale en dirección INCORRECTA, se CANCELA la orden
+        if calculated_fvg_type == 'BAJISTA' and not is_buy:
+            # FVG BAJISTA + dirección BEARISH: precio debe estar DEBAJO del FVG
+            if current_price < fvg_bottom:
+                # ✅ Precio salió correctamente (DEBAJO del FVG)
+                log.info(
+                    "✅ Validación dirección: Precio (%.5f) está DEBAJO del FVG Bottom (%.5f) - Dirección correcta", current_price, fvg_bottom
+                )
+            elif current_price > fvg_top:
+                # ❌ ERROR CRÍTICO: Precio salió ARRIBA del FVG pero esperábamos salida BAJISTA
+                log.error(
+                    "❌ VALIDACIÓN FALLIDA: Precio salió del FVG en dirección INCORRECTA | "
+                    "FVG BAJISTA + dirección BEARISH esperada, pero precio (%.5f) está ARRIBA del FVG Top (%.5f) | "
+                    "El precio salió ALCISTA cuando debería haber salido BAJISTA - CANCELANDO ORDEN",
+                    current_price, fvg_top
                 )
                 return None
-            
-            # VALIDACIÓN FINAL 3: La dirección de salida DEBE ser correcta
-            # ⚠️ VALIDACIÓN CRÍTICA: El precio DEBE salir del FVG en la dirección CORRECTA
-            # Si sale en dirección INCORRECTA, se CANCELA la orden
-            if calculated_fvg_type == 'BAJISTA' and direction == 'BEARISH':
-                # FVG BAJISTA + dirección BEARISH: precio debe estar DEBAJO del FVG
-                if current_price < fvg_bottom:
-                    # ✅ Precio salió correctamente (DEBAJO del FVG)
-                    self.logger.info(
-                        f"[{symbol}] ✅ Validación dirección: Precio ({current_price:.5f}) está DEBAJO del FVG Bottom ({fvg_bottom:.5f}) - Dirección correcta"
-                    )
-                elif current_price > fvg_top:
-                    # ❌ ERROR CRÍTICO: Precio salió ARRIBA del FVG pero esperábamos salida BAJISTA
-                    self.logger.error(
-                        f"[{symbol}] ❌ VALIDACIÓN FALLIDA: Precio salió del FVG en dirección INCORRECTA | "
-                        f"FVG BAJISTA + dirección BEARISH esperada, pero precio ({current_price:.5f}) está ARRIBA del FVG Top ({fvg_top:.5f}) | "
-                        f"El precio salió ALCISTA cuando debería haber salido BAJISTA - CANCELANDO ORDEN"
-                    )
-                    return None
-                else:
-                    # Precio aún dentro del FVG o en el borde
-                    self.logger.error(
-                        f"[{symbol}] ❌ VALIDACIÓN FALLIDA: Precio ({current_price:.5f}) NO salió del FVG en dirección {direction} | "
-                        f"Debe estar DEBAJO de {fvg_bottom:.5f} - Cancelando orden"
-                    )
-                    return None
-            elif calculated_fvg_type == 'ALCISTA' and direction == 'BULLISH':
-                # FVG ALCISTA + dirección BULLISH: precio debe estar ARRIBA del FVG
-                if current_price > fvg_top:
-                    # ✅ Precio salió correctamente (ARRIBA del FVG)
-                    self.logger.info(
-                        f"[{symbol}] ✅ Validación dirección: Precio ({current_price:.5f}) está ARRIBA del FVG Top ({fvg_top:.5f}) - Dirección correcta"
-                    )
-                elif current_price < fvg_bottom:
-                    # ❌ ERROR CRÍTICO: Precio salió DEBAJO del FVG pero esperábamos salida ALCISTA
-                    self.logger.error(
-                        f"[{symbol}] ❌ VALIDACIÓN FALLIDA: Precio salió del FVG en dirección INCORRECTA | "
-                        f"FVG ALCISTA + dirección BULLISH esperada, pero precio ({current_price:.5f}) está DEBAJO del FVG Bottom ({fvg_bottom:.5f}) | "
-                        f"El precio salió BAJISTA cuando debería haber salido ALCISTA - CANCELANDO ORDEN"
-                    )
-                    return None
-                else:
-                    # Precio aún dentro del FVG o en el borde
-                    self.logger.error(
-                        f"[{symbol}] ❌ VALIDACIÓN FALLIDA: Precio ({current_price:.5f}) NO salió del FVG en dirección {direction} | "
-                        f"Debe estar ARRIBA de {fvg_top:.5f} - Cancelando orden"
-                    )
-                    return None
             else:
-                self.logger.error(
-                    f"[{symbol}] ❌ VALIDACIÓN FALLIDA: FVG {calculated_fvg_type} no coincide con dirección {direction} esperada - Cancelando orden"
+                # Precio aún dentro del FVG o en el borde
+                log.error(
+                    "❌ VALIDACIÓN FALLIDA: Precio (%.5f) NO salió del FVG en dirección %s | "
+                    "Debe estar DEBAJO de %.5f - Cancelando orden",
+                    current_price, direction, fvg_bottom
                 )
                 return None
-            
-            self.logger.info(
-                f"[{symbol}] ✅ VALIDACIÓN FINAL EXITOSA: Vela EN FORMACIÓN entró al FVG {calculated_fvg_type} y precio salió correctamente | "
-                f"Vela: H={candle_high:.5f} L={candle_low:.5f} C={candle_close:.5f} | "
-                f"Precio actual: {current_price:.5f} | FVG: {fvg_bottom:.5f}-{fvg_top:.5f} | Dirección: {direction}"
-            )
-            
-            # Verificar límite de trades por día
-            if not self._check_daily_trade_limit(symbol):
-                return None
-            
-            # ⚠️ VERIFICACIÓN CRÍTICA FINAL: Verificar posiciones abiertas JUSTO ANTES de ejecutar
-            # Esto previene race conditions donde una posición puede estar abierta entre la verificación anterior y la ejecución
-            if self._has_open_positions(symbol):
-                self.logger.error(
-                    f"[{symbol}] ❌ VALIDACIÓN FALLIDA: Se detectaron posiciones abiertas JUSTO ANTES de ejecutar - "
-                    f"CANCELANDO ORDEN para evitar posición opuesta"
+        elif calculated_fvg_type == 'ALCISTA' and is_buy:
+            # FVG ALCISTA + dirección BULLISH: precio debe estar ARRIBA del FVG
+            if current_price > fvg_top:
+                # ✅ Precio salió correctamente (ARRIBA del FVG)
+                log.info(
+                    "✅ Validación dirección: Precio (%.5f) está ARRIBA del FVG Top (%.5f) - Dirección correcta", current_price, fvg_top
+                )
+            elif current_price < fvg_bottom:
+                # ❌ ERROR CRÍTICO: Precio salió DEBAJO del FVG pero esperábamos salida ALCISTA
+                log.error(
+                    "❌ VALIDACIÓN FALLIDA: Precio salió del FVG en dirección INCORRECTA | "
+                    "FVG ALCISTA + dirección BULLISH esperada, pero precio (%.5f) está DEBAJO del FVG Bottom (%.5f) | "
+                    "El precio salió BAJISTA cuando debería haber salido ALCISTA - CANCELANDO ORDEN",
+                    current_price, fvg_bottom
                 )
                 return None
-            
-            direction = entry_signal['direction']
-            stop_loss = entry_signal['stop_loss']
-            take_profit = entry_signal['take_profit']
-            rr = entry_signal['rr']
-            
-            # ⚡ OBTENER PRECIO ACTUAL DEL MERCADO EN ESTE MOMENTO EXACTO
-            # Las condiciones se cumplieron, ahora obtenemos el precio actual para ejecutar orden a mercado
-            tick = mt5.symbol_info_tick(symbol)
-            if tick is None:
-                self.logger.error(f"[{symbol}] ❌ No se pudo obtener precio actual del mercado - Cancelando orden")
-                return None
-            
-            # Precio de entrada = precio actual del mercado (bid para venta, ask para compra)
-            if direction == 'BULLISH':
-                entry_price = float(tick.ask)  # Compra: precio ASK
-                self.logger.info(f"[{symbol}] 💹 Precio de entrada a mercado (BUY): {entry_price:.5f} (ASK actual)")
             else:
-                entry_price = float(tick.bid)  # Venta: precio BID
-                self.logger.info(f"[{symbol}] 💹 Precio de entrada a mercado (SELL): {entry_price:.5f} (BID actual)")
-            
-            # ⚠️ VALIDACIÓN CRÍTICA: El precio de entrada DEBE estar fuera del FVG con distancia mínima
-            # Esto previene entradas cuando el precio está justo en el borde del FVG o dentro de él
-            # debido a la diferencia entre BID/ASK y el precio usado en la validación anterior
-            symbol_info = mt5.symbol_info(symbol)
-            if symbol_info is None:
-                self.logger.error(f"[{symbol}] ❌ No se pudo obtener información del símbolo")
+                # Precio aún dentro del FVG o en el borde
+                log.error(
+                    "❌ VALIDACIÓN FALLIDA: Precio (%.5f) NO salió del FVG en dirección %s | "
+                    "Debe estar ARRIBA de %.5f - Cancelando orden",
+                    current_price, direction, fvg_top
+                )
                 return None
-            
-            point = symbol_info.point
-            spread_points = symbol_info.spread
-            spread_price = spread_points * point
-            
-            # Distancia mínima requerida desde el FVG: spread + margen de seguridad (2 pips mínimo)
-            # Esto asegura que el precio de entrada esté claramente fuera del FVG
-            # Usamos los valores del FVG calculado (fvg_top y fvg_bottom) que ya fueron validados arriba
-            pips_to_points = 10 if symbol_info.digits == 5 else 1
-            min_distance_from_fvg = max(
-                spread_price * 2,  # Al menos 2x el spread
-                point * pips_to_points * 2  # Mínimo 2 pips
+        else:
+            log.error(
+                "❌ VALIDACIÓN FALLIDA: FVG %s no coincide con dirección %s esperada - Cancelando orden", calculated_fvg_type, direction
             )
-            
-            # Validar que el precio de entrada esté fuera del FVG con distancia mínima
-            if direction == 'BULLISH' and calculated_fvg_type == 'ALCISTA':
-                # Para BUY con FVG ALCISTA: entry_price (ASK) debe estar ARRIBA del FVG Top con distancia mínima
-                required_min_price = fvg_top + min_distance_from_fvg
-                if entry_price <= required_min_price:
-                    self.logger.error(
-                        f"[{symbol}] ❌ VALIDACIÓN FALLIDA: Precio de entrada (ASK={entry_price:.5f}) está muy cerca o dentro del FVG | "
-                        f"FVG Top: {fvg_top:.5f} | Precio mínimo requerido: {required_min_price:.5f} | "
-                        f"Distancia mínima: {min_distance_from_fvg:.5f} ({min_distance_from_fvg * (10000 if symbol_info.digits == 5 else 100):.1f} pips) | "
-                        f"Cancelando orden - El precio debe salir más del FVG antes de entrar"
-                    )
-                    return None
-                self.logger.info(
-                    f"[{symbol}] ✅ Precio de entrada validado: ASK={entry_price:.5f} está ARRIBA del FVG Top ({fvg_top:.5f}) "
-                    f"con distancia de {entry_price - fvg_top:.5f} ({(entry_price - fvg_top) * (10000 if symbol_info.digits == 5 else 100):.1f} pips)"
-                )
-            elif direction == 'BEARISH' and calculated_fvg_type == 'BAJISTA':
-                # Para SELL con FVG BAJISTA: entry_price (BID) debe estar DEBAJO del FVG Bottom con distancia mínima
-                required_max_price = fvg_bottom - min_distance_from_fvg
-                if entry_price >= required_max_price:
-                    self.logger.error(
-                        f"[{symbol}] ❌ VALIDACIÓN FALLIDA: Precio de entrada (BID={entry_price:.5f}) está muy cerca o dentro del FVG | "
-                        f"FVG Bottom: {fvg_bottom:.5f} | Precio máximo requerido: {required_max_price:.5f} | "
-                        f"Distancia mínima: {min_distance_from_fvg:.5f} ({min_distance_from_fvg * (10000 if symbol_info.digits == 5 else 100):.1f} pips) | "
-                        f"Cancelando orden - El precio debe salir más del FVG antes de entrar"
-                    )
-                    return None
-                self.logger.info(
-                    f"[{symbol}] ✅ Precio de entrada validado: BID={entry_price:.5f} está DEBAJO del FVG Bottom ({fvg_bottom:.5f}) "
-                    f"con distancia de {fvg_bottom - entry_price:.5f} ({(fvg_bottom - entry_price) * (10000 if symbol_info.digits == 5 else 100):.1f} pips)"
+            return None
+        
+        log.info(
+            "✅ VALIDACIÓN FINAL EXITOSA: Vela EN FORMACIÓN entró al FVG %s y precio salió correctamente | "
+            "Vela: H=%.5f L=%.5f C=%.5f | "
+            "Precio actual: %.5f | FVG: %.5f-%.5f | Dirección: %s",
+            calculated_fvg_type, candle_high, candle_low, candle_close, current_price, fvg_bottom, fvg_top, direction
+        )
+        
+        # Verificar límite de trades por día
+        if not self._check_daily_trade_limit(symbol):
+            return None
+        
+        # ⚠️ VERIFICACIÓN CRÍTICA FINAL: Verificar posiciones abiertas JUSTO ANTES de ejecutar
+        # Esto previene race conditions donde una posición puede estar abierta entre la verificación anterior y la ejecución
+        if self._has_open_positions(symbol):
+            log.error(
+                "❌ VALIDACIÓN FALLIDA: Se detectaron posiciones abiertas JUSTO ANTES de ejecutar - "
+                "CANCELANDO ORDEN para evitar posición opuesta"
+            )
+            return None
+        
+        direction = entry_signal['direction']
+        stop_loss = entry_signal['stop_loss']
+        take_profit = entry_signal['take_profit']
+        rr = entry_signal['rr']
+        
+        # ⚡ OBTENER PRECIO ACTUAL DEL MERCADO EN ESTE MOMENTO EXACTO
+        # Las condiciones se cumplieron, ahora obtenemos el precio actual para ejecutar orden a mercado
+        tick = mt5.symbol_info_tick(symbol)
+        if tick is None:
+            log.error("❌ No se pudo obtener precio actual del mercado - Cancelando orden")
+            return None
+        
+        # Precio de entrada = precio actual del mercado (bid para venta, ask para compra)
+        if is_buy:
+            entry_price = float(tick.ask)  # Compra: precio ASK
+            log.info("💹 Precio de entrada a mercado (BUY): %.5f (ASK actual)", entry_price)
+        else:
+            entry_price = float(tick.bid)  # Venta: precio BID
+            log.info("💹 Precio de entrada a mercado (SELL): %.5f (BID actual)", entry_price)
+        
+        # ⚠️ VALIDACIÓN CRÍTICA: El precio de entrada DEBE estar fuera del FVG con distancia mínima
+        # Esto previene entradas cuando el precio está justo en el borde del FVG o dentro de él
+        # debido a la diferencia entre BID/ASK y el precio usado en la validación anterior
+        symbol_info = mt5.symbol_info(symbol)
+        if symbol_info is None:
+            log.error("❌ No se pudo obtener información del símbolo")
+            return None
+        
+        point = symbol_info.point
+        spread_points = symbol_info.spread
+        spread_price = spread_points * point
+        
+        # Distancia mínima requerida desde el FVG: spread + margen de seguridad (2 pips mínimo)
+        # Esto asegura que el precio de entrada esté claramente fuera del FVG
+        # Usamos los valores del FVG calculado (fvg_top y fvg_bottom) que ya fueron validados arriba
+        pips_to_points = 10 if symbol_info.digits == 5 else 1
+        min_distance_from_fvg = max(
+            spread_price * 2,  # Al menos 2x el spread
+            point * pips_to_points * 2  # Mínimo 2 pips
+        )
+        
+        # Validar que el precio de entrada esté fuera del FVG con distancia mínima
+        if is_buy and calculated_fvg_type == 'ALCISTA':
+            # Para BUY con FVG ALCISTA: entry_price (ASK) debe estar ARRIBA del FVG Top con distancia mínima
+            required_min_price = fvg_top + min_distance_from_fvg
+            if entry_price <= required_min_price:
+                log.error(
+                    "❌ VALIDACIÓN FALLIDA: Precio de entrada (ASK=%.5f) está muy cerca o dentro del FVG | "
+                    "FVG Top: %.5f | Precio mínimo requerido: %.5f | "
+                    "Distancia mínima: %.5f (%.1f pips) | "
+                    "Cancelando orden - El precio debe salir más del FVG antes de entrar",
+                    entry_price, fvg_top, required_min_price, min_distance_from_fvg, min_distance_from_fvg * (10000 if symbol_info.digits == 5 else 100)
                 )
-            
-            # ⚠️ VERIFICAR Y AJUSTAR SL CON EL PRECIO REAL DE ENTRADA
-            # El SL puede haberse calculado con un precio diferente, asegurar distancia mínima con precio real
-            # (symbol_info ya fue obtenido arriba, reutilizamos)
-            
-            point = symbol_info.point
-            spread_points = symbol_info.spread
-            spread_price = spread_points * point
-            
-            # Obtener tamaño del FVG del entry_signal para calcular distancia mínima
-            fvg_info = entry_signal.get('fvg', {})
-            fvg_size = abs(fvg_info.get('fvg_top', 0) - fvg_info.get('fvg_bottom', 0)) if fvg_info else point * 2
-            
-            # Para calcular pips correctamente: 1 pip = 10 points para símbolos con 5 dígitos, 1 point para 3 dígitos
-            pips_to_points = 10 if symbol_info.digits == 5 else 1
-            fvg_size_pips = fvg_size * (10000 if symbol_info.digits == 5 else 100)
-            
-            # Distancia mínima del SL: adaptativa según tamaño del FVG Y temporalidad de entrada
-            # IMPORTANTE: La distancia mínima debe adaptarse a la temporalidad de entrada
-            # - M1: Entradas más ajustadas, SL más corto (15-20 pips)
-            # - M5 o superior: SL más amplio (30-40 pips)
-            entry_tf = self.entry_timeframe.upper()
-            if entry_tf == 'M1':
-                # Para M1: SL más ajustado
-                if fvg_size_pips < 3:
-                    min_pips = 15  # FVG muy pequeño en M1: 15 pips mínimo
-                elif fvg_size_pips < 5:
-                    min_pips = 18  # FVG pequeño en M1: 18 pips mínimo
-                else:
-                    min_pips = 20  # FVG normal en M1: 20 pips mínimo
-            else:
-                # Para M5 o superior: SL más amplio
-                if fvg_size_pips < 5:
-                    # FVG muy pequeño (< 5 pips): usar distancia mínima generosa de 40 pips
-                    min_pips = 40
-                elif fvg_size_pips < 10:
-                    # FVG pequeño (5-10 pips): usar distancia mínima de 35 pips
-                    min_pips = 35
-                else:
-                    # FVG normal o grande (>= 10 pips): usar distancia mínima estándar de 30 pips
-                    min_pips = 30
-            
-            min_sl_distance_pips = min_pips * pips_to_points * point
-            
-            # La distancia mínima debe ser el mayor entre:
-            # 1. 5x el spread (mínimo por spread)
-            # 2. La distancia mínima en pips (30-40 pips según tamaño del FVG)
-            # 3. 2.5x el tamaño del FVG (solo si el FVG es grande, para cubrirlo bien)
-            min_sl_distance = max(
-                spread_price * 5,  # 5x el spread como mínimo
-                min_sl_distance_pips,  # Mínimo 30-40 pips según tamaño del FVG
-                fvg_size * 2.5  # 2.5x el tamaño del FVG para cubrirlo bien + margen adicional
+                return None
+            log.info(
+                "✅ Precio de entrada validado: ASK=%.5f está ARRIBA del FVG Top (%.5f) "
+                "con distancia de %.5f (%.1f pips)",
+                entry_price, fvg_top, entry_price - fvg_top, (entry_price - fvg_top) * (10000 if symbol_info.digits == 5 else 100)
             )
-            
-            # Verificar distancia actual del SL al entry real
-            current_sl_distance = abs(entry_price - stop_loss)
-            original_sl = stop_loss
-            
-            # Si la distancia es menor que el mínimo, ajustar el SL
-            if current_sl_distance < min_sl_distance:
-                if direction == 'BULLISH':
-                    # Para BUY: SL debe estar debajo del entry
-                    min_sl_price = entry_price - min_sl_distance
-                    if stop_loss > min_sl_price:
-                        stop_loss = min_sl_price
-                        self.logger.warning(
-                            f"[{symbol}] ⚠️  SL ajustado por distancia mínima con precio real: "
-                            f"{original_sl:.5f} → {stop_loss:.5f} | "
-                            f"Distancia anterior: {current_sl_distance:.5f} ({current_sl_distance * 10000:.1f} pips) | "
-                            f"Nueva distancia: {min_sl_distance:.5f} ({min_sl_distance * 10000:.1f} pips)"
-                        )
-                else:
-                    # Para SELL: SL debe estar arriba del entry
-                    min_sl_price = entry_price + min_sl_distance
-                    if stop_loss < min_sl_price:
-                        stop_loss = min_sl_price
-                        self.logger.warning(
-                            f"[{symbol}] ⚠️  SL ajustado por distancia mínima con precio real: "
-                            f"{original_sl:.5f} → {stop_loss:.5f} | "
-                            f"Distancia anterior: {current_sl_distance:.5f} ({current_sl_distance * 10000:.1f} pips) | "
-                            f"Nueva distancia: {min_sl_distance:.5f} ({min_sl_distance * 10000:.1f} pips)"
-                        )
-            else:
-                final_distance = abs(entry_price - stop_loss)
-                pips_final = self._price_to_pips(final_distance, symbol_info.digits)
-                pips_min = self._price_to_pips(min_sl_distance, symbol_info.digits)
-                self.logger.info(
-                    f"[{symbol}] ✅ SL tiene distancia adecuada: {final_distance:.5f} ({pips_final:.1f} pips) >= "
-                    f"mínimo requerido: {min_sl_distance:.5f} ({pips_min:.1f} pips)"
+        elif not is_buy and calculated_fvg_type == 'BAJISTA':
+            # Para SELL con FVG BAJISTA: entry_price (BID) debe estar DEBAJO del FVG Bottom con distancia mínima
+            required_max_price = fvg_bottom - min_distance_from_fvg
+            if entry_price >= required_max_price:
+                log.error(
+                    "❌ VALIDACIÓN FALLIDA: Precio de entrada (BID=%.5f) está muy cerca o dentro del FVG | "
+                    "FVG Bottom: %.5f | Precio máximo requerido: %.5f | "
+                    "Distancia mínima: %.5f (%.1f pips) | "
+                    "Cancelando orden - El precio debe salir más del FVG antes de entrar",
+                    entry_price, fvg_bottom, required_max_price, min_distance_from_fvg, min_distance_from_fvg * (10000 if symbol_info.digits == 5 else 100)
                 )
-            
-            # Recalcular RIESGO con el precio real de entrada y SL ajustado
-            # IMPORTANTE: Mantener el SL ajustado (basado en distancia mínima + FVG)
-            # Solo ajustaremos el TP para mantener el RR de 1:2
-            risk = abs(entry_price - stop_loss)
-            if risk <= 0:
-                self.logger.error(f"[{symbol}] ❌ Risk calculado 0 o negativo después de ajustar entry_price - Cancelando orden")
                 return None
-            
-            # Obtener información del FVG para validaciones (ya calculado arriba en la validación final)
-            if 'calculated_fvg_bottom' in locals() and 'calculated_fvg_top' in locals():
-                fvg_size_calc = abs(calculated_fvg_top - calculated_fvg_bottom)
+            log.info(
+                "✅ Precio de entrada validado: BID=%.5f está DEBAJO del FVG Bottom (%.5f) "
+                "con distancia de %.5f (%.1f pips)",
+                entry_price, fvg_bottom, fvg_bottom - entry_price, (fvg_bottom - entry_price) * (10000 if symbol_info.digits == 5 else 100)
+            )
+        
+        # ⚠️ VERIFICAR Y AJUSTAR SL CON EL PRECIO REAL DE ENTRADA
+        # El SL puede haberse calculado con un precio diferente, asegurar distancia mínima con precio real
+        # (symbol_info, point y spread_points ya fueron obtenidos arriba, reutilizamos)
+        
+        # Obtener tamaño del FVG del entry_signal para calcular distancia mínima
+        fvg_info = entry_signal.get('fvg', {})
+        fvg_size = abs(fvg_info.get('fvg_top', 0) - fvg_info.get('fvg_bottom', 0)) if fvg_info else point * 2
+        
+        # Para calcular pips correctamente: 1 pip = 10 points para símbolos con 5 dígitos, 1 point para 3 dígitos
+        pips_to_points = 10 if symbol_info.digits == 5 else 1
+        fvg_size_pips = fvg_size * (10000 if symbol_info.digits == 5 else 100)
+        
+        # Distancia mínima del SL: adaptativa según tamaño del FVG Y temporalidad de entrada
+        # IMPORTANTE: La distancia mínima debe adaptarse a la temporalidad de entrada
+        # - M1: Entradas más ajustadas, SL más corto (15-20 pips)
+        # - M5 o superior: SL más amplio (30-40 pips)
+        entry_tf = self.entry_timeframe.upper()
+        if entry_tf == 'M1':
+            # Para M1: SL más ajustado
+            if fvg_size_pips < 3:
+                min_pips = 15  # FVG muy pequeño en M1: 15 pips mínimo
+            elif fvg_size_pips < 5:
+                min_pips = 18  # FVG pequeño en M1: 18 pips mínimo
             else:
-                # Si no está disponible, usar el tamaño del FVG del entry_signal
-                fvg_size_calc = fvg_size
-            
-            point = symbol_info.point  # Precisión del símbolo (ej: 0.00001 para EURUSD)
-            digits = symbol_info.digits  # Dígitos decimales del símbolo (ej: 5 para EURUSD)
-            stop_level = symbol_info.trade_stops_level  # Distancia mínima requerida por el broker
-            min_distance = stop_level * point  # Distancia mínima en precio
-            
-            # ⚠️ FORZAR RR EXACTO 1:2 CON EL PRECIO REAL
-            # Mantenemos el SL original (basado en FVG) y ajustamos el TP para mantener RR exacto de 1:2
-            max_rr = self.min_rr  # 2.0 (1:2)
-            original_tp = take_profit
-            original_sl = stop_loss  # Guardar SL original para referencia
-            
-            # Calcular risk real con el precio de entrada actual
-            risk_actual = abs(entry_price - stop_loss)
-            if risk_actual == 0:
-                self.logger.error(f"[{symbol}] ❌ Risk calculado 0 - Cancelando orden")
-                return None
-            
-            # Calcular reward para RR exacto de 1:2 basado en el risk real
-            reward_target = risk_actual * max_rr  # Reward = Risk * 2.0
-            
-            # Calcular TP forzado con reward que mantiene RR exacto de 1:2
-            if direction == 'BULLISH':
-                take_profit_raw = entry_price + reward_target
+                min_pips = 20  # FVG normal en M1: 20 pips mínimo
+        else:
+            # Para M5 o superior: SL más amplio
+            if fvg_size_pips < 5:
+                # FVG muy pequeño (< 5 pips): usar distancia mínima generosa de 40 pips
+                min_pips = 40
+            elif fvg_size_pips < 10:
+                # FVG pequeño (5-10 pips): usar distancia mínima de 35 pips
+                min_pips = 35
             else:
-                take_profit_raw = entry_price - reward_target
-            
-            # Redondear TP según los digits del símbolo
-            take_profit = round(take_profit_raw, digits)
-            
-            # Recalcular reward real después del redondeo
-            if direction == 'BULLISH':
-                reward_actual = take_profit - entry_price
+                # FVG normal o grande (>= 10 pips): usar distancia mínima estándar de 30 pips
+                min_pips = 30
+        
+        # La distancia mínima debe ser el mayor entre:
+        # 1. 5x el spread (mínimo por spread)
+        # 2. La distancia mínima en pips (30-40 pips según tamaño del FVG)
+        # 3. 2.5x el tamaño del FVG (solo si el FVG es grande, para cubrirlo bien)
+        # Se compara en puntos enteros (spread ya viene en puntos desde MT5) y se convierte
+        # a precio con una única multiplicación al final. El tamaño del FVG es un número entero
+        # de puntos: se redondea antes del ceil para que el ruido de fvg_size / point no sume un punto
+        min_sl_points = max(
+            spread_points * 5,  # 5x el spread como mínimo
+            min_pips * pips_to_points,  # Mínimo 30-40 pips según tamaño del FVG
+            math.ceil(round(fvg_size / point) * 2.5)  # 2.5x el tamaño del FVG para cubrirlo bien + margen adicional
+        )
+        min_sl_distance = min_sl_points * point
+        
+        # Verificar distancia actual del SL al entry real
+        current_sl_distance = abs(entry_price - stop_loss)
+        original_sl = stop_loss
+        
+        # Si la distancia es menor que el mínimo, ajustar el SL
+        if current_sl_distance < min_sl_distance:
+            if is_buy:
+                # Para BUY: SL debe estar debajo del entry
+                min_sl_price = entry_price - min_sl_distance
+                if stop_loss > min_sl_price:
+                    stop_loss = min_sl_price
+                    log.warning(
+                        "⚠️  SL ajustado por distancia mínima con precio real: "
+                        "%.5f → %.5f | "
+                        "Distancia anterior: %.5f (%.1f pips) | "
+                        "Nueva distancia: %.5f (%.1f pips)",
+                        original_sl, stop_loss, current_sl_distance, current_sl_distance * 10000, min_sl_distance, min_sl_distance * 10000
+                    )
             else:
+                # Para SELL: SL debe estar arriba del entry
+                min_sl_price = entry_price + min_sl_distance
+                if stop_loss < min_sl_price:
+                    stop_loss = min_sl_price
+                    log.warning(
+                        "⚠️  SL ajustado por distancia mínima con precio real: "
+                        "%.5f → %.5f | "
+                        "Distancia anterior: %.5f (%.1f pips) | "
+                        "Nueva distancia: %.5f (%.1f pips)",
+                        original_sl, stop_loss, current_sl_distance, current_sl_distance * 10000, min_sl_distance, min_sl_distance * 10000
+                    )
+        else:
+            final_distance = abs(entry_price - stop_loss)
+            pips_final = self._price_to_pips(final_distance, symbol_info.digits)
+            pips_min = self._price_to_pips(min_sl_distance, symbol_info.digits)
+            log.info(
+                "✅ SL tiene distancia adecuada: %.5f (%.1f pips) >= "
+                "mínimo requerido: %.5f (%.1f pips)",
+                final_distance, pips_final, min_sl_distance, pips_min
+            )
+        
+        # Recalcular RIESGO con el precio real de entrada y SL ajustado
+        # IMPORTANTE: Mantener el SL ajustado (basado en distancia mínima + FVG)
+        # Solo ajustaremos el TP para mantener el RR de 1:2
+        risk = entry_price - stop_loss if is_buy else stop_loss - entry_price
+        if risk <= 0:
+            log.error("❌ Risk calculado 0 o negativo después de ajustar entry_price - Cancelando orden")
+            return None
+        
+        # Obtener información del FVG para validaciones (ya calculado arriba en la validación final)
+        if 'calculated_fvg_bottom' in locals() and 'calculated_fvg_top' in locals():
+            fvg_size_calc = abs(calculated_fvg_top - calculated_fvg_bottom)
+        else:
+            # Si no está disponible, usar el tamaño del FVG del entry_signal
+            fvg_size_calc = fvg_size
+        
+        point = symbol_info.point  # Precisión del símbolo (ej: 0.00001 para EURUSD)
+        digits = symbol_info.digits  # Dígitos decimales del símbolo (ej: 5 para EURUSD)
+        stop_level = symbol_info.trade_stops_level  # Distancia mínima requerida por el broker
+        min_distance = stop_level * point  # Distancia mínima en precio
+        
+        # ⚠️ FORZAR RR EXACTO 1:2 CON EL PRECIO REAL
+        # Mantenemos el SL original (basado en FVG) y ajustamos el TP para mantener RR exacto de 1:2
+        max_rr = self.min_rr  # 2.0 (1:2)
+        original_tp = take_profit
+        original_sl = stop_loss  # Guardar SL original para referencia
+        
+        # Risk real con el precio de entrada actual (ya validado > 0 arriba)
+        risk_actual = risk
+        
+        # Calcular reward para RR exacto de 1:2 basado en el risk real
+        reward_target = risk_actual * max_rr  # Reward = Risk * 2.0
+        
+        # Calcular TP forzado con reward que mantiene RR exacto de 1:2
+        if is_buy:
+            take_profit_raw = entry_price + reward_target
+        else:
+            take_profit_raw = entry_price - reward_target
+        
+        # Redondear TP según los digits del símbolo
+        take_profit = round(take_profit_raw, digits)
+        
+        # Recalcular reward real después del redondeo
+        if is_buy:
+            reward_actual = take_profit - entry_price
+        else:
+            reward_actual = entry_price - take_profit
+        
+        # Verificar que el TP redondeado cumpla con la distancia mínima del broker
+        # Si no cumple, ajustar ligeramente pero manteniendo RR lo más cercano a 1:2
+        if is_buy:
+            tp_distance = take_profit - entry_price
+            if tp_distance < min_distance:
+                # Ajustar TP para cumplir distancia mínima, pero recalcular para mantener RR
+                take_profit = round(entry_price + min_distance, digits)
+                reward_actual = take_profit - entry_price
+                # Si el TP ajustado es mayor que el reward target, mantenerlo (mejor RR)
+                if reward_actual < reward_target:
+                    # Recalcular TP para mantener RR exacto si es posible
+                    take_profit = round(entry_price + reward_target, digits)
+                    reward_actual = take_profit - entry_price
+        else:
+            tp_distance = entry_price - take_profit
+            if tp_distance < min_distance:
+                # Ajustar TP para cumplir distancia mínima, pero recalcular para mantener RR
+                take_profit = round(entry_price - min_distance, digits)
                 reward_actual = entry_price - take_profit
-            
-            # Verificar que el TP redondeado cumpla con la distancia mínima del broker
-            # Si no cumple, ajustar ligeramente pero manteniendo RR lo más cercano a 1:2
-            if direction == 'BULLISH':
-                tp_distance = take_profit - entry_price
-                if tp_distance < min_distance:
-                    # Ajustar TP para cumplir distancia mínima, pero recalcular para mantener RR
-                    take_profit = round(entry_price + min_distance, digits)
+                # Si el TP ajustado es mayor que el reward target, mantenerlo (mejor RR)
+                if reward_actual < reward_target:
+                    # Recalcular TP para mantener RR exacto si es posible
+                    take_profit = round(entry_price - reward_target, digits)
+                    reward_actual = entry_price - take_profit
+        
+        # Recalcular RR final con TP ajustado y SL original
+        rr = reward_actual / risk_actual  # RR real con TP ajustado y SL original
+        
+        # Log del RR forzado
+        log.info(
+            "📈 RR recalculado y FORZADO a %.2f:1 con precio real | "
+            "Entry=%.5f, SL=%.5f (Risk: %.5f), "
+            "TP original=%.5f → TP ajustado=%.5f (Reward: %.5f)",
+            rr, entry_price, stop_loss, risk_actual, original_tp, take_profit, reward_actual
+        )
+        
+        # Verificar que el RR sea al menos el mínimo requerido
+        if rr < (self.min_rr - 0.01):  # Tolerancia de 0.01 para redondeo
+            # Si el RR es menor que el mínimo, solo ajustar ligeramente el SL si es necesario
+            # pero manteniendo una distancia razonable (no demasiado corta)
+            required_reward = risk_actual * max_rr
+            
+            # Verificar si podemos ajustar el TP para cumplir RR sin hacer SL demasiado corto
+            if is_buy:
+                min_tp = entry_price + min_distance
+                if required_reward >= min_distance:
+                    # Podemos ajustar TP para cumplir RR
+                    take_profit = round(entry_price + required_reward, digits)
                     reward_actual = take_profit - entry_price
-                    # Si el TP ajustado es mayor que el reward target, mantenerlo (mejor RR)
-                    if reward_actual < reward_target:
-                        # Recalcular TP para mantener RR exacto si es posible
-                        take_profit = round(entry_price + reward_target, digits)
-                        reward_actual = take_profit - entry_price
+                    rr = reward_actual / risk_actual
+                else:
+                    # El reward requerido es menor que la distancia mínima, usar distancia mínima
+                    take_profit = round(min_tp, digits)
+                    reward_actual = take_profit - entry_price
+                    rr = reward_actual / risk_actual
             else:
-                tp_distance = entry_price - take_profit
-                if tp_distance < min_distance:
-                    # Ajustar TP para cumplir distancia mínima, pero recalcular para mantener RR
-                    take_profit = round(entry_price - min_distance, digits)
+                min_tp = entry_price - min_distance
+                if required_reward >= min_distance:
+                    # Podemos ajustar TP para cumplir RR
+                    take_profit = round(entry_price - required_reward, digits)
                     reward_actual = entry_price - take_profit
-                    # Si el TP ajustado es mayor que el reward target, mantenerlo (mejor RR)
-                    if reward_actual < reward_target:
-                        # Recalcular TP para mantener RR exacto si es posible
-                        take_profit = round(entry_price - reward_target, digits)
-                        reward_actual = entry_price - take_profit
-            
-            # Recalcular RR final con TP ajustado y SL original
-            rr = reward_actual / risk_actual  # RR real con TP ajustado y SL original
-            
-            # Log del RR forzado
-            self.logger.info(
-                f"[{symbol}] 📈 RR recalculado y FORZADO a {rr:.2f}:1 con precio real | "
-                f"Entry={entry_price:.5f}, SL={stop_loss:.5f} (Risk: {risk_actual:.5f}), "
-                f"TP original={original_tp:.5f} → TP ajustado={take_profit:.5f} (Reward: {reward_actual:.5f})"
-            )
-            
-            # Verificar que el RR sea al menos el mínimo requerido
-            if rr < (self.min_rr - 0.01):  # Tolerancia de 0.01 para redondeo
-                # Si el RR es menor que el mínimo, solo ajustar ligeramente el SL si es necesario
-                # pero manteniendo una distancia razonable (no demasiado corta)
-                required_reward = risk_actual * max_rr
+                    rr = reward_actual / risk_actual
+                else:
+                    # El reward requerido es menor que la distancia mínima, usar distancia mínima
+                    take_profit = round(min_tp, digits)
+                    reward_actual = entry_price - take_profit
+                    rr = reward_actual / risk_actual
+            
+            # Si después de ajustar el TP el RR aún es menor, verificar si podemos ajustar SL ligeramente
+            # pero solo si no lo hace demasiado corto (mínimo 1.5x el tamaño del FVG)
+            if rr < (self.min_rr - 0.01):
+                # Obtener información del FVG calculado en la validación final
+                # (calculated_fvg_bottom y calculated_fvg_top están disponibles en este scope)
+                if 'calculated_fvg_bottom' in locals() and 'calculated_fvg_top' in locals():
+                    fvg_size = abs(calculated_fvg_top - calculated_fvg_bottom)
+                else:
+                    # Si no están disponibles, usar el risk actual como referencia
+                    fvg_size = risk_actual
                 
-                # Verificar si podemos ajustar el TP para cumplir RR sin hacer SL demasiado corto
-                if direction == 'BULLISH':
-                    min_tp = entry_price + min_distance
-                    if required_reward >= min_distance:
-                        # Podemos ajustar TP para cumplir RR
-                        take_profit = round(entry_price + required_reward, digits)
-                        reward_actual = take_profit - entry_price
-                        rr = reward_actual / risk_actual
-                    else:
-                        # El reward requerido es menor que la distancia mínima, usar distancia mínima
-                        take_profit = round(min_tp, digits)
+                # Calcular distancia mínima razonable del SL
+                # No hacer el SL demasiado corto: mínimo 1.5x el tamaño del FVG o 80% del risk actual
+                min_sl_distance_reasonable = max(
+                    fvg_size_calc * 1.5,  # Mínimo 1.5x el tamaño del FVG
+                    min_distance * 2,  # O 2x la distancia mínima del broker
+                    risk_actual * 0.8  # O 80% del risk actual (no hacer SL demasiado corto)
+                )
+                
+                log.info(
+                    "⚠️  Ajustando SL para mantener RR mínimo | "
+                    "Distancia mínima razonable del SL: %.5f | "
+                    "FVG size: %.5f",
+                    min_sl_distance_reasonable, fvg_size_calc
+                )
+                
+                # Calcular nuevo SL que mantenga distancia razonable
+                # IMPORTANTE: Solo ajustar el SL si es necesario y manteniendo distancia razonable
+                # No hacer el SL demasiado corto (más cercano al entry)
+                if is_buy:
+                    new_sl = entry_price - min_sl_distance_reasonable
+                    # Para BUY: SL debe estar debajo del entry
+                    # Solo ajustar si el nuevo SL está más lejos (más abajo) que el original
+                    # Esto aumenta el risk y permite mantener RR de 1:2
+                    if new_sl < stop_loss:  # new_sl más abajo = más lejos = más risk
+                        stop_loss = round(new_sl, digits)
+                        risk_actual = entry_price - stop_loss
+                        # Recalcular TP para mantener RR
+                        reward_actual = risk_actual * max_rr
+                        take_profit = round(entry_price + reward_actual, digits)
                         reward_actual = take_profit - entry_price
                         rr = reward_actual / risk_actual
+                        log.info(
+                            "⚠️  SL ajustado para mantener RR mínimo: "
+                            "SL original=%.5f → SL ajustado=%.5f | "
+                            "Distancia razonable: %.5f",
+                            original_sl, stop_loss, min_sl_distance_reasonable
+                        )
                 else:
-                    min_tp = entry_price - min_distance
-                    if required_reward >= min_distance:
-                        # Podemos ajustar TP para cumplir RR
-                        take_profit = round(entry_price - required_reward, digits)
-                        reward_actual = entry_price - take_profit
-                        rr = reward_actual / risk_actual
-                    else:
-                        # El reward requerido es menor que la distancia mínima, usar distancia mínima
-                        take_profit = round(min_tp, digits)
+                    new_sl = entry_price + min_sl_distance_reasonable
+                    # Para SELL: SL debe estar arriba del entry
+                    # Solo ajustar si el nuevo SL está más lejos (más arriba) que el original
+                    # Esto aumenta el risk y permite mantener RR de 1:2
+                    if new_sl > stop_loss:  # new_sl más arriba = más lejos = más risk
+                        stop_loss = round(new_sl, digits)
+                        risk_actual = stop_loss - entry_price
+                        # Recalcular TP para mantener RR
+                        reward_actual = risk_actual * max_rr
+                        take_profit = round(entry_price - reward_actual, digits)
                         reward_actual = entry_price - take_profit
                         rr = reward_actual / risk_actual
+                        log.info(
+                            "⚠️  SL ajustado para mantener RR mínimo: "
+                            "SL original=%.5f → SL ajustado=%.5f | "
+                            "Distancia razonable: %.5f",
+                            original_sl, stop_loss, min_sl_distance_reasonable
+                        )
                 
-                # Si después de ajustar el TP el RR aún es menor, verificar si podemos ajustar SL ligeramente
-                # pero solo si no lo hace demasiado corto (mínimo 1.5x el tamaño del FVG)
                 if rr < (self.min_rr - 0.01):
-                    # Obtener información del FVG calculado en la validación final
-                    # (calculated_fvg_bottom y calculated_fvg_top están disponibles en este scope)
-                    if 'calculated_fvg_bottom' in locals() and 'calculated_fvg_top' in locals():
-                        fvg_size = abs(calculated_fvg_top - calculated_fvg_bottom)
-                    else:
-                        # Si no están disponibles, usar el risk actual como referencia
-                        fvg_size = risk_actual
-                    
-                    # Calcular distancia mínima razonable del SL
-                    # No hacer el SL demasiado corto: mínimo 1.5x el tamaño del FVG o 80% del risk actual
-                    min_sl_distance_reasonable = max(
-                        fvg_size_calc * 1.5,  # Mínimo 1.5x el tamaño del FVG
-                        min_distance * 2,  # O 2x la distancia mínima del broker
-                        risk_actual * 0.8  # O 80% del risk actual (no hacer SL demasiado corto)
+                    log.error(
+                        "❌ ERROR: No se pudo alcanzar RR mínimo (%.2f) manteniendo SL razonable | "
+                        "RR final: %.2f | Cancelando orden",
+                        self.min_rr, rr
                     )
-                    
-                    self.logger.info(
-                        f"[{symbol}] ⚠️  Ajustando SL para mantener RR mínimo | "
-                        f"Distancia mínima razonable del SL: {min_sl_distance_reasonable:.5f} | "
-                        f"FVG size: {fvg_size_calc:.5f}"
-                    )
-                    
-                    # Calcular nuevo SL que mantenga distancia razonable
-                    # IMPORTANTE: Solo ajustar el SL si es necesario y manteniendo distancia razonable
-                    # No hacer el SL demasiado corto (más cercano al entry)
-                    if direction == 'BULLISH':
-                        new_sl = entry_price - min_sl_distance_reasonable
-                        # Para BUY: SL debe estar debajo del entry
-                        # Solo ajustar si el nuevo SL está más lejos (más abajo) que el original
-                        # Esto aumenta el risk y permite mantener RR de 1:2
-                        if new_sl < stop_loss:  # new_sl más abajo = más lejos = más risk
-                            stop_loss = round(new_sl, digits)
-                            risk_actual = abs(entry_price - stop_loss)
-                            # Recalcular TP para mantener RR
-                            reward_actual = risk_actual * max_rr
-                            take_profit = round(entry_price + reward_actual, digits)
-                            reward_actual = take_profit - entry_price
-                            rr = reward_actual / risk_actual
-                            self.logger.info(
-                                f"[{symbol}] ⚠️  SL ajustado para mantener RR mínimo: "
-                                f"SL original={original_sl:.5f} → SL ajustado={stop_loss:.5f} | "
-                                f"Distancia razonable: {min_sl_distance_reasonable:.5f}"
-                            )
-                    else:
-                        new_sl = entry_price + min_sl_distance_reasonable
-                        # Para SELL: SL debe estar arriba del entry
-                        # Solo ajustar si el nuevo SL está más lejos (más arriba) que el original
-                        # Esto aumenta el risk y permite mantener RR de 1:2
-                        if new_sl > stop_loss:  # new_sl más arriba = más lejos = más risk
-                            stop_loss = round(new_sl, digits)
-                            risk_actual = abs(entry_price - stop_loss)
-                            # Recalcular TP para mantener RR
-                            reward_actual = risk_actual * max_rr
-                            take_profit = round(entry_price - reward_actual, digits)
-                            reward_actual = entry_price - take_profit
-                            rr = reward_actual / risk_actual
-                            self.logger.info(
-                                f"[{symbol}] ⚠️  SL ajustado para mantener RR mínimo: "
-                                f"SL original={original_sl:.5f} → SL ajustado={stop_loss:.5f} | "
-                                f"Distancia razonable: {min_sl_distance_reasonable:.5f}"
-                            )
-                    
-                    if rr < (self.min_rr - 0.01):
-                        self.logger.error(
-                            f"[{symbol}] ❌ ERROR: No se pudo alcanzar RR mínimo ({self.min_rr:.2f}) manteniendo SL razonable | "
-                            f"RR final: {rr:.2f} | Cancelando orden"
-                        )
-                        return None
-            
-            self.logger.info(
-                f"[{symbol}] 📈 RR recalculado y FORZADO a {rr:.2f}:1 con precio real | "
-                f"Entry={entry_price:.5f}, SL={stop_loss:.5f} (original: {original_sl:.5f}), TP original={original_tp:.5f} → TP ajustado={take_profit:.5f} (redondeado según digits={digits})"
+                    return None
+        
+        log.info(
+            "📈 RR recalculado y FORZADO a %.2f:1 con precio real | "
+            "Entry=%.5f, SL=%.5f (original: %.5f), TP original=%.5f → TP ajustado=%.5f (redondeado según digits=%s)",
+            rr, entry_price, stop_loss, original_sl, original_tp, take_profit, digits
+        )
+        
+        # Crear diccionario FVG con la información calculada y validada
+        fvg = {
+            'fvg_type': calculated_fvg_type,
+            'fvg_bottom': fvg_bottom,
+            'fvg_top': fvg_top,
+            'status': 'VALIDADO',
+            'entered_fvg': True,  # Ya validado arriba
+            'exited_fvg': True,   # Ya validado arriba
+            'exit_direction': self._SWEEP_DISPATCH.get((sweep_type, direction, calculated_fvg_type))
+        }
+        
+        # Calcular volumen basado en el riesgo porcentual
+        volume = self._calculate_volume_by_risk(symbol, entry_price, stop_loss)
+        if volume is None or volume <= 0:
+            log.error("❌ No se pudo calcular el volumen por riesgo")
+            return None
+        
+        # Verificar que el RR sea exactamente 2.0:1 (con pequeña tolerancia por redondeo)
+        rr_exact = abs(rr - self.min_rr) <= 0.05  # Tolerancia de 0.05 para redondeo
+        # Log estructurado de la orden (un solo registro; la primera línea lleva fecha y nivel)
+        if log.isEnabledFor(logging.INFO):
+            sweep_price = turtle_soup.get('sweep_price')
+            target_price_log = turtle_soup.get('target_price')
+            banner = (_ORDER_BANNER_HEAD + "\n" + _ORDER_BANNER_RR_EXACT) if rr_exact else _ORDER_BANNER_HEAD
+            log.info(banner + "\n" + _ORDER_BANNER_CONTEXT, {
+                'direction': direction, 'side': 'COMPRA' if is_buy else 'VENTA',
+                'entry': entry_price, 'sl': stop_loss, 'tp': take_profit,
+                'signal_risk': entry_signal.get('risk', 0), 'signal_reward': entry_signal.get('reward', 0),
+                'rr': rr, 'min_rr': self.min_rr,
+                'risk': risk_actual, 'risk_pips': self._price_to_pips(risk_actual, symbol_info.digits),
+                'reward': reward_actual, 'reward_pips': self._price_to_pips(reward_actual, symbol_info.digits),
+                'volume': volume, 'risk_pct': self.risk_per_trade_percent,
+                'sweep_type': turtle_soup.get('sweep_type', 'N/A'), 'ts_direction': turtle_soup.get('direction', 'N/A'),
+                'swept_candle': turtle_soup.get('swept_candle', 'N/A'),
+                'swept_extreme': turtle_soup.get('swept_extreme', 'N/A'),
+                'sweep_price': f"{sweep_price:.5f}" if sweep_price is not None else 'N/A',
+                'target': f"{target_price_log:.5f}" if target_price_log is not None else 'N/A',
+                'entry_tf': self.entry_timeframe, 'fvg_type': fvg.get('fvg_type', 'N/A'),
+                'fvg_bottom': fvg.get('fvg_bottom', 0), 'fvg_top': fvg.get('fvg_top', 0),
+                'fvg_status': fvg.get('status', 'N/A'),
+                'fvg_entered': fvg.get('entered_fvg', False), 'fvg_exited': fvg.get('exited_fvg', False),
+                'fvg_exit': fvg.get('exit_direction', 'N/A'),
+            })
+        if not rr_exact:
+            log.warning(
+                "⚠️  RR (%.2f:1) difiere del objetivo (%s:1) | "
+                "Diferencia: %.2f | "
+                "Esto puede deberse a redondeo del broker o restricciones de stop level",
+                rr, self.min_rr, abs(rr - self.min_rr)
             )
-            
-            # Crear diccionario FVG con la información calculada y validada
-            fvg = {
-                'fvg_type': calculated_fvg_type,
-                'fvg_bottom': fvg_bottom,
-                'fvg_top': fvg_top,
-                'status': 'VALIDADO',
-                'entered_fvg': True,  # Ya validado arriba
-                'exited_fvg': True,   # Ya validado arriba
-                'exit_direction': 'BAJISTA' if (calculated_fvg_type == 'BAJISTA' and direction == 'BEARISH') else 'ALCISTA' if (calculated_fvg_type == 'ALCISTA' and direction == 'BULLISH') else None
+        
+        # Ejecutar orden según dirección (BULLISH → buy, BEARISH → sell)
+        try:
+            result = self._side_fn[direction](
+                symbol=symbol,
+                volume=volume,
+                price=entry_price,
+                stop_loss=stop_loss,
+                take_profit=take_profit,
+                comment=self._comment
+            )
+        except Exception as e:
+            log.error("❌ Error al ejecutar orden: %r", e)
+            return None
+        
+        if result['success']:
+            # Incrementar contador de trades del día
+            self.trades_today += 1
+            
+            log.info(_ORDER_OK_BANNER, {
+                'ticket': result['order_ticket'], 'symbol': symbol,
+                'entry': entry_price, 'volume': volume, 'sl': stop_loss, 'tp': take_profit, 'rr': rr,
+                'trades': self.trades_today, 'max_trades': self.max_trades_per_day,
+            })
+            
+            # Guardar orden en base de datos (método disponible en BaseStrategy)
+            extra_data = {
+                'turtle_soup': turtle_soup,
+                'entry_signal': entry_signal,
+                'trades_today': self.trades_today,
+                'max_trades_per_day': self.max_trades_per_day
             }
             
-            # Calcular volumen basado en el riesgo porcentual
-            volume = self._calculate_volume_by_risk(symbol, entry_price, stop_loss)
-            if volume is None or volume <= 0:
-                self.logger.error(f"[{symbol}] ❌ No se pudo calcular el volumen por riesgo")
-                return None
-            
-            # Log estructurado de la orden
-            self.logger.info(f"[{symbol}] {'='*70}")
-            self.logger.info(f"[{symbol}] 💹 EJECUTANDO ORDEN DE TRADING")
-            self.logger.info(f"[{symbol}] {'='*70}")
-            self.logger.info(f"[{symbol}] 📊 Dirección: {direction} ({'COMPRA' if direction == 'BULLISH' else 'VENTA'})")
-            self.logger.info(f"[{symbol}] 💰 Precio de Entrada: {entry_price:.5f}")
-            self.logger.info(f"[{symbol}] 🛑 Stop Loss: {stop_loss:.5f} (Risk: {entry_signal.get('risk', 0):.5f})")
-            self.logger.info(f"[{symbol}] 🎯 Take Profit: {take_profit:.5f} (Reward: {entry_signal.get('reward', 0):.5f})")
-            # Log final del RR con detalles
-            risk_pips = self._price_to_pips(risk_actual, symbol_info.digits)
-            reward_pips = self._price_to_pips(reward_actual, symbol_info.digits)
-            self.logger.info(
-                f"[{symbol}] 📈 Risk/Reward FINAL: {rr:.2f}:1 (objetivo: {self.min_rr}:1) | "
-                f"Risk: {risk_actual:.5f} ({risk_pips:.1f} pips) | "
-                f"Reward: {reward_actual:.5f} ({reward_pips:.1f} pips)"
+            self.save_order_to_db_async(
+                ticket=result['order_ticket'],
+                symbol=symbol,
+                order_type=direction,  # 'BULLISH' o 'BEARISH' -> convertimos a 'BUY' o 'SELL'
+                entry_price=entry_price,
+                volume=volume,
+                stop_loss=stop_loss,
+                take_profit=take_profit,
+                rr=rr,
+                comment=self._comment,
+                extra_data=extra_data
             )
             
-            # Verificar que el RR sea exactamente 2.0:1 (con pequeña tolerancia por redondeo)
-            if abs(rr - self.min_rr) > 0.05:  # Tolerancia de 0.05 para redondeo
-                self.logger.warning(
-                    f"[{symbol}] ⚠️  RR ({rr:.2f}:1) difiere del objetivo ({self.min_rr}:1) | "
-                    f"Diferencia: {abs(rr - self.min_rr):.2f} | "
-                    f"Esto puede deberse a redondeo del broker o restricciones de stop level"
-                )
-            else:
-                self.logger.info(f"[{symbol}] ✅ RR exacto de {self.min_rr}:1 logrado exitosamente")
-            self.logger.info(f"[{symbol}] 📦 Volumen: {volume:.2f} lotes (calculado por {self.risk_per_trade_percent}% de riesgo)")
-            self.logger.info(f"[{symbol}] {'-'*70}")
-            self.logger.info(f"[{symbol}] 📋 Contexto de la Señal:")
-            self.logger.info(f"[{symbol}]    • Turtle Soup H4: {turtle_soup.get('sweep_type', 'N/A')} → {turtle_soup.get('direction', 'N/A')}")
-            self.logger.info(f"[{symbol}]    • Vela barrida: {turtle_soup.get('swept_candle', 'N/A')} ({turtle_soup.get('swept_extreme', 'N/A')})")
-            sweep_price = turtle_soup.get('sweep_price')
-            sweep_price_str = f"{sweep_price:.5f}" if sweep_price is not None else 'N/A'
-            self.logger.info(f"[{symbol}]    • Precio barrido: {sweep_price_str}")
-            target_price_log = turtle_soup.get('target_price')
-            target_price_str = f"{target_price_log:.5f}" if target_price_log is not None else 'N/A'
-            self.logger.info(f"[{symbol}]    • Objetivo: {target_price_str}")
-            if fvg:
-                self.logger.info(f"[{symbol}]    • FVG {self.entry_timeframe}: {fvg.get('fvg_type', 'N/A')} ({fvg.get('fvg_bottom', 0):.5f} - {fvg.get('fvg_top', 0):.5f})")
-                self.logger.info(f"[{symbol}]    • FVG Estado: {fvg.get('status', 'N/A')} | Entró: {fvg.get('entered_fvg', False)} | Salió: {fvg.get('exited_fvg', False)}")
-                self.logger.info(f"[{symbol}]    • Dirección de salida FVG: {fvg.get('exit_direction', 'N/A')}")
-            self.logger.info(f"[{symbol}] {'='*70}")
-            
-            # Ejecutar orden según dirección
-            if direction == 'BULLISH':
-                result = self.executor.buy(
-                    symbol=symbol,
-                    volume=volume,
-                    price=entry_price,
-                    stop_loss=stop_loss,
-                    take_profit=take_profit,
-                    comment=f"TurtleSoup H4 + FVG {self.entry_timeframe}"
-                )
-            else:
-                result = self.executor.sell(
-                    symbol=symbol,
-                    volume=volume,
-                    price=entry_price,
-                    stop_loss=stop_loss,
-                    take_profit=take_profit,
-                    comment=f"TurtleSoup H4 + FVG {self.entry_timeframe}"
-                )
-            
-            if result['success']:
-                # Incrementar contador de trades del día
-                self.trades_today += 1
-                
-                self.logger.info(f"[{symbol}] {'='*70}")
-                self.logger.info(f"[{symbol}] ✅ ORDEN EJECUTADA EXITOSAMENTE")
-                self.logger.info(f"[{symbol}] {'='*70}")
-                self.logger.info(f"[{symbol}] 🎫 Ticket: {result['order_ticket']}")
-                self.logger.info(f"[{symbol}] 📊 Símbolo: {symbol}")
-                self.logger.info(f"[{symbol}] 💰 Precio: {entry_price:.5f}")
-                self.logger.info(f"[{symbol}] 📦 Volumen: {volume:.2f} lotes")
-                self.logger.info(f"[{symbol}] 🛑 Stop Loss: {stop_loss:.5f}")
-                self.logger.info(f"[{symbol}] 🎯 Take Profit: {take_profit:.5f}")
-                self.logger.info(f"[{symbol}] 📈 Risk/Reward: {rr:.2f}:1")
-                self.logger.info(f"[{symbol}] 📊 Trades hoy: {self.trades_today}/{self.max_trades_per_day}")
-                self.logger.info(f"[{symbol}] {'='*70}")
-                
-                # Guardar orden en base de datos (método disponible en BaseStrategy)
-                extra_data = {
-                    'turtle_soup': turtle_soup,
-                    'entry_signal': entry_signal,
-                    'trades_today': self.trades_today,
-                    'max_trades_per_day': self.max_trades_per_day
-                }
-                
-                self.save_order_to_db(
-                    ticket=result['order_ticket'],
-                    symbol=symbol,
-                    order_type=direction,  # 'BULLISH' o 'BEARISH' -> convertimos a 'BUY' o 'SELL'
-                    entry_price=entry_price,
-                    volume=volume,
-                    stop_loss=stop_loss,
-                    take_profit=take_profit,
-                    rr=rr,
-                    comment=f"TurtleSoup H4 + FVG {self.entry_timeframe}",
-                    extra_data=extra_data
-                )
-                
-                return {
-                    'action': f'{direction}_EXECUTED',
-                    'ticket': result['order_ticket'],
-                    'turtle_soup': turtle_soup,
-                    'entry_signal': entry_signal
-                }
-            else:
-                self.logger.error(f"[{symbol}] {'='*70}")
-                self.logger.error(f"[{symbol}] ❌ ERROR AL EJECUTAR ORDEN")
-                self.logger.error(f"[{symbol}] {'='*70}")
-                self.logger.error(f"[{symbol}] Mensaje: {result.get('message', 'Error desconocido')}")
-                self.logger.error(f"[{symbol}] {'='*70}")
-                return None
-                
-        except Exception as e:
-            self.logger.error(f"[{symbol}] ❌ Error al ejecutar orden: {e}", exc_info=True)
+            return {
+                'action': f'{direction}_EXECUTED',
+                'ticket': result['order_ticket'],
+                'turtle_soup': turtle_soup,
+                'entry_signal': entry_signal
+            }
+        else:
+            log.error(_ORDER_ERROR_BANNER, result.get('message', 'Error desconocido'))
             return None
 
@@ -4,10 +4,15 @@ Gestiona diferentes estrategias de trading
 """
 
 import logging
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 
+# Un único hilo para persistir órdenes en BD fuera del loop de estrategias
+# (un solo worker conserva el orden de escritura)
+_order_db_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="OrderDBWriter")
+
 
 class StrategyManager:
     """Gestiona múltiples estrategias de trading"""
@@ -65,6 +70,44 @@ class StrategyManager:
         strategy = self.strategies[strategy_name]
         return strategy.analyze(symbol, rates)
     
+    def analyze_batch(self, symbols: List[str], rates_by_symbol: Dict[str, np.ndarray],
+                      strategy_name: str) -> Dict[str, Optional[Dict]]:
+        """
+        Analiza varios símbolos en una sola llamada usando la estrategia especificada
+        
+        Args:
+            symbols: Símbolos a analizar
+            rates_by_symbol: Array de velas OHLCV de MT5 por símbolo
+            strategy_name: Nombre de la estrategia a usar
+            
+        Returns:
+            Dict símbolo -> señal de trading o None
+        """
+        if strategy_name not in self.strategies:
+            self.logger.error(f"Estrategia '{strategy_name}' no encontrada")
+            return {}
+        
+        strategy = self.strategies[strategy_name]
+        return strategy.analyze_batch(symbols, rates_by_symbol)
+    
+    def has_batch_analysis(self, strategy_name: str) -> bool:
+        """
+        Verifica si la estrategia sobrescribe analyze_batch (filtrado en bloque de símbolos)
+        
+        Con el analyze_batch por defecto (un bucle sobre analyze) no se gana nada obteniendo
+        antes las velas de todos los símbolos: es mejor obtener y analizar símbolo a símbolo.
+        
+        Args:
+            strategy_name: Nombre de la estrategia
+            
+        Returns:
+            True si la estrategia tiene su propio analyze_batch, False si no
+        """
+        strategy = self.strategies.get(strategy_name)
+        if strategy is None:
+            return False
+        return type(strategy).analyze_batch is not BaseStrategy.analyze_batch
+    
     def needs_intensive_monitoring(self, strategy_name: str) -> bool:
         """
         Verifica si la estrategia necesita monitoreo intensivo
@@ -102,7 +145,7 @@ class BaseStrategy:
         """Obtiene la instancia de OrderExecutor (lazy initialization)"""
         if self._order_executor is None:
             from Base.order_executor import OrderExecutor
-            self._order_executor = OrderExecutor()
+            self._order_executor = OrderExecutor.instance()
         return self._order_executor
     
     def _get_db_manager(self):
@@ -176,6 +219,15 @@ class BaseStrategy:
             self.logger.error(f"Error al guardar orden en BD: {e}", exc_info=True)
             return False
     
+    def save_order_to_db_async(self, **order) -> None:
+        """
+        Guarda una orden en BD en segundo plano (no bloquea el loop de la estrategia)
+        
+        Acepta los mismos argumentos que save_order_to_db, que captura y registra sus
+        propios errores. Los dicts pasados (extra_data) no deben modificarse después.
+        """
+        _order_db_pool.submit(self.save_order_to_db, **order)
+    
     def _should_close_day_after_first_tp(self) -> bool:
         """
         Verifica si está habilitada la opción de cerrar el día después del primer TP
@@ -323,11 +375,12 @@ class BaseStrategy:
                     if db_manager.enabled:
                         ticket = position.get('ticket')
                         try:
-                            cursor = db_manager.connection.cursor()
                             query = "SELECT CreatedAt FROM Orders WHERE Ticket = ?"
-                            cursor.execute(query, (ticket,))
-                            row = cursor.fetchone()
-                            cursor.close()
+                            with db_manager.lock:
+                                cursor = db_manager.connection.cursor()
+                                cursor.execute(query, (ticket,))
+                                row = cursor.fetchone()
+                                cursor.close()
                             
                             if row and row[0]:
                                 created_at = row[0]
@@ -391,6 +444,29 @@ class BaseStrategy:
         """
         raise NotImplementedError("Las estrategias deben implementar el método analyze()")
     
+    def analyze_batch(self, symbols: List[str], rates_by_symbol: Dict[str, np.ndarray]) -> Dict[str, Optional[Dict]]:
+        """
+        Analiza varios símbolos; por defecto llama a analyze() para cada uno
+        
+        Las estrategias pueden sobrescribirlo para descartar en bloque (vectorizado) los
+        símbolos sin patrón antes del análisis individual.
+        
+        Args:
+            symbols: Símbolos a analizar
+            rates_by_symbol: Array de velas OHLCV por símbolo
+            
+        Returns:
+            Dict símbolo -> señal de trading o None
+        """
+        signals = {}
+        for symbol in symbols:
+            try:
+                signals[symbol] = self.analyze(symbol, rates_by_symbol[symbol])
+            except Exception as e:
+                self.logger.error(f"Error al analizar {symbol}: {e}", exc_info=True)
+                signals[symbol] = None
+        return signals
+    
     def _create_signal(self, action: str, symbol: str, price: float, 
                       stop_loss: float = None, take_profit: float = None,
                       timestamp: int = None) -> Dict:
@@ -439,10 +515,10 @@ class DefaultStrategy(BaseStrategy):
             return None
         
         # Ejemplo básico: obtener último precio
-        last_candle = rates[-1]
-        current_price = last_candle['close']
+        current_price = rates['close'][-1]
         
-        self.logger.debug(f"{symbol} - Precio actual: {current_price}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("%s - Precio actual: %s", symbol, current_price)
         
         # TODO: Implementar lógica de estrategia aquí
         # Por ahora retorna None (no hay señal)
@@ -0,0 +1,182 @@
+"""
+Tests para el kernel de clasificación de FVG (_fvg_kernel) y detect_fvg con velas sintéticas
+
+MetaTrader5 se sustituye por un mock: no hace falta un terminal MT5 para ejecutarlos.
+"""
+
+import random
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+# Sin terminal MT5 (solo Windows): basta con el stub para importar los módulos de Base
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+from Base import fvg_detector
+from Base.fvg_detector import FVGDetector, _fvg_kernel
+
+
+RATES_DTYPE = np.dtype([
+    ('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+    ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8'),
+])
+
+
+def make_rates(candles):
+    """
+    Crea un array estructurado de MT5 a partir de (high, low), más antigua primero
+    """
+    rates = np.zeros(len(candles), dtype=RATES_DTYPE)
+    for i, (high, low) in enumerate(candles):
+        rates[i] = (1_700_000_000 + i * 14400, (high + low) / 2, high, low, (high + low) / 2, 100, 0, 0)
+    return rates
+
+
+def reference_classify(vela1, vela2, vela3, current_price):
+    """
+    Clasificación de detect_fvg antes del kernel (misma prioridad y condiciones)
+
+    Returns:
+        Tupla (tipo, bottom, top, vela que forma el FVG) o None si no hay FVG
+    """
+    if vela1['low'] < vela3['high'] and vela3['low'] > vela1['high']:
+        return 'ALCISTA', vela1['high'], vela3['low'], vela3
+    elif vela1['high'] > vela3['low'] and vela3['high'] < vela1['low']:
+        return 'BAJISTA', vela3['high'], vela1['low'], vela3
+
+    if vela1['high'] < vela2['low']:
+        fvg_bottom, fvg_top = vela1['high'], vela2['low']
+        fvg_type = 'ALCISTA'
+    elif vela1['low'] > vela2['high']:
+        fvg_top, fvg_bottom = vela1['low'], vela2['high']
+        fvg_type = 'BAJISTA'
+    else:
+        return None
+    if fvg_bottom <= current_price <= fvg_top or \
+       (current_price > fvg_top and current_price - fvg_top < (fvg_top - fvg_bottom) * 2) or \
+       (current_price < fvg_bottom and fvg_bottom - current_price < (fvg_top - fvg_bottom) * 2):
+        return fvg_type, fvg_bottom, fvg_top, vela2
+    return None
+
+
+def reference_detect(detector, rates, current_price):
+    """detect_fvg con la clasificación anterior al kernel"""
+    vela1, vela2, vela3 = detector._candles_from_rates(rates)
+    ref = reference_classify(vela1, vela2, vela3, current_price)
+    if ref is None:
+        return None
+    fvg_type, fvg_bottom, fvg_top, forming = ref
+    return detector._analyze_fvg(
+        fvg_type=fvg_type, fvg_bottom=fvg_bottom, fvg_top=fvg_top,
+        current_price=current_price, forming_candle=forming, prev_candle=vela1,
+        next_candle=vela3, symbol='EURUSD', timeframe='M5'
+    )
+
+
+def without_timestamp(fvg):
+    """Quita el timestamp (datetime.now()) para comparar resultados"""
+    if fvg is None:
+        return None
+    return {k: v for k, v in fvg.items() if k != 'timestamp'}
+
+
+@pytest.fixture
+def mt5_mock():
+    """Sustituye el módulo MT5 que usa fvg_detector"""
+    with patch.object(fvg_detector, 'mt5') as mock:
+        yield mock
+
+
+class TestFVGKernel:
+    """Tests de _fvg_kernel y detect_fvg con rates/current_price ya obtenidos"""
+
+    # vela1, vela2, vela3 como (high, low)
+    BULLISH_13 = [(1.1000, 1.0950), (1.1100, 1.0990), (1.1150, 1.1050)]
+    BEARISH_13 = [(1.1050, 1.1000), (1.1010, 1.0900), (1.0950, 1.0850)]
+    BULLISH_12 = [(1.1000, 1.0950), (1.1100, 1.1040), (1.1060, 1.0980)]
+    NO_GAP = [(1.1000, 1.0950), (1.1010, 1.0960), (1.1005, 1.0955)]
+
+    def detect(self, candles, current_price):
+        return FVGDetector().detect_fvg('EURUSD', 'M5', rates=make_rates(candles), current_price=current_price)
+
+    def test_bullish_fvg_vela1_vela3(self, mt5_mock):
+        fvg = self.detect(self.BULLISH_13, 1.1120)
+        assert fvg['fvg_type'] == 'ALCISTA'
+        assert (fvg['fvg_bottom'], fvg['fvg_top']) == (1.1000, 1.1050)
+        assert fvg['forming_candle']['low'] == 1.1050
+        mt5_mock.copy_rates_from_pos.assert_not_called()
+        mt5_mock.symbol_info_tick.assert_not_called()
+
+    def test_bearish_fvg_vela1_vela3(self, mt5_mock):
+        fvg = self.detect(self.BEARISH_13, 1.0900)
+        assert fvg['fvg_type'] == 'BAJISTA'
+        assert (fvg['fvg_bottom'], fvg['fvg_top']) == (1.0950, 1.1000)
+
+    def test_no_gap(self, mt5_mock):
+        assert self.detect(self.NO_GAP, 1.0980) is None
+
+    def test_vela1_vela2_fvg_price_inside(self, mt5_mock):
+        fvg = self.detect(self.BULLISH_12, 1.1020)
+        assert fvg['fvg_type'] == 'ALCISTA'
+        assert (fvg['fvg_bottom'], fvg['fvg_top']) == (1.1000, 1.1040)
+        assert fvg['price_touching_fvg'] is True
+        # La vela que forma un FVG vela1-vela2 es vela2
+        assert fvg['forming_candle']['low'] == 1.1040
+
+    def test_vela1_vela2_fvg_price_far_outside(self, mt5_mock):
+        # Tamaño 0.0040: a más de 2x el tamaño del FVG ya no cuenta como interacción
+        assert self.detect(self.BULLISH_12, 1.1040 + 0.0081) is None
+        assert self.detect(self.BULLISH_12, 1.1000 - 0.0081) is None
+
+    @pytest.mark.parametrize('candles, price', [
+        (BULLISH_13, 1.1120), (BULLISH_13, 1.1020), (BEARISH_13, 1.0900), (BEARISH_13, 1.0980),
+        (BULLISH_12, 1.1020), (BULLISH_12, 1.1070), (BULLISH_12, 1.2000), (NO_GAP, 1.0980),
+    ])
+    def test_parity_with_reference(self, mt5_mock, candles, price):
+        rates = make_rates(candles)
+        detector = FVGDetector()
+        result = detector.detect_fvg('EURUSD', 'M5', rates=rates, current_price=price)
+        assert without_timestamp(result) == without_timestamp(reference_detect(detector, rates, price))
+
+    def test_parity_random_candles(self, mt5_mock):
+        rng = random.Random(42)
+        detector = FVGDetector()
+        for _ in range(2000):
+            candles = []
+            for _ in range(3):
+                low = round(1.1 + rng.uniform(-0.01, 0.01), 5)
+                candles.append((round(low + rng.uniform(0.0, 0.006), 5), low))
+            price = round(1.1 + rng.uniform(-0.015, 0.015), 5)
+            rates = make_rates(candles)
+            h = np.ascontiguousarray(rates['high'], dtype=np.float64)
+            l = np.ascontiguousarray(rates['low'], dtype=np.float64)
+            kind, bottom, top = _fvg_kernel(h, l, price)
+            vela1, vela2, vela3 = detector._candles_from_rates(rates)
+            ref = reference_classify(vela1, vela2, vela3, price)
+            if ref is None:
+                assert kind == 0, candles
+            else:
+                assert ('ALCISTA' if kind > 0 else 'BAJISTA', bottom, top) == ref[:3], candles
+                assert (abs(kind) == 1) == (ref[3] is vela3)
+
+    def test_rates_unsorted_and_longer(self, mt5_mock):
+        # Se usan las 3 velas más recientes por tiempo, sin depender del orden recibido
+        rates = make_rates([(1.0800, 1.0700)] + self.BULLISH_13)[::-1]
+        fvg = FVGDetector().detect_fvg('EURUSD', 'M5', rates=rates, current_price=1.1120)
+        assert (fvg['fvg_type'], fvg['fvg_bottom'], fvg['fvg_top']) == ('ALCISTA', 1.1000, 1.1050)
+
+    def test_fetch_path_matches_given_rates(self, mt5_mock):
+        rates = make_rates(self.BEARISH_13)
+        mt5_mock.copy_rates_from_pos.return_value = rates
+        mt5_mock.symbol_info_tick.return_value = MagicMock(bid=1.0900)
+        detector = FVGDetector()
+        fetched = detector.detect_fvg('EURUSD', 'M5')
+        given = detector.detect_fvg('EURUSD', 'M5', rates=rates, current_price=1.0900)
+        assert without_timestamp(fetched) == without_timestamp(given)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
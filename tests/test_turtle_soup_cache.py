@@ -0,0 +1,166 @@
+"""
+Tests para la caché de detect_turtle_soup_h4 (por barra H4 antes de las 13:00 NY y por fecha después)
+
+MetaTrader5 y la detección se sustituyen por mocks: no hace falta un terminal MT5 para ejecutarlos.
+"""
+
+import sys
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytz = pytest.importorskip('pytz')
+
+# Sin terminal MT5 (solo Windows): basta con el stub para importar los módulos de Base
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+from Base import turtle_soup_detector
+from Base.turtle_soup_detector import TurtleSoupDetector, detect_turtle_soup_h4
+
+
+NY_TZ = pytz.timezone('America/New_York')
+BAR_TIME = 1_700_000_000
+NEXT_BAR_TIME = BAR_TIME + 14400
+
+
+def make_bar(bar_time):
+    """Barra H4 actual tal como la devuelve copy_rates_from_pos(symbol, H4, 0, 1)"""
+    return np.array([(bar_time,)], dtype=[('time', '<i8')])
+
+
+def make_result(times):
+    """Resultado de detect_turtle_soup con las velas clave abiertas en los tiempos dados"""
+    return {
+        'detected': True,
+        'sweep_type': 'BULLISH_SWEEP',
+        'direction': 'BULLISH',
+        'candles': {key: {'time': t} for key, t in zip(('1am', '5am', '9am'), times)},
+    }
+
+
+@pytest.fixture
+def ts_env():
+    """
+    Deja la caché vacía y simula MT5, la detección y la hora NY
+
+    Yields:
+        Objeto con los mocks: mt5, detect y set_ny_time(hour)
+    """
+    turtle_soup_detector._bar_cache.clear()
+    turtle_soup_detector._detect_turtle_soup_closed.cache_clear()
+
+    env = MagicMock()
+    with patch.object(turtle_soup_detector, 'mt5') as mt5_mock, \
+         patch.object(TurtleSoupDetector, 'detect_turtle_soup') as detect_mock, \
+         patch.object(turtle_soup_detector, 'datetime') as datetime_mock:
+        env.mt5 = mt5_mock
+        env.detect = detect_mock
+
+        def set_ny_time(hour, day=15):
+            datetime_mock.now.return_value = NY_TZ.localize(datetime(2026, 10, day, hour, 30))
+        env.set_ny_time = set_ny_time
+        set_ny_time(11)
+        mt5_mock.copy_rates_from_pos.return_value = make_bar(BAR_TIME)
+        yield env
+
+    turtle_soup_detector._bar_cache.clear()
+    turtle_soup_detector._detect_turtle_soup_closed.cache_clear()
+
+
+class TestTurtleSoupPerBarCache:
+    """Tests de la caché por barra H4 (antes de las 13:00 NY)"""
+
+    def test_forming_key_candle_is_never_cached(self, ts_env):
+        # La vela de 9 AM es la barra H4 en formación: sus extremos aún cambian
+        ts_env.detect.return_value = make_result((BAR_TIME - 28800, BAR_TIME - 14400, BAR_TIME))
+
+        for _ in range(3):
+            assert detect_turtle_soup_h4('EURUSD')['detected'] is True
+
+        assert ts_env.detect.call_count == 3
+        assert 'EURUSD' not in turtle_soup_detector._bar_cache
+
+    def test_closed_key_candles_are_cached_within_bar(self, ts_env):
+        result = make_result((BAR_TIME - 43200, BAR_TIME - 28800, BAR_TIME - 14400))
+        ts_env.detect.return_value = result
+
+        assert detect_turtle_soup_h4('EURUSD') is result
+        assert detect_turtle_soup_h4('EURUSD') is result
+
+        assert ts_env.detect.call_count == 1
+
+    def test_new_bar_time_invalidates_cache(self, ts_env):
+        first = make_result((BAR_TIME - 43200, BAR_TIME - 28800, BAR_TIME - 14400))
+        second = make_result((BAR_TIME - 28800, BAR_TIME - 14400, BAR_TIME))
+        ts_env.detect.side_effect = [first, second]
+
+        assert detect_turtle_soup_h4('EURUSD') is first
+        ts_env.mt5.copy_rates_from_pos.return_value = make_bar(NEXT_BAR_TIME)
+        assert detect_turtle_soup_h4('EURUSD') is second
+
+        assert ts_env.detect.call_count == 2
+        assert turtle_soup_detector._bar_cache['EURUSD'] == (NEXT_BAR_TIME, second)
+
+    def test_none_result_is_retried(self, ts_env):
+        result = make_result((BAR_TIME - 43200, BAR_TIME - 28800, BAR_TIME - 14400))
+        ts_env.detect.side_effect = [None, result]
+
+        assert detect_turtle_soup_h4('EURUSD') is None
+        assert 'EURUSD' not in turtle_soup_detector._bar_cache
+        assert detect_turtle_soup_h4('EURUSD') is result
+
+        assert ts_env.detect.call_count == 2
+
+    def test_missing_bar_detects_without_cache(self, ts_env):
+        ts_env.mt5.copy_rates_from_pos.return_value = None
+        ts_env.detect.return_value = make_result((1, 2, 3))
+
+        detect_turtle_soup_h4('EURUSD')
+        detect_turtle_soup_h4('EURUSD')
+
+        assert ts_env.detect.call_count == 2
+        assert 'EURUSD' not in turtle_soup_detector._bar_cache
+
+
+class TestTurtleSoupClosedCache:
+    """Tests de la caché por fecha NY (desde las 13:00 NY)"""
+
+    def test_after_13_ny_uses_date_keyed_cache(self, ts_env):
+        ts_env.set_ny_time(14)
+        result = make_result((1, 2, 3))
+        ts_env.detect.return_value = result
+
+        assert detect_turtle_soup_h4('EURUSD') is result
+        ts_env.set_ny_time(18)
+        assert detect_turtle_soup_h4('EURUSD') is result
+
+        assert ts_env.detect.call_count == 1
+        # La barra H4 actual no se consulta: el resultado es fijo hasta el día siguiente
+        ts_env.mt5.copy_rates_from_pos.assert_not_called()
+
+    def test_next_day_detects_again(self, ts_env):
+        ts_env.set_ny_time(14)
+        ts_env.detect.return_value = make_result((1, 2, 3))
+        detect_turtle_soup_h4('EURUSD')
+
+        ts_env.set_ny_time(14, day=16)
+        detect_turtle_soup_h4('EURUSD')
+
+        assert ts_env.detect.call_count == 2
+
+    def test_none_result_is_retried_after_13_ny(self, ts_env):
+        ts_env.set_ny_time(14)
+        result = make_result((1, 2, 3))
+        ts_env.detect.side_effect = [None, result]
+
+        assert detect_turtle_soup_h4('EURUSD') is None
+        assert detect_turtle_soup_h4('EURUSD') is result
+        assert detect_turtle_soup_h4('EURUSD') is result
+
+        assert ts_env.detect.call_count == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])